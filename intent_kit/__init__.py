@@ -15,6 +15,7 @@ from intent_kit.core import (
     run_dag,
     ContextProtocol,
     DefaultContext,
+    ExecutionEnvironment,
 )
 
 # run_dag is available from core.traversal
@@ -31,4 +32,5 @@ __all__ = [
     "run_dag",
     "ContextProtocol",
     "DefaultContext",
+    "ExecutionEnvironment",
 ]
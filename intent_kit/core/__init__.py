@@ -13,6 +13,7 @@ from .traversal import run_dag
 from .validation import validate_dag_structure
 
 from .context import ContextProtocol, DefaultContext
+from .runtime import ExecutionEnvironment
 
 # Exceptions
 from .exceptions import (
@@ -20,6 +21,7 @@ from .exceptions import (
     TraversalError,
     TraversalLimitError,
     ContextConflictError,
+    ContextVersionError,
     ExecutionError,
 )
 
@@ -31,6 +33,7 @@ __all__ = [
     "NodeProtocol",
     "ExecutionResult",
     "ContextProtocol",
+    "ExecutionEnvironment",
     # DAG building
     "DAGBuilder",
     # Graph execution
@@ -43,5 +46,6 @@ __all__ = [
     "TraversalError",
     "TraversalLimitError",
     "ContextConflictError",
+    "ContextVersionError",
     "ExecutionError",
 ]
@@ -13,6 +13,10 @@ from intent_kit.core.context.protocols import (
 
 from intent_kit.core.context.default import DefaultContext
 from intent_kit.core.context.adapters import DictBackedContext
+from intent_kit.core.context.concurrent import ConcurrentContext
+from intent_kit.core.context.layered import LayeredContext
+from intent_kit.core.context.transaction import ContextTransaction
+from intent_kit.core.context.store import ContextStore, StoredContext
 
 __all__ = [
     "ContextProtocol",
@@ -21,4 +25,9 @@ __all__ = [
     "LoggerLike",
     "DefaultContext",
     "DictBackedContext",
+    "ConcurrentContext",
+    "LayeredContext",
+    "ContextTransaction",
+    "ContextStore",
+    "StoredContext",
 ]
@@ -4,6 +4,7 @@ from typing import Any, Mapping, Optional
 
 from intent_kit.core.context.default import DefaultContext
 from intent_kit.core.context.protocols import LoggerLike
+from intent_kit.core.context.telemetry import DEFAULT_TELEMETRY_CAPACITY
 from intent_kit.utils.logger import Logger
 
 
@@ -20,10 +21,16 @@ class DictBackedContext(DefaultContext):
         backing: Optional[Mapping[str, Any]],
         *,
         logger: Optional[LoggerLike] = None,
+        telemetry_capacity: int = DEFAULT_TELEMETRY_CAPACITY,
+        track_provenance: bool = False,
     ) -> None:
-        super().__init__(logger=logger or Logger("intent_kit.context.dict_backed"))
+        super().__init__(
+            logger=logger or Logger("intent_kit.context.dict_backed"),
+            telemetry_capacity=telemetry_capacity,
+            track_provenance=track_provenance,
+        )
         # Single hydration step
         if backing is not None:
             for k, v in backing.items():
                 if isinstance(k, str):
-                    self._data[k] = v
+                    self._write(k, v)
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from intent_kit.core.context.default import DefaultContext
+from intent_kit.core.context.policies import ReducerLike
+from intent_kit.core.context.protocols import ContextPatch, LoggerLike
+from intent_kit.core.context.telemetry import DEFAULT_TELEMETRY_CAPACITY
+from intent_kit.core.exceptions import ContextVersionError
+
+# Attempts update() makes before giving up on a contended key
+DEFAULT_MAX_RETRIES = 100
+
+
+class ConcurrentContext(DefaultContext):
+    """
+    DefaultContext that threads and asyncio tasks can share.
+
+    Reads of single keys (get, has, get_versioned) are lock-free. Every
+    other operation takes one re-entrant lock, held only while merging and
+    storing, so patches are applied atomically and snapshots never show a
+    half-applied patch.
+
+    Every write stamps the key with the next value of a context-wide
+    sequence, so a key's version changes on each write and never repeats;
+    absent keys have version 0. Patches may carry the versions their writer
+    read (ContextPatch["versions"]); apply_patch checks them under the lock
+    and raises ContextVersionError if any key changed meanwhile. update()
+    wraps that read-compute-write cycle in a retry loop.
+
+    The lock is never held across an await, so asyncio tasks on one loop
+    never block each other; optimistic writes also protect read-modify-write
+    cycles that await between the read and the write.
+
+    append_list always copies instead of extending in place, since a
+    lock-free reader may hold the stored list.
+    """
+
+    def __init__(
+        self,
+        *,
+        logger: Optional[LoggerLike] = None,
+        telemetry_capacity: int = DEFAULT_TELEMETRY_CAPACITY,
+        track_provenance: bool = False,
+    ) -> None:
+        super().__init__(
+            logger=logger,
+            telemetry_capacity=telemetry_capacity,
+            track_provenance=track_provenance,
+        )
+        self._lock = threading.RLock()
+        self._versions: Dict[str, int] = {}
+        self._version = 0
+
+    # ---------- Versions ----------
+    @property
+    def version(self) -> int:
+        """Sequence number of the latest write; increases on every write."""
+        return self._version
+
+    def get_version(self, key: str) -> int:
+        """Return the version of a key, or 0 if it is not set."""
+        return self._versions.get(key, 0)
+
+    def get_versioned(self, key: str, default: Any = None) -> Tuple[Any, int]:
+        """
+        Return a key's value with the version to pass in ContextPatch["versions"].
+
+        Lock-free. The version is read before the value, so a concurrent
+        write can only pair the value with an older version; the resulting
+        patch is then rejected rather than overwriting the newer value.
+        """
+        version = self._versions.get(key, 0)
+        return self._view.get(key, default), version
+
+    def update(
+        self,
+        key: str,
+        fn: Callable[[Any], Any],
+        *,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        provenance: str = "update",
+    ) -> Any:
+        """
+        Replace a key with fn(current value) without losing concurrent updates.
+
+        `fn` runs outside the lock and is retried if another writer changed
+        the key first, so it must not mutate its argument or have side
+        effects. The current value is None when the key is not set.
+
+        Returns:
+            The value written
+
+        Raises:
+            ContextVersionError: If every attempt lost the race
+        """
+        for _ in range(max_retries + 1):
+            current, version = self.get_versioned(key)
+            value = fn(current)
+            try:
+                self.apply_patch(
+                    ContextPatch(
+                        data={key: value},
+                        provenance=provenance,
+                        versions={key: version},
+                    )
+                )
+            except ContextVersionError:
+                continue
+            return value
+        raise ContextVersionError(f"Gave up updating {key} after {max_retries} retries")
+
+    # ---------- Core KV ----------
+    def set(self, key: str, value: Any, modified_by: Optional[str] = None) -> None:
+        with self._lock:
+            super().set(key, value, modified_by)
+
+    def keys(self) -> Iterable[str]:
+        with self._lock:
+            return super().keys()
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return super().delete(key)
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        with self._lock:
+            return super().keys_with_prefix(prefix)
+
+    def select_keys(self, include: Iterable[str]) -> List[str]:
+        with self._lock:
+            return super().select_keys(include)
+
+    def delete_namespace(self, namespace: str) -> int:
+        with self._lock:
+            return super().delete_namespace(namespace)
+
+    # ---------- Patching & snapshots ----------
+    def snapshot(self, include: Optional[Iterable[str]] = None) -> Mapping[str, Any]:
+        with self._lock:
+            return super().snapshot(include)
+
+    def apply_patches(self, patches: Iterable[ContextPatch]) -> None:
+        """
+        Apply patches atomically, after checking their expected versions.
+
+        Versions are checked against the state before the batch, since that
+        is what their writers read.
+
+        Raises:
+            ContextVersionError: If a key changed since its writer read it;
+                nothing is written
+            ContextConflictError: On irreconcilable merges; nothing is written
+        """
+        patches = list(patches)
+        with self._lock:
+            stale = sorted(
+                {
+                    key
+                    for patch in patches
+                    for key, expected in patch.get("versions", {}).items()
+                    if self._versions.get(key, 0) != expected
+                }
+            )
+            if stale:
+                raise ContextVersionError(
+                    f"Context keys changed since read: {', '.join(stale)}"
+                )
+            super().apply_patches(patches)
+
+    def register_reducer(self, key: str, reducer: ReducerLike) -> None:
+        with self._lock:
+            super().register_reducer(key, reducer)
+
+    def merge_from(self, other: Mapping[str, Any]) -> None:
+        with self._lock:
+            super().merge_from(other)
+
+    # ---------- Fingerprint ----------
+    def fingerprint(self, include: Optional[Iterable[str]] = None) -> str:
+        with self._lock:
+            return super().fingerprint(include)
+
+    def _write(self, key: str, value: Any) -> None:
+        # Value before version: get_versioned() reads them in the other order
+        super()._write(key, value)
+        self._version += 1
+        self._versions[key] = self._version
+
+    def _delete(self, key: str) -> None:
+        super()._delete(key)
+        self._version += 1
+        self._versions.pop(key, None)
+
+    def _own(self, key: str) -> None:
+        # Lock-free readers may hold any stored list; never extend in place
+        pass
+
+    # ---------- Telemetry ----------
+    def get_errors(
+        self, where: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            return super().get_errors(where, limit)
+
+    def get_operations(
+        self,
+        name: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            return super().get_operations(name, status, limit)
+
+    def add_error(
+        self, *, where: str, err: str, meta: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        with self._lock:
+            super().add_error(where=where, err=err, meta=meta)
+
+    def track_operation(
+        self, *, name: str, status: str, meta: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        with self._lock:
+            super().track_operation(name=name, status=status, meta=meta)
@@ -1,6 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, Mapping, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 from time import perf_counter
 
 from intent_kit.core.context.protocols import (
@@ -9,13 +20,33 @@ from intent_kit.core.context.protocols import (
     MergePolicyName,
     LoggerLike,
 )
-from intent_kit.core.context.fingerprint import canonical_fingerprint
-from intent_kit.core.context.policies import apply_merge
+from intent_kit.core.context.fingerprint import FingerprintSelection, key_digest
+from intent_kit.core.context.key_index import KeyIndex
+from intent_kit.core.context.provenance import (
+    NO_STEP,
+    ProvenanceRecord,
+    ProvenanceTracker,
+)
+from intent_kit.core.context.telemetry import (
+    DEFAULT_TELEMETRY_CAPACITY,
+    TelemetryBuffer,
+)
+from intent_kit.core.context.policies import (
+    Reducer,
+    ReducerLike,
+    apply_merge_many,
+    as_reducer,
+)
 from intent_kit.core.exceptions import ContextConflictError
 from intent_kit.utils.logger import Logger
 
+if TYPE_CHECKING:
+    from intent_kit.core.context.layered import LayeredContext
+
 
 DEFAULT_EXCLUDED_FP_PREFIXES = ("tmp.", "private.")
+# Distinct include sets whose digests are maintained incrementally per context
+MAX_TRACKED_FP_SELECTIONS = 16
 
 
 class DefaultContext(ContextProtocol):
@@ -23,33 +54,122 @@ class DefaultContext(ContextProtocol):
     Reference dotted-key context with deterministic merge + memoization.
 
     Storage model:
-      - _data: Dict[str, Any] with dotted keys
+      - _data: Dict[str, Any] with dotted keys; every write lands here
+      - _view: Mapping[str, Any] that reads go through (_data itself here;
+        LayeredContext chains it over read-only parent layers)
       - _logger: LoggerLike
+      - _index: sorted KeyIndex over visible keys, built on first use
+      - _fp_selections: rolling digests per fingerprinted include set
+      - _fp_digests: digest of each key counted by a rolling digest
+      - _fp_dirty: keys written since the rolling digests were refreshed
+      - _reducers: per-context reducers for the `reduce` policy, by key/glob
+      - _owned: keys whose list value only this context references, so
+        append_list may extend it in place; cleared when values escape
+        through get(), snapshot() or fork()
+      - _shared: whether _data is read by forked children; the next write
+        then copies it first, so children keep the state they forked from
+      - _telemetry: bounded TelemetryBuffer per namespace ("errors",
+        "operations"); kept out of _data, so never snapshotted or fingerprinted
+      - _provenance: ProvenanceTracker of each key's last writer, or None
+        unless created with track_provenance=True
+
+    All writes go through _write so the rolling digests stay current. Values
+    are digested when fingerprinted, so mutate stored values by set() rather
+    than in place.
     """
 
-    def __init__(self, *, logger: Optional[LoggerLike] = None) -> None:
+    def __init__(
+        self,
+        *,
+        logger: Optional[LoggerLike] = None,
+        telemetry_capacity: int = DEFAULT_TELEMETRY_CAPACITY,
+        track_provenance: bool = False,
+    ) -> None:
         self._data: Dict[str, Any] = {}
+        self._view: Mapping[str, Any] = self._data
         self._logger: LoggerLike = logger or Logger("intent_kit.context")
+        self._fp_selections: Dict[Optional[Tuple[str, ...]], FingerprintSelection] = {}
+        self._fp_digests: Dict[str, int] = {}
+        self._fp_dirty: Set[str] = set()
+        self._index: Optional[KeyIndex] = None
+        self._reducers: Dict[str, Reducer] = {}
+        self._owned: Set[str] = set()
+        self._shared = False
+        self._telemetry: Dict[str, TelemetryBuffer] = {
+            "errors": TelemetryBuffer(telemetry_capacity),
+            "operations": TelemetryBuffer(telemetry_capacity),
+        }
+        self._provenance: Optional[ProvenanceTracker] = (
+            ProvenanceTracker() if track_provenance else None
+        )
 
     # ---------- Core KV ----------
     def get(self, key: str, default: Any = None) -> Any:
-        return self._data.get(key, default)
+        if self._owned:
+            # The caller may keep the value; stop extending it in place
+            self._owned.discard(key)
+        return self._view.get(key, default)
 
     def set(self, key: str, value: Any, modified_by: Optional[str] = None) -> None:
-        # TODO: optionally record provenance/modified_by
-        self._data[key] = value
+        self._write(key, value)
+        if self._provenance is not None:
+            tracker = self._provenance
+            tracker.record(key, tracker.intern(modified_by), NO_STEP, perf_counter())
 
     def has(self, key: str) -> bool:
-        return key in self._data
+        return key in self._view
 
     def keys(self) -> Iterable[str]:
         # Returning a stable view helps reproducibility
-        return sorted(self._data.keys())
+        return list(self._key_index())
+
+    def delete(self, key: str) -> bool:
+        """Remove a key; return False if it was not set."""
+        if key not in self._view:
+            return False
+        self._delete(key)
+        return True
+
+    # ---------- Key index ----------
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        """Return the keys starting with `prefix`, sorted, in O(log n + matches)."""
+        return self._key_index().prefix(prefix)
+
+    def select_keys(self, include: Iterable[str]) -> List[str]:
+        """
+        Return the keys matching any glob pattern in `include`, sorted.
+
+        Patterns with a literal prefix ("user.*") only visit matching keys.
+        """
+        return self._key_index().select(include)
+
+    def delete_namespace(self, namespace: str) -> int:
+        """
+        Remove every key under a dotted namespace ("errors" -> "errors.*").
+
+        Returns:
+            Number of keys removed
+        """
+        removed = self._key_index().namespace(namespace)
+        for key in removed:
+            self._delete(key)
+        return len(removed)
+
+    def _key_index(self) -> KeyIndex:
+        if self._index is None:
+            self._index = KeyIndex(self._view)
+        return self._index
 
     # ---------- Patching & snapshots ----------
-    def snapshot(self) -> Mapping[str, Any]:
-        # Shallow copy is enough for deterministic reads/merges
-        return dict(self._data)
+    def snapshot(self, include: Optional[Iterable[str]] = None) -> Mapping[str, Any]:
+        """Return a copy of the context, or only of keys matching `include` globs."""
+        # Shallow copy is enough for deterministic reads/merges, as long as
+        # shared lists are copied before the next append (see _owned)
+        self._owned.clear()
+        if include is None:
+            return dict(self._view)
+        view = self._view
+        return {key: view[key] for key in self.select_keys(include)}
 
     def apply_patch(self, patch: ContextPatch) -> None:
         """
@@ -60,33 +180,111 @@ class DefaultContext(ContextProtocol):
           - Default policy: last_write_wins
           - Disallow writes to "private.*"
           - Raise ContextConflictError on irreconcilable merges
-          - Track provenance on write (optional)
+          - Atomic: when a merge fails, no key of the patch is written
+          - Record patch provenance/step per key (with track_provenance)
         """
-        data = patch.get("data", {})
-        policies = patch.get("policy", {})
-        # TODO: use provenance for tracking
-        _ = patch.get("provenance", "unknown")
-
-        for key, incoming in data.items():
-            if key.startswith("private."):
-                raise ContextConflictError(f"Write to protected namespace: {key}")
+        self.apply_patches((patch,))
+        # TODO: handle patch.tags (e.g., mark keys affecting memoization)
 
-            policy: MergePolicyName = policies.get(key, "last_write_wins")
-            existing = self._data.get(key, None)
+    def apply_patches(self, patches: Iterable[ContextPatch]) -> None:
+        """
+        Apply patches in order, with the same result as apply_patch on each.
 
-            try:
-                merged = apply_merge(
-                    policy=policy, existing=existing, incoming=incoming, key=key
+        All merges are computed before anything is written, so a
+        ContextConflictError leaves the context untouched. Successive values
+        for a key under the same policy are merged in one pass (one list
+        concatenation, one bulk reducer call), so folding many small patches
+        costs O(total size).
+        """
+        # key -> runs of (policy, incoming values) in patch order
+        pending: Dict[str, List[Tuple[MergePolicyName, List[Any]]]] = {}
+        tracker = self._provenance
+        # (keys, interned writer, step) per patch, recorded once all is written
+        sources: List[Tuple[Iterable[str], int, int]] = []
+        for patch in patches:
+            policies = patch.get("policy", {})
+            if tracker is not None:
+                sources.append(
+                    (
+                        patch.get("data", {}),
+                        tracker.intern(patch.get("provenance")),
+                        patch.get("step", NO_STEP),
+                    )
                 )
-            except ContextConflictError:
-                raise
-            except Exception as e:  # wrap unexpected policy errors
-                raise ContextConflictError(f"Merge failed for {key}: {e}") from e
-
-            self._data[key] = merged
-            # TODO: optionally track provenance per key, e.g., self._meta[key] = provenance
+            for key, incoming in patch.get("data", {}).items():
+                if key.startswith("private."):
+                    raise ContextConflictError(f"Write to protected namespace: {key}")
+                policy: MergePolicyName = policies.get(key, "last_write_wins")
+                runs = pending.setdefault(key, [])
+                if runs and runs[-1][0] == policy:
+                    runs[-1][1].append(incoming)
+                else:
+                    runs.append((policy, [incoming]))
+
+        merged: Dict[str, Any] = {}
+        extend: List[Tuple[str, List[Any]]] = []
+        for key, runs in pending.items():
+            value = self._view.get(key, None)
+            if key in self._owned and len(runs) == 1 and runs[0][0] == "append_list":
+                if all(isinstance(v, list) for v in runs[0][1]):
+                    # Cannot fail: extend the owned list once everything merged
+                    extend.append((key, runs[0][1]))
+                    continue
+            for policy, values in runs:
+                value = self._merge(key, policy, value, values)
+            merged[key] = value
+
+        # Nothing below raises, so the batch is applied all or nothing
+        for key, values in extend:
+            owned = self._view[key]
+            for incoming in values:
+                owned.extend(incoming)
+            self._write(key, owned)
+            self._own(key)
+        for key, value in merged.items():
+            self._write(key, value)
+            if pending[key][-1][0] == "append_list":
+                # A list only this context references: later appends may extend it
+                self._own(key)
+        if tracker is not None:
+            now = perf_counter()
+            for keys, writer_id, step in sources:
+                tracker.record_many(keys, writer_id, step, now)
+
+    def _own(self, key: str) -> None:
+        """Mark the list stored at `key` as extendable in place."""
+        self._owned.add(key)
+
+    def _merge(
+        self,
+        key: str,
+        policy: MergePolicyName,
+        existing: Any,
+        incoming_values: Sequence[Any],
+    ) -> Any:
+        try:
+            return apply_merge_many(
+                policy=policy,
+                existing=existing,
+                incoming_values=incoming_values,
+                key=key,
+                reducers=self._reducers,
+            )
+        except ContextConflictError:
+            raise
+        except Exception as e:  # wrap unexpected policy errors
+            raise ContextConflictError(f"Merge failed for {key}: {e}") from e
+
+    def register_reducer(self, key: str, reducer: ReducerLike) -> None:
+        """
+        Register a reducer for the `reduce` policy in this context only.
 
-        # TODO: handle patch.tags (e.g., mark keys affecting memoization)
+        Args:
+            key: Context key, or glob pattern such as "metrics.*"
+            reducer: Builtin name, Reducer or callable(existing, incoming);
+                overrides policies.register_reducer for matching keys
+        """
+        self._reducers[key] = as_reducer(reducer)
 
     def merge_from(self, other: Mapping[str, Any]) -> None:
         """
@@ -94,10 +292,63 @@ class DefaultContext(ContextProtocol):
 
         NOTE: This is a coarse merge; use apply_patch for policy-aware merging.
         """
+        written = []
         for k, v in other.items():
             if k.startswith("private."):
                 continue
-            self._data[k] = v
+            self._write(k, v)
+            written.append(k)
+        if self._provenance is not None:
+            tracker = self._provenance
+            writer_id = tracker.intern("merge_from")
+            tracker.record_many(written, writer_id, NO_STEP, perf_counter())
+
+    def fork(self) -> LayeredContext:
+        """
+        Return a copy-on-write child context layered over this one.
+
+        Forking is O(1): the child reads through to this context and keeps its
+        own writes in an overlay until LayeredContext.commit() is called. The
+        child sees this context as it was at fork time; the first write here
+        afterwards copies the stored dict once (see _share).
+        """
+        from intent_kit.core.context.layered import LayeredContext
+
+        return LayeredContext(
+            self,
+            logger=self._logger,
+            telemetry_capacity=self._telemetry["errors"].capacity,
+            track_provenance=self._provenance is not None,
+        )
+
+    # ---------- Provenance ----------
+    def provenance(self, key: str) -> Optional[ProvenanceRecord]:
+        """
+        Return who last wrote a key, at which traversal step, and when.
+
+        Returns None if provenance tracking is off (see track_provenance) or
+        the key was not written through set(), apply_patch() or merge_from().
+        """
+        if self._provenance is None:
+            return None
+        return self._provenance.get(key)
+
+    def last_writers(self, include: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        Return {key: last writer} for keys matching `include` globs, sorted.
+
+        Useful to see which nodes keep changing fingerprinted keys when memo
+        hit rates drop: last_writers(["user.*", "shared.*"]). Empty when
+        provenance tracking is off.
+        """
+        if self._provenance is None:
+            return {}
+        return self._provenance.last_writers(include)
+
+    @property
+    def provenance_tracker(self) -> Optional[ProvenanceTracker]:
+        """The ProvenanceTracker, or None when tracking is off."""
+        return self._provenance
 
     # ---------- Fingerprint ----------
     def fingerprint(self, include: Optional[Iterable[str]] = None) -> str:
@@ -106,20 +357,137 @@ class DefaultContext(ContextProtocol):
 
         Supports glob patterns in `include` (e.g., "user.*", "shared.*").
         Excludes DEFAULT_EXCLUDED_FP_PREFIXES by default.
-        Uses canonical_fingerprint for deterministic output.
+
+        The fingerprint is a rolling digest over the selected keys (see
+        digest_fingerprint), maintained as keys are written. The first call
+        for an include set scans the context once; later calls only digest
+        the keys written since the previous call.
         """
-        selected = _select_keys_for_fingerprint(
-            data=self._data,
-            include=include,
-            exclude_prefixes=DEFAULT_EXCLUDED_FP_PREFIXES,
-        )
-        return canonical_fingerprint(selected)
+        selection_key = tuple(sorted(set(include))) if include else None
+        selection = self._fp_selections.get(selection_key)
+        if selection is None:
+            selection = FingerprintSelection(
+                selection_key, DEFAULT_EXCLUDED_FP_PREFIXES
+            )
+            candidates = self.select_keys(selection_key or ("user.*", "shared.*"))
+            view = self._view
+            if len(self._fp_selections) >= MAX_TRACKED_FP_SELECTIONS:
+                # Too many distinct include sets; digest this one from scratch
+                for key in candidates:
+                    if selection.matches(key):
+                        selection.add(key_digest(key, view[key]))
+                return selection.fingerprint()
+            self._refresh_fingerprints()
+            for key in candidates:
+                if selection.matches(key):
+                    digest = self._fp_digests.get(key)
+                    if digest is None:
+                        digest = self._fp_digests[key] = key_digest(key, view[key])
+                    selection.add(digest)
+            self._fp_selections[selection_key] = selection
+            return selection.fingerprint()
+
+        self._refresh_fingerprints()
+        return selection.fingerprint()
+
+    def _share(self) -> Mapping[str, Any]:
+        """Return a read-only mapping of the current state for a forked child.
+
+        _data itself is handed out and copied on the next write, so forking
+        stays O(1) and siblings never see each other's commits. Subclasses
+        whose reads do not go through _data alone hand out a snapshot.
+        """
+        if self._view is not self._data:
+            return self.snapshot()
+        self._shared = True
+        # The child may read any stored list; stop extending them in place
+        self._owned.clear()
+        return self._data
+
+    def _unshare(self) -> None:
+        """Copy _data before its first change since it was shared with a child."""
+        self._data = dict(self._data)
+        self._view = self._data
+        self._shared = False
+
+    def _write(self, key: str, value: Any) -> None:
+        """Store a value, keeping the key index and rolling digests current."""
+        if self._shared:
+            self._unshare()
+        self._data[key] = value
+        self._owned.discard(key)
+        if self._index is not None:
+            self._index.add(key)
+        if self._fp_selections:
+            self._fp_dirty.add(key)
+
+    def _delete(self, key: str) -> None:
+        """Remove a visible key, keeping the key index and rolling digests current."""
+        if self._shared:
+            self._unshare()
+        del self._data[key]
+        self._owned.discard(key)
+        if self._provenance is not None:
+            self._provenance.forget(key)
+        if self._index is not None:
+            self._index.discard(key)
+        if self._fp_selections:
+            self._fp_dirty.add(key)
+
+    def _refresh_fingerprints(self) -> None:
+        """Fold keys written since the last refresh into the rolling digests."""
+        dirty = self._fp_dirty
+        while dirty:
+            key = next(iter(dirty))
+            members = [s for s in self._fp_selections.values() if s.matches(key)]
+            if members:
+                old = self._fp_digests.get(key)
+                new = key_digest(key, self._view[key]) if key in self._view else None
+                for selection in members:
+                    if old is not None:
+                        selection.remove(old)
+                    if new is not None:
+                        selection.add(new)
+                if new is None:
+                    self._fp_digests.pop(key, None)
+                else:
+                    self._fp_digests[key] = new
+            dirty.discard(key)
 
     # ---------- Telemetry ----------
     @property
     def logger(self) -> LoggerLike:
         return self._logger
 
+    def get_errors(
+        self, where: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Return retained errors, oldest first, optionally for one location."""
+        match = {} if where is None else {"where": where}
+        return self._telemetry["errors"].query(limit, **match)
+
+    def get_operations(
+        self,
+        name: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return retained operations, oldest first, filtered by name/status."""
+        match = {
+            field: value
+            for field, value in (("name", name), ("status", status))
+            if value is not None
+        }
+        return self._telemetry["operations"].query(limit, **match)
+
+    def telemetry(self, namespace: str) -> TelemetryBuffer:
+        """
+        Return the ring buffer for a telemetry namespace ("errors", "operations").
+
+        Use it to check how many records were dropped or to resize it.
+        """
+        return self._telemetry[namespace]
+
     def add_error(
         self, *, where: str, err: str, meta: Optional[Mapping[str, Any]] = None
     ) -> None:
@@ -138,8 +506,8 @@ class DefaultContext(ContextProtocol):
             "meta": meta or {},
         }
 
-        # Store error in context for potential recovery/debugging
-        self._data[f"errors.{where}"] = error_data
+        # Keep recent errors for recovery/debugging, outside the context keys
+        self._telemetry["errors"].append(error_data)
 
         # Simple error log without verbose metadata
         self._logger.error(f"CTX error at {where}: {err}")
@@ -162,9 +530,8 @@ class DefaultContext(ContextProtocol):
             "meta": meta or {},
         }
 
-        # Store operation in context for potential analysis
-        operation_key = f"operations.{name}.{status}"
-        self._data[operation_key] = operation_data
+        # Keep recent operations for analysis, outside the context keys
+        self._telemetry["operations"].append(operation_data)
 
         # Simple operation log without verbose metadata
         if status == "started":
@@ -173,31 +540,3 @@ class DefaultContext(ContextProtocol):
             self._logger.info(f"CTX op {name} completed")
         else:
             self._logger.debug(f"CTX op {name} {status}")
-
-
-def _select_keys_for_fingerprint(
-    data: Mapping[str, Any],
-    include: Optional[Iterable[str]],
-    exclude_prefixes: Iterable[str],
-) -> Dict[str, Any]:
-    """
-    Build a dict of keys → values to feed into the fingerprint.
-
-    Supports glob patterns in `include` (e.g., "user.*", "shared.*").
-    If include is None, uses conservative default (only 'user.*' & 'shared.*').
-    """
-    import fnmatch
-
-    if include:
-        # Use glob matching for include patterns
-        keys_set = set()
-        for pattern in include:
-            keys_set.update(fnmatch.filter(data.keys(), pattern))
-        keys = sorted(keys_set)
-    else:
-        # Default conservative subset
-        keys = sorted([k for k in data.keys() if k.startswith(("user.", "shared."))])
-
-    # Exclude protected/ephemeral prefixes
-    filtered = [k for k in keys if not k.startswith(tuple(exclude_prefixes))]
-    return {k: data[k] for k in filtered}
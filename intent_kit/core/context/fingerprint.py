@@ -1,6 +1,14 @@
 from __future__ import annotations
-import json
-from typing import Any, Mapping
+import fnmatch
+import hashlib
+import re
+from typing import Any, Iterable, Mapping, Optional, Tuple
+
+from intent_kit.utils.json_backend import canonical_dumps
+
+# Rolling digests are sums of per-key digests modulo 2**DIGEST_BITS
+DIGEST_BITS = 128
+_DIGEST_MASK = (1 << DIGEST_BITS) - 1
 
 
 def canonical_fingerprint(selected: Mapping[str, Any]) -> str:
@@ -12,4 +20,73 @@ def canonical_fingerprint(selected: Mapping[str, Any]) -> str:
       - Consider hashing (e.g., blake2b) over the JSON string if shorter keys are desired
     """
     # Canonical JSON: sort keys, no whitespace churn
-    return json.dumps(selected, sort_keys=True, separators=(",", ":"))
+    return canonical_dumps(selected)
+
+
+def key_digest(key: str, value: Any) -> int:
+    """
+    Digest a single key/value pair from its canonical JSON encoding.
+    """
+    encoded = canonical_dumps([key, value]).encode("utf-8")
+    digest = hashlib.blake2b(encoded, digest_size=DIGEST_BITS // 8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def format_digest(total: int, count: int) -> str:
+    """
+    Render a rolling digest (sum of key digests) and its key count.
+    """
+    return f"{count:x}-{total & _DIGEST_MASK:0{DIGEST_BITS // 4}x}"
+
+
+def digest_fingerprint(selected: Mapping[str, Any]) -> str:
+    """
+    Fingerprint a selection by full recomputation.
+
+    The result is independent of key order and equals the rolling digest that
+    DefaultContext maintains incrementally for the same selection.
+    """
+    total = sum(key_digest(k, v) for k, v in selected.items())
+    return format_digest(total, len(selected))
+
+
+class FingerprintSelection:
+    """
+    A compiled key selection with a rolling digest over its member keys.
+
+    Membership depends only on the key: it matches the include globs (or the
+    default user.*/shared.* prefixes when there are none) and is not under an
+    excluded prefix. Keeping the digest current costs O(1) per changed key.
+    """
+
+    def __init__(
+        self, include: Optional[Iterable[str]], exclude_prefixes: Tuple[str, ...]
+    ) -> None:
+        patterns = tuple(include or ())
+        self.include = patterns
+        self._exclude = exclude_prefixes
+        self._regex = (
+            re.compile("|".join(fnmatch.translate(p) for p in patterns))
+            if patterns
+            else None
+        )
+        self.total = 0
+        self.count = 0
+
+    def matches(self, key: str) -> bool:
+        if key.startswith(self._exclude):
+            return False
+        if self._regex is None:
+            return key.startswith(("user.", "shared."))
+        return self._regex.match(key) is not None
+
+    def add(self, digest: int) -> None:
+        self.total = (self.total + digest) & _DIGEST_MASK
+        self.count += 1
+
+    def remove(self, digest: int) -> None:
+        self.total = (self.total - digest) & _DIGEST_MASK
+        self.count -= 1
+
+    def fingerprint(self) -> str:
+        return format_digest(self.total, self.count)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import fnmatch
+import re
+from bisect import bisect_left, insort
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Pattern, Set
+
+# Characters that end the literal prefix of a glob pattern
+_GLOB_SPECIAL = re.compile(r"[*?\[]")
+
+
+@lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> Pattern[str]:
+    return re.compile(fnmatch.translate(pattern))
+
+
+def glob_prefix(pattern: str) -> str:
+    """Return the literal text a glob pattern starts with ("user." for "user.*")."""
+    match = _GLOB_SPECIAL.search(pattern)
+    return pattern if match is None else pattern[: match.start()]
+
+
+class KeyIndex:
+    """
+    Sorted index over dotted context keys.
+
+    Keys sharing a prefix are contiguous in sorted order, so prefix scans,
+    namespace deletion and globs with a literal prefix ("user.*", "errors.n?")
+    cost O(log n + matches). Globs starting with a wildcard scan every key.
+    Matching follows fnmatch.fnmatchcase, like fnmatch.filter on POSIX.
+    """
+
+    def __init__(self, keys: Iterable[str] = ()) -> None:
+        self._members: Set[str] = set(keys)
+        self._sorted: List[str] = sorted(self._members)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._members
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sorted)
+
+    def add(self, key: str) -> bool:
+        """Index a key; return False if it was already present."""
+        if key in self._members:
+            return False
+        self._members.add(key)
+        insort(self._sorted, key)
+        return True
+
+    def discard(self, key: str) -> bool:
+        """Drop a key; return False if it was not present."""
+        if key not in self._members:
+            return False
+        self._members.discard(key)
+        del self._sorted[bisect_left(self._sorted, key)]
+        return True
+
+    def _prefix_range(self, prefix: str) -> range:
+        keys = self._sorted
+        start = end = bisect_left(keys, prefix)
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        return range(start, end)
+
+    def prefix(self, prefix: str) -> List[str]:
+        """Return the keys starting with `prefix`, sorted."""
+        span = self._prefix_range(prefix)
+        return self._sorted[span.start : span.stop]
+
+    def namespace(self, namespace: str) -> List[str]:
+        """Return the keys under a dotted namespace ("user" -> "user.*"), sorted."""
+        return self.prefix(namespace + ".")
+
+    def discard_prefix(self, prefix: str) -> List[str]:
+        """Drop and return the keys starting with `prefix`."""
+        span = self._prefix_range(prefix)
+        removed = self._sorted[span.start : span.stop]
+        del self._sorted[span.start : span.stop]
+        self._members.difference_update(removed)
+        return removed
+
+    def glob(self, pattern: str) -> List[str]:
+        """Return the keys matching a glob pattern, sorted."""
+        literal = glob_prefix(pattern)
+        if literal == pattern:
+            return [pattern] if pattern in self._members else []
+        regex = _compile_glob(pattern)
+        return [key for key in self.prefix(literal) if regex.match(key)]
+
+    def select(self, patterns: Iterable[str]) -> List[str]:
+        """Return the keys matching any of the glob patterns, sorted."""
+        patterns = list(patterns)
+        if len(patterns) == 1:
+            return self.glob(patterns[0])
+        selected: Set[str] = set()
+        for pattern in patterns:
+            selected.update(self.glob(pattern))
+        return sorted(selected)
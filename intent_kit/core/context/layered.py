@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from intent_kit.core.context.default import DefaultContext
+from intent_kit.core.context.protocols import (
+    ContextPatch,
+    ContextProtocol,
+    LoggerLike,
+    MergePolicyName,
+)
+from intent_kit.core.context.telemetry import (
+    DEFAULT_TELEMETRY_CAPACITY,
+    TelemetryBuffer,
+)
+from intent_kit.utils.logger import Logger
+
+# Local frozen layers kept before they are compacted into one
+MAX_LOCAL_LAYERS = 8
+
+Parent = Union[ContextProtocol, Mapping[str, Any]]
+
+# Overlay value marking a key deleted in this layer
+_DELETED: Any = object()
+
+
+class _LayerView(ChainMap):
+    """ChainMap that treats keys deleted in an upper layer as missing."""
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+        if value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        for mapping in self.maps:
+            if key in mapping:
+                value = mapping[key]
+                return default if value is _DELETED else value
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        for mapping in self.maps:
+            if key in mapping:
+                return mapping[key] is not _DELETED
+        return False
+
+    def _merged(self) -> Dict[str, Any]:
+        merged: Dict[str, Any] = {}
+        for mapping in reversed(self.maps):
+            merged.update(mapping)
+        return merged
+
+    def __iter__(self) -> Iterator[str]:
+        return (k for k, v in self._merged().items() if v is not _DELETED)
+
+    def __len__(self) -> int:
+        return sum(1 for v in self._merged().values() if v is not _DELETED)
+
+
+class LayeredContext(DefaultContext):
+    """
+    Copy-on-write context: a write overlay over a read-only parent chain.
+
+    Reads fall through the overlay, then this context's frozen layers, then
+    the parent's layers. Writes only ever touch the overlay, so a large shared
+    base (tenant config, user profile) is never copied per request.
+
+    Storage model:
+      - _data: the write overlay
+      - _local: overlays frozen by snapshot()/fork(), newest first
+      - _parent_layers: the parent's layers, read-only, newest first
+      - _view: ChainMap over all of the above; deleting an inherited key
+        writes a tombstone to the overlay
+
+    snapshot() and fork() are O(1): they freeze the overlay into _local and
+    share every layer instead of copying it. commit() applies the changes made
+    here back to the parent as a single ContextPatch.
+
+    The parent is read through, not copied, yet later parent writes stay
+    invisible here: a LayeredContext parent freezes its overlay when forked,
+    and a DefaultContext parent copies its dict on its next write. Sibling
+    forks therefore never see each other's commits. A plain mapping parent
+    should not be written to while children are alive.
+    """
+
+    def __init__(
+        self,
+        parent: Optional[Parent] = None,
+        *,
+        logger: Optional[LoggerLike] = None,
+        telemetry_capacity: int = DEFAULT_TELEMETRY_CAPACITY,
+        track_provenance: bool = False,
+    ) -> None:
+        super().__init__(
+            logger=logger or Logger("intent_kit.context.layered"),
+            telemetry_capacity=telemetry_capacity,
+            track_provenance=track_provenance,
+        )
+        self._parent = parent
+        self._local: List[Dict[str, Any]] = []
+        self._parent_layers = _layers_of(parent)
+        self._rebuild_view()
+
+    # ---------- Layers ----------
+    def _rebuild_view(self) -> None:
+        # ChainMap only writes to its first map; the other layers are read-only
+        self._view = _LayerView(
+            self._data, *self._local, *self._parent_layers  # type: ignore[arg-type]
+        )
+
+    def _delete(self, key: str) -> None:
+        if any(key in layer for layer in (*self._local, *self._parent_layers)):
+            self._data[key] = _DELETED
+        else:
+            del self._data[key]
+        self._owned.discard(key)
+        if self._provenance is not None:
+            self._provenance.forget(key)
+        if self._index is not None:
+            self._index.discard(key)
+        if self._fp_selections:
+            self._fp_dirty.add(key)
+
+    def _freeze(self) -> Tuple[Mapping[str, Any], ...]:
+        """Freeze the overlay and return every layer under it, newest first."""
+        if self._data:
+            # Frozen layers are shared, so their lists must not grow in place
+            self._owned.clear()
+            self._local.insert(0, self._data)
+            if len(self._local) > MAX_LOCAL_LAYERS:
+                # Compact; snapshots still hold the old layers, so build a new one
+                compacted: Dict[str, Any] = {}
+                for layer in reversed(self._local):
+                    compacted.update(layer)
+                self._local = [compacted]
+            self._data = {}
+            self._rebuild_view()
+        return (*self._local, *self._parent_layers)
+
+    @property
+    def depth(self) -> int:
+        """Number of layers reads may fall through, including the overlay."""
+        return 1 + len(self._local) + len(self._parent_layers)
+
+    # ---------- Patching & snapshots ----------
+    def snapshot(self, include: Optional[Iterable[str]] = None) -> Mapping[str, Any]:
+        """
+        Return a read-only view of the current state in O(1).
+
+        The view shares layers with this context; later writes go to a fresh
+        overlay and are not visible through it. With `include` globs, return
+        a copy of the matching keys instead.
+        """
+        if include is not None:
+            return super().snapshot(include)
+        return MappingProxyType(_LayerView(*self._freeze()))  # type: ignore[arg-type]
+
+    def fork(self) -> LayeredContext:
+        """Return a child context layered over the current state, in O(1)."""
+        return LayeredContext(
+            self,
+            logger=self._logger,
+            telemetry_capacity=self._telemetry["errors"].capacity,
+            track_provenance=self._provenance is not None,
+        )
+
+    def _changes(self) -> Dict[str, Any]:
+        changed: Dict[str, Any] = {}
+        for layer in reversed(self._local):
+            changed.update(layer)
+        changed.update(self._data)
+        return changed
+
+    def changes(self) -> Dict[str, Any]:
+        """Return the keys written in this context (not inherited), oldest first."""
+        return {k: v for k, v in self._changes().items() if v is not _DELETED}
+
+    def deleted_keys(self) -> List[str]:
+        """Return the inherited keys deleted in this context, sorted."""
+        return sorted(k for k, v in self._changes().items() if v is _DELETED)
+
+    def commit(
+        self,
+        provenance: str = "layered_context",
+        policy: Optional[Mapping[str, MergePolicyName]] = None,
+    ) -> ContextPatch:
+        """
+        Apply the changes made here to the parent context as one patch.
+
+        private.* keys stay local, as with merge_from. Keys deleted here are
+        then deleted from the parent if it supports delete(). Afterwards this
+        context is empty again and layered over the parent's updated state.
+        Errors and operations recorded here are appended to a DefaultContext
+        parent's telemetry buffers, and with provenance tracked on both sides
+        the parent keeps the original writer of each committed key.
+
+        Args:
+            provenance: Source recorded on the patch
+            policy: Optional per-key merge policies; last_write_wins otherwise
+
+        Returns:
+            The ContextPatch applied to the parent
+
+        Raises:
+            ValueError: If the parent is not a context
+            ContextConflictError: If the parent rejects the patch
+        """
+        parent = self._parent
+        if not hasattr(parent, "apply_patch"):
+            raise ValueError("LayeredContext.commit() requires a parent context")
+        data = {k: v for k, v in self.changes().items() if not k.startswith("private.")}
+        patch = ContextPatch(data=data, provenance=provenance)
+        if policy:
+            patch["policy"] = policy
+        parent.apply_patch(patch)  # type: ignore[union-attr]
+        delete = getattr(parent, "delete", None)
+        if delete is not None:
+            for key in self.deleted_keys():
+                if not key.startswith("private."):
+                    delete(key)
+        if isinstance(parent, DefaultContext):
+            for namespace, buffer in self._telemetry.items():
+                parent.telemetry(namespace).extend(buffer)
+                self._telemetry[namespace] = TelemetryBuffer(buffer.capacity)
+            if parent._provenance is not None and self._provenance is not None:
+                parent._provenance.update(self._provenance, data)
+        if self._provenance is not None:
+            self._provenance.clear()
+
+        self._data = {}
+        self._local = []
+        self._parent_layers = _layers_of(parent)
+        self._rebuild_view()
+        self._fp_selections.clear()
+        self._fp_digests.clear()
+        self._fp_dirty.clear()
+        self._index = None
+        return patch
+
+
+def _layers_of(parent: Optional[Parent]) -> Tuple[Mapping[str, Any], ...]:
+    """Return the read-only layers a child of `parent` reads through."""
+    if parent is None:
+        return ()
+    if isinstance(parent, LayeredContext):
+        return parent._freeze()
+    if isinstance(parent, DefaultContext):
+        return (parent._share(),)
+    if hasattr(parent, "snapshot"):
+        # Other ContextProtocol implementations only expose a copy
+        return (parent.snapshot(),)  # type: ignore[union-attr]
+    return (parent,)  # type: ignore[return-value]
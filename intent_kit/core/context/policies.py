@@ -1,10 +1,31 @@
 from __future__ import annotations
-from typing import Any
+import fnmatch
+import heapq
+from collections import Counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from intent_kit.core.exceptions import ContextConflictError
 
 
-def apply_merge(*, policy: str, existing: Any, incoming: Any, key: str) -> Any:
+def apply_merge(
+    *,
+    policy: str,
+    existing: Any,
+    incoming: Any,
+    key: str,
+    reducers: Optional[Mapping[str, Reducer]] = None,
+    in_place: bool = False,
+) -> Any:
     """
     Route to a concrete merge policy implementation.
 
@@ -13,23 +34,62 @@ def apply_merge(*, policy: str, existing: Any, incoming: Any, key: str) -> Any:
       - first_write_wins
       - append_list
       - merge_dict (shallow)
-      - reduce (requires registered reducer)
+      - reduce (requires registered reducer, see register_reducer)
+
+    `reducers` maps keys (or globs) to reducers and takes precedence over the
+    global registry. With `in_place`, append_list extends `existing` instead of
+    copying it; callers must own the list (see DefaultContext.apply_patch).
     """
     if policy == "last_write_wins":
         return _last_write_wins(existing, incoming)
     if policy == "first_write_wins":
         return _first_write_wins(existing, incoming)
     if policy == "append_list":
-        return _append_list(existing, incoming, key)
+        return _append_list(existing, incoming, key, in_place)
     if policy == "merge_dict":
         return _merge_dict(existing, incoming, key)
     if policy == "reduce":
-        # TODO: wire a reducer registry; for now fail explicitly
-        raise ContextConflictError(f"Reducer not registered for key: {key}")
+        return _require_reducer(key, reducers)(existing, incoming)
 
     raise ContextConflictError(f"Unknown merge policy: {policy}")
 
 
+def apply_merge_many(
+    *,
+    policy: str,
+    existing: Any,
+    incoming_values: Sequence[Any],
+    key: str,
+    reducers: Optional[Mapping[str, Reducer]] = None,
+    in_place: bool = False,
+) -> Any:
+    """
+    Merge several incoming values into one key in a single pass.
+
+    Equivalent to folding apply_merge over `incoming_values`, but append_list
+    concatenates once and reducers use their bulk form, so n merges cost
+    O(total size) instead of O(n * size).
+    """
+    if not incoming_values:
+        return existing
+    if policy == "last_write_wins":
+        return incoming_values[-1]
+    if policy == "append_list":
+        for incoming in incoming_values:
+            _check_list_incoming(incoming, key)
+        merged = _append_list(existing, incoming_values[0], key, in_place)
+        for incoming in incoming_values[1:]:
+            merged.extend(incoming)
+        return merged
+    if policy == "reduce":
+        return _require_reducer(key, reducers).reduce_many(existing, incoming_values)
+    for incoming in incoming_values:
+        existing = apply_merge(
+            policy=policy, existing=existing, incoming=incoming, key=key
+        )
+    return existing
+
+
 def _last_write_wins(existing: Any, incoming: Any) -> Any:
     return incoming
 
@@ -38,17 +98,24 @@ def _first_write_wins(existing: Any, incoming: Any) -> Any:
     return existing if existing is not None else incoming
 
 
-def _append_list(existing: Any, incoming: Any, key: str) -> Any:
+def _check_list_incoming(incoming: Any, key: str) -> None:
+    if not isinstance(incoming, list):
+        raise ContextConflictError(
+            f"append_list expects list for incoming value at {key}; got {type(incoming).__name__}"
+        )
+
+
+def _append_list(existing: Any, incoming: Any, key: str, in_place: bool = False) -> Any:
     if existing is None:
         existing = []
     if not isinstance(existing, list):
         raise ContextConflictError(
             f"append_list expects list at {key}; got {type(existing).__name__}"
         )
-    if not isinstance(incoming, list):
-        raise ContextConflictError(
-            f"append_list expects list for incoming value at {key}; got {type(incoming).__name__}"
-        )
+    _check_list_incoming(incoming, key)
+    if in_place:
+        existing.extend(incoming)
+        return existing
     return [*existing, *incoming]
 
 
@@ -60,3 +127,176 @@ def _merge_dict(existing: Any, incoming: Any, key: str) -> Any:
     out = dict(existing)
     out.update(incoming)
     return out
+
+
+# ---------- Reducers ----------
+
+
+class Reducer:
+    """
+    Combines an existing value with an incoming one for the `reduce` policy.
+
+    `fold(existing, incoming)` is called with existing=None for the first
+    write. An optional `bulk(existing, incoming_values)` merges many values at
+    once; without it, bulk merges fold one value at a time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fold: Callable[[Any, Any], Any],
+        bulk: Optional[Callable[[Any, Sequence[Any]], Any]] = None,
+    ) -> None:
+        self.name = name
+        self.fold = fold
+        self.bulk = bulk
+
+    def __call__(self, existing: Any, incoming: Any) -> Any:
+        return self.fold(existing, incoming)
+
+    def reduce_many(self, existing: Any, incoming_values: Sequence[Any]) -> Any:
+        if self.bulk is not None:
+            return self.bulk(existing, incoming_values)
+        for incoming in incoming_values:
+            existing = self.fold(existing, incoming)
+        return existing
+
+    def __repr__(self) -> str:
+        return f"Reducer({self.name!r})"
+
+
+ReducerLike = Union[str, Reducer, Callable[[Any, Any], Any]]
+
+
+def _items(value: Any) -> List[Any]:
+    """Treat lists/tuples as several items and anything else as one."""
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _sum_bulk(existing: Any, incoming_values: Sequence[Any]) -> Any:
+    return sum(incoming_values, existing if existing is not None else 0)
+
+
+def _extreme(pick: Callable[..., Any]) -> Callable[[Any, Sequence[Any]], Any]:
+    def bulk(existing: Any, incoming_values: Sequence[Any]) -> Any:
+        values = list(incoming_values)
+        if existing is not None:
+            values.append(existing)
+        return pick(values)
+
+    return bulk
+
+
+def _count(counter: Counter, incoming: Any) -> None:
+    if isinstance(incoming, Mapping):
+        counter.update(incoming)
+    else:
+        counter.update(_items(incoming))
+
+
+def _counter_bulk(existing: Any, incoming_values: Sequence[Any]) -> Dict[Any, int]:
+    counter: Counter = Counter(existing or {})
+    for incoming in incoming_values:
+        _count(counter, incoming)
+    return dict(counter)
+
+
+def _union_bulk(existing: Any, incoming_values: Sequence[Any]) -> List[Any]:
+    # Ordered union (first occurrence wins) keeps the value JSON-serializable
+    merged = dict.fromkeys(existing or ())
+    for incoming in incoming_values:
+        merged.update(dict.fromkeys(_items(incoming)))
+    return list(merged)
+
+
+def _single(bulk: Callable[[Any, Sequence[Any]], Any]) -> Callable[[Any, Any], Any]:
+    return lambda existing, incoming: bulk(existing, (incoming,))
+
+
+def top_k(k: int, key: Optional[Callable[[Any], Any]] = None) -> Reducer:
+    """
+    Build a reducer keeping the k largest items seen, largest first.
+
+    Incoming values are single items or lists of items.
+    """
+    if k < 1:
+        raise ValueError(f"top_k needs k >= 1, got {k}")
+
+    def bulk(existing: Any, incoming_values: Sequence[Any]) -> List[Any]:
+        pool = list(existing or ())
+        for incoming in incoming_values:
+            pool.extend(_items(incoming))
+        return heapq.nlargest(k, pool, key=key)
+
+    return Reducer(f"top_k({k})", _single(bulk), bulk)
+
+
+BUILTIN_REDUCERS: Dict[str, Reducer] = {
+    "sum": Reducer("sum", _single(_sum_bulk), _sum_bulk),
+    "max": Reducer("max", _single(_extreme(max)), _extreme(max)),
+    "min": Reducer("min", _single(_extreme(min)), _extreme(min)),
+    "counter": Reducer("counter", _single(_counter_bulk), _counter_bulk),
+    "set_union": Reducer("set_union", _single(_union_bulk), _union_bulk),
+}
+
+_REGISTRY: Dict[str, Reducer] = {}
+
+
+def as_reducer(reducer: ReducerLike) -> Reducer:
+    """Resolve a builtin reducer name or wrap a callable(existing, incoming)."""
+    if isinstance(reducer, Reducer):
+        return reducer
+    if isinstance(reducer, str):
+        try:
+            return BUILTIN_REDUCERS[reducer]
+        except KeyError:
+            raise ValueError(
+                f"Unknown reducer '{reducer}'. Builtins: {sorted(BUILTIN_REDUCERS)}"
+            ) from None
+    if callable(reducer):
+        return Reducer(getattr(reducer, "__name__", "custom"), reducer)
+    raise TypeError(f"Reducer must be a name or callable, got {type(reducer).__name__}")
+
+
+def register_reducer(key: str, reducer: ReducerLike) -> None:
+    """
+    Register the reducer used by the `reduce` policy for a key.
+
+    Args:
+        key: Context key, or glob pattern such as "metrics.*"
+        reducer: Builtin name ("sum", "max", "min", "counter", "set_union"),
+            a Reducer (e.g. top_k(5)) or a callable(existing, incoming)
+    """
+    _REGISTRY[key] = as_reducer(reducer)
+
+
+def unregister_reducer(key: str) -> None:
+    """Remove a globally registered reducer; missing keys are ignored."""
+    _REGISTRY.pop(key, None)
+
+
+def resolve_reducer(
+    key: str, reducers: Optional[Mapping[str, Reducer]] = None
+) -> Optional[Reducer]:
+    """Find the reducer for a key: exact entries first, then globs, local first."""
+    for registry in (reducers or {}, _REGISTRY):
+        reducer = registry.get(key)
+        if reducer is not None:
+            return reducer
+    for registry in (reducers or {}, _REGISTRY):
+        for pattern, reducer in registry.items():
+            if fnmatch.fnmatchcase(key, pattern):
+                return reducer
+    return None
+
+
+def _require_reducer(key: str, reducers: Optional[Mapping[str, Reducer]]) -> Reducer:
+    reducer = resolve_reducer(key, reducers)
+    if reducer is None:
+        raise ContextConflictError(f"Reducer not registered for key: {key}")
+    return reducer
+
+
+def registered_reducers() -> Iterable[str]:
+    """Return the keys and globs with a globally registered reducer."""
+    return sorted(_REGISTRY)
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from typing import Any, Iterable, Mapping, Optional, Protocol, TypedDict, Literal
 
-
 MergePolicyName = Literal[
     "last_write_wins",
     "first_write_wins",
@@ -20,12 +19,17 @@ class ContextPatch(TypedDict, total=False):
     policy:    per-key merge policies (optional; default policy applies otherwise)
     provenance: node id or source identifier for auditability
     tags:      optional set of tags (e.g., {"affects_memo"})
+    versions:  expected version per key for optimistic writes (0 = absent);
+               checked by ConcurrentContext, which rejects stale patches
+    step:      traversal step index that produced the patch (for provenance)
     """
 
     data: Mapping[str, Any]
     policy: Mapping[str, MergePolicyName]
     provenance: str
     tags: set[str]
+    versions: Mapping[str, int]
+    step: int
 
 
 class LoggerLike(Protocol):
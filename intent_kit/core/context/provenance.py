@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import fnmatch
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Step recorded for writes made outside a traversal step (e.g. ctx.set)
+NO_STEP = -1
+# Writer recorded when none is given
+UNKNOWN_WRITER = "unknown"
+
+
+class ProvenanceRecord(NamedTuple):
+    """Who last wrote a key, at which traversal step, and when."""
+
+    writer: str
+    step: Optional[int]
+    timestamp: float
+
+
+class ProvenanceTracker:
+    """
+    Last writer of every key, kept in a compact parallel structure.
+
+    Writer ids (node ids, "traversal:init", ...) are interned once; each key
+    maps to a (writer index, step, timestamp) tuple, so recording a write is
+    one dict store and memory stays proportional to the number of keys.
+    """
+
+    def __init__(self) -> None:
+        self._writers: List[str] = []
+        self._writer_ids: Dict[str, int] = {}
+        self._records: Dict[str, Tuple[int, int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def intern(self, writer: Optional[str]) -> int:
+        """Return the index of a writer id, adding it on first use."""
+        writer = writer or UNKNOWN_WRITER
+        index = self._writer_ids.get(writer)
+        if index is None:
+            index = self._writer_ids[writer] = len(self._writers)
+            self._writers.append(writer)
+        return index
+
+    def record(self, key: str, writer_id: int, step: int, timestamp: float) -> None:
+        """Record an interned writer as the last writer of a key."""
+        self._records[key] = (writer_id, step, timestamp)
+
+    def record_many(
+        self, keys: Iterable[str], writer_id: int, step: int, timestamp: float
+    ) -> None:
+        """Record one interned writer as the last writer of several keys."""
+        self._records.update(dict.fromkeys(keys, (writer_id, step, timestamp)))
+
+    def update(self, other: ProvenanceTracker, keys: Iterable[str]) -> None:
+        """Copy the records of `keys` from another tracker."""
+        for key in keys:
+            entry = other._records.get(key)
+            if entry is not None:
+                writer_id, step, timestamp = entry
+                self.record(
+                    key, self.intern(other._writers[writer_id]), step, timestamp
+                )
+
+    def forget(self, key: str) -> None:
+        self._records.pop(key, None)
+
+    def clear(self) -> None:
+        self._records.clear()
+
+    def get(self, key: str) -> Optional[ProvenanceRecord]:
+        """Return the provenance of a key, or None if it was never recorded."""
+        entry = self._records.get(key)
+        if entry is None:
+            return None
+        writer_id, step, timestamp = entry
+        return ProvenanceRecord(
+            self._writers[writer_id], None if step == NO_STEP else step, timestamp
+        )
+
+    def last_writers(self, include: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        Return {key: last writer}, sorted by key.
+
+        Args:
+            include: Glob patterns (e.g. "user.*") limiting the keys
+        """
+        patterns = list(include) if include is not None else None
+        writers = self._writers
+        return {
+            key: writers[self._records[key][0]]
+            for key in sorted(self._records)
+            if patterns is None
+            or any(fnmatch.fnmatchcase(key, pattern) for pattern in patterns)
+        }
+
+    def keys_written_by(self, writer: str) -> List[str]:
+        """Return the keys whose last writer is `writer`, sorted."""
+        writer_id = self._writer_ids.get(writer)
+        if writer_id is None:
+            return []
+        return sorted(k for k, entry in self._records.items() if entry[0] == writer_id)
+
+    def writer_counts(self) -> Dict[str, int]:
+        """Return how many keys each writer wrote last, most first."""
+        counts = Counter(entry[0] for entry in self._records.values())
+        return {self._writers[index]: n for index, n in counts.most_common()}
@@ -0,0 +1,539 @@
+"""
+Compact binary serialization of context state.
+
+Contexts are encoded in the MessagePack wire format (implemented here with
+``struct``, so no extra dependency is needed). Types beyond JSON's (tuple,
+set, datetime, ...) are carried as MessagePack extension types through a
+TypeRegistry; register your own with register_type().
+
+Runtime objects that only make sense in the current process, such as an
+``llm_service`` stored in the context by code predating ExecutionEnvironment,
+are not encoded. They are recorded by key as references and resolved from
+the receiver's own ``runtime`` mapping on decode.
+
+Encoding against a previous snapshot (``base``) produces a delta holding
+only the keys that changed or were deleted.
+
+Example:
+    data = encode_context(ctx)
+    restored = DictBackedContext(decode_context(data, runtime={"llm_service": svc}))
+
+    delta = encode_context(ctx, base=previous_snapshot)
+    state = decode_context(delta, base=previous_snapshot)
+"""
+
+from __future__ import annotations
+
+import struct
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+# Bumped when the envelope layout changes; decoders reject other versions
+FORMAT_VERSION = 1
+# Keys that held runtime objects before ExecutionEnvironment; always referenced
+RUNTIME_KEYS = frozenset({"llm_service", "metadata"})
+# What encode_context does with values it cannot encode
+NON_PORTABLE_MODES = ("reference", "skip", "error")
+
+_FLOAT = struct.Struct(">Bd")
+_U8 = struct.Struct(">BB")
+_U16 = struct.Struct(">BH")
+_U32 = struct.Struct(">BI")
+_U64 = struct.Struct(">BQ")
+_I8 = struct.Struct(">Bb")
+_I16 = struct.Struct(">Bh")
+_I32 = struct.Struct(">Bi")
+_I64 = struct.Struct(">Bq")
+_EXT8 = struct.Struct(">BBb")
+_EXT16 = struct.Struct(">BHb")
+_EXT32 = struct.Struct(">BIb")
+
+
+class TypeRegistry:
+    """
+    Maps Python types to MessagePack extension codes.
+
+    Each registered type has a code (0-127), an `encode(obj)` returning an
+    encodable value and a `decode(value)` rebuilding the object. Codes
+    0-15 are reserved for the builtin registrations. Lookups fall back to
+    the parent registry, so a TypeRegistry(parent=DEFAULT_REGISTRY) adds
+    types locally.
+    """
+
+    def __init__(self, parent: Optional[TypeRegistry] = None) -> None:
+        self._parent = parent
+        self._by_type: Dict[type, Tuple[int, Callable[[Any], Any]]] = {}
+        self._by_code: Dict[int, Tuple[type, Callable[[Any], Any]]] = {}
+
+    def register(
+        self,
+        cls: type,
+        code: int,
+        encode: Callable[[Any], Any],
+        decode: Callable[[Any], Any],
+    ) -> None:
+        """
+        Register how to encode instances of `cls` (and its subclasses).
+
+        Raises:
+            ValueError: If the code is out of range or used by another type
+        """
+        if not 0 <= code <= 127:
+            raise ValueError(f"Extension code must be in 0-127, got {code}")
+        taken = self._by_code.get(code)
+        if taken is not None and taken[0] is not cls:
+            raise ValueError(
+                f"Extension code {code} is already used by {taken[0].__name__}"
+            )
+        self._by_type[cls] = (code, encode)
+        self._by_code[code] = (cls, decode)
+
+    def encoder(self, cls: type) -> Optional[Tuple[int, Callable[[Any], Any]]]:
+        """Return (code, encode) for a type or its closest registered base."""
+        for klass in cls.__mro__:
+            registry: Optional[TypeRegistry] = self
+            while registry is not None:
+                found = registry._by_type.get(klass)
+                if found is not None:
+                    return found
+                registry = registry._parent
+        return None
+
+    def decoder(self, code: int) -> Optional[Callable[[Any], Any]]:
+        """Return the decode function registered for an extension code."""
+        registry: Optional[TypeRegistry] = self
+        while registry is not None:
+            found = registry._by_code.get(code)
+            if found is not None:
+                return found[1]
+            registry = registry._parent
+        return None
+
+
+def _sorted_items(values: Any) -> List[Any]:
+    # Sorted when possible so equal sets encode to equal bytes
+    try:
+        return sorted(values)
+    except TypeError:
+        return list(values)
+
+
+DEFAULT_REGISTRY = TypeRegistry()
+DEFAULT_REGISTRY.register(tuple, 1, list, tuple)
+DEFAULT_REGISTRY.register(set, 2, _sorted_items, set)
+DEFAULT_REGISTRY.register(frozenset, 3, _sorted_items, frozenset)
+DEFAULT_REGISTRY.register(datetime, 4, datetime.isoformat, datetime.fromisoformat)
+DEFAULT_REGISTRY.register(date, 5, date.isoformat, date.fromisoformat)
+
+
+def register_type(
+    cls: type,
+    code: int,
+    encode: Callable[[Any], Any],
+    decode: Callable[[Any], Any],
+) -> None:
+    """
+    Register a type in the default registry.
+
+    Args:
+        cls: Type to encode; subclasses use the same registration
+        code: Extension code, 16-127 (0-15 are reserved)
+        encode: Returns an encodable value for an instance
+        decode: Rebuilds an instance from that value
+    """
+    DEFAULT_REGISTRY.register(cls, code, encode, decode)
+
+
+# ---------- MessagePack encoding ----------
+
+
+def _pack_header(out: bytearray, n: int, fix: int, b16: int, b32: int) -> None:
+    if n < 16:
+        out.append(fix | n)
+    elif n < 0x10000:
+        out += _U16.pack(b16, n)
+    else:
+        out += _U32.pack(b32, n)
+
+
+def _pack_int(out: bytearray, n: int) -> None:
+    if 0 <= n < 0x80:
+        out.append(n)
+    elif -32 <= n < 0:
+        out.append(n & 0xFF)
+    elif n > 0:
+        if n < 0x100:
+            out += _U8.pack(0xCC, n)
+        elif n < 0x10000:
+            out += _U16.pack(0xCD, n)
+        elif n < 0x100000000:
+            out += _U32.pack(0xCE, n)
+        elif n < 0x10000000000000000:
+            out += _U64.pack(0xCF, n)
+        else:
+            raise OverflowError(f"Integer too large to encode: {n}")
+    elif n >= -0x80:
+        out += _I8.pack(0xD0, n)
+    elif n >= -0x8000:
+        out += _I16.pack(0xD1, n)
+    elif n >= -0x80000000:
+        out += _I32.pack(0xD2, n)
+    elif n >= -0x8000000000000000:
+        out += _I64.pack(0xD3, n)
+    else:
+        raise OverflowError(f"Integer too small to encode: {n}")
+
+
+def _pack_str(out: bytearray, s: str) -> None:
+    data = s.encode("utf-8")
+    n = len(data)
+    if n < 32:
+        out.append(0xA0 | n)
+    elif n < 0x100:
+        out += _U8.pack(0xD9, n)
+    elif n < 0x10000:
+        out += _U16.pack(0xDA, n)
+    else:
+        out += _U32.pack(0xDB, n)
+    out += data
+
+
+def _pack_bin(out: bytearray, data: bytes) -> None:
+    n = len(data)
+    if n < 0x100:
+        out += _U8.pack(0xC4, n)
+    elif n < 0x10000:
+        out += _U16.pack(0xC5, n)
+    else:
+        out += _U32.pack(0xC6, n)
+    out += data
+
+
+def _pack(out: bytearray, obj: Any, registry: TypeRegistry) -> None:
+    t = type(obj)
+    if t is str:
+        _pack_str(out, obj)
+    elif t is int:
+        _pack_int(out, obj)
+    elif t is dict:
+        _pack_header(out, len(obj), 0x80, 0xDE, 0xDF)
+        for key, value in obj.items():
+            _pack(out, key, registry)
+            _pack(out, value, registry)
+    elif t is list:
+        _pack_header(out, len(obj), 0x90, 0xDC, 0xDD)
+        for item in obj:
+            _pack(out, item, registry)
+    elif t is float:
+        out += _FLOAT.pack(0xCB, obj)
+    elif obj is None:
+        out.append(0xC0)
+    elif t is bool:
+        out.append(0xC3 if obj else 0xC2)
+    elif t is bytes or t is bytearray:
+        _pack_bin(out, obj)
+    else:
+        ext = registry.encoder(t)
+        if ext is not None:
+            code, encode = ext
+            payload = bytearray()
+            _pack(payload, encode(obj), registry)
+            n = len(payload)
+            if n < 0x100:
+                out += _EXT8.pack(0xC7, n, code)
+            elif n < 0x10000:
+                out += _EXT16.pack(0xC8, n, code)
+            else:
+                out += _EXT32.pack(0xC9, n, code)
+            out += payload
+        # Subclasses of the builtins encode as their base, as json does
+        elif isinstance(obj, bool):
+            out.append(0xC3 if obj else 0xC2)
+        elif isinstance(obj, int):
+            _pack_int(out, int(obj))
+        elif isinstance(obj, float):
+            out += _FLOAT.pack(0xCB, obj)
+        elif isinstance(obj, str):
+            _pack_str(out, str(obj))
+        elif isinstance(obj, dict):
+            _pack(out, dict(obj), registry)
+        elif isinstance(obj, list):
+            _pack(out, list(obj), registry)
+        else:
+            raise TypeError(
+                f"Cannot encode {t.__name__}; register it with register_type()"
+            )
+
+
+def pack(obj: Any, registry: Optional[TypeRegistry] = None) -> bytes:
+    """
+    Encode a value as MessagePack.
+
+    Raises:
+        TypeError: If the value contains an unregistered type
+        OverflowError: If an integer does not fit in 64 bits
+    """
+    out = bytearray()
+    _pack(out, obj, registry or DEFAULT_REGISTRY)
+    return bytes(out)
+
+
+# ---------- MessagePack decoding ----------
+
+# Fixed-width formats: first byte -> (struct format, size)
+_FIXED = {
+    0xCA: (">f", 4),
+    0xCB: (">d", 8),
+    0xCC: (">B", 1),
+    0xCD: (">H", 2),
+    0xCE: (">I", 4),
+    0xCF: (">Q", 8),
+    0xD0: (">b", 1),
+    0xD1: (">h", 2),
+    0xD2: (">i", 4),
+    0xD3: (">q", 8),
+}
+# Variable-length formats: first byte -> (kind, length format, length size)
+_SIZED = {
+    0xC4: ("bin", ">B", 1),
+    0xC5: ("bin", ">H", 2),
+    0xC6: ("bin", ">I", 4),
+    0xD9: ("str", ">B", 1),
+    0xDA: ("str", ">H", 2),
+    0xDB: ("str", ">I", 4),
+    0xDC: ("array", ">H", 2),
+    0xDD: ("array", ">I", 4),
+    0xDE: ("map", ">H", 2),
+    0xDF: ("map", ">I", 4),
+    0xC7: ("ext", ">B", 1),
+    0xC8: ("ext", ">H", 2),
+    0xC9: ("ext", ">I", 4),
+}
+_FIXEXT = {0xD4: 1, 0xD5: 2, 0xD6: 4, 0xD7: 8, 0xD8: 16}
+_CONSTANTS = {0xC0: None, 0xC2: False, 0xC3: True}
+
+
+def _take(data: bytes, pos: int, n: int) -> bytes:
+    end = pos + n
+    if end > len(data):
+        raise ValueError(f"Truncated data: {n} bytes needed at offset {pos}")
+    return data[pos:end]
+
+
+def _unpack(data: bytes, pos: int, registry: TypeRegistry) -> Tuple[Any, int]:
+    b = data[pos]
+    pos += 1
+    if b <= 0x7F:
+        return b, pos
+    if b >= 0xE0:
+        return b - 0x100, pos
+    if 0xA0 <= b <= 0xBF:
+        n = b & 0x1F
+        return _take(data, pos, n).decode("utf-8"), pos + n
+    if 0x90 <= b <= 0x9F:
+        return _unpack_array(data, pos, b & 0x0F, registry)
+    if 0x80 <= b <= 0x8F:
+        return _unpack_map(data, pos, b & 0x0F, registry)
+    if b in _CONSTANTS:
+        return _CONSTANTS[b], pos
+    if b in _FIXED:
+        fmt, size = _FIXED[b]
+        return struct.unpack_from(fmt, data, pos)[0], pos + size
+    if b in _SIZED:
+        kind, fmt, size = _SIZED[b]
+        (n,) = struct.unpack_from(fmt, data, pos)
+        pos += size
+        if kind == "str":
+            return _take(data, pos, n).decode("utf-8"), pos + n
+        if kind == "bin":
+            return bytes(_take(data, pos, n)), pos + n
+        if kind == "array":
+            return _unpack_array(data, pos, n, registry)
+        if kind == "map":
+            return _unpack_map(data, pos, n, registry)
+        return _unpack_ext(data, pos + 1, n, data[pos], registry)
+    if b in _FIXEXT:
+        return _unpack_ext(data, pos + 1, _FIXEXT[b], data[pos], registry)
+    raise ValueError(f"Invalid MessagePack byte 0x{b:02x} at offset {pos - 1}")
+
+
+def _unpack_array(
+    data: bytes, pos: int, n: int, registry: TypeRegistry
+) -> Tuple[List[Any], int]:
+    items = []
+    for _ in range(n):
+        item, pos = _unpack(data, pos, registry)
+        items.append(item)
+    return items, pos
+
+
+def _unpack_map(
+    data: bytes, pos: int, n: int, registry: TypeRegistry
+) -> Tuple[Dict[Any, Any], int]:
+    result = {}
+    for _ in range(n):
+        key, pos = _unpack(data, pos, registry)
+        value, pos = _unpack(data, pos, registry)
+        result[key] = value
+    return result, pos
+
+
+def _unpack_ext(
+    data: bytes, pos: int, n: int, code: int, registry: TypeRegistry
+) -> Tuple[Any, int]:
+    code = code - 0x100 if code > 0x7F else code
+    decode = registry.decoder(code)
+    if decode is None:
+        raise ValueError(f"Unknown extension type {code}")
+    end = pos + n
+    value, used = _unpack(data, pos, registry)
+    if used != end:
+        raise ValueError(f"Malformed extension type {code}")
+    return decode(value), end
+
+
+def unpack(data: bytes, registry: Optional[TypeRegistry] = None) -> Any:
+    """
+    Decode a MessagePack value.
+
+    Raises:
+        ValueError: If the data is malformed, truncated or uses an
+            unregistered extension type
+    """
+    try:
+        value, pos = _unpack(data, 0, registry or DEFAULT_REGISTRY)
+    except ValueError:
+        raise
+    except (IndexError, struct.error, TypeError) as e:
+        raise ValueError(f"Malformed MessagePack data: {e}") from e
+    if pos != len(data):
+        raise ValueError(f"Trailing data after offset {pos}")
+    return value
+
+
+# ---------- Context envelopes ----------
+
+
+def _same(a: Any, b: Any) -> bool:
+    if a is b:
+        return True
+    try:
+        return type(a) is type(b) and bool(a == b)
+    except Exception:  # incomparable values count as changed
+        return False
+
+
+def encode_context(
+    ctx: Any,
+    *,
+    base: Optional[Mapping[str, Any]] = None,
+    registry: Optional[TypeRegistry] = None,
+    non_portable: str = "reference",
+    runtime_keys: frozenset[str] = RUNTIME_KEYS,
+) -> bytes:
+    """
+    Encode a context (or a snapshot mapping) into a compact binary envelope.
+
+    Args:
+        ctx: Context with snapshot(), or a mapping of dotted keys to values
+        base: Previous snapshot to encode a delta against: only changed and
+            deleted keys are written, and decode_context needs the same base
+        registry: Extension types to use (DEFAULT_REGISTRY otherwise)
+        non_portable: For values that cannot be encoded: "reference" records
+            the key so the receiver can supply its own object, "skip" drops
+            it, "error" raises TypeError
+        runtime_keys: Keys always treated as process-local references
+
+    Returns:
+        The encoded envelope
+    """
+    if non_portable not in NON_PORTABLE_MODES:
+        raise ValueError(
+            f"non_portable must be one of {NON_PORTABLE_MODES}, got {non_portable!r}"
+        )
+    registry = registry or DEFAULT_REGISTRY
+    current = ctx.snapshot() if hasattr(ctx, "snapshot") else ctx
+
+    entries = bytearray()
+    count = 0
+    refs: List[str] = []
+    skipped: List[str] = []
+    for key, value in current.items():
+        if key in runtime_keys:
+            refs.append(key)
+            continue
+        if base is not None and key in base and _same(base[key], value):
+            continue
+        entry = bytearray()
+        try:
+            _pack_str(entry, key)
+            _pack(entry, value, registry)
+        except (TypeError, OverflowError) as e:
+            if non_portable == "error":
+                raise TypeError(f"Context key {key} is not portable: {e}") from e
+            (refs if non_portable == "reference" else skipped).append(key)
+            continue
+        entries += entry
+        count += 1
+
+    deleted = []
+    if base is not None:
+        # Skipped keys are dropped from the base too, rather than left stale
+        deleted = [key for key in base if key not in current]
+        deleted += [key for key in skipped if key in base]
+
+    # [version, is_delta, {key: value}, [deleted keys], [referenced keys]]
+    out = bytearray([0x95])
+    _pack_int(out, FORMAT_VERSION)
+    out.append(0xC2 if base is None else 0xC3)
+    _pack_header(out, count, 0x80, 0xDE, 0xDF)
+    out += entries
+    _pack(out, deleted, registry)
+    _pack(out, refs, registry)
+    return bytes(out)
+
+
+def decode_context(
+    data: bytes,
+    *,
+    base: Optional[Mapping[str, Any]] = None,
+    runtime: Optional[Mapping[str, Any]] = None,
+    registry: Optional[TypeRegistry] = None,
+) -> Dict[str, Any]:
+    """
+    Decode an envelope from encode_context into a dict of context values.
+
+    Args:
+        data: Encoded envelope
+        base: The snapshot a delta was encoded against (required for deltas)
+        runtime: Objects for referenced keys, e.g. {"llm_service": service};
+            referenced keys missing here keep their base value, if any,
+            and are otherwise left out
+        registry: Extension types to use (DEFAULT_REGISTRY otherwise)
+
+    Raises:
+        ValueError: If the data is malformed, from another format version,
+            or a delta decoded without its base
+    """
+    envelope = unpack(data, registry)
+    if not isinstance(envelope, list) or len(envelope) != 5:
+        raise ValueError("Not an encoded context")
+    version, is_delta, values, deleted, refs = envelope
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported context format version {version}")
+    if is_delta:
+        if base is None:
+            raise ValueError(
+                "Decoding a delta requires the base it was encoded against"
+            )
+        result = dict(base)
+        for key in deleted:
+            result.pop(key, None)
+    else:
+        result = {}
+    result.update(values)
+    if runtime is not None:
+        for key in refs:
+            if key in runtime:
+                result[key] = runtime[key]
+    return result
@@ -0,0 +1,466 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from intent_kit.core.context.default import DefaultContext
+from intent_kit.core.context.protocols import ContextProtocol, LoggerLike
+from intent_kit.core.context.telemetry import DEFAULT_TELEMETRY_CAPACITY
+from intent_kit.utils import json_backend
+from intent_kit.utils.logger import Logger
+
+# Connections kept open per store; threads beyond this wait for a free one
+DEFAULT_POOL_SIZE = 4
+# Ephemeral keys that are never persisted
+DEFAULT_UNPERSISTED_PREFIXES = ("tmp.",)
+# Keys fetched per query; below SQLite's bound-parameter limit
+_FETCH_CHUNK = 500
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS context_sessions (
+        session_id TEXT PRIMARY KEY,
+        updated_at REAL NOT NULL,
+        expires_at REAL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS context_sessions_expiry
+    ON context_sessions (expires_at)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS context_entries (
+        session_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (session_id, key)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+class _ConnectionPool:
+    """Up to `size` SQLite connections in WAL mode, shared between threads."""
+
+    def __init__(self, path: str, size: int) -> None:
+        if size < 1:
+            raise ValueError(f"Pool size must be positive, got {size}")
+        self._path = path
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly by the store
+        conn = sqlite3.connect(
+            self._path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Durable at checkpoints; safe against corruption, much faster commits
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._idle = queue.LifoQueue()
+
+
+class ContextStore:
+    """
+    Persist context state per session id in a local SQLite database.
+
+    Sessions move between workers (or process restarts) by loading them from
+    the same database file: load() returns a StoredContext that fetches each
+    value on first access, and save() writes only the keys written or
+    deleted since the context was loaded or last saved. Connections are
+    pooled and use WAL mode, so readers never block the writer.
+
+    With a `ttl`, a session expires `ttl` seconds after its last save;
+    expired sessions load empty and are removed by load() or
+    purge_expired().
+
+    Values are stored as JSON (see intent_kit.utils.json_backend). Keys
+    under `exclude_prefixes` and values JSON cannot encode (services,
+    clients) are not persisted.
+
+    Example:
+        store = ContextStore("sessions.db", ttl=3600)
+        ctx = store.load("user-42")
+        run_dag(dag, "Hi, I'm Alice", ctx=ctx)
+        store.save(ctx)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        ttl: Optional[float] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        exclude_prefixes: Sequence[str] = DEFAULT_UNPERSISTED_PREFIXES,
+        clock: Callable[[], float] = time.time,
+        logger: Optional[LoggerLike] = None,
+    ) -> None:
+        if path == ":memory:":
+            # Every pooled connection would open its own empty database
+            raise ValueError("ContextStore needs a database file, not ':memory:'")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"Session TTL must be positive, got {ttl}")
+        self.path = path
+        self.ttl = ttl
+        self._exclude = tuple(exclude_prefixes)
+        self._clock = clock
+        self._logger: LoggerLike = logger or Logger("intent_kit.context.store")
+        self._pool = _ConnectionPool(path, pool_size)
+        with self._transaction() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def __enter__(self) -> ContextStore:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self._pool.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._pool.connection() as conn:
+            # Take the write lock up front instead of upgrading mid-transaction
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+
+    # ---------- Sessions ----------
+    def load(
+        self,
+        session_id: str,
+        *,
+        lazy: bool = True,
+        logger: Optional[LoggerLike] = None,
+        telemetry_capacity: int = DEFAULT_TELEMETRY_CAPACITY,
+        track_provenance: bool = False,
+    ) -> StoredContext:
+        """
+        Return the context of a session; empty if it is unknown or expired.
+
+        Args:
+            session_id: Session to load
+            lazy: Read only key names now and each value on first access;
+                with False, read every value up front in one query
+            logger: Logger for the returned context
+            telemetry_capacity: Telemetry ring buffer size of the context
+            track_provenance: Record the last writer of each key written
+        """
+        ctx = StoredContext(
+            self,
+            session_id,
+            logger=logger,
+            telemetry_capacity=telemetry_capacity,
+            track_provenance=track_provenance,
+        )
+        expired = False
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT expires_at FROM context_sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is not None and row[0] is not None and row[0] <= self._clock():
+                expired = True
+            elif row is not None and lazy:
+                ctx._hydrate_keys(
+                    key
+                    for (key,) in conn.execute(
+                        "SELECT key FROM context_entries WHERE session_id = ?",
+                        (session_id,),
+                    )
+                )
+            elif row is not None:
+                ctx._hydrate_values(
+                    (key, json_backend.loads(value))
+                    for key, value in conn.execute(
+                        "SELECT key, value FROM context_entries WHERE session_id = ?",
+                        (session_id,),
+                    )
+                )
+        if expired:
+            self.delete_session(session_id)
+        return ctx
+
+    def save(self, ctx: ContextProtocol, session_id: Optional[str] = None) -> int:
+        """
+        Persist a context and refresh its session's expiry.
+
+        A StoredContext loaded from this store writes only its changes since
+        it was loaded or last saved. Any other context (or a StoredContext
+        saved under another session id) replaces the session's state.
+
+        Returns:
+            Number of keys written or deleted
+
+        Raises:
+            ValueError: If `session_id` is missing for a context not loaded
+                from this store
+        """
+        stored: Optional[StoredContext] = None
+        if (
+            isinstance(ctx, StoredContext)
+            and ctx.store is self
+            and session_id in (None, ctx.session_id)
+        ):
+            stored = ctx
+            session_id = ctx.session_id
+            written = {key: ctx._data[key] for key in ctx._dirty}
+            deleted = sorted(ctx._deleted)
+        elif session_id is None:
+            raise ValueError(
+                "session_id is required to save a context not loaded from this store"
+            )
+        else:
+            written = dict(ctx.snapshot())
+            deleted = []
+
+        rows = []
+        for key, value in written.items():
+            if key.startswith(self._exclude):
+                continue
+            try:
+                rows.append((session_id, key, json_backend.dumps(value)))
+            except (TypeError, ValueError) as e:
+                self._logger.debug(f"Context key {key} not persisted: {e}")
+
+        now = self._clock()
+        expires_at = None if self.ttl is None else now + self.ttl
+        with self._transaction() as conn:
+            if stored is None:
+                conn.execute(
+                    "DELETE FROM context_entries WHERE session_id = ?", (session_id,)
+                )
+            conn.executemany(
+                "DELETE FROM context_entries WHERE session_id = ? AND key = ?",
+                [(session_id, key) for key in deleted],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO context_entries (session_id, key, value) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO context_sessions "
+                "(session_id, updated_at, expires_at) VALUES (?, ?, ?)",
+                (session_id, now, expires_at),
+            )
+        if stored is not None:
+            stored._mark_saved()
+        return len(rows) + len(deleted)
+
+    def delete_session(self, session_id: str) -> bool:
+        """Remove a session and its keys; return False if it did not exist."""
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM context_entries WHERE session_id = ?", (session_id,)
+            )
+            cursor = conn.execute(
+                "DELETE FROM context_sessions WHERE session_id = ?", (session_id,)
+            )
+        return cursor.rowcount > 0
+
+    def sessions(self) -> List[str]:
+        """Return the ids of sessions that have not expired, sorted."""
+        with self._pool.connection() as conn:
+            return [
+                session_id
+                for (session_id,) in conn.execute(
+                    "SELECT session_id FROM context_sessions "
+                    "WHERE expires_at IS NULL OR expires_at > ? ORDER BY session_id",
+                    (self._clock(),),
+                )
+            ]
+
+    def purge_expired(self) -> int:
+        """
+        Remove every expired session.
+
+        Returns:
+            Number of sessions removed
+        """
+        now = self._clock()
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM context_entries WHERE session_id IN ("
+                "SELECT session_id FROM context_sessions WHERE expires_at <= ?)",
+                (now,),
+            )
+            cursor = conn.execute(
+                "DELETE FROM context_sessions WHERE expires_at <= ?", (now,)
+            )
+        return cursor.rowcount
+
+    def _fetch(self, session_id: str, keys: Sequence[str]) -> Dict[str, Any]:
+        """Read and decode the values of some keys of a session."""
+        values: Dict[str, Any] = {}
+        with self._pool.connection() as conn:
+            for start in range(0, len(keys), _FETCH_CHUNK):
+                chunk = keys[start : start + _FETCH_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                for key, value in conn.execute(
+                    "SELECT key, value FROM context_entries "
+                    f"WHERE session_id = ? AND key IN ({placeholders})",
+                    (session_id, *chunk),
+                ):
+                    values[key] = json_backend.loads(value)
+        return values
+
+
+class _LazyView(Mapping[str, Any]):
+    """Read view of a StoredContext that fetches unloaded values on access."""
+
+    def __init__(self, ctx: StoredContext) -> None:
+        self._ctx = ctx
+
+    def __getitem__(self, key: str) -> Any:
+        data = self._ctx._data
+        if key not in data and key in self._ctx._unloaded:
+            self._ctx._load((key,))
+        return data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ctx._data or key in self._ctx._unloaded
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._ctx._data)
+        yield from list(self._ctx._unloaded)
+
+    def __len__(self) -> int:
+        return len(self._ctx._data) + len(self._ctx._unloaded)
+
+
+class StoredContext(DefaultContext):
+    """
+    DefaultContext bound to a ContextStore session.
+
+    Storage model, on top of DefaultContext's:
+      - _data: values loaded from the store or written since
+      - _unloaded: persisted keys whose value has not been fetched yet;
+        reads go through a lazy view that fetches them on access
+      - _dirty / _deleted: keys written / deleted since the last load or
+        save, i.e. what ContextStore.save() persists
+
+    Create these with ContextStore.load(), not directly.
+    """
+
+    def __init__(
+        self,
+        store: ContextStore,
+        session_id: str,
+        *,
+        logger: Optional[LoggerLike] = None,
+        telemetry_capacity: int = DEFAULT_TELEMETRY_CAPACITY,
+        track_provenance: bool = False,
+    ) -> None:
+        super().__init__(
+            logger=logger,
+            telemetry_capacity=telemetry_capacity,
+            track_provenance=track_provenance,
+        )
+        self.store = store
+        self.session_id = session_id
+        self._unloaded: Set[str] = set()
+        self._dirty: Set[str] = set()
+        self._deleted: Set[str] = set()
+        self._view = _LazyView(self)
+
+    @property
+    def dirty_keys(self) -> List[str]:
+        """Keys written since the last load or save, sorted."""
+        return sorted(self._dirty)
+
+    @property
+    def deleted_keys(self) -> List[str]:
+        """Keys deleted since the last load or save, sorted."""
+        return sorted(self._deleted)
+
+    def snapshot(self, include: Optional[Iterable[str]] = None) -> Mapping[str, Any]:
+        # Fetch what the copy needs in bulk rather than one query per key
+        self._load(self._unloaded if include is None else self.select_keys(include))
+        return super().snapshot(include)
+
+    def fingerprint(self, include: Optional[Iterable[str]] = None) -> str:
+        self._load(self.select_keys(include or ("user.*", "shared.*")))
+        return super().fingerprint(include)
+
+    def _hydrate_keys(self, keys: Iterable[str]) -> None:
+        self._unloaded.update(keys)
+
+    def _hydrate_values(self, items: Iterable[Tuple[str, Any]]) -> None:
+        self._data.update(items)
+
+    def _load(self, keys: Iterable[str]) -> None:
+        """Fetch unloaded values of `keys` in one round trip."""
+        missing = [key for key in keys if key in self._unloaded]
+        if not missing:
+            return
+        values = self.store._fetch(self.session_id, missing)
+        self._data.update(values)
+        # Keys deleted from the store meanwhile are dropped
+        self._unloaded.difference_update(missing)
+
+    def _mark_saved(self) -> None:
+        self._dirty.clear()
+        self._deleted.clear()
+
+    def _write(self, key: str, value: Any) -> None:
+        self._unloaded.discard(key)
+        super()._write(key, value)
+        self._dirty.add(key)
+        self._deleted.discard(key)
+
+    def _delete(self, key: str) -> None:
+        if key in self._unloaded:
+            # No need to fetch a value that is being deleted
+            self._unloaded.discard(key)
+            self._data[key] = None
+        super()._delete(key)
+        self._dirty.discard(key)
+        self._deleted.add(key)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+# Records kept per telemetry namespace before the oldest are dropped
+DEFAULT_TELEMETRY_CAPACITY = 256
+
+
+class TelemetryBuffer:
+    """
+    Bounded ring buffer of telemetry records (errors, operations).
+
+    Appending is O(1); once `capacity` records are held, each append drops
+    the oldest one. `total` counts every record ever appended, so
+    `total - len(buffer)` records have been dropped.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TELEMETRY_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError(f"Telemetry capacity must be positive, got {capacity}")
+        self._records: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self.total = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._records.maxlen or 0
+
+    @property
+    def dropped(self) -> int:
+        return self.total - len(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._records)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self._records.append(record)
+        self.total += 1
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.append(record)
+
+    def resize(self, capacity: int) -> None:
+        """Change the capacity, keeping the newest records that fit."""
+        if capacity < 1:
+            raise ValueError(f"Telemetry capacity must be positive, got {capacity}")
+        self._records = deque(self._records, maxlen=capacity)
+
+    def query(self, limit: Optional[int] = None, **match: Any) -> List[Dict[str, Any]]:
+        """
+        Return records whose fields equal every `match` value, oldest first.
+
+        Args:
+            limit: Return only the newest `limit` matching records
+            **match: Field values to filter on (e.g. status="failed")
+        """
+        records = [
+            record
+            for record in self._records
+            if all(record.get(field) == value for field, value in match.items())
+        ]
+        if limit is not None:
+            records = records[-limit:] if limit > 0 else []
+        return records
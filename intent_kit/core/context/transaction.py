@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Set
+
+from intent_kit.core.context.protocols import ContextPatch, ContextProtocol
+from intent_kit.core.exceptions import ContextConflictError
+
+# Policies whose result depends on which writer goes last (or first)
+_ORDER_SENSITIVE = ("last_write_wins", "first_write_wins")
+
+
+class ContextTransaction:
+    """
+    Stage context patches and apply them together in one atomic commit.
+
+    Patches are applied in the order they were staged, so the last writer
+    wins as it would without the transaction; run_dag stages the nodes of a
+    frontier in traversal-step order.
+
+    Two provenances conflict on a key when they write it with different
+    policies, with an order-sensitive policy (last/first_write_wins) and
+    different values, or with merge_dict and different values for the same
+    sub-key. In strict mode commit() raises ContextConflictError on any
+    conflict; otherwise conflicts are logged and resolved by staging order.
+
+    Example:
+        with ContextTransaction(ctx) as tx:
+            tx.stage(ContextPatch(data={"user.name": "Alice"}, provenance="a"))
+            tx.stage(ContextPatch(data={"user.age": 30}, provenance="b"))
+    """
+
+    def __init__(self, ctx: ContextProtocol, *, strict: bool = False) -> None:
+        self._ctx = ctx
+        self._strict = strict
+        self._staged: List[ContextPatch] = []
+
+    def __enter__(self) -> ContextTransaction:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def __len__(self) -> int:
+        return len(self._staged)
+
+    def stage(self, patch: ContextPatch) -> None:
+        """Stage a patch; nothing is written until commit()."""
+        if patch.get("data"):
+            self._staged.append(patch)
+
+    def discard(self) -> None:
+        """Drop every staged patch."""
+        self._staged.clear()
+
+    def ordered(self) -> List[ContextPatch]:
+        """Return the staged patches in the order commit() applies them."""
+        return list(self._staged)
+
+    def conflicts(self) -> Dict[str, List[str]]:
+        """
+        Return conflicting keys with the provenances writing them.
+
+        Returns:
+            Mapping of key to sorted provenances, empty when there is none
+        """
+        writers: Dict[str, Dict[str, List[Any]]] = {}
+        policies: Dict[str, Set[str]] = {}
+        for patch in self._staged:
+            provenance = patch.get("provenance") or "unknown"
+            patch_policies = patch.get("policy", {})
+            for key, value in patch.get("data", {}).items():
+                writers.setdefault(key, {}).setdefault(provenance, []).append(value)
+                policies.setdefault(key, set()).add(
+                    patch_policies.get(key, "last_write_wins")
+                )
+
+        found: Dict[str, List[str]] = {}
+        for key, by_provenance in writers.items():
+            if len(by_provenance) > 1 and _conflicting(
+                policies[key], list(by_provenance.values())
+            ):
+                found[key] = sorted(by_provenance)
+        return found
+
+    def commit(self) -> List[ContextPatch]:
+        """
+        Apply the staged patches atomically and clear the transaction.
+
+        Returns:
+            The patches applied, in application order
+
+        Raises:
+            ContextConflictError: On a conflict in strict mode, or when a merge
+                fails; the context is left unchanged in both cases if it
+                supports apply_patches (DefaultContext and subclasses)
+        """
+        conflicts = self.conflicts()
+        if conflicts:
+            details = "; ".join(
+                f"{key} <- {', '.join(provenances)}"
+                for key, provenances in sorted(conflicts.items())
+            )
+            if self._strict:
+                self.discard()
+                raise ContextConflictError(f"Conflicting context writes: {details}")
+            logger = getattr(self._ctx, "logger", None)
+            if logger is not None:
+                logger.warning(
+                    f"Conflicting context writes resolved by order: {details}"
+                )
+
+        patches = self.ordered()
+        self.discard()
+        apply_patches = getattr(self._ctx, "apply_patches", None)
+        if apply_patches is not None:
+            apply_patches(patches)
+        else:
+            for patch in patches:
+                self._ctx.apply_patch(patch)
+        return patches
+
+
+def _conflicting(policies: Set[str], values_by_writer: List[List[Any]]) -> bool:
+    if len(policies) > 1:
+        return True
+    policy = next(iter(policies))
+    if policy in _ORDER_SENSITIVE:
+        # Each writer's effective value: its last write, or first for first_write_wins
+        pick = 0 if policy == "first_write_wins" else -1
+        effective = [values[pick] for values in values_by_writer]
+        return any(value != effective[0] for value in effective[1:])
+    if policy == "merge_dict":
+        seen: Dict[Any, Any] = {}
+        for values in values_by_writer:
+            combined: Dict[Any, Any] = {}
+            for value in values:
+                if isinstance(value, dict):
+                    combined.update(value)
+            for sub_key, sub_value in combined.items():
+                if sub_key in seen and seen[sub_key] != sub_value:
+                    return True
+                seen[sub_key] = sub_value
+    # append_list and reduce combine every writer's values
+    return False
@@ -223,7 +223,13 @@ class DAGBuilder:
         Raises:
             ValueError: If the node type is not supported
         """
-        supported_types = {"classifier", "action", "extractor", "clarification"}
+        supported_types = {
+            "classifier",
+            "action",
+            "extractor",
+            "clarification",
+            "classify_extract",
+        }
 
         if node_type not in supported_types:
             raise ValueError(
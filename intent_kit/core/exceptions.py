@@ -61,6 +61,12 @@ class ContextConflictError(RuntimeError):
     pass
 
 
+class ContextVersionError(ContextConflictError):
+    """Raised when an optimistic write finds a key changed since it was read."""
+
+    pass
+
+
 class CycleError(RuntimeError):
     """Raised when a cycle is detected in the DAG."""
 
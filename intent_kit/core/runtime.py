@@ -0,0 +1,117 @@
+"""
+Runtime services passed to nodes alongside the context.
+
+The context holds request data only. Process-level objects a node needs to
+do its work (the LLM service, the DAG's metadata, any extra clients) travel
+in an ExecutionEnvironment instead, so they never show up in snapshots,
+fingerprints, prompts or serialized state.
+
+An environment is immutable and holds no request state, so one instance can
+be built at startup and shared by every request and thread:
+
+    env = ExecutionEnvironment.for_dag(dag, llm_service=LLMService())
+    for user_input in inputs:
+        result, ctx = run_dag(dag, user_input, env=env)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from ..services.ai.llm_service import LLMService
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def _freeze(mapping: Optional[Mapping[str, Any]]) -> Mapping[str, Any]:
+    """Return a read-only copy of a mapping; read-only views are kept as is."""
+    if not mapping:
+        return _EMPTY
+    if isinstance(mapping, MappingProxyType):
+        return mapping
+    return MappingProxyType(dict(mapping))
+
+
+@dataclass(frozen=True)
+class ExecutionEnvironment:
+    """
+    Typed, immutable runtime services for DAG execution.
+
+    Attributes:
+        llm_service: Service nodes use for LLM calls
+        metadata: DAG metadata (e.g. "default_llm_config"), read-only
+        services: Extra named runtime objects for custom actions, read-only
+    """
+
+    llm_service: Optional[LLMService] = None
+    metadata: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+    services: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+
+    def __post_init__(self) -> None:
+        # Read-only views, so a shared environment cannot be changed by a node
+        object.__setattr__(self, "metadata", _freeze(self.metadata))
+        object.__setattr__(self, "services", _freeze(self.services))
+
+    @classmethod
+    def for_dag(
+        cls,
+        dag: Any,
+        llm_service: Optional[LLMService] = None,
+        services: Optional[Mapping[str, Any]] = None,
+    ) -> ExecutionEnvironment:
+        """Build the environment for a DAG, taking its metadata."""
+        return cls(
+            llm_service=llm_service,
+            metadata=getattr(dag, "metadata", None) or _EMPTY,
+            services=services or _EMPTY,
+        )
+
+    @classmethod
+    def from_context(cls, ctx: Any) -> ExecutionEnvironment:
+        """
+        Build an environment from the legacy "llm_service" and "metadata" keys.
+
+        Used by nodes executed directly with a context that still carries its
+        runtime objects, as contexts did before the environment existed.
+        """
+        if not hasattr(ctx, "get"):
+            return _EMPTY_ENVIRONMENT
+        llm_service = ctx.get("llm_service")
+        metadata = ctx.get("metadata")
+        if llm_service is None and not metadata:
+            return _EMPTY_ENVIRONMENT
+        return cls(
+            llm_service=llm_service,
+            metadata=metadata if isinstance(metadata, Mapping) else _EMPTY,
+        )
+
+    @property
+    def default_llm_config(self) -> Dict[str, Any]:
+        """LLM config for nodes that do not set their own."""
+        return self.metadata.get("default_llm_config", {})
+
+    def get_service(self, name: str, default: Any = None) -> Any:
+        """Return an extra runtime service by name."""
+        return self.services.get(name, default)
+
+    def with_services(self, **services: Any) -> ExecutionEnvironment:
+        """Return a copy of this environment with extra services added."""
+        return ExecutionEnvironment(
+            llm_service=self.llm_service,
+            metadata=self.metadata,
+            services={**self.services, **services},
+        )
+
+
+_EMPTY_ENVIRONMENT = ExecutionEnvironment()
+
+
+def resolve_environment(
+    ctx: Any, env: Optional[ExecutionEnvironment] = None
+) -> ExecutionEnvironment:
+    """Return `env`, or the environment a legacy context carries."""
+    if env is not None:
+        return env
+    return ExecutionEnvironment.from_context(ctx)
@@ -8,11 +8,14 @@ from ..nodes.classifier import ClassifierNode
 from ..nodes.action import ActionNode
 from ..nodes.extractor import ExtractorNode
 from ..nodes.clarification import ClarificationNode
+from ..nodes.classify_extract import ClassifyExtractNode
 
 from .exceptions import TraversalLimitError, TraversalError
 from .types import IntentDAG, GraphNode
 from .types import NodeProtocol, ExecutionResult
-from .context import ContextProtocol, ContextPatch, DefaultContext
+from .context import ContextProtocol, ContextPatch, ContextTransaction, DefaultContext
+from .runtime import ExecutionEnvironment
+from ..services.ai.base_client import supported_params
 from ..services.ai.llm_service import LLMService
 
 
@@ -24,6 +27,7 @@ def run_dag(
     max_fanout_per_node: int = 16,
     enable_memoization: bool = False,
     llm_service: Optional[LLMService] = None,
+    env: Optional[ExecutionEnvironment] = None,
 ) -> Tuple[ExecutionResult, ContextProtocol]:
     """Execute a DAG starting from entrypoints using BFS traversal.
 
@@ -34,7 +38,11 @@ def run_dag(
         max_steps: Maximum number of steps to execute
         max_fanout_per_node: Maximum number of outgoing edges per node
         enable_memoization: Whether to enable node memoization
-        llm_service: LLM service instance (defaults to new LLMService if not provided)
+        llm_service: LLM service instance (defaults to new LLMService if not provided);
+            ignored when env is given
+        env: Runtime services passed to every node alongside the context.
+            Build one with ExecutionEnvironment.for_dag and reuse it across
+            requests; defaults to one holding llm_service and dag.metadata
 
     Returns:
         Tuple of (last execution result, context)
@@ -51,14 +59,9 @@ def run_dag(
     if ctx is None:
         ctx = DefaultContext()
 
-    # Create default LLM service if not provided
-    if llm_service is None:
-        llm_service = LLMService()
-
-    # Attach LLM service and DAG metadata to context
-    ctx.set("llm_service", llm_service, modified_by="traversal:init")
-    if hasattr(dag, "metadata"):
-        ctx.set("metadata", dag.metadata, modified_by="traversal:init")
+    # Runtime services travel next to the context, never inside it
+    if env is None:
+        env = ExecutionEnvironment.for_dag(dag, llm_service or LLMService())
 
     # Initialize worklist with entrypoints
     q = deque(dag.entrypoints)
@@ -66,147 +69,191 @@ def run_dag(
     steps = 0
     last_result: Optional[ExecutionResult] = None
     total_metrics: Dict[str, Any] = {}
-    context_patches: Dict[str, Dict[str, Any]] = {}
     memo_cache: Dict[tuple[str, str, str], ExecutionResult] = {}
-
-    while q:
-        node_id = q.popleft()
-        steps += 1
-
-        if steps > max_steps:
-            raise TraversalLimitError(f"Exceeded max_steps limit of {max_steps}")
-
-        node = dag.nodes[node_id]
-
-        # Apply merged context patch for this node
-        if node_id in context_patches:
-            patch = ContextPatch(data=context_patches[node_id], provenance=node_id)
-            ctx.apply_patch(patch)
-            # Clear the patch after applying it
-            del context_patches[node_id]
-
-        # Check memoization cache
-        if enable_memoization:
-            cache_key = _create_memo_key(node_id, ctx, user_input)
-            if cache_key in memo_cache:
-                result = memo_cache[cache_key]
-                if hasattr(ctx, "logger"):
-                    input_summary = f"input='{user_input[:50]}{'...' if len(user_input) > 50 else ''}'"
-                    output_summary = f"output='{str(result.data)[:50]}{'...' if len(str(result.data)) > 50 else ''}'"
-                    ctx.logger.info(
-                        f"Node execution completed (memoized): {node_id} ({node.type}) in 0.00ms | {input_summary} | {output_summary}"
+    transaction = ContextTransaction(ctx)
+    terminated = False
+
+    while q and not terminated:
+        # Nodes of one frontier all see the context as it was when the frontier
+        # started; their patches are committed together, in step order, once the
+        # whole frontier has run. A frontier that raises commits nothing.
+        frontier = list(q)
+        q.clear()
+        with transaction:
+            for node_id in frontier:
+                steps += 1
+
+                if steps > max_steps:
+                    raise TraversalLimitError(
+                        f"Exceeded max_steps limit of {max_steps}"
                     )
+
+                node = dag.nodes[node_id]
+                result = _execute_node(
+                    dag,
+                    node_id,
+                    node,
+                    user_input,
+                    ctx,
+                    env,
+                    q,
+                    seen_steps,
+                    transaction,
+                    memo_cache if enable_memoization else None,
+                    steps,
+                )
+                if result is None:
+                    # Failed and routed via its "error" edge
+                    continue
+
                 last_result = result
                 _merge_metrics(total_metrics, result.metrics)
 
-                # Apply context patch from memoized result
+                # Stage the context patch for the frontier commit
                 if result.context_patch:
-                    patch = ContextPatch(data=result.context_patch, provenance=node_id)
-                    ctx.apply_patch(patch)
+                    transaction.stage(
+                        ContextPatch(
+                            data=result.context_patch, provenance=node_id, step=steps
+                        )
+                    )
 
+                # Check if we should terminate
                 if result.terminate:
+                    terminated = True
                     break
 
+                # Enqueue next nodes (unless terminating)
                 _enqueue_next_nodes(
-                    dag,
-                    node_id,
-                    result,
-                    q,
-                    seen_steps,
-                    max_fanout_per_node,
-                    context_patches,
+                    dag, node_id, result, q, seen_steps, max_fanout_per_node
                 )
-                continue
 
-        # Resolve node implementation
-        impl = _create_node(node)
+    if last_result is None:
+        raise TraversalError("No nodes were executed")
 
-        if impl is None:
-            raise TraversalError(f"Could not resolve implementation for node {node_id}")
+    return last_result, ctx
 
-        # Execute node
-        t0 = perf_counter()
 
-        # Track start of node execution
-        if hasattr(ctx, "logger"):
-            ctx.logger.debug(f"Node execution started: {node_id} ({node.type})")
-
-        try:
-            # Execute node - LLM service is now available in context
-            result = impl.execute(user_input, ctx)
-        except Exception as e:
-            # Handle node execution errors
-            dt = (perf_counter() - t0) * 1000
+def _execute_node(
+    dag: IntentDAG,
+    node_id: str,
+    node: GraphNode,
+    user_input: str,
+    ctx: ContextProtocol,
+    env: ExecutionEnvironment,
+    q: deque,
+    seen_steps: set[tuple[str, Optional[str]]],
+    transaction: ContextTransaction,
+    memo_cache: Optional[Dict[tuple[str, str, str], ExecutionResult]],
+    step_index: int,
+) -> Optional[ExecutionResult]:
+    """Execute one node, or reuse its memoized result.
+
+    Args:
+        dag: The DAG
+        node_id: The node ID
+        node: The node definition
+        user_input: The user input to process
+        ctx: The execution context
+        env: Runtime services passed to the node
+        q: Queue that error handlers are added to
+        seen_steps: Set of seen steps
+        transaction: Frontier transaction that error patches are staged in
+        memo_cache: Memoized results, or None when memoization is disabled
+        step_index: Index of this execution step, recorded on staged patches
+
+    Returns:
+        The execution result, or None if the node failed and the error was
+        routed via its "error" edge
+
+    Raises:
+        TraversalError: When the node fails and has no error handler
+    """
+    # Check memoization cache
+    if memo_cache is not None:
+        cache_key = _create_memo_key(node_id, ctx, user_input)
+        if cache_key in memo_cache:
+            result = memo_cache[cache_key]
             if hasattr(ctx, "logger"):
                 input_summary = (
                     f"input='{user_input[:50]}{'...' if len(user_input) > 50 else ''}'"
                 )
-                ctx.logger.error(
-                    f"Node execution failed: {node_id} ({node.type}) after {dt:.2f}ms | {input_summary} | error: {str(e)}"
+                output_summary = f"output='{str(result.data)[:50]}{'...' if len(str(result.data)) > 50 else ''}'"
+                ctx.logger.info(
+                    f"Node execution completed (memoized): {node_id} ({node.type}) in 0.00ms | {input_summary} | {output_summary}"
                 )
+            return result
 
-            # Apply error context patch
-            error_patch = {
-                "last_error": str(e),
-                "error_node": node_id,
-                "error_type": type(e).__name__,
-                "error_timestamp": perf_counter(),
-            }
-
-            # Route via "error" edge if exists
-            if "error" in dag.adj.get(node_id, {}):
-                for error_target in dag.adj[node_id]["error"]:
-                    step = (error_target, "error")
-                    if step not in seen_steps:
-                        seen_steps.add(step)
-                        q.append(error_target)
-                        context_patches[error_target] = error_patch
-            else:
-                # Stop traversal if no error handler
-                raise TraversalError(f"Node {node_id} failed: {e}")
-            continue
+    # Resolve node implementation
+    impl = _create_node(node)
 
-        dt = (perf_counter() - t0) * 1000
+    if impl is None:
+        raise TraversalError(f"Could not resolve implementation for node {node_id}")
+
+    # Execute node
+    t0 = perf_counter()
 
-        # Cache result if memoization enabled
-        if enable_memoization:
-            cache_key = _create_memo_key(node_id, ctx, user_input)
-            memo_cache[cache_key] = result
+    # Track start of node execution
+    if hasattr(ctx, "logger"):
+        ctx.logger.debug(f"Node execution started: {node_id} ({node.type})")
 
-        # Log execution
+    try:
+        # Nodes written before environments existed take (user_input, ctx)
+        result = impl.execute(
+            user_input, ctx, **supported_params(impl.execute, {"env": env})
+        )
+    except Exception as e:
+        # Handle node execution errors
+        dt = (perf_counter() - t0) * 1000
         if hasattr(ctx, "logger"):
             input_summary = (
                 f"input='{user_input[:50]}{'...' if len(user_input) > 50 else ''}'"
             )
-            output_summary = f"output='{str(result.data)[:50]}{'...' if len(str(result.data)) > 50 else ''}'"
-            ctx.logger.info(
-                f"Node execution completed: {node_id} ({node.type}) in {dt:.2f}ms | {input_summary} | {output_summary}"
+            ctx.logger.error(
+                f"Node execution failed: {node_id} ({node.type}) after {dt:.2f}ms | {input_summary} | error: {str(e)}"
             )
 
-        # Update metrics
-        _merge_metrics(total_metrics, result.metrics)
-
-        # Apply context patch from current result
-        if result.context_patch:
-            patch = ContextPatch(data=result.context_patch, provenance=node_id)
-            ctx.apply_patch(patch)
+        # Error context patch for the error handlers
+        error_patch = {
+            "last_error": str(e),
+            "error_node": node_id,
+            "error_type": type(e).__name__,
+            "error_timestamp": perf_counter(),
+        }
+
+        # Route via "error" edge if exists
+        if "error" not in dag.adj.get(node_id, {}):
+            # Stop traversal if no error handler
+            raise TraversalError(f"Node {node_id} failed: {e}")
+        routed = False
+        for error_target in dag.adj[node_id]["error"]:
+            step = (error_target, "error")
+            if step not in seen_steps:
+                seen_steps.add(step)
+                q.append(error_target)
+                routed = True
+        if routed:
+            transaction.stage(
+                ContextPatch(data=error_patch, provenance=node_id, step=step_index)
+            )
+        return None
 
-        # Store the last result
-        last_result = result
+    dt = (perf_counter() - t0) * 1000
 
-        # Check if we should terminate
-        if result.terminate:
-            break
+    # Cache result if memoization enabled
+    if memo_cache is not None:
+        memo_cache[_create_memo_key(node_id, ctx, user_input)] = result
 
-        # Enqueue next nodes (unless terminating)
-        _enqueue_next_nodes(
-            dag, node_id, result, q, seen_steps, max_fanout_per_node, context_patches
+    # Log execution
+    if hasattr(ctx, "logger"):
+        input_summary = (
+            f"input='{user_input[:50]}{'...' if len(user_input) > 50 else ''}'"
+        )
+        output_summary = f"output='{str(result.data)[:50]}{'...' if len(str(result.data)) > 50 else ''}'"
+        ctx.logger.info(
+            f"Node execution completed: {node_id} ({node.type}) in {dt:.2f}ms | {input_summary} | {output_summary}"
         )
 
-    if last_result is None:
-        raise TraversalError("No nodes were executed")
-
-    return last_result, ctx
+    return result
 
 
 def _create_node(node: GraphNode) -> NodeProtocol:
@@ -244,10 +291,13 @@ def _create_node(node: GraphNode) -> NodeProtocol:
         return ExtractorNode(**config)
     elif node_type == "clarification":
         return ClarificationNode(**config)
+    elif node_type == "classify_extract":
+        return ClassifyExtractNode(**config)
     else:
         raise ValueError(
             f"Unsupported node type '{node_type}'. "
-            f"Supported types: classifier, action, extractor, clarification"
+            f"Supported types: classifier, action, extractor, clarification, "
+            f"classify_extract"
         )
 
 
@@ -277,7 +327,6 @@ def _enqueue_next_nodes(
     q: deque,
     seen_steps: set[tuple[str, Optional[str]]],
     max_fanout_per_node: int,
-    context_patches: Dict[str, Dict[str, Any]],
 ) -> None:
     """Enqueue next nodes based on execution result.
 
@@ -288,7 +337,6 @@ def _enqueue_next_nodes(
         q: Queue to add nodes to
         seen_steps: Set of seen steps
         max_fanout_per_node: Maximum fanout per node
-        context_patches: Context patches for downstream nodes
     """
     labels = result.next_edges or []
     if not labels:
@@ -309,12 +357,6 @@ def _enqueue_next_nodes(
                         f"Exceeded max_fanout_per_node limit of {max_fanout_per_node} for node {node_id}"
                     )
 
-                # Merge context patches for downstream nodes
-                if result.context_patch:
-                    if next_node not in context_patches:
-                        context_patches[next_node] = {}
-                    context_patches[next_node].update(result.context_patch)
-
 
 def _merge_metrics(total_metrics: Dict[str, Any], node_metrics: Dict[str, Any]) -> None:
     """Merge node metrics into total metrics.
@@ -3,6 +3,7 @@ from typing import Dict, Set, List, Optional, Union
 from dataclasses import dataclass, field
 
 from .context import ContextProtocol
+from .runtime import ExecutionEnvironment
 
 EdgeLabel = Optional[str]
 
@@ -69,12 +70,19 @@ class ExecutionResult:
 class NodeProtocol(Protocol):
     """Protocol for nodes that can be executed in the DAG."""
 
-    def execute(self, user_input: str, ctx: ContextProtocol) -> ExecutionResult:
+    def execute(
+        self,
+        user_input: str,
+        ctx: ContextProtocol,
+        env: Optional[ExecutionEnvironment] = None,
+    ) -> ExecutionResult:
         """Execute the node with given input and context.
 
         Args:
             user_input: The user input to process
             ctx: The execution context
+            env: Runtime services (LLM service, DAG metadata); nodes called
+                without one fall back to ExecutionEnvironment.from_context
 
         Returns:
             ExecutionResult containing the result and next steps
@@ -13,6 +13,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from intent_kit.services.yaml_service import yaml_service
 from intent_kit.core.context import DefaultContext as Context
+from intent_kit.utils.json_backend import dumps
 from intent_kit.utils.perf_util import PerfUtil
 from intent_kit.core.types import ExecutionResult
 
@@ -146,8 +147,6 @@ class EvalResult:
             path = str(
                 results_dir / f"{self.dataset_name}_eval_results_{timestamp}.json"
             )
-        import json
-
         data = {
             "dataset_name": self.dataset_name,
             "summary": {
@@ -170,7 +169,7 @@ class EvalResult:
             ],
         }
         with open(path, "w") as f:
-            json.dump(data, f, indent=2)
+            f.write(dumps(data, indent=True))
         return str(path)
 
     def save_markdown(self, path: Optional[str] = None) -> str:
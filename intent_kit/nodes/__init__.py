@@ -9,6 +9,15 @@ from .action import ActionNode
 from .classifier import ClassifierNode
 from .extractor import ExtractorNode
 from .clarification import ClarificationNode
+from .classify_extract import ClassifyExtractNode
+from .local_classifiers import (
+    CentroidClassifier,
+    ClassificationScore,
+    LabelRule,
+    LocalClassifier,
+    RuleClassifier,
+)
+from .local_extractors import CallableExtractor, ParamExtractor, RegexExtractor
 
 __all__ = [
     # DAG nodes
@@ -16,4 +25,15 @@ __all__ = [
     "ClassifierNode",
     "ExtractorNode",
     "ClarificationNode",
+    "ClassifyExtractNode",
+    # Local classifiers
+    "CentroidClassifier",
+    "ClassificationScore",
+    "LabelRule",
+    "LocalClassifier",
+    "RuleClassifier",
+    # Local extractors
+    "CallableExtractor",
+    "ParamExtractor",
+    "RegexExtractor",
 ]
@@ -4,6 +4,7 @@ import time
 from typing import Any, Callable, Dict, Optional, List
 from intent_kit.core.types import NodeProtocol, ExecutionResult
 from intent_kit.core.context import ContextProtocol
+from intent_kit.core.runtime import ExecutionEnvironment, resolve_environment
 from intent_kit.utils.logger import Logger
 
 
@@ -20,6 +21,7 @@ class ActionNode(NodeProtocol):
         context_read: Optional[List[str]] = None,
         context_write: Optional[List[str]] = None,
         param_keys: Optional[List[str]] = None,
+        services: Optional[List[str]] = None,
     ):
         """Initialize the DAG action node.
 
@@ -31,6 +33,8 @@ class ActionNode(NodeProtocol):
             param_key: Key in context to get parameters from
             context_read: List of context keys to read and pass to action
             context_write: List of context keys that the action will write
+            services: Names of runtime services from the execution environment
+                to pass to action as keyword arguments
         """
         self.name = name
         self.action = action
@@ -41,14 +45,21 @@ class ActionNode(NodeProtocol):
         self.context_write = context_write or []
         # List of parameter keys to check
         self.param_keys = param_keys or [param_key]
+        self.services = services or []
         self.logger = Logger(name)
 
-    def execute(self, user_input: str, ctx: ContextProtocol) -> ExecutionResult:
+    def execute(
+        self,
+        user_input: str,
+        ctx: ContextProtocol,
+        env: Optional[ExecutionEnvironment] = None,
+    ) -> ExecutionResult:
         """Execute the action node using parameters from context.
 
         Args:
             user_input: User input string (not used, parameters come from context)
             ctx: Execution context containing extracted parameters
+            env: Runtime services; read from the context when not given
 
         Returns:
             ExecutionResult with action results
@@ -74,8 +85,15 @@ class ActionNode(NodeProtocol):
         self.logger.info(f"Context read keys: {self.context_read}")
         self.logger.info(f"Context values: {context_values}")
 
+        # Requested runtime services are passed by name but never logged or
+        # written back to the context
+        service_params = {}
+        if self.services:
+            env = resolve_environment(ctx, env)
+            service_params = {name: env.get_service(name) for name in self.services}
+
         # Execute the action with all parameters
-        action_result = self.action(**all_params)
+        action_result = self.action(**all_params, **service_params)
 
         # Create context patch with action result
         context_patch = {"action_result": action_result, "action_name": self.name}
@@ -3,7 +3,9 @@
 from typing import Any, Dict, Optional
 from intent_kit.core.types import NodeProtocol, ExecutionResult
 from intent_kit.core.context import ContextProtocol
+from intent_kit.core.runtime import ExecutionEnvironment, resolve_environment
 from intent_kit.utils.logger import Logger
+from intent_kit.utils.prompt_context import render_context
 from intent_kit.utils.type_coercion import validate_raw_content
 
 
@@ -24,6 +26,7 @@ class ClarificationNode(NodeProtocol):
         custom_prompt: Optional[str] = None,
         context_read: Optional[list[str]] = None,
         context_write: Optional[list[str]] = None,
+        context_max_tokens: Optional[int] = 500,
     ):
         """Initialize the clarification node.
 
@@ -34,6 +37,9 @@ class ClarificationNode(NodeProtocol):
             description: Description of the node's purpose
             llm_config: LLM configuration for generating contextual clarification messages
             custom_prompt: Custom prompt for generating clarification messages
+            context_read: List of context keys rendered into the LLM prompt
+            context_write: List of context keys to write after execution
+            context_max_tokens: Token budget for the rendered context keys
         """
         self.name = name
         self.clarification_message = clarification_message
@@ -43,6 +49,7 @@ class ClarificationNode(NodeProtocol):
         self.custom_prompt = custom_prompt
         self.context_read = context_read or []
         self.context_write = context_write or []
+        self.context_max_tokens = context_max_tokens
         self.logger = Logger(name)
 
     def _default_message(self) -> str:
@@ -52,12 +59,18 @@ class ClarificationNode(NodeProtocol):
             "Could you please clarify your request?"
         )
 
-    def execute(self, user_input: str, ctx: ContextProtocol) -> ExecutionResult:
+    def execute(
+        self,
+        user_input: str,
+        ctx: ContextProtocol,
+        env: Optional[ExecutionEnvironment] = None,
+    ) -> ExecutionResult:
         """Execute the clarification node.
 
         Args:
             user_input: The original user input that was unclear
             ctx: The execution context
+            env: Runtime services; read from the context when not given
 
         Returns:
             ExecutionResult with clarification message and termination flag
@@ -71,7 +84,9 @@ class ClarificationNode(NodeProtocol):
 
         # Generate clarification message using LLM if configured
         if self.llm_config and self.custom_prompt:
-            clarification_text = self._generate_clarification_with_llm(user_input, ctx)
+            clarification_text = self._generate_clarification_with_llm(
+                user_input, ctx, env
+            )
         else:
             # Use static message
             clarification_text = self._format_message()
@@ -109,11 +124,12 @@ class ClarificationNode(NodeProtocol):
             context_patch=context_patch,
         )
 
-    def _generate_clarification_with_llm(self, user_input: str, ctx: Any) -> str:
+    def _generate_clarification_with_llm(
+        self, user_input: str, ctx: Any, env: Optional[ExecutionEnvironment] = None
+    ) -> str:
         """Generate a contextual clarification message using LLM."""
         try:
-            # Get LLM service from context
-            llm_service = ctx.get("llm_service") if hasattr(ctx, "get") else None
+            llm_service = resolve_environment(ctx, env).llm_service
 
             if not llm_service or not self.llm_config:
                 self.logger.warning("LLM service not available, using static message")
@@ -146,12 +162,10 @@ class ClarificationNode(NodeProtocol):
         if self.custom_prompt:
             return self.custom_prompt.format(user_input=user_input)
 
-        # Build context info
-        context_info = ""
-        if ctx and hasattr(ctx, "snapshot"):
-            context_data = ctx.snapshot()
-            if context_data:
-                context_info = f"\nAvailable Context:\n{context_data}"
+        # Build context info from the declared context_read keys only
+        context_info = render_context(
+            ctx, self.context_read, self.context_max_tokens
+        ).text
 
         # Build available options text
         options_text = ""
@@ -1,12 +1,90 @@
 """DAG ClassifierNode implementation with LLM integration."""
 
 import time
-from typing import Any, Dict, List, Optional, Callable
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from intent_kit.core.types import NodeProtocol, ExecutionResult
 from intent_kit.core.context import ContextProtocol
+from intent_kit.core.runtime import ExecutionEnvironment, resolve_environment
 from intent_kit.utils.logger import Logger
+from intent_kit.services.ai.base_client import supported_params
 from intent_kit.services.ai.llm_service import LLMService
 from intent_kit.utils.type_coercion import validate_raw_content
+from intent_kit.nodes.local_classifiers import (
+    ClassificationScore,
+    LocalClassifier,
+    CentroidClassifier,
+    RuleClassifier,
+)
+from intent_kit.utils.perf_util import PerfUtil
+from intent_kit.utils.prompt_context import render_context
+from intent_kit.utils.prompt_template import PromptTemplate
+
+CONFIDENCE_METHODS = ("self_reported", "agreement")
+
+
+@dataclass
+class CascadeTier:
+    """One tier of a classifier cascade.
+
+    Local tiers wrap a LocalClassifier; LLM tiers call a model with their own
+    llm_config and derive a confidence from the model's self-reported score or
+    from agreement between several samples. A tier's label is accepted when its
+    confidence reaches the threshold; otherwise the input escalates.
+    """
+
+    name: str
+    threshold: float = 0.0
+    classifier: Optional[LocalClassifier] = None
+    llm_config: Dict[str, Any] = field(default_factory=dict)
+    confidence_method: str = "self_reported"
+    samples: int = 3
+
+    @classmethod
+    def from_config(cls, index: int, config: Dict[str, Any]) -> "CascadeTier":
+        """Build a tier from a JSON-friendly cascade entry.
+
+        Supported ``type`` values are ``rules`` (with ``rules``), ``centroid``
+        (with ``dataset`` or ``examples``), ``local`` (with ``classifier``) and
+        ``llm`` (with ``llm_config``, ``confidence`` and ``samples``).
+        """
+        tier_type = config.get("type", "llm")
+        name = config.get("name") or f"{index}_{tier_type}"
+        threshold = float(config.get("threshold", 0.0))
+
+        if tier_type == "rules":
+            return cls(
+                name=name,
+                threshold=threshold,
+                classifier=RuleClassifier.from_config(config["rules"]),
+            )
+        if tier_type == "centroid":
+            if "dataset" in config:
+                classifier = CentroidClassifier.from_dataset(config["dataset"])
+            else:
+                classifier = CentroidClassifier(config["examples"])
+            return cls(name=name, threshold=threshold, classifier=classifier)
+        if tier_type == "local":
+            return cls(name=name, threshold=threshold, classifier=config["classifier"])
+        if tier_type == "llm":
+            confidence_method = config.get("confidence", "self_reported")
+            if confidence_method not in CONFIDENCE_METHODS:
+                raise ValueError(
+                    f"Unknown confidence method '{confidence_method}' for tier "
+                    f"'{name}'. Supported: {', '.join(CONFIDENCE_METHODS)}"
+                )
+            samples = int(config.get("samples", 3))
+            if samples < 1:
+                raise ValueError(f"samples must be at least 1 for tier '{name}'")
+            return cls(
+                name=name,
+                threshold=threshold,
+                llm_config=dict(config.get("llm_config", {})),
+                confidence_method=confidence_method,
+                samples=samples,
+            )
+        raise ValueError(f"Unsupported cascade tier type: {tier_type}")
 
 
 class ClassifierNode(NodeProtocol):
@@ -22,6 +100,14 @@ class ClassifierNode(NodeProtocol):
         custom_prompt: Optional[str] = None,
         context_read: Optional[List[str]] = None,
         context_write: Optional[List[str]] = None,
+        batch_size: int = 20,
+        local_classifier: Optional[LocalClassifier] = None,
+        confidence_threshold: float = 0.4,
+        rules: Optional[Dict[str, Any]] = None,
+        cascade: Optional[List[Dict[str, Any]]] = None,
+        minimal_output: bool = False,
+        context_max_tokens: Optional[int] = 500,
+        report_prompt_savings: bool = False,
     ):
         """Initialize the DAG classifier node.
 
@@ -34,7 +120,33 @@ class ClassifierNode(NodeProtocol):
             custom_prompt: Custom prompt for classification
             context_read: List of context keys to read before execution
             context_write: List of context keys to write after execution
+            batch_size: Maximum number of inputs packed into one LLM request
+                by execute_batch
+            local_classifier: LLM-free classifier tried before the LLM
+            confidence_threshold: Minimum local confidence needed to skip the LLM
+            rules: Keyword/regex rules per label, compiled into a RuleClassifier
+                used as the local classifier
+            cascade: Ordered classifier tiers (rules, local models, LLMs); each
+                input escalates until a tier is confident enough
+            minimal_output: Constrain LLM classification to a short, greedy
+                generation of exactly one label and require an exact match
+            context_max_tokens: Token budget for the context_read keys rendered
+                into prompts (None for unlimited)
+            report_prompt_savings: Record ``prompt_tokens_saved``, the
+                estimated prompt tokens saved over embedding the whole context,
+                in metrics. Off by default, since the estimate walks every
+                context value on each call.
         """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if rules is not None:
+            if local_classifier is not None:
+                raise ValueError("Provide either rules or local_classifier, not both")
+            local_classifier = RuleClassifier.from_config(rules)
+        if cascade is not None and local_classifier is not None:
+            raise ValueError(
+                "cascade cannot be combined with rules or local_classifier"
+            )
         self.name = name
         self.output_labels = output_labels
         self.description = description
@@ -43,14 +155,31 @@ class ClassifierNode(NodeProtocol):
         self.custom_prompt = custom_prompt
         self.context_read = context_read or []
         self.context_write = context_write or []
+        self.batch_size = batch_size
+        self.local_classifier = local_classifier
+        self.confidence_threshold = confidence_threshold
+        self.cascade = [
+            CascadeTier.from_config(index, tier)
+            for index, tier in enumerate(cascade or [])
+        ]
+        self.minimal_output = minimal_output
+        self.context_max_tokens = context_max_tokens
+        self.report_prompt_savings = report_prompt_savings
+        self._templates: Dict[str, Tuple[Tuple[Any, ...], PromptTemplate]] = {}
         self.logger = Logger(name)
 
-    def execute(self, user_input: str, ctx: ContextProtocol) -> ExecutionResult:
+    def execute(
+        self,
+        user_input: str,
+        ctx: ContextProtocol,
+        env: Optional[ExecutionEnvironment] = None,
+    ) -> ExecutionResult:
         """Execute the classifier node using LLM or custom function.
 
         Args:
             user_input: User input string
             ctx: Execution context
+            env: Runtime services; read from the context when not given
 
         Returns:
             ExecutionResult with classification results
@@ -63,24 +192,32 @@ class ClassifierNode(NodeProtocol):
                 if value is not None:
                     context_data[key] = value
 
-            # Get LLM service from context
-            llm_service = ctx.get("llm_service") if hasattr(ctx, "get") else None
-
-            # Get effective LLM config (node-specific or default from DAG)
-            effective_llm_config = self.llm_config
-            if not effective_llm_config and hasattr(ctx, "get"):
-                # Try to get default config from DAG metadata
-                metadata = ctx.get("metadata", {})
-                effective_llm_config = metadata.get("default_llm_config", {})
+            llm_service, effective_llm_config = self._resolve_llm(ctx, env)
+            metrics: Dict[str, Any] = {}
+            local_score = None
+            if not self.classification_func:
+                local_score = self._classify_locally(user_input, metrics)
 
             # Use custom classification function if provided
             if self.classification_func:
                 chosen_label = self.classification_func(user_input, context_data)
+            elif self.cascade:
+                chosen_label = self._classify_with_cascade(
+                    user_input, ctx, llm_service, metrics
+                )
+            elif local_score is not None and local_score.label is not None:
+                # Confident local classification, no LLM call needed
+                chosen_label = local_score.label
             elif llm_service and effective_llm_config:
                 # Use LLM for classification
+                if self.local_classifier is not None:
+                    metrics["llm_escalations"] = 1
                 chosen_label = self._classify_with_llm(
-                    user_input, ctx, llm_service, effective_llm_config
+                    user_input, ctx, llm_service, effective_llm_config, metrics
                 )
+            elif self.local_classifier is not None:
+                # Local classifier was unsure and there is no LLM to escalate to
+                chosen_label = ""
             else:
                 raise ValueError("No classification function or LLM service provided")
 
@@ -90,47 +227,332 @@ class ClassifierNode(NodeProtocol):
                 f"LLM classification result OUTPUT_LABELS: {self.output_labels}"
             )
 
-            # Use the existing parsing logic to properly match the label
-            parsed_label = self._parse_classification_response(chosen_label)
-            chosen_label = parsed_label if parsed_label is not None else ""
+            return self._build_result(chosen_label, metrics)
+        except Exception as e:
+            return self._build_error_result(e)
 
-            if chosen_label not in self.output_labels:
-                self.logger.warning(
-                    f"Invalid label '{chosen_label}', not in {self.output_labels}"
-                )
-                chosen_label = ""  # Use empty string instead of None
+    def execute_batch(
+        self,
+        user_inputs: List[str],
+        ctx: ContextProtocol,
+        env: Optional[ExecutionEnvironment] = None,
+    ) -> List[ExecutionResult]:
+        """Classify many inputs, packing up to batch_size of them per LLM request.
+
+        Each chunk of inputs is sent as one numbered prompt that asks for a JSON
+        object mapping input numbers to labels. Labels are validated per item;
+        items whose label is missing or not one of output_labels (including
+        "unknown") are re-run individually through execute. Token usage, cost
+        and duration of a batched request are split evenly across the items it
+        served.
+
+        Args:
+            user_inputs: User input strings to classify
+            ctx: Execution context shared by all inputs
+            env: Runtime services; read from the context when not given
+
+        Returns:
+            One ExecutionResult per input, in input order
+        """
+        if not user_inputs:
+            return []
+
+        llm_service, effective_llm_config = self._resolve_llm(ctx, env)
+        if (
+            self.classification_func
+            or self.custom_prompt
+            or self.cascade
+            or llm_service is None
+            or not effective_llm_config
+        ):
+            # Nothing to amortize; classify each input on its own
+            return [self.execute(user_input, ctx, env) for user_input in user_inputs]
+
+        results: List[Optional[ExecutionResult]] = [None] * len(user_inputs)
+        escalated: List[int] = []
+        for index, user_input in enumerate(user_inputs):
+            metrics: Dict[str, Any] = {}
+            local_score = self._classify_locally(user_input, metrics)
+            if local_score is not None and local_score.label is not None:
+                results[index] = self._build_result(local_score.label, metrics)
+            else:
+                escalated.append(index)
+
+        for start in range(0, len(escalated), self.batch_size):
+            chunk = escalated[start : start + self.batch_size]
+            chunk_results = self._classify_chunk(
+                [user_inputs[index] for index in chunk],
+                ctx,
+                llm_service,
+                effective_llm_config,
+                env,
+            )
+            for index, result in zip(chunk, chunk_results):
+                # Items re-run through execute already counted their escalation
+                if (
+                    self.local_classifier is not None
+                    and "llm_escalations" not in result.metrics
+                ):
+                    result.merge_metrics({"llm_escalations": 1})
+                results[index] = result
+        return [result for result in results if result is not None]
+
+    def _classify_chunk(
+        self,
+        user_inputs: List[str],
+        ctx: ContextProtocol,
+        llm_service: LLMService,
+        llm_config: Dict[str, Any],
+        env: Optional[ExecutionEnvironment] = None,
+    ) -> List[ExecutionResult]:
+        """Classify one chunk of inputs with a single LLM request."""
+        labels: Dict[int, Optional[str]] = {}
+        batch_metrics: List[Dict[str, Any]] = [{} for _ in user_inputs]
+        try:
+            prompt_metrics: Dict[str, Any] = {}
+            prompt = self._build_batch_classification_prompt(
+                user_inputs, ctx, prompt_metrics
+            )
+            model = llm_config.get("model", "gpt-3.5-turbo")
+            llm_client = llm_service.get_client(llm_config)
+            raw_response = llm_client.generate(
+                prompt,
+                model=model,
+                **supported_params(
+                    llm_client.generate,
+                    {
+                        **self._batch_generation_params(len(user_inputs)),
+                        **self._cache_params(self._batch_classification_template()),
+                    },
+                ),
+            )
+            batch_metrics = _split_usage(raw_response, len(user_inputs), prompt_metrics)
+            labels = self._parse_batch_response(raw_response.content, len(user_inputs))
+        except Exception as e:
+            self.logger.warning(f"Batch classification failed, falling back: {e}")
+
+        results: List[ExecutionResult] = []
+        for index, user_input in enumerate(user_inputs):
+            # Labels outside output_labels, "unknown" included, are retried
+            label = labels.get(index)
+            if label is not None:
+                label = self._parse_classification_response(label)
+            if label is None:
+                self.logger.debug(f"Falling back to single classification: {index}")
+                result = self.execute(user_input, ctx, env)
+                result.merge_metrics(batch_metrics[index])
+                results.append(result)
+            else:
+                results.append(self._build_result(label, batch_metrics[index]))
+        return results
+
+    def _parse_batch_response(
+        self, content: str, expected_count: int
+    ) -> Dict[int, Optional[str]]:
+        """Parse a numbered JSON batch response into zero-based index → label.
 
-            # Create context patch with classification result
-            context_patch: Dict[str, Any] = {"chosen_label": chosen_label}
+        Items that are missing or whose value is not a string are omitted so the
+        caller can fall back to per-item classification for them.
+        """
+        parsed = validate_raw_content(content, dict)
+        labels: Dict[int, Optional[str]] = {}
+        for key, value in parsed.items():
+            try:
+                index = int(str(key).strip()) - 1
+            except ValueError:
+                continue
+            if 0 <= index < expected_count and isinstance(value, str):
+                labels[index] = value
+        return labels
+
+    def _classify_with_cascade(
+        self,
+        user_input: str,
+        ctx: Any,
+        llm_service: Optional[LLMService],
+        metrics: Dict[str, Any],
+    ) -> str:
+        """Run the cascade tiers in order until one is confident enough.
 
-            # Add context write operations if specified
-            for key in self.context_write:
-                if key == "intent.confidence":
-                    context_patch[key] = chosen_label
-                elif key == "classification.time":
-                    context_patch[key] = time.time()
+        Per-tier metrics are recorded under ``cascade.<tier>.*``: ``calls``,
+        ``hits``, ``latency`` and, for LLM tiers, ``input_tokens``,
+        ``output_tokens`` and ``cost``. Summed over many executions, hits
+        divided by calls gives each tier's hit rate.
+        """
+        for tier in self.cascade:
+            prefix = f"cascade.{tier.name}"
+            perf_util = PerfUtil(prefix, auto_print=False)
+            perf_util.start()
+            usage: Dict[str, Any] = {}
+            try:
+                if tier.classifier is not None:
+                    score = tier.classifier.classify(user_input)
+                elif llm_service is not None and tier.llm_config:
+                    score = self._score_with_llm(
+                        user_input, ctx, llm_service, tier, usage
+                    )
                 else:
-                    # For other keys, we could add more special cases as needed
-                    context_patch[key] = chosen_label
-
-            return ExecutionResult(
-                data=chosen_label,  # Return the classification result in data
-                # Route to clarification when classification fails
-                next_edges=[chosen_label] if chosen_label else ["clarification"],
-                terminate=False,  # Classifiers don't terminate
-                metrics={},
-                context_patch=context_patch,
+                    self.logger.warning(f"Skipping tier {tier.name}: no LLM available")
+                    continue
+            except Exception as e:
+                self.logger.warning(f"Cascade tier {tier.name} failed: {e}")
+                score = ClassificationScore(label=None, confidence=0.0)
+            finally:
+                metrics[f"{prefix}.latency"] = perf_util.stop()
+
+            metrics[f"{prefix}.calls"] = 1
+            for key, value in usage.items():
+                metrics[f"{prefix}.{key}"] = value
+            metrics[f"{prefix}.confidence"] = score.confidence
+
+            if score.label is not None and score.confidence >= tier.threshold:
+                metrics[f"{prefix}.hits"] = 1
+                metrics["cascade_tier"] = tier.name
+                self.logger.debug(
+                    f"Cascade tier {tier.name} chose {score.label} "
+                    f"({score.confidence:.2f})"
+                )
+                return score.label
+
+        self.logger.info("No cascade tier was confident enough")
+        return ""
+
+    def _score_with_llm(
+        self,
+        user_input: str,
+        ctx: Any,
+        llm_service: LLMService,
+        tier: CascadeTier,
+        usage: Dict[str, Any],
+    ) -> ClassificationScore:
+        """Classify with an LLM tier and derive a confidence for the label."""
+        model = tier.llm_config.get("model", "gpt-3.5-turbo")
+        llm_client = llm_service.get_client(tier.llm_config)
+
+        if tier.confidence_method == "agreement":
+            prompt = self._build_classification_prompt(user_input, ctx, usage)
+            params = supported_params(
+                llm_client.generate, self._classification_cache_params()
             )
+            votes: Counter = Counter()
+            for _ in range(tier.samples):
+                raw_response = llm_client.generate(prompt, model=model, **params)
+                _accumulate_usage(usage, raw_response)
+                label = self._parse_classification_response(
+                    validate_raw_content(raw_response.content, str)
+                )
+                votes[label] += 1
+            label, count = votes.most_common(1)[0]
+            return ClassificationScore(
+                label=label,
+                confidence=count / tier.samples if label is not None else 0.0,
+                scores={vote: n / tier.samples for vote, n in votes.items() if vote},
+            )
+
+        prompt = self._build_scored_classification_prompt(user_input, ctx, usage)
+        raw_response = llm_client.generate(
+            prompt,
+            model=model,
+            **supported_params(
+                llm_client.generate,
+                self._cache_params(self._scored_classification_template()),
+            ),
+        )
+        _accumulate_usage(usage, raw_response)
+        parsed = validate_raw_content(raw_response.content, dict)
+        label = self._parse_classification_response(parsed.get("label"))
+        try:
+            confidence = float(parsed.get("confidence", 0.0))
+        except (TypeError, ValueError):
+            confidence = 0.0
+        confidence = min(max(confidence, 0.0), 1.0)
+        return ClassificationScore(
+            label=label, confidence=confidence if label is not None else 0.0
+        )
+
+    def _classify_locally(
+        self, user_input: str, metrics: Dict[str, Any]
+    ) -> Optional[ClassificationScore]:
+        """Run the local classifier, if any, and record its outcome in metrics.
+
+        Returns the score when it clears the confidence threshold; otherwise a
+        score with a None label so the caller escalates.
+        """
+        if self.local_classifier is None:
+            return None
+        try:
+            score = self.local_classifier.classify(user_input)
         except Exception as e:
-            self.logger.error(f"Classification failed: {e}")
-            return ExecutionResult(
-                # Return error info in data
-                data=f"ClassificationError: {str(e)}",
-                next_edges=None,
-                terminate=True,  # Terminate on error
-                metrics={},
-                context_patch={"error": str(e), "error_type": "ClassificationError"},
+            self.logger.warning(f"Local classification failed: {e}")
+            return ClassificationScore(label=None, confidence=0.0)
+
+        metrics["local_confidence"] = score.confidence
+        if score.label is not None and score.confidence >= self.confidence_threshold:
+            metrics["local_hits"] = 1
+            self.logger.debug(
+                f"Local classification result: {score.label} ({score.confidence:.2f})"
+            )
+            return score
+        return ClassificationScore(
+            label=None, confidence=score.confidence, scores=score.scores
+        )
+
+    def _resolve_llm(
+        self, ctx: Any, env: Optional[ExecutionEnvironment] = None
+    ) -> Tuple[Optional[LLMService], Dict[str, Any]]:
+        """Get the LLM service and effective LLM config for this node."""
+        env = resolve_environment(ctx, env)
+
+        # Node-specific config, or the default from the DAG metadata
+        return env.llm_service, self.llm_config or env.default_llm_config
+
+    def _build_result(
+        self, chosen_label: str, metrics: Dict[str, Any]
+    ) -> ExecutionResult:
+        """Build the routing result for a raw classification label."""
+        # Use the existing parsing logic to properly match the label
+        parsed_label = self._parse_classification_response(chosen_label)
+        chosen_label = parsed_label if parsed_label is not None else ""
+
+        if chosen_label not in self.output_labels:
+            self.logger.warning(
+                f"Invalid label '{chosen_label}', not in {self.output_labels}"
             )
+            chosen_label = ""  # Use empty string instead of None
+
+        # Create context patch with classification result
+        context_patch: Dict[str, Any] = {"chosen_label": chosen_label}
+
+        # Add context write operations if specified
+        for key in self.context_write:
+            if key == "intent.confidence":
+                context_patch[key] = chosen_label
+            elif key == "classification.time":
+                context_patch[key] = time.time()
+            else:
+                # For other keys, we could add more special cases as needed
+                context_patch[key] = chosen_label
+
+        return ExecutionResult(
+            data=chosen_label,  # Return the classification result in data
+            # Route to clarification when classification fails
+            next_edges=[chosen_label] if chosen_label else ["clarification"],
+            terminate=False,  # Classifiers don't terminate
+            metrics=metrics,
+            context_patch=context_patch,
+        )
+
+    def _build_error_result(self, error: Exception) -> ExecutionResult:
+        """Build the terminating result for a failed classification."""
+        self.logger.error(f"Classification failed: {error}")
+        return ExecutionResult(
+            # Return error info in data
+            data=f"ClassificationError: {str(error)}",
+            next_edges=None,
+            terminate=True,  # Terminate on error
+            metrics={},
+            context_patch={"error": str(error), "error_type": "ClassificationError"},
+        )
 
     def _classify_with_llm(
         self,
@@ -138,11 +560,12 @@ class ClassifierNode(NodeProtocol):
         ctx: Any,
         llm_service: LLMService,
         llm_config: Dict[str, Any],
+        metrics: Optional[Dict[str, Any]] = None,
     ) -> str:
         """Classify user input using LLM services."""
         try:
             # Build prompt for classification
-            prompt = self._build_classification_prompt(user_input, ctx)
+            prompt = self._build_classification_prompt(user_input, ctx, metrics)
 
             # Get model from config or use default
             model = llm_config.get("model", "gpt-3.5-turbo")
@@ -151,7 +574,20 @@ class ClassifierNode(NodeProtocol):
             llm_client = llm_service.get_client(llm_config)
 
             # Get raw response
-            raw_response = llm_client.generate(prompt, model=model)
+            raw_response = llm_client.generate(
+                prompt,
+                model=model,
+                **supported_params(
+                    llm_client.generate,
+                    {
+                        **self._generation_params(),
+                        **self._classification_cache_params(),
+                    },
+                ),
+            )
+            cached_tokens = getattr(raw_response, "cached_tokens", None)
+            if metrics is not None and isinstance(cached_tokens, int) and cached_tokens:
+                metrics["cached_tokens"] = cached_tokens
 
             # Parse the response using the validation utility
             chosen_label = validate_raw_content(raw_response.content, str)
@@ -164,36 +600,81 @@ class ClassifierNode(NodeProtocol):
             self.logger.error(f"LLM classification failed: {e}")
             return ""
 
-    def _build_classification_prompt(self, user_input: str, ctx: Any) -> str:
-        """Build the classification prompt."""
-        if self.custom_prompt:
-            return self.custom_prompt.format(user_input=user_input)
-
-        # Build label descriptions
-        label_descriptions = []
-        for label in self.output_labels:
-            label_descriptions.append(f"- {label}")
-
-        label_descriptions_text = "\n".join(label_descriptions)
+    def _generation_params(self) -> Dict[str, Any]:
+        """Generation parameters for single-input LLM classification.
 
-        # Build context info
-        context_info = ""
-        if ctx and hasattr(ctx, "snapshot"):
-            context_data = ctx.snapshot()
-            if context_data:
-                context_info = f"\nAvailable Context:\n{context_data}"
-
-        return f"""You are a strict classification specialist. Given a user input, classify it into one of the available categories.
+        In minimal-output mode the model decodes greedily, stops at the first
+        newline, may emit only as many tokens as the longest label can need,
+        and is constrained to the label set by clients whose
+        supports_choices(model) is true; the rest ignore the choices.
+        """
+        if not self.minimal_output:
+            return {}
+        return {
+            "max_tokens": self._label_max_tokens(),
+            "temperature": 0.0,
+            "stop": ["\n"],
+            "choices": [*self.output_labels, "unknown"],
+        }
+
+    def _batch_generation_params(self, count: int) -> Dict[str, Any]:
+        """Generation parameters for a batched classification request.
+
+        In minimal-output mode the model decodes greedily and may emit only as
+        many tokens as a JSON object of `count` numbered labels needs. There is
+        no newline stop or label constraint, since the answer is a JSON object.
+        """
+        if not self.minimal_output:
+            return {}
+        # Each entry also spends a few tokens on its number, quotes and commas
+        per_item = self._label_max_tokens() + len(str(count)) + 4
+        return {"max_tokens": count * per_item + 4, "temperature": 0.0}
+
+    def _label_max_tokens(self) -> int:
+        """Token budget for answering with the longest label.
+
+        Byte-level BPE tokens cover at least one byte each, so a label's UTF-8
+        length bounds its token count on any such tokenizer; two more tokens
+        leave room for leading whitespace. Greedy decoding stops at the
+        newline, so the generous budget costs nothing.
+        """
+        labels = [*self.output_labels, "unknown"]
+        return max(len(label.encode("utf-8")) for label in labels) + 2
+
+    def _compiled_template(
+        self, kind: str, build: Callable[[str], PromptTemplate]
+    ) -> PromptTemplate:
+        """Return a cached prompt template, recompiling it if the node changed."""
+        key = (self.name, self.description, tuple(self.output_labels))
+        cached = self._templates.get(kind)
+        if cached is None or cached[0] != key:
+            labels_text = "\n".join(f"- {label}" for label in self.output_labels)
+            cached = (key, build(labels_text))
+            self._templates[kind] = cached
+        return cached[1]
+
+    def _cache_params(self, template: PromptTemplate) -> Dict[str, Any]:
+        """Generation parameters marking the template prefix as cacheable."""
+        return {"cache_prefix": template.prefix_length}
+
+    def _classification_cache_params(self) -> Dict[str, Any]:
+        """Cache parameters for single-input prompts (none for custom prompts)."""
+        if self.custom_prompt:
+            return {}
+        return self._cache_params(self._classification_template())
 
-User Input: {user_input}
+    def _classification_template(self) -> PromptTemplate:
+        """Template for single-input classification prompts."""
+        return self._compiled_template(
+            "single",
+            lambda labels_text: PromptTemplate(
+                prefix=f"""You are a strict classification specialist. Given a user input, classify it into one of the available categories.
 
 Classification Task: {self.name}
 Description: {self.description}
 
 Available Categories:
-{label_descriptions_text}
-
-{context_info}
+{labels_text}
 
 Instructions:
 - Analyze the user input carefully
@@ -203,20 +684,146 @@ Instructions:
 - If the input is ambiguous or could fit multiple categories, return "unknown"
 - If the input is about topics not covered by these categories, return "unknown"
 - Be strict - only classify if there's a clear, unambiguous match
+""",
+                body="""{context_info}
+
+User Input: {user_input}
 
-Return only the category name:"""
+Return only the category name:""",
+            ),
+        )
+
+    def _batch_classification_template(self) -> PromptTemplate:
+        """Template for batched classification prompts."""
+        return self._compiled_template(
+            "batch",
+            lambda labels_text: PromptTemplate(
+                prefix=f"""You are a strict classification specialist. Given a numbered list of user inputs, classify each one into one of the available categories.
+
+Classification Task: {self.name}
+Description: {self.description}
+
+Available Categories:
+{labels_text}
+
+Instructions:
+- Classify every input independently
+- Choose the most appropriate category from the available options ONLY
+- Use each category name exactly as listed above
+- If an input doesn't clearly match any category, use "unknown"
+- If an input is ambiguous or could fit multiple categories, use "unknown"
+- Be strict - only classify if there's a clear, unambiguous match
+""",
+                body="""{context_info}
+
+User Inputs:
+{numbered_inputs}
+
+Return only a JSON object mapping each input number to its category, for example {{"1": "category", "2": "unknown"}}:""",
+            ),
+        )
+
+    def _scored_classification_template(self) -> PromptTemplate:
+        """Template for classification prompts with a self-reported confidence."""
+        return self._compiled_template(
+            "scored",
+            lambda labels_text: PromptTemplate(
+                prefix=f"""You are a strict classification specialist. Given a user input, classify it into one of the available categories and rate your confidence.
+
+Classification Task: {self.name}
+Description: {self.description}
+
+Available Categories:
+{labels_text}
+
+Instructions:
+- Choose the most appropriate category from the available options ONLY
+- Use the category name exactly as listed above, or "unknown" if none fits
+- Set confidence to a number between 0 and 1 reflecting how certain you are
+- Use a low confidence if the input is ambiguous or could fit multiple categories
+""",
+                body="""{context_info}
+
+User Input: {user_input}
+
+Return only a JSON object of the form {{"label": "category", "confidence": 0.0}}:""",
+            ),
+        )
+
+    def _build_classification_prompt(
+        self, user_input: str, ctx: Any, metrics: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build the classification prompt."""
+        if self.custom_prompt:
+            return self.custom_prompt.format(user_input=user_input)
+
+        return self._classification_template().render(
+            context_info=self._build_context_info(ctx, metrics),
+            user_input=user_input,
+        )
+
+    def _build_batch_classification_prompt(
+        self,
+        user_inputs: List[str],
+        ctx: Any,
+        metrics: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Build a prompt that classifies several numbered inputs at once."""
+        numbered_inputs = "\n".join(
+            f"{index}. {user_input}" for index, user_input in enumerate(user_inputs, 1)
+        )
+        return self._batch_classification_template().render(
+            context_info=self._build_context_info(ctx, metrics),
+            numbered_inputs=numbered_inputs,
+        )
+
+    def _build_scored_classification_prompt(
+        self, user_input: str, ctx: Any, metrics: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build a prompt asking for a label and a self-reported confidence."""
+        return self._scored_classification_template().render(
+            context_info=self._build_context_info(ctx, metrics),
+            user_input=user_input,
+        )
+
+    def _build_context_info(
+        self, ctx: Any, metrics: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Render the context_read keys shared by classification prompts.
+
+        With report_prompt_savings, records the estimated prompt tokens saved
+        over embedding the whole context snapshot as ``prompt_tokens_saved``
+        in metrics.
+        """
+        rendered = render_context(ctx, self.context_read, self.context_max_tokens)
+        if metrics is not None:
+            if self.report_prompt_savings:
+                metrics["prompt_tokens_saved"] = (
+                    metrics.get("prompt_tokens_saved", 0) + rendered.tokens_saved
+                )
+            if rendered.truncated:
+                metrics["context_truncated"] = True
+        return rendered.text
 
     def _parse_classification_response(self, response: Any) -> Optional[str]:
         """Parse the LLM classification response."""
         if isinstance(response, str):
             # Clean up the response
             label = response.strip().lower()
+            if not label:
+                # An empty response must not partially match every label
+                return None
 
             # Find the best match
             for output_label in self.output_labels:
                 if output_label.lower() == label:
                     return output_label
 
+            if self.minimal_output:
+                # Constrained generations must name a label exactly
+                self.logger.warning(f"LLM response '{response}' is not a label")
+                return None
+
             # Try partial matching
             for output_label in self.output_labels:
                 if output_label.lower() in label or label in output_label.lower():
@@ -239,3 +846,41 @@ Return only the category name:"""
     def context_write_keys(self) -> List[str]:
         """List of context keys to write after execution."""
         return self.context_write
+
+
+def _split_usage(
+    raw_response: Any, count: int, extra: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Split the usage of one batched response evenly across its items.
+
+    Integer token counts (including integer entries of extra, such as
+    ``prompt_tokens_saved``) are distributed so the per-item values sum exactly
+    to the reported totals.
+    """
+    per_item: List[Dict[str, Any]] = [{"batch_size": count} for _ in range(count)]
+    totals = {
+        key: getattr(raw_response, key, None)
+        for key in ("input_tokens", "output_tokens", "cached_tokens")
+    }
+    for key, value in (extra or {}).items():
+        if isinstance(value, int) and not isinstance(value, bool):
+            totals[key] = value
+    for key, total in totals.items():
+        if isinstance(total, int) and total:
+            share, remainder = divmod(total, count)
+            for index, metrics in enumerate(per_item):
+                metrics[key] = share + (1 if index < remainder else 0)
+    for key in ("cost", "duration"):
+        total = getattr(raw_response, key, None)
+        if isinstance(total, (int, float)) and total:
+            for metrics in per_item:
+                metrics[key] = total / count
+    return per_item
+
+
+def _accumulate_usage(usage: Dict[str, Any], raw_response: Any) -> None:
+    """Add a response's token usage and cost to a running usage dict."""
+    for key in ("input_tokens", "output_tokens", "cached_tokens", "cost"):
+        value = getattr(raw_response, key, None)
+        if isinstance(value, (int, float)) and value:
+            usage[key] = usage.get(key, 0) + value
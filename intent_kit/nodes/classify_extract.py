@@ -0,0 +1,301 @@
+"""DAG ClassifyExtractNode implementation: classification and extraction in one call."""
+
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from intent_kit.core.types import NodeProtocol, ExecutionResult
+from intent_kit.core.context import ContextProtocol
+from intent_kit.core.runtime import ExecutionEnvironment, resolve_environment
+from intent_kit.services.ai.base_client import supported_params
+from intent_kit.utils.logger import Logger
+from intent_kit.utils.prompt_context import render_context
+from intent_kit.utils.prompt_template import PromptTemplate
+from intent_kit.utils.type_coercion import (
+    TypeValidationError,
+    compile_validator,
+    validate_raw_content,
+)
+from intent_kit.nodes.extractor import default_param_value
+
+ParamSchema = Dict[str, Union[Type[Any], str]]
+
+
+class ClassifyExtractNode(NodeProtocol):
+    """Fused classifier and extractor node for DAG execution.
+
+    A single LLM call returns ``{"label": ..., "params": {...}}``. The label
+    routes exactly like a ClassifierNode (unknown labels go to the
+    ``clarification`` edge) and the parameters for the chosen label are
+    validated against that label's schema and written to ``output_key`` like
+    an ExtractorNode, so a classifier → extractor → action chain becomes
+    classify_extract → action with one round trip instead of two.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        param_schemas: Dict[str, ParamSchema],
+        description: str = "",
+        llm_config: Optional[Dict[str, Any]] = None,
+        output_key: str = "extracted_params",
+        context_read: Optional[List[str]] = None,
+        context_write: Optional[List[str]] = None,
+        context_max_tokens: Optional[int] = 500,
+        report_prompt_savings: bool = False,
+    ):
+        """Initialize the fused classify-and-extract node.
+
+        Args:
+            name: Node name
+            param_schemas: Mapping of output label to that label's parameter
+                schema (use an empty schema for labels without parameters)
+            description: Node description
+            llm_config: LLM configuration
+            output_key: Key to store extracted parameters in context
+            context_read: List of context keys rendered into the prompt
+            context_write: List of context keys that receive the chosen label
+                (``*.time`` keys receive the classification timestamp)
+            context_max_tokens: Token budget for the rendered context keys
+            report_prompt_savings: Record ``prompt_tokens_saved``, the
+                estimated prompt tokens saved over embedding the whole context,
+                in metrics. Off by default, since the estimate walks every
+                context value on each call.
+        """
+        if not param_schemas:
+            raise ValueError("ClassifyExtractNode requires at least one label")
+        self.name = name
+        self.param_schemas = param_schemas
+        self.description = description
+        self.llm_config = llm_config or {}
+        self.output_key = output_key
+        self.context_read = context_read or []
+        self.context_write = context_write or []
+        self.context_max_tokens = context_max_tokens
+        self.report_prompt_savings = report_prompt_savings
+        self._template: Optional[Tuple[Tuple[Any, ...], PromptTemplate]] = None
+        self.logger = Logger(name)
+
+    @property
+    def output_labels(self) -> List[str]:
+        """Labels this node can route to."""
+        return list(self.param_schemas)
+
+    def execute(
+        self,
+        user_input: str,
+        ctx: ContextProtocol,
+        env: Optional[ExecutionEnvironment] = None,
+    ) -> ExecutionResult:
+        """Classify the input and extract the chosen label's parameters.
+
+        Args:
+            user_input: User input string
+            ctx: Execution context
+            env: Runtime services; read from the context when not given
+
+        Returns:
+            ExecutionResult routing on the chosen label with extracted parameters
+        """
+        try:
+            env = resolve_environment(ctx, env)
+            llm_service = env.llm_service
+
+            # Get effective LLM config (node-specific or default from DAG)
+            effective_llm_config = self.llm_config or env.default_llm_config
+
+            if not llm_service or not effective_llm_config:
+                raise ValueError(
+                    "LLM service and config required for classify-and-extract"
+                )
+
+            metrics: Dict[str, Any] = {}
+            prompt = self._build_prompt(user_input, ctx, metrics)
+            model = effective_llm_config.get("model", "gpt-3.5-turbo")
+            llm_client = llm_service.get_client(effective_llm_config)
+            raw_response = llm_client.generate(
+                prompt,
+                model=model,
+                **supported_params(
+                    llm_client.generate,
+                    {"cache_prefix": self._prompt_template().prefix_length},
+                ),
+            )
+
+            for key in ("input_tokens", "output_tokens", "cached_tokens"):
+                value = getattr(raw_response, key, None)
+                if isinstance(value, int) and value:
+                    metrics[key] = value
+            for key in ("cost", "duration"):
+                value = getattr(raw_response, key, None)
+                if isinstance(value, (int, float)) and value:
+                    metrics[key] = value
+
+            label, params = self._parse_response(raw_response.content)
+            return self._build_result(label, params, metrics)
+
+        except Exception as e:
+            self.logger.error(f"Classify-and-extract failed: {e}")
+            return ExecutionResult(
+                data=f"ClassificationError: {str(e)}",
+                next_edges=None,
+                terminate=True,  # Terminate on error
+                metrics={},
+                context_patch={
+                    "error": str(e),
+                    "error_type": "ClassificationError",
+                    "extraction_success": False,
+                },
+            )
+
+    def _parse_response(self, content: str) -> Tuple[str, Dict[str, Any]]:
+        """Parse the model's JSON answer into a known label and its parameters.
+
+        Returns an empty label when the model answered with anything other than
+        one of the output labels.
+        """
+        try:
+            parsed = validate_raw_content(content, dict)
+        except (TypeValidationError, ValueError) as e:
+            self.logger.warning(f"Could not parse classify-and-extract response: {e}")
+            return "", {}
+
+        raw_label = parsed.get("label")
+        label = ""
+        if isinstance(raw_label, str):
+            for output_label in self.param_schemas:
+                if output_label.lower() == raw_label.strip().lower():
+                    label = output_label
+                    break
+        if not label:
+            self.logger.warning(f"Response label {raw_label!r} is not a known label")
+            return "", {}
+
+        raw_params = parsed.get("params")
+        if not isinstance(raw_params, dict):
+            raw_params = {}
+        return label, self._validate_params(label, raw_params)
+
+    def _validate_params(
+        self, label: str, raw_params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Coerce the chosen label's parameters, filling defaults for missing ones.
+
+        Parameters that are not in the label's schema are dropped.
+        """
+        validated: Dict[str, Any] = {}
+        for param_name, param_type in self.param_schemas[label].items():
+            if param_name not in raw_params or raw_params[param_name] is None:
+                validated[param_name] = default_param_value(param_type)
+                continue
+            try:
+                validated[param_name] = compile_validator(param_type)(
+                    raw_params[param_name]
+                )
+            except (TypeValidationError, ValueError) as e:
+                self.logger.warning(
+                    f"Parameter validation failed for {param_name}: {e}"
+                )
+                validated[param_name] = raw_params[param_name]
+        return validated
+
+    def _build_result(
+        self, label: str, params: Dict[str, Any], metrics: Dict[str, Any]
+    ) -> ExecutionResult:
+        """Build a classifier-style routing result carrying extracted params."""
+        context_patch: Dict[str, Any] = {"chosen_label": label}
+        if label:
+            context_patch[self.output_key] = params
+            context_patch["extraction_success"] = True
+
+        for key in self.context_write:
+            if key.endswith(".time"):
+                context_patch[key] = time.time()
+            else:
+                context_patch[key] = label
+
+        return ExecutionResult(
+            data={"label": label, "params": params},
+            # Route to clarification when classification fails
+            next_edges=[label] if label else ["clarification"],
+            terminate=False,
+            metrics=metrics,
+            context_patch=context_patch,
+        )
+
+    def _prompt_template(self) -> PromptTemplate:
+        """Return the compiled prompt template, recompiling on changes."""
+        key = (
+            self.name,
+            self.description,
+            tuple(
+                (label, tuple(schema.items()))
+                for label, schema in self.param_schemas.items()
+            ),
+        )
+        if self._template is None or self._template[0] != key:
+            self._template = (key, self._compile_template())
+        return self._template[1]
+
+    def _compile_template(self) -> PromptTemplate:
+        """Compile the static instructions and per-label schemas into a template."""
+        label_descriptions = []
+        for label, schema in self.param_schemas.items():
+            param_text = ", ".join(
+                f"{param_name} ({_type_name(param_type)})"
+                for param_name, param_type in schema.items()
+            )
+            label_descriptions.append(f"- {label}: {param_text or 'no parameters'}")
+        label_descriptions_text = "\n".join(label_descriptions)
+
+        return PromptTemplate(
+            prefix=f"""You are a strict classification and parameter extraction specialist. Given a user input, classify it into one of the available categories and extract that category's parameters.
+
+Task: {self.name}
+Description: {self.description}
+
+Available Categories and Parameters:
+{label_descriptions_text}
+
+Instructions:
+- Choose the most appropriate category from the available options ONLY
+- Use the category name exactly as listed above
+- If the input doesn't clearly match any category or is ambiguous, use "unknown" and empty params
+- Extract only the parameters listed for the chosen category
+- If a parameter is not mentioned, infer it from context or omit it
+""",
+            body="""{context_info}
+
+User Input: {user_input}
+
+Return only a JSON object of the form {{"label": "category", "params": {{"name": "value"}}}}:""",
+        )
+
+    def _build_prompt(
+        self, user_input: str, ctx: Any, metrics: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build the fused classification and extraction prompt."""
+        rendered = render_context(ctx, self.context_read, self.context_max_tokens)
+        if metrics is not None:
+            if self.report_prompt_savings:
+                metrics["prompt_tokens_saved"] = rendered.tokens_saved
+            if rendered.truncated:
+                metrics["context_truncated"] = True
+        return self._prompt_template().render(
+            context_info=rendered.text, user_input=user_input
+        )
+
+    @property
+    def context_read_keys(self) -> List[str]:
+        """List of context keys to read before execution."""
+        return self.context_read
+
+    @property
+    def context_write_keys(self) -> List[str]:
+        """List of context keys to write after execution."""
+        return self.context_write
+
+
+def _type_name(param_type: Union[Type[Any], str]) -> str:
+    """Render a parameter type for the prompt."""
+    if isinstance(param_type, str):
+        return param_type
+    return getattr(param_type, "__name__", str(param_type))
@@ -1,17 +1,37 @@
 """DAG ExtractorNode implementation for parameter extraction."""
 
-from typing import Any, Dict, Optional, Union, Type, List
+from typing import Any, Callable, Dict, Optional, Union, Type, List, Tuple
 from intent_kit.core.types import NodeProtocol, ExecutionResult
 from intent_kit.core.context import ContextProtocol
+from intent_kit.core.runtime import ExecutionEnvironment, resolve_environment
+from intent_kit.services.ai.base_client import supported_params
+from intent_kit.utils.incremental_json import IncrementalJSONObjectParser
 from intent_kit.utils.logger import Logger
+from intent_kit.utils.perf_util import PerfUtil
+from intent_kit.utils.prompt_context import render_context
+from intent_kit.utils.prompt_template import PromptTemplate
+from intent_kit.nodes.local_extractors import ParamExtractor, as_param_extractor
 from intent_kit.utils.type_coercion import (
-    validate_type,
-    resolve_type,
+    compile_validator,
     TypeValidationError,
     validate_raw_content,
+    TYPE_MAP,
 )
 
 
+def default_param_value(param_type: Union[Type[Any], str]) -> Any:
+    """Return a sensible default for a parameter missing from an extraction."""
+    if isinstance(param_type, str):
+        param_type = TYPE_MAP.get(param_type, str)
+    if param_type is int:
+        return 0
+    if param_type is float:
+        return 0.0
+    if param_type is bool:
+        return False
+    return ""
+
+
 class ExtractorNode(NodeProtocol):
     """Parameter extraction node for DAG execution using LLM services."""
 
@@ -25,6 +45,11 @@ class ExtractorNode(NodeProtocol):
         output_key: str = "extracted_params",
         context_read: Optional[List[str]] = None,
         context_write: Optional[List[str]] = None,
+        context_max_tokens: Optional[int] = 500,
+        param_extractors: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        on_param: Optional[Callable[[str, Any], None]] = None,
+        report_prompt_savings: bool = False,
     ):
         """Initialize the DAG extractor node.
 
@@ -37,7 +62,26 @@ class ExtractorNode(NodeProtocol):
             output_key: Key to store extracted parameters in context
             context_read: List of context keys to read before execution
             context_write: List of context keys to write after execution
+            context_max_tokens: Token budget for the context_read keys rendered
+                into the prompt (None for unlimited)
+            param_extractors: Rule-based extractors per parameter (regexes,
+                compiled patterns, callables or ParamExtractor objects) tried
+                before the LLM, which is then asked only for the rest
+            stream: Stream the LLM answer, validating each parameter as soon
+                as its value is complete and stopping generation once all
+                requested parameters are present
+            on_param: Called with (name, value) for each parameter as soon as
+                it is known: rule-based values first, then each LLM value as
+                it is validated, while a stream is still open. Lets callers
+                start work before the node returns.
+            report_prompt_savings: Record ``prompt_tokens_saved``, the
+                estimated prompt tokens saved over embedding the whole context,
+                in metrics. Off by default, since the estimate walks every
+                context value on each call.
         """
+        unknown = sorted(set(param_extractors or {}) - set(param_schema))
+        if unknown:
+            raise ValueError(f"Extractors given for unknown parameters: {unknown}")
         self.name = name
         self.param_schema = param_schema
         self.description = description
@@ -46,72 +90,57 @@ class ExtractorNode(NodeProtocol):
         self.output_key = output_key
         self.context_read = context_read or []
         self.context_write = context_write or []
+        self.context_max_tokens = context_max_tokens
+        self.stream = stream
+        self.on_param = on_param
+        self.report_prompt_savings = report_prompt_savings
+        self.param_extractors: Dict[str, ParamExtractor] = {
+            param_name: as_param_extractor(spec)
+            for param_name, spec in (param_extractors or {}).items()
+        }
+        self._templates: Dict[
+            Tuple[str, ...], Tuple[Tuple[Any, ...], PromptTemplate]
+        ] = {}
         self.logger = Logger(name)
 
-    def execute(self, user_input: str, ctx: ContextProtocol) -> ExecutionResult:
+    def execute(
+        self,
+        user_input: str,
+        ctx: ContextProtocol,
+        env: Optional[ExecutionEnvironment] = None,
+    ) -> ExecutionResult:
         """Execute parameter extraction using LLM.
 
         Args:
             user_input: User input string
             ctx: Execution context
+            env: Runtime services; read from the context when not given
 
         Returns:
             ExecutionResult with extracted parameters
         """
         try:
-            # Read context values if specified
-            context_data = {}
-            for key in self.context_read:
-                value = ctx.get(key)
-                if value is not None:
-                    context_data[key] = value
-
-            # Get LLM service from context
-            llm_service = ctx.get("llm_service") if hasattr(ctx, "get") else None
-
-            # Get effective LLM config (node-specific or default from DAG)
-            effective_llm_config = self.llm_config
-            if not effective_llm_config and hasattr(ctx, "get"):
-                # Try to get default config from DAG metadata
-                metadata = ctx.get("metadata", {})
-                effective_llm_config = metadata.get("default_llm_config", {})
-
-            if not llm_service or not effective_llm_config:
-                raise ValueError(
-                    "LLM service and config required for parameter extraction"
+            # Try the rule-based extractors first
+            metrics: Dict[str, Any] = {}
+            resolved = self._extract_locally(user_input)
+            for param_name, value in resolved.items():
+                self._emit(param_name, value)
+            unresolved = [name for name in self.param_schema if name not in resolved]
+            if self.param_extractors:
+                metrics["rule_params"] = len(resolved)
+                metrics["llm_params"] = len(unresolved)
+                metrics["llm_skipped"] = 0 if unresolved else 1
+
+            validated_params = dict(resolved)
+            if unresolved or not self.param_extractors:
+                llm_params = self._extract_with_llm(
+                    user_input, ctx, unresolved, metrics, env
                 )
-
-            # Build prompt for parameter extraction (pass context data for potential use)
-            prompt = self._build_prompt(user_input, ctx)
-
-            # Get model from config or use default
-            model = effective_llm_config.get("model")
-            if not model:
-                raise ValueError("LLM model required for parameter extraction")
-
-            # Get client from shared service
-            llm_client = llm_service.get_client(effective_llm_config)
-
-            # Generate raw response using LLM
-            raw_response = llm_client.generate(prompt, model=model)
-
-            # Parse and validate the extracted parameters using the validation utility
-            validated_params = validate_raw_content(raw_response.content, dict)
+                validated_params = {**llm_params, **resolved}
 
             # Ensure all required parameters are present with defaults if missing
             validated_params = self._ensure_all_parameters_present(validated_params)
 
-            # Build metrics
-            metrics = {}
-            if raw_response.input_tokens:
-                metrics["input_tokens"] = raw_response.input_tokens
-            if raw_response.output_tokens:
-                metrics["output_tokens"] = raw_response.output_tokens
-            if raw_response.cost:
-                metrics["cost"] = raw_response.cost
-            if raw_response.duration:
-                metrics["duration"] = raw_response.duration
-
             # Create context patch with extraction results
             context_patch = {
                 self.output_key: validated_params,
@@ -153,14 +182,190 @@ class ExtractorNode(NodeProtocol):
                 },
             )
 
-    def _build_prompt(self, user_input: str, ctx: Any) -> str:
-        """Build the parameter extraction prompt."""
-        if self.custom_prompt:
-            return self.custom_prompt.format(user_input=user_input)
+    def _extract_locally(self, user_input: str) -> Dict[str, Any]:
+        """Resolve parameters with the rule-based extractors.
 
+        Values that cannot be coerced to the parameter's type are treated as
+        unresolved so the LLM gets a chance at them.
+        """
+        resolved: Dict[str, Any] = {}
+        for param_name, extractor in self.param_extractors.items():
+            try:
+                value = extractor.extract(user_input)
+                if value is None:
+                    continue
+                resolved[param_name] = compile_validator(self.param_schema[param_name])(
+                    value
+                )
+            except Exception as e:
+                # Any failure, including one raised by a user callable, leaves
+                # the parameter to the LLM
+                self.logger.debug(f"Rule extraction failed for {param_name}: {e}")
+        return resolved
+
+    def _emit(self, param_name: str, value: Any) -> None:
+        """Hand a parameter to the on_param callback, if there is one."""
+        if self.on_param is not None:
+            self.on_param(param_name, value)
+
+    def _extract_with_llm(
+        self,
+        user_input: str,
+        ctx: Any,
+        param_names: List[str],
+        metrics: Dict[str, Any],
+        env: Optional[ExecutionEnvironment] = None,
+    ) -> Dict[str, Any]:
+        """Ask the LLM for the given parameters and record its usage in metrics."""
+        env = resolve_environment(ctx, env)
+        llm_service = env.llm_service
+
+        # Get effective LLM config (node-specific or default from DAG)
+        effective_llm_config = self.llm_config or env.default_llm_config
+
+        if not llm_service or not effective_llm_config:
+            raise ValueError("LLM service and config required for parameter extraction")
+
+        # Build prompt for the parameters still missing
+        prompt = self._build_prompt(user_input, ctx, metrics, param_names)
+
+        # Get model from config or use default
+        model = effective_llm_config.get("model")
+        if not model:
+            raise ValueError("LLM model required for parameter extraction")
+
+        # Get client from shared service
+        llm_client = llm_service.get_client(effective_llm_config)
+
+        # Generate raw response using LLM, marking the static prefix cacheable
+        cache_params = (
+            {}
+            if self.custom_prompt
+            else {"cache_prefix": self._prompt_template(param_names).prefix_length}
+        )
+        if self.stream:
+            return self._stream_with_llm(
+                llm_client, prompt, model, param_names, metrics, cache_params
+            )
+        raw_response = llm_client.generate(
+            prompt, model=model, **supported_params(llm_client.generate, cache_params)
+        )
+
+        # Parse the answer, then coerce each parameter to its schema type
+        extracted_params = self._validate_params(
+            validate_raw_content(raw_response.content, dict)
+        )
+        for param_name in param_names:
+            if param_name in extracted_params:
+                self._emit(param_name, extracted_params[param_name])
+
+        # Build metrics
+        if raw_response.input_tokens:
+            metrics["input_tokens"] = raw_response.input_tokens
+        if raw_response.output_tokens:
+            metrics["output_tokens"] = raw_response.output_tokens
+        cached_tokens = getattr(raw_response, "cached_tokens", None)
+        if isinstance(cached_tokens, int) and cached_tokens:
+            metrics["cached_tokens"] = cached_tokens
+        if raw_response.cost:
+            metrics["cost"] = raw_response.cost
+        if raw_response.duration:
+            metrics["duration"] = raw_response.duration
+        return extracted_params
+
+    def _stream_with_llm(
+        self,
+        llm_client: Any,
+        prompt: str,
+        model: str,
+        param_names: List[str],
+        metrics: Dict[str, Any],
+        cache_params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Stream the LLM answer, validating parameters as their values close.
+
+        The stream is closed as soon as every requested parameter has been
+        received, so the remaining output is never generated. If the answer
+        cannot be parsed incrementally (YAML, truncated or malformed JSON),
+        the full text is parsed as a regular response instead.
+        """
+        perf_util = PerfUtil("extractor_stream", auto_print=False)
+        perf_util.start()
+        parser = IncrementalJSONObjectParser()
+        incremental = True
+        chunks: List[str] = []
+        params: Dict[str, Any] = {}
+        stream = llm_client.generate_stream(
+            prompt,
+            model=model,
+            **supported_params(llm_client.generate_stream, cache_params),
+        )
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                if not incremental:
+                    continue
+                try:
+                    members = parser.feed(chunk)
+                except ValueError as e:
+                    self.logger.debug(f"Incremental parsing stopped: {e}")
+                    incremental = False
+                    continue
+                for param_name, value in members:
+                    params[param_name] = self._validate_param(param_name, value)
+                    if param_name in param_names:
+                        self._emit(param_name, params[param_name])
+                if all(name in params for name in param_names):
+                    if not parser.done:
+                        metrics["stream_aborted_early"] = True
+                    break
+        finally:
+            close = getattr(stream, "close", None)
+            if callable(close):
+                close()
+
+        metrics["stream_chunks"] = len(chunks)
+        metrics["duration"] = perf_util.stop()
+        if incremental and all(name in params for name in param_names):
+            return params
+        full = self._validate_params(validate_raw_content("".join(chunks), dict))
+        for param_name in param_names:
+            if param_name in full and param_name not in params:
+                self._emit(param_name, full[param_name])
+        return full
+
+    def _validate_param(self, param_name: str, value: Any) -> Any:
+        """Coerce a streamed parameter to its schema type, keeping it on failure."""
+        if param_name not in self.param_schema or value is None:
+            return value
+        try:
+            return compile_validator(self.param_schema[param_name])(value)
+        except (TypeValidationError, ValueError) as e:
+            self.logger.warning(f"Parameter validation failed for {param_name}: {e}")
+            return value
+
+    def _prompt_template(
+        self, param_names: Optional[List[str]] = None
+    ) -> PromptTemplate:
+        """Return the compiled extraction template, recompiling on changes.
+
+        Args:
+            param_names: Parameters to ask for (defaults to the whole schema)
+        """
+        names = tuple(param_names if param_names is not None else self.param_schema)
+        key = (self.name, self.description, tuple(self.param_schema.items()))
+        cached = self._templates.get(names)
+        if cached is None or cached[0] != key:
+            cached = (key, self._compile_template(names))
+            self._templates[names] = cached
+        return cached[1]
+
+    def _compile_template(self, param_names: Tuple[str, ...]) -> PromptTemplate:
+        """Compile the static instructions and parameter list into a template."""
         # Build parameter descriptions
         param_descriptions = []
-        for param_name, param_type in self.param_schema.items():
+        for param_name in param_names:
+            param_type = self.param_schema[param_name]
             if isinstance(param_type, str):
                 type_name = param_type
             elif hasattr(param_type, "__name__"):
@@ -172,16 +377,8 @@ class ExtractorNode(NodeProtocol):
 
         param_descriptions_text = "\n".join(param_descriptions)
 
-        # Build context info
-        context_info = ""
-        if ctx and hasattr(ctx, "snapshot"):
-            context_data = ctx.snapshot()
-            if context_data:
-                context_info = f"\nAvailable Context:\n{context_data}"
-
-        return f"""You are a parameter extraction specialist. Given a user input, extract the required parameters.
-
-User Input: {user_input}
+        return PromptTemplate(
+            prefix=f"""You are a parameter extraction specialist. Given a user input, extract the required parameters.
 
 Extraction Task: {self.name}
 Description: {self.description}
@@ -189,8 +386,6 @@ Description: {self.description}
 Required Parameters:
 {param_descriptions_text}
 
-{context_info}
-
 Instructions:
 - Extract the required parameters from the user input
 - Consider the available context information to help with extraction
@@ -202,8 +397,42 @@ Instructions:
   * For booleans: use false if not specified
 - Always return ALL required parameters, never omit them
 - Be specific and accurate in your extraction
+""",
+            body="""{context_info}
+
+User Input: {user_input}
+
+Return only the JSON object with the extracted parameters:""",
+        )
+
+    def _build_prompt(
+        self,
+        user_input: str,
+        ctx: Any,
+        metrics: Optional[Dict[str, Any]] = None,
+        param_names: Optional[List[str]] = None,
+    ) -> str:
+        """Build the parameter extraction prompt.
+
+        Only the context_read keys are rendered into the prompt; with
+        report_prompt_savings, the estimated tokens saved over the full context
+        snapshot are recorded in metrics.
+        When param_names is given, only those parameters are requested.
+        """
+        if self.custom_prompt:
+            return self.custom_prompt.format(user_input=user_input)
+
+        # Build context info
+        rendered = render_context(ctx, self.context_read, self.context_max_tokens)
+        if metrics is not None:
+            if self.report_prompt_savings:
+                metrics["prompt_tokens_saved"] = rendered.tokens_saved
+            if rendered.truncated:
+                metrics["context_truncated"] = True
 
-Return only the JSON object with the extracted parameters:"""
+        return self._prompt_template(param_names).render(
+            context_info=rendered.text, user_input=user_input
+        )
 
     def _parse_response(self, response: Any) -> Dict[str, Any]:
         """Parse the LLM response to extract parameters."""
@@ -230,30 +459,25 @@ Return only the JSON object with the extracted parameters:"""
             self.logger.warning(f"Unexpected response type: {type(response)}")
             return {}
 
+    def _validate_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Coerce every parsed parameter to its schema type.
+
+        The LLM answer goes through the same compiled validators whether it
+        was streamed or not; values that fail keep their parsed form, and keys
+        outside the schema are passed through.
+        """
+        return {
+            name: self._validate_param(name, value) for name, value in params.items()
+        }
+
     def _validate_and_cast_data(self, parsed_data: Any) -> Dict[str, Any]:
-        """Validate and cast the parsed data to the expected types."""
+        """Validate and cast the parsed data to the schema, None when missing."""
         if not isinstance(parsed_data, dict):
             raise TypeValidationError(
                 f"Expected dict, got {type(parsed_data)}", parsed_data, dict
             )
-
-        validated_data = {}
-        for param_name, param_type in self.param_schema.items():
-            if param_name in parsed_data:
-                try:
-                    resolved_type = resolve_type(param_type)
-                    validated_data[param_name] = validate_type(
-                        parsed_data[param_name], resolved_type
-                    )
-                except TypeValidationError as e:
-                    self.logger.warning(
-                        f"Parameter validation failed for {param_name}: {e}"
-                    )
-                    validated_data[param_name] = parsed_data[param_name]
-            else:
-                validated_data[param_name] = None
-
-        return validated_data
+        validated = self._validate_params(parsed_data)
+        return {name: validated.get(name) for name in self.param_schema}
 
     def _ensure_all_parameters_present(
         self, extracted_params: Dict[str, Any]
@@ -266,30 +490,7 @@ Return only the JSON object with the extracted parameters:"""
         # Ensure all required parameters are present, even if extracted_params was empty
         for param_name, param_type in self.param_schema.items():
             if param_name not in result_params:
-                # Provide sensible defaults based on parameter type
-                if isinstance(param_type, str):
-                    if param_type == "str":
-                        result_params[param_name] = ""
-                    elif param_type == "int":
-                        result_params[param_name] = 0
-                    elif param_type == "float":
-                        result_params[param_name] = 0.0
-                    elif param_type == "bool":
-                        result_params[param_name] = False
-                    else:
-                        result_params[param_name] = ""
-                else:
-                    # For complex types, try to provide a reasonable default
-                    if param_type is str:
-                        result_params[param_name] = ""
-                    elif param_type is int:
-                        result_params[param_name] = 0
-                    elif param_type is float:
-                        result_params[param_name] = 0.0
-                    elif param_type is bool:
-                        result_params[param_name] = False
-                    else:
-                        result_params[param_name] = ""
+                result_params[param_name] = default_param_value(param_type)
 
         return result_params
 
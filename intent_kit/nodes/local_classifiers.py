@@ -0,0 +1,337 @@
+"""LLM-free classifiers that ClassifierNode can try before calling an LLM."""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    Union,
+    runtime_checkable,
+)
+
+from intent_kit.utils.aho_corasick import AhoCorasick
+from intent_kit.utils.embeddings import (
+    Embedder,
+    HashedNgramEmbedder,
+    SparseVector,
+    centroid,
+    cosine_similarity,
+)
+
+# Backreferences and conditionals refer to groups by number or name, which
+# change once a pattern is wrapped in a larger alternation
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+_DEFAULT_FLAGS = re.compile("").flags
+
+
+def _needs_own_regex(pattern: str) -> bool:
+    """Whether a pattern would change meaning inside an alternation.
+
+    Group references would be renumbered, group names could collide, and
+    global inline flags such as ``(?i)`` are only valid at the very start of
+    an expression. Raises re.error for an invalid pattern.
+    """
+    compiled = re.compile(pattern)
+    return (
+        bool(compiled.groupindex)
+        or compiled.flags != _DEFAULT_FLAGS
+        or _GROUP_REFERENCE.search(pattern) is not None
+    )
+
+
+@dataclass
+class ClassificationScore:
+    """Label chosen by a local classifier with its confidence in [0, 1].
+
+    A label of None means the classifier abstains.
+    """
+
+    label: Optional[str]
+    confidence: float
+    scores: Dict[str, float] = field(default_factory=dict)
+
+
+@runtime_checkable
+class LocalClassifier(Protocol):
+    """Protocol for classifiers that run in process without an LLM."""
+
+    def classify(self, user_input: str) -> ClassificationScore:
+        """Classify a user input.
+
+        Args:
+            user_input: User input string
+
+        Returns:
+            ClassificationScore with the best label and its confidence
+        """
+        ...
+
+
+class CentroidClassifier:
+    """Nearest-centroid classifier over local text embeddings.
+
+    Exemplars for each label are embedded with a pluggable Embedder (a hashed
+    n-gram TF-IDF embedder by default). Inputs are scored by cosine similarity
+    against either each label's centroid or its closest exemplar, and the
+    similarity of the best label is reported as the confidence.
+    """
+
+    def __init__(
+        self,
+        examples: Mapping[str, Sequence[str]],
+        embedder: Optional[Embedder] = None,
+        strategy: Literal["centroid", "exemplar"] = "centroid",
+    ):
+        """Fit the classifier on labeled exemplars.
+
+        Args:
+            examples: Mapping of label to exemplar utterances
+            embedder: Embedder to use (defaults to HashedNgramEmbedder)
+            strategy: Score against label centroids or the nearest exemplar
+        """
+        if strategy not in ("centroid", "exemplar"):
+            raise ValueError(f"Unknown strategy: {strategy}")
+        examples = {label: list(texts) for label, texts in examples.items() if texts}
+        if not examples:
+            raise ValueError("CentroidClassifier requires at least one exemplar")
+
+        self.embedder: Embedder = embedder or HashedNgramEmbedder()
+        self.strategy = strategy
+        self.labels = list(examples)
+
+        self.embedder.fit([text for texts in examples.values() for text in texts])
+        self._exemplars: Dict[str, List[SparseVector]] = {
+            label: [self.embedder.embed(text) for text in texts]
+            for label, texts in examples.items()
+        }
+        self._centroids: Dict[str, SparseVector] = {
+            label: centroid(vectors) for label, vectors in self._exemplars.items()
+        }
+
+    @classmethod
+    def from_dataset(
+        cls,
+        dataset: Union[str, Path, Any],
+        embedder: Optional[Embedder] = None,
+        strategy: Literal["centroid", "exemplar"] = "centroid",
+    ) -> "CentroidClassifier":
+        """Build a classifier from an eval dataset's inputs and expected labels.
+
+        Args:
+            dataset: Path to an eval dataset YAML file or a loaded Dataset
+            embedder: Embedder to use (defaults to HashedNgramEmbedder)
+            strategy: Score against label centroids or the nearest exemplar
+
+        Returns:
+            Fitted CentroidClassifier
+        """
+        if isinstance(dataset, (str, Path)):
+            from intent_kit.evals import load_dataset
+
+            dataset = load_dataset(dataset)
+
+        examples: Dict[str, List[str]] = {}
+        for test_case in dataset.test_cases:
+            if isinstance(test_case.expected, str) and test_case.expected:
+                examples.setdefault(test_case.expected, []).append(test_case.input)
+        return cls(examples, embedder=embedder, strategy=strategy)
+
+    def classify(self, user_input: str) -> ClassificationScore:
+        """Score the input against every label and return the best match."""
+        vector = self.embedder.embed(user_input)
+        scores: Dict[str, float] = {}
+        for label in self.labels:
+            if self.strategy == "centroid":
+                score = cosine_similarity(vector, self._centroids[label])
+            else:
+                score = max(
+                    cosine_similarity(vector, exemplar)
+                    for exemplar in self._exemplars[label]
+                )
+            scores[label] = score
+
+        best_label = max(scores, key=lambda label: scores[label])
+        confidence = min(max(scores[best_label], 0.0), 1.0)
+        if confidence == 0.0:
+            return ClassificationScore(label=None, confidence=0.0, scores=scores)
+        return ClassificationScore(
+            label=best_label, confidence=confidence, scores=scores
+        )
+
+
+@dataclass
+class LabelRule:
+    """Keywords and regex patterns that select a label.
+
+    Higher priority rules win when several labels match.
+    """
+
+    label: str
+    keywords: List[str] = field(default_factory=list)
+    patterns: List[str] = field(default_factory=list)
+    priority: int = 0
+
+
+class RuleClassifier:
+    """Keyword/regex classifier compiled for few-pass matching.
+
+    All keywords of all labels are compiled into one Aho–Corasick automaton,
+    scanned once per input regardless of the number of labels. Each rule's
+    regex patterns are joined into one alternation, scanned once per rule, so
+    matches of different labels may overlap. Patterns with backreferences,
+    named groups or global inline flags such as ``(?i)`` are scanned on their
+    own, since an alternation would change their meaning.
+
+    When several labels match, the winner is chosen by highest priority, then
+    most hits, then earliest first match, then rule order. Confidence is 1.0
+    for an unambiguous match and the winner's share of hits otherwise. Inputs
+    that match nothing abstain so ClassifierNode can fall back to the LLM.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[LabelRule],
+        case_sensitive: bool = False,
+        whole_words: bool = True,
+    ):
+        """Compile the rules.
+
+        Args:
+            rules: Label rules in tie-break order
+            case_sensitive: Whether keywords and patterns are case sensitive
+            whole_words: Whether keywords must match on word boundaries
+        """
+        self.rules = list(rules)
+        self.case_sensitive = case_sensitive
+        self.whole_words = whole_words
+
+        keywords: List[str] = []
+        self._keyword_rules: List[int] = []
+        # (regex, rule index) pairs, each scanned once per input
+        self._patterns: List[Tuple["re.Pattern[str]", int]] = []
+        flags = 0 if case_sensitive else re.IGNORECASE
+        for rule_index, rule in enumerate(self.rules):
+            for keyword in rule.keywords:
+                keywords.append(self._fold(keyword))
+                self._keyword_rules.append(rule_index)
+            alternatives: List[str] = []
+            for pattern in rule.patterns:
+                # Validates each pattern on its own for a clear error message
+                if _needs_own_regex(pattern):
+                    self._patterns.append((re.compile(pattern, flags), rule_index))
+                else:
+                    alternatives.append(f"(?:{pattern})")
+            if alternatives:
+                self._patterns.append(
+                    (re.compile("|".join(alternatives), flags), rule_index)
+                )
+
+        self._automaton = AhoCorasick(keywords) if keywords else None
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Mapping[str, Any],
+        case_sensitive: bool = False,
+        whole_words: bool = True,
+    ) -> "RuleClassifier":
+        """Build a classifier from a JSON-friendly label mapping.
+
+        Each label maps either to a list of keywords or to a dict with
+        ``keywords``, ``patterns`` and ``priority``.
+
+        Args:
+            config: Mapping of label to rule specification
+            case_sensitive: Whether keywords and patterns are case sensitive
+            whole_words: Whether keywords must match on word boundaries
+
+        Returns:
+            Compiled RuleClassifier
+        """
+        rules = []
+        for label, spec in config.items():
+            if isinstance(spec, Mapping):
+                rules.append(
+                    LabelRule(
+                        label=label,
+                        keywords=list(spec.get("keywords", [])),
+                        patterns=list(spec.get("patterns", [])),
+                        priority=int(spec.get("priority", 0)),
+                    )
+                )
+            elif isinstance(spec, (list, tuple)):
+                rules.append(LabelRule(label=label, keywords=list(spec)))
+            else:
+                raise ValueError(f"Invalid rule for label '{label}': {spec!r}")
+        return cls(rules, case_sensitive=case_sensitive, whole_words=whole_words)
+
+    def _fold(self, text: str) -> str:
+        """Normalize case for keyword matching."""
+        return text if self.case_sensitive else text.lower()
+
+    def _on_word_boundary(self, text: str, start: int, end: int) -> bool:
+        """Check that a keyword match is not part of a larger word."""
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not (before.isalnum() or before == "_") and not (
+            after.isalnum() or after == "_"
+        )
+
+    def classify(self, user_input: str) -> ClassificationScore:
+        """Match the input against all rules and pick the winning label."""
+        hits: Dict[int, int] = {}
+        first_seen: Dict[int, int] = {}
+
+        def record(rule_index: int, position: int) -> None:
+            hits[rule_index] = hits.get(rule_index, 0) + 1
+            if position < first_seen.get(rule_index, len(user_input) + 1):
+                first_seen[rule_index] = position
+
+        if self._automaton is not None:
+            text = self._fold(user_input)
+            for start, end, keyword_index in self._automaton.iter_matches(text):
+                if self.whole_words and not self._on_word_boundary(text, start, end):
+                    continue
+                record(self._keyword_rules[keyword_index], start)
+
+        for pattern, rule_index in self._patterns:
+            for match in pattern.finditer(user_input):
+                record(rule_index, match.start())
+
+        if not hits:
+            return ClassificationScore(label=None, confidence=0.0)
+
+        winner = min(
+            hits,
+            key=lambda rule_index: (
+                -self.rules[rule_index].priority,
+                -hits[rule_index],
+                first_seen[rule_index],
+                rule_index,
+            ),
+        )
+        scores: Dict[str, float] = {}
+        for rule_index, count in hits.items():
+            label = self.rules[rule_index].label
+            scores[label] = scores.get(label, 0.0) + count
+        total = sum(scores.values())
+        scores = {label: count / total for label, count in scores.items()}
+
+        winning_label = self.rules[winner].label
+        outranked = all(
+            self.rules[rule_index].priority < self.rules[winner].priority
+            for rule_index in hits
+            if self.rules[rule_index].label != winning_label
+        )
+        confidence = 1.0 if outranked else scores[winning_label]
+        return ClassificationScore(
+            label=winning_label, confidence=confidence, scores=scores
+        )
@@ -0,0 +1,135 @@
+"""LLM-free parameter extractors that ExtractorNode can try before calling an LLM."""
+
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    Pattern,
+    Protocol,
+    Union,
+    runtime_checkable,
+)
+
+# Patterns for common structured values, usable as {"builtin": "<name>"}
+COMMON_PATTERNS: Dict[str, str] = {
+    "email": r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+    "integer": r"(?<![\w.])[-+]?\d+(?![\w.])",
+    "number": r"(?<![\w.])[-+]?(?:\d+\.\d*|\.\d+|\d+)(?![\w.])",
+    "iso_date": r"\b\d{4}-\d{2}-\d{2}\b",
+    "time": r"\b(?:[01]?\d|2[0-3]):[0-5]\d(?::[0-5]\d)?\b",
+    "uuid": (
+        r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+        r"[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
+    ),
+    "url": r"https?://[^\s<>\"']+",
+}
+
+
+@runtime_checkable
+class ParamExtractor(Protocol):
+    """Protocol for extractors that resolve one parameter without an LLM."""
+
+    def extract(self, user_input: str) -> Optional[Any]:
+        """Extract the parameter value from a user input.
+
+        Args:
+            user_input: User input string
+
+        Returns:
+            The extracted value, or None when the parameter was not found
+        """
+        ...
+
+
+class RegexExtractor:
+    """Extracts a parameter with a precompiled regular expression.
+
+    The value is the named group ``value`` if the pattern defines one, else
+    the first group, else the whole match.
+    """
+
+    def __init__(
+        self,
+        pattern: Union[str, Pattern[str]],
+        flags: int = 0,
+        convert: Optional[Callable[[str], Any]] = None,
+    ):
+        """Compile the pattern.
+
+        Args:
+            pattern: Regex string or compiled pattern
+            flags: Regex flags used when compiling a string pattern
+            convert: Optional function applied to the matched text
+        """
+        self.pattern = (
+            pattern if isinstance(pattern, re.Pattern) else re.compile(pattern, flags)
+        )
+        self.convert = convert
+        if "value" in self.pattern.groupindex:
+            self._group: Union[int, str] = "value"
+        else:
+            self._group = 1 if self.pattern.groups else 0
+
+    def extract(self, user_input: str) -> Optional[Any]:
+        """Return the first match in the input, or None."""
+        match = self.pattern.search(user_input)
+        if match is None:
+            return None
+        value = match.group(self._group)
+        if value is None:
+            return None
+        return self.convert(value) if self.convert else value
+
+
+class CallableExtractor:
+    """Adapts a plain function ``(user_input) -> value | None`` to an extractor."""
+
+    def __init__(self, func: Callable[[str], Optional[Any]]):
+        """Wrap the function.
+
+        Args:
+            func: Function returning the value or None when not found
+        """
+        self.func = func
+
+    def extract(self, user_input: str) -> Optional[Any]:
+        """Call the wrapped function."""
+        return self.func(user_input)
+
+
+def as_param_extractor(spec: Any) -> ParamExtractor:
+    """Build a ParamExtractor from a flexible specification.
+
+    Accepted specifications are an object with an ``extract`` method, a
+    compiled pattern or regex string, a callable, or a JSON-friendly dict with
+    ``pattern`` (plus optional ``ignore_case``) or ``builtin`` naming one of
+    COMMON_PATTERNS.
+
+    Args:
+        spec: Extractor specification
+
+    Returns:
+        The corresponding ParamExtractor
+    """
+    if isinstance(spec, ParamExtractor):
+        return spec
+    if isinstance(spec, (str, re.Pattern)):
+        return RegexExtractor(spec)
+    if isinstance(spec, Mapping):
+        flags = re.IGNORECASE if spec.get("ignore_case") else 0
+        if "builtin" in spec:
+            name = spec["builtin"]
+            if name not in COMMON_PATTERNS:
+                raise ValueError(
+                    f"Unknown builtin pattern '{name}'. "
+                    f"Available: {sorted(COMMON_PATTERNS)}"
+                )
+            return RegexExtractor(COMMON_PATTERNS[name], flags)
+        if "pattern" in spec:
+            return RegexExtractor(spec["pattern"], flags)
+    if callable(spec):
+        return CallableExtractor(spec)
+    raise ValueError(f"Invalid parameter extractor: {spec!r}")
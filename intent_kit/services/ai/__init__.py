@@ -11,6 +11,7 @@ from .google_client import GoogleClient
 from .openrouter_client import OpenRouterClient
 from .ollama_client import OllamaClient
 from .llm_factory import LLMFactory
+from .recording_client import RecordingLLMClient, CassetteWriter, iter_cassette
 from .pricing_service import PricingService
 from .llm_response import LLMResponse, RawLLMResponse, StructuredLLMResponse
 from .pricing import ModelPricing, PricingConfig, PricingService as BasePricingService
@@ -23,6 +24,9 @@ __all__ = [
     "OpenRouterClient",
     "OllamaClient",
     "LLMFactory",
+    "RecordingLLMClient",
+    "CassetteWriter",
+    "iter_cassette",
     "PricingService",
     "LLMResponse",
     "RawLLMResponse",
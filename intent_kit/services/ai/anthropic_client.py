@@ -3,9 +3,10 @@ Anthropic client wrapper for intent-kit
 """
 
 from dataclasses import dataclass
-from typing import Optional, List, TypeVar
+from typing import Any, Dict, Optional, List, TypeVar
 from intent_kit.services.ai.base_client import (
     BaseLLMClient,
+    usage_count,
     PricingConfiguration,
     ProviderPricing,
     ModelPricing,
@@ -134,11 +135,24 @@ class AnthropicClient(BaseLLMClient):
         return cleaned
 
     def generate(
-        self, prompt: str, model: str = "claude-3-5-sonnet-20241022"
+        self, prompt: str, model: str = "claude-3-5-sonnet-20241022", **params: Any
     ) -> RawLLMResponse:
-        """Generate text using Anthropic's Claude model."""
+        """Generate text using Anthropic's Claude model.
+
+        The Messages API has no enum constraint, so choices are not enforced
+        and whitespace-only stop sequences (which it rejects) are dropped. A
+        cache_prefix is sent as its own content block with ``cache_control``
+        so later prompts sharing that prefix are read from the prompt cache.
+        """
         self._ensure_imported()
         assert self._client is not None
+        self._check_generation_params(params)
+        request_params: Dict[str, Any] = {}
+        if params.get("temperature") is not None:
+            request_params["temperature"] = params["temperature"]
+        stop_sequences = [stop for stop in params.get("stop") or [] if stop.strip()]
+        if stop_sequences:
+            request_params["stop_sequences"] = stop_sequences
         model = model or "claude-3-5-sonnet-20241022"
         perf_util = PerfUtil("anthropic_generate")
         perf_util.start()
@@ -146,8 +160,11 @@ class AnthropicClient(BaseLLMClient):
         try:
             response = self._client.messages.create(
                 model=model,
-                max_tokens=1000,
-                messages=[{"role": "user", "content": prompt}],
+                max_tokens=params.get("max_tokens") or 1000,
+                messages=[
+                    {"role": "user", "content": self._message_content(prompt, params)}
+                ],
+                **request_params,
             )
 
             # Extract content from the response
@@ -195,12 +212,27 @@ class AnthropicClient(BaseLLMClient):
                 output_tokens=output_tokens,
                 cost=cost,
                 duration=duration,
+                cached_tokens=usage_count(response.usage, "cache_read_input_tokens"),
             )
 
         except Exception as e:
             self.logger.error(f"Error generating text with Anthropic: {e}")
             raise
 
+    def _message_content(self, prompt: str, params: Dict[str, Any]) -> Any:
+        """Build the user message content, marking a cacheable prefix if given."""
+        prefix_length = params.get("cache_prefix") or 0
+        if not 0 < prefix_length < len(prompt):
+            return prompt
+        return [
+            {
+                "type": "text",
+                "text": prompt[:prefix_length],
+                "cache_control": {"type": "ephemeral"},
+            },
+            {"type": "text", "text": prompt[prefix_length:]},
+        ]
+
     def calculate_cost(
         self,
         model: str,
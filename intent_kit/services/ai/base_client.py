@@ -6,7 +6,20 @@ This module provides a base class for all LLM client implementations.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional, Any, Dict, TypeVar
+from functools import lru_cache
+import inspect
+import json
+from typing import (
+    Optional,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    TypeVar,
+)
 from intent_kit.types import Cost, InputTokens, OutputTokens
 from intent_kit.services.ai.llm_response import RawLLMResponse
 from intent_kit.services.ai.pricing_service import PricingService
@@ -14,6 +27,207 @@ from intent_kit.utils.logger import Logger
 
 T = TypeVar("T")
 
+# Optional generation parameters understood by every client's generate().
+#   max_tokens:  Upper bound on generated tokens
+#   temperature: Sampling temperature
+#   stop:        List of stop sequences
+#   choices:     List of allowed outputs; clients whose supports_choices(model)
+#                is true constrain decoding so the content is exactly one choice,
+#                others ignore them
+#   cache_prefix: Length in characters of the prompt's static prefix, which
+#                clients with explicit prompt caching mark as cacheable
+GENERATION_PARAMS = ("max_tokens", "temperature", "stop", "choices", "cache_prefix")
+
+# Name of the single property used to wrap choices in a JSON-schema response
+CHOICE_FIELD = "choice"
+
+# Tokens spent on the JSON wrapper around a constrained choice
+_CHOICE_WRAPPER_TOKENS = 16
+
+# OpenAI model families with strict json_schema structured outputs, and the
+# earlier snapshots within them that reject it
+_JSON_SCHEMA_MODELS = ("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4")
+_NO_JSON_SCHEMA_MODELS = ("gpt-4o-2024-05-13", "o1-mini", "o1-preview")
+
+# OpenAI reasoning model families, which take max_completion_tokens (spent on
+# hidden reasoning as well as the answer) and reject temperature and stop
+_REASONING_MODELS = ("o1", "o3", "o4", "gpt-5")
+_NON_REASONING_MODELS = ("gpt-5-chat",)
+
+
+def supports_json_schema(model: str) -> bool:
+    """Whether an OpenAI model accepts a strict ``json_schema`` response format."""
+    name = model.lower()
+    if name.startswith(_NO_JSON_SCHEMA_MODELS):
+        return False
+    return name.startswith(_JSON_SCHEMA_MODELS)
+
+
+def is_reasoning_model(model: str) -> bool:
+    """Whether an OpenAI model (optionally ``openai/``-prefixed) reasons first."""
+    name = model.lower().rsplit("/", 1)[-1]
+    if name.startswith(_NON_REASONING_MODELS):
+        return False
+    return name.startswith(_REASONING_MODELS)
+
+
+def choice_json_schema(choices: List[str]) -> Dict[str, Any]:
+    """Build a strict JSON schema for an object holding one of the choices."""
+    return {
+        "type": "object",
+        "properties": {CHOICE_FIELD: {"type": "string", "enum": list(choices)}},
+        "required": [CHOICE_FIELD],
+        "additionalProperties": False,
+    }
+
+
+def unwrap_choice(content: str) -> str:
+    """Extract the chosen value from a JSON-encoded constrained response.
+
+    Accepts either a bare JSON string or an object with a ``choice`` property
+    and returns the content unchanged when it is neither.
+    """
+    try:
+        value = json.loads(content)
+    except (TypeError, ValueError):
+        return content
+    if isinstance(value, dict):
+        value = value.get(CHOICE_FIELD, content)
+    return value if isinstance(value, str) else content
+
+
+@lru_cache(maxsize=256)
+def _keyword_names(func: Callable[..., Any]) -> Optional[FrozenSet[str]]:
+    """Names `func` accepts as keywords, or None when it takes ``**kwargs``."""
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters):
+        return None
+    keyword_kinds = (
+        inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        inspect.Parameter.KEYWORD_ONLY,
+    )
+    return frozenset(p.name for p in parameters if p.kind in keyword_kinds)
+
+
+def supported_params(
+    method: Callable[..., Any], params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Keep the keyword parameters a method accepts.
+
+    Clients written against an older ``generate(prompt, model)`` signature
+    would raise TypeError on newer parameters such as ``cache_prefix``, and
+    nodes written as ``execute(user_input, ctx)`` on ``env``; they get only
+    the parameters they name. Methods taking ``**kwargs`` get all.
+
+    Args:
+        method: E.g. a client's generate or generate_stream, or a node's execute
+        params: Keyword parameters (see GENERATION_PARAMS for clients)
+
+    Returns:
+        The subset of params the method can be called with
+    """
+    func = getattr(method, "__func__", method)
+    try:
+        names = _keyword_names(func)
+    except TypeError:
+        # Unhashable callable; inspect it without caching
+        names = _keyword_names.__wrapped__(func)
+    if names is None:
+        return params
+    return {key: value for key, value in params.items() if key in names}
+
+
+def usage_count(usage: Any, *path: str) -> Optional[int]:
+    """Read a nested integer usage field, returning None when it is absent.
+
+    Args:
+        usage: Provider usage object (or None)
+        *path: Attribute names leading to the count
+
+    Returns:
+        The count, or None if any attribute is missing or not an integer
+    """
+    value = usage
+    for name in path:
+        value = getattr(value, name, None)
+        if value is None:
+            return None
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def chat_completion_kwargs(
+    params: Dict[str, Any], default_max_tokens: int = 1000, model: str = ""
+) -> Dict[str, Any]:
+    """Map generation parameters onto OpenAI-compatible chat completion kwargs.
+
+    Choices are enforced with a strict ``json_schema`` response format, which
+    wraps the answer in a small JSON object; callers unwrap it with
+    ``unwrap_choice``. Stop sequences are dropped in that case so they cannot
+    truncate the JSON, and the token budget is widened to cover the wrapper.
+
+    Reasoning models (see ``is_reasoning_model``) get ``max_completion_tokens``
+    instead, never below ``default_max_tokens`` because a label-sized budget
+    would be used up by reasoning before any answer; temperature and stop,
+    which they reject, are not sent.
+    """
+    if is_reasoning_model(model):
+        requested = params.get("max_tokens") or 0
+        if requested and params.get("choices"):
+            requested += _CHOICE_WRAPPER_TOKENS
+        kwargs: Dict[str, Any] = {
+            "max_completion_tokens": max(requested, default_max_tokens)
+        }
+        if params.get("choices"):
+            kwargs["response_format"] = _choice_response_format(params["choices"])
+        return kwargs
+
+    kwargs = {"max_tokens": params.get("max_tokens") or default_max_tokens}
+    if params.get("temperature") is not None:
+        kwargs["temperature"] = params["temperature"]
+    if params.get("choices"):
+        kwargs["response_format"] = _choice_response_format(params["choices"])
+        if params.get("max_tokens"):
+            kwargs["max_tokens"] = params["max_tokens"] + _CHOICE_WRAPPER_TOKENS
+    elif params.get("stop"):
+        kwargs["stop"] = list(params["stop"])
+    return kwargs
+
+
+def _choice_response_format(choices: List[str]) -> Dict[str, Any]:
+    """Build the strict ``json_schema`` response format enforcing choices."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": CHOICE_FIELD,
+            "strict": True,
+            "schema": choice_json_schema(choices),
+        },
+    }
+
+
+def iter_chat_completion_deltas(stream: Iterable[Any]) -> Iterator[str]:
+    """Yield the content deltas of an OpenAI-compatible streamed completion.
+
+    The stream is closed when the consumer stops early, which ends the request
+    so the provider stops generating (and billing) further tokens.
+    """
+    try:
+        for chunk in stream:
+            choices = getattr(chunk, "choices", None)
+            if not choices:
+                continue
+            delta = getattr(choices[0], "delta", None)
+            content = getattr(delta, "content", None)
+            if isinstance(content, str) and content:
+                yield content
+    finally:
+        close = getattr(stream, "close", None)
+        if callable(close):
+            close()
+
 
 @dataclass
 class ModelPricing:
@@ -80,19 +294,62 @@ class BaseLLMClient(ABC):
         pass
 
     @abstractmethod
-    def generate(self, prompt: str, model: str) -> RawLLMResponse:
+    def generate(self, prompt: str, model: str, **params: Any) -> RawLLMResponse:
         """
         Generate text using the LLM model.
 
         Args:
             prompt: The text prompt to send to the model
             model: The model name to use
+            **params: Optional generation parameters (see GENERATION_PARAMS);
+                providers ignore parameters they cannot honor
 
         Returns:
             RawLLMResponse containing the raw generated text and metadata
         """
         pass
 
+    def generate_stream(self, prompt: str, model: str, **params: Any) -> Iterator[str]:
+        """
+        Generate text as a stream of content chunks.
+
+        Clients without native streaming yield the full completion as a single
+        chunk. Closing the returned generator early stops generation on
+        clients that stream.
+
+        Args:
+            prompt: The text prompt to send to the model
+            model: The model name to use
+            **params: Optional generation parameters (see GENERATION_PARAMS)
+
+        Yields:
+            Pieces of the generated text, in order
+        """
+        yield self.generate(prompt, model, **params).content
+
+    def supports_choices(self, model: str) -> bool:
+        """Whether generate() can constrain `model`'s output to ``choices``.
+
+        Clients that cannot ignore the parameter; callers still get the
+        max_tokens and stop limits.
+        """
+        return False
+
+    def _honored_params(self, model: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop ``choices`` when `model` cannot enforce them."""
+        if params.get("choices") and not self.supports_choices(model):
+            return {key: value for key, value in params.items() if key != "choices"}
+        return params
+
+    def _check_generation_params(self, params: Dict[str, Any]) -> None:
+        """Reject generation parameters no client understands."""
+        unknown = sorted(set(params) - set(GENERATION_PARAMS))
+        if unknown:
+            raise ValueError(
+                "Unsupported generation parameters for "
+                f"{type(self).__name__}: {unknown}"
+            )
+
     def calculate_cost(
         self,
         model: str,
@@ -3,9 +3,10 @@ Google AI client wrapper for intent-kit
 """
 
 from dataclasses import dataclass
-from typing import Optional, TypeVar
+from typing import Any, Dict, Optional, TypeVar
 from intent_kit.services.ai.base_client import (
     BaseLLMClient,
+    usage_count,
     PricingConfiguration,
     ProviderPricing,
     ModelPricing,
@@ -126,12 +127,34 @@ class GoogleClient(BaseLLMClient):
 
         return cleaned
 
+    def supports_choices(self, model: str) -> bool:
+        """Gemini models constrain output with the ``text/x.enum`` type."""
+        return True
+
     def generate(
-        self, prompt: str, model: str = "gemini-2.0-flash-lite"
+        self, prompt: str, model: str = "gemini-2.0-flash-lite", **params: Any
     ) -> RawLLMResponse:
-        """Generate text using Google's Gemini model."""
+        """Generate text using Google's Gemini model.
+
+        Choices are enforced with the ``text/x.enum`` response type, which
+        returns the chosen value as plain text.
+        """
         self._ensure_imported()
         assert self._client is not None
+        self._check_generation_params(params)
+        config_params: Dict[str, Any] = {"response_mime_type": "text/plain"}
+        if params.get("max_tokens"):
+            config_params["max_output_tokens"] = params["max_tokens"]
+        if params.get("temperature") is not None:
+            config_params["temperature"] = params["temperature"]
+        if params.get("stop"):
+            config_params["stop_sequences"] = list(params["stop"])
+        if params.get("choices"):
+            config_params["response_mime_type"] = "text/x.enum"
+            config_params["response_schema"] = {
+                "type": "STRING",
+                "enum": list(params["choices"]),
+            }
         model = model or "gemini-2.0-flash-lite"
         perf_util = PerfUtil("google_generate")
         perf_util.start()
@@ -145,9 +168,7 @@ class GoogleClient(BaseLLMClient):
                     types.Part.from_text(text=prompt),
                 ],
             )
-            generate_content_config = types.GenerateContentConfig(
-                response_mime_type="text/plain",
-            )
+            generate_content_config = types.GenerateContentConfig(**config_params)
 
             response = self._client.models.generate_content(
                 model=model,
@@ -192,6 +213,10 @@ class GoogleClient(BaseLLMClient):
                 output_tokens=output_tokens,
                 cost=cost,
                 duration=duration,
+                # Served by Gemini's implicit context caching
+                cached_tokens=usage_count(
+                    response.usage_metadata, "cached_content_token_count"
+                ),
             )
 
         except Exception as e:
@@ -14,8 +14,9 @@ from typing import (
     Union,
     cast,
 )
+from intent_kit.utils.structured_text import locate_structured
 from intent_kit.utils.type_coercion import (
-    validate_type,
+    compile_validator,
     validate_raw_content,
     TypeValidationError,
 )
@@ -111,6 +112,8 @@ class RawLLMResponse:
     cost: Optional[float] = None
     duration: Optional[float] = None
     metadata: Optional[Dict[str, Any]] = None
+    # Input tokens served from the provider's prompt cache, when reported
+    cached_tokens: Optional[int] = None
 
     def __post_init__(self):
         """Initialize metadata if not provided."""
@@ -185,7 +188,7 @@ class StructuredLLMResponse(LLMResponse, Generic[T]):
                 converted_output = self._convert_to_expected_type(
                     parsed_output, expected_type
                 )
-                parsed_output = validate_type(converted_output, expected_type)
+                parsed_output = compile_validator(expected_type)(converted_output)
             except Exception as e:
                 # If validation fails, keep the original parsed output
                 # but store the error for debugging
@@ -240,47 +243,17 @@ class StructuredLLMResponse(LLMResponse, Generic[T]):
 
         # Otherwise, try to validate now
 
-        return validate_type(self.output, self._expected_type)  # type: ignore
+        return compile_validator(self._expected_type)(self.output)
 
     def _parse_string_to_structured(self, output_str: str) -> StructuredOutput:
         """Parse a string into structured data with better JSON/YAML detection."""
-        # Clean the string - remove common LLM artifacts
-        cleaned_str = output_str.strip()
-
-        # Remove markdown code blocks if present
-        import re
-
-        json_block_pattern = re.compile(r"```json\s*([\s\S]*?)\s*```", re.IGNORECASE)
-        yaml_block_pattern = re.compile(r"```yaml\s*([\s\S]*?)\s*```", re.IGNORECASE)
-        generic_block_pattern = re.compile(r"```\s*([\s\S]*?)\s*```")
-
-        # Try to extract from JSON code block first
-        match = json_block_pattern.search(cleaned_str)
-        if match:
-            cleaned_str = match.group(1).strip()
-        else:
-            # Try YAML code block
-            match = yaml_block_pattern.search(cleaned_str)
-            if match:
-                cleaned_str = match.group(1).strip()
-            else:
-                # Try generic code block
-                match = generic_block_pattern.search(cleaned_str)
-                if match:
-                    cleaned_str = match.group(1).strip()
-
-        # Try to parse as JSON first
-        try:
-            import json
-
-            result = json.loads(cleaned_str)
-            return result
-        except (json.JSONDecodeError, ValueError):
-            pass
+        payload = locate_structured(output_str)
+        if payload.is_json:
+            return payload.value
 
         if yaml is not None:
             # Try to parse as YAML (try both cleaned and original string)
-            for test_str in [cleaned_str, output_str]:
+            for test_str in [payload.source, output_str]:
                 try:
                     parsed = yaml.safe_load(test_str)
                     # Only return YAML result if it's a dict or list, otherwise wrap in dict
@@ -358,9 +331,7 @@ class StructuredLLMResponse(LLMResponse, Generic[T]):
                 return cast(T, 0.0)
 
         # For other types, try to use the type validator
-        from intent_kit.utils.type_coercion import validate_type
-
-        return cast(T, validate_type(data, expected_type))
+        return cast(T, compile_validator(expected_type)(data))
 
     @classmethod
     def from_llm_response(
@@ -61,19 +61,22 @@ class LLMService:
         """List all cached client keys."""
         return list(self._clients.keys())
 
-    def generate_raw(self, prompt: str, llm_config: Dict[str, Any]) -> RawLLMResponse:
+    def generate_raw(
+        self, prompt: str, llm_config: Dict[str, Any], **params: Any
+    ) -> RawLLMResponse:
         """Generate a raw response from the LLM.
 
         Args:
             prompt: The prompt to send to the LLM
             llm_config: LLM configuration dictionary
+            **params: Optional generation parameters passed to the client
 
         Returns:
             RawLLMResponse with the raw content and metadata
         """
         client = self.get_client(llm_config)
         model = llm_config.get("model", "default")
-        return client.generate(prompt, model)
+        return client.generate(prompt, model, **params)
 
     def generate_structured(
         self, prompt: str, llm_config: Dict[str, Any], expected_type: Type[T]
@@ -3,9 +3,10 @@ Ollama client wrapper for intent-kit
 """
 
 from dataclasses import dataclass
-from typing import Optional, TypeVar
+from typing import Any, Dict, Iterator, Optional, TypeVar
 from intent_kit.services.ai.base_client import (
     BaseLLMClient,
+    unwrap_choice,
     PricingConfiguration,
     ProviderPricing,
     ModelPricing,
@@ -130,10 +131,40 @@ class OllamaClient(BaseLLMClient):
 
         return cleaned
 
-    def generate(self, prompt: str, model: str = "llama2") -> RawLLMResponse:
-        """Generate text using Ollama's LLM model."""
+    def _request_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Map generation parameters onto Ollama ``options`` and ``format``."""
+        request_params: Dict[str, Any] = {}
+        options: Dict[str, Any] = {}
+        if params.get("max_tokens"):
+            options["num_predict"] = params["max_tokens"]
+        if params.get("temperature") is not None:
+            options["temperature"] = params["temperature"]
+        if params.get("stop"):
+            options["stop"] = list(params["stop"])
+        if options:
+            request_params["options"] = options
+        if params.get("choices"):
+            request_params["format"] = {
+                "type": "string",
+                "enum": list(params["choices"]),
+            }
+        return request_params
+
+    def supports_choices(self, model: str) -> bool:
+        """Ollama constrains any model's output with a JSON-schema ``format``."""
+        return True
+
+    def generate(
+        self, prompt: str, model: str = "llama2", **params: Any
+    ) -> RawLLMResponse:
+        """Generate text using Ollama's LLM model.
+
+        Choices are enforced with a JSON-schema ``format`` (a string enum).
+        """
         self._ensure_imported()
         assert self._client is not None
+        self._check_generation_params(params)
+        request_params = self._request_params(params)
         model = model or "llama2"
         perf_util = PerfUtil("ollama_generate")
         perf_util.start()
@@ -142,10 +173,13 @@ class OllamaClient(BaseLLMClient):
             response = self._client.generate(
                 model=model,
                 prompt=prompt,
+                **request_params,
             )
 
             # Extract response content
             output_text = response.get("response", "")
+            if params.get("choices") and output_text:
+                output_text = unwrap_choice(output_text)
 
             # Extract token information
             input_tokens = 0
@@ -183,16 +217,35 @@ class OllamaClient(BaseLLMClient):
             self.logger.error(f"Error generating text with Ollama: {e}")
             raise
 
-    def generate_stream(self, prompt: str, model: str = "llama2"):
-        """Generate text using Ollama model with streaming."""
+    def generate_stream(
+        self, prompt: str, model: str = "llama2", **params: Any
+    ) -> Iterator[str]:
+        """Generate text using Ollama model with streaming.
+
+        Closing the generator closes the response stream, which stops
+        generation.
+        """
         self._ensure_imported()
         assert self._client is not None  # Type assertion for linter
+        if params.get("choices"):
+            # Constrained answers are JSON-encoded; return them unwrapped and whole
+            yield from super().generate_stream(prompt, model, **params)
+            return
+        self._check_generation_params(params)
+        stream = None
         try:
-            for chunk in self._client.generate(model=model, prompt=prompt, stream=True):
+            stream = self._client.generate(
+                model=model, prompt=prompt, stream=True, **self._request_params(params)
+            )
+            for chunk in stream:
                 yield chunk["response"]
         except Exception as e:
             self.logger.error(f"Error streaming with Ollama: {e}")
             raise
+        finally:
+            close = getattr(stream, "close", None)
+            if callable(close):
+                close()
 
     def chat(self, messages: list, model: str = "llama2") -> str:
         """Chat with Ollama model using messages format."""
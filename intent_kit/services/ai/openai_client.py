@@ -3,9 +3,14 @@ OpenAI client wrapper for intent-kit
 """
 
 from dataclasses import dataclass
-from typing import Optional, List, TypeVar
+from typing import Any, Iterator, Optional, List, TypeVar
 from intent_kit.services.ai.base_client import (
     BaseLLMClient,
+    chat_completion_kwargs,
+    iter_chat_completion_deltas,
+    supports_json_schema,
+    unwrap_choice,
+    usage_count,
     PricingConfiguration,
     ProviderPricing,
     ModelPricing,
@@ -168,10 +173,18 @@ class OpenAIClient(BaseLLMClient):
 
         return cleaned
 
-    def generate(self, prompt: str, model: str = "gpt-4") -> RawLLMResponse:
-        """Generate text using OpenAI's GPT model."""
+    def generate(
+        self, prompt: str, model: str = "gpt-4", **params: Any
+    ) -> RawLLMResponse:
+        """Generate text using OpenAI's GPT model.
+
+        Choices are enforced with structured outputs (a strict JSON schema) on
+        models that support them and ignored on the rest.
+        """
         self._ensure_imported()
         assert self._client is not None
+        self._check_generation_params(params)
+        params = self._honored_params(model, params)
 
         perf_util = PerfUtil("openai_generate")
         perf_util.start()
@@ -181,7 +194,7 @@ class OpenAIClient(BaseLLMClient):
                 self._client.chat.completions.create(
                     model=model,
                     messages=[{"role": "user", "content": prompt}],
-                    max_tokens=1000,
+                    **chat_completion_kwargs(params, model=model),
                 )
             )
 
@@ -198,6 +211,8 @@ class OpenAIClient(BaseLLMClient):
 
             # Extract content from the first choice
             content = openai_response.choices[0].message.content
+            if params.get("choices") and content:
+                content = unwrap_choice(content)
 
             # Extract token information
             if openai_response.usage:
@@ -244,12 +259,44 @@ class OpenAIClient(BaseLLMClient):
                 output_tokens=output_tokens,
                 cost=cost,
                 duration=duration,
+                # Served by OpenAI's automatic prefix caching
+                cached_tokens=usage_count(
+                    openai_response.usage, "prompt_tokens_details", "cached_tokens"
+                ),
             )
 
         except Exception as e:
             self.logger.error(f"Error generating text with OpenAI: {e}")
             raise
 
+    def supports_choices(self, model: str) -> bool:
+        """Structured outputs exist from gpt-4o-2024-08-06 on, not on gpt-4."""
+        return supports_json_schema(model)
+
+    def generate_stream(
+        self, prompt: str, model: str = "gpt-4", **params: Any
+    ) -> Iterator[str]:
+        """Stream text from OpenAI's GPT model as content deltas.
+
+        Closing the generator closes the HTTP stream, which stops generation.
+        Constrained choices are returned whole, since the wrapped JSON answer
+        is only unwrapped once complete.
+        """
+        params = self._honored_params(model, params)
+        if params.get("choices"):
+            yield from super().generate_stream(prompt, model, **params)
+            return
+        self._ensure_imported()
+        assert self._client is not None
+        self._check_generation_params(params)
+        stream = self._client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            **chat_completion_kwargs(params, model=model),
+        )
+        yield from iter_chat_completion_deltas(stream)
+
     def calculate_cost(
         self,
         model: str,
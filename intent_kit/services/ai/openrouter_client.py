@@ -9,15 +9,21 @@ from intent_kit.types import InputTokens, OutputTokens, Cost
 from .llm_response import RawLLMResponse
 from intent_kit.services.ai.base_client import (
     BaseLLMClient,
+    chat_completion_kwargs,
+    iter_chat_completion_deltas,
+    supports_json_schema,
+    unwrap_choice,
+    usage_count,
     PricingConfiguration,
     ProviderPricing,
     ModelPricing,
 )
 from intent_kit.services.ai.pricing_service import PricingService
 from dataclasses import dataclass
-from typing import Optional, Any, List, Union, Dict, TypeVar
+from typing import Optional, Any, Iterator, List, Union, Dict, TypeVar
 import json
 import re
+from intent_kit.utils import json_backend
 from intent_kit.utils.logger import get_logger
 
 T = TypeVar("T")
@@ -86,7 +92,7 @@ class OpenRouterChatCompletionMessage:
 
         # Try JSON first
         try:
-            return json.loads(cleaned_content)
+            return json_backend.loads(cleaned_content)
         except (json.JSONDecodeError, ValueError) as e:
             self.logger.error(f"Error parsing content as JSON: {e}")
 
@@ -322,11 +328,17 @@ class OpenRouterClient(BaseLLMClient):
         return cleaned
 
     def generate(
-        self, prompt: str, model: str = "mistralai/mistral-7b-instruct"
+        self, prompt: str, model: str = "mistralai/mistral-7b-instruct", **params: Any
     ) -> RawLLMResponse:
-        """Generate text using OpenRouter's LLM model."""
+        """Generate text using OpenRouter's LLM model.
+
+        Choices are enforced with structured outputs on models that support
+        them and ignored on the rest.
+        """
         self._ensure_imported()
         assert self._client is not None
+        self._check_generation_params(params)
+        params = self._honored_params(model, params)
 
         perf_util = PerfUtil("openrouter_generate")
         perf_util.start()
@@ -334,7 +346,7 @@ class OpenRouterClient(BaseLLMClient):
         response: OpenRouterChatCompletion = self._client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=1000,
+            **chat_completion_kwargs(params, model=model),
         )
 
         if not response.choices:
@@ -355,6 +367,8 @@ class OpenRouterClient(BaseLLMClient):
         # Extract content from the first choice
         first_choice = OpenRouterChoice.from_raw(response.choices[0])
         content = first_choice.message.content or ""
+        if params.get("choices") and content:
+            content = unwrap_choice(content)
 
         # Extract usage information
         input_tokens = response.usage.prompt_tokens if response.usage else 0
@@ -380,7 +394,39 @@ class OpenRouterClient(BaseLLMClient):
             output_tokens=output_tokens,
             cost=cost,
             duration=duration,
+            cached_tokens=usage_count(
+                response.usage, "prompt_tokens_details", "cached_tokens"
+            ),
+        )
+
+    def supports_choices(self, model: str) -> bool:
+        """Only OpenAI models are known to honor a strict JSON schema here."""
+        vendor, _, name = model.partition("/")
+        return vendor == "openai" and supports_json_schema(name)
+
+    def generate_stream(
+        self, prompt: str, model: str = "mistralai/mistral-7b-instruct", **params: Any
+    ) -> Iterator[str]:
+        """Stream text from OpenRouter's LLM model as content deltas.
+
+        Closing the generator closes the HTTP stream, which stops generation.
+        Constrained choices are returned whole, since the wrapped JSON answer
+        is only unwrapped once complete.
+        """
+        params = self._honored_params(model, params)
+        if params.get("choices"):
+            yield from super().generate_stream(prompt, model, **params)
+            return
+        self._ensure_imported()
+        assert self._client is not None
+        self._check_generation_params(params)
+        stream = self._client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            **chat_completion_kwargs(params, model=model),
         )
+        yield from iter_chat_completion_deltas(stream)
 
     def calculate_cost(
         self,
@@ -0,0 +1,272 @@
+"""
+Recording LLM client for intent-kit
+
+This module provides a wrapper around any BaseLLMClient that records every
+request/response pair into an append-only, gzip-compressed JSONL cassette.
+Cassettes can later be read back with ``iter_cassette`` to replay captured
+traffic offline.
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from intent_kit.services.ai.base_client import BaseLLMClient
+from intent_kit.services.ai.llm_response import RawLLMResponse
+from intent_kit.utils import json_backend
+from intent_kit.utils.perf_util import PerfUtil
+
+CASSETTE_FORMAT_VERSION = 1
+
+
+def cassette_key(
+    prompt: str, model: str, params: Optional[Dict[str, Any]] = None
+) -> str:
+    """Build the stable lookup key used to match a request against a cassette.
+
+    Args:
+        prompt: The prompt sent to the model
+        model: The model name
+        params: Optional generation parameters
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = json_backend.canonical_dumps(
+        {"prompt": prompt, "model": model, "params": params or {}}, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CassetteWriter:
+    """Append-only writer for gzip-compressed JSONL cassettes.
+
+    Records are serialized and written immediately, so memory use is bounded
+    by the compressor window regardless of how much traffic is captured.
+    The compressed stream is flushed every ``flush_every`` records; each
+    writer session appends a new gzip member, which readers handle
+    transparently. A member is only finished on ``close()``; if the process
+    dies first, ``iter_cassette`` still returns every flushed record.
+    """
+
+    def __init__(self, path: Union[str, Path], flush_every: int = 100):
+        """Open the cassette for appending.
+
+        Args:
+            path: Cassette file path (conventionally ``*.jsonl.gz``)
+            flush_every: Number of records between compressed stream flushes
+        """
+        if flush_every < 1:
+            raise ValueError("flush_every must be at least 1")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.records_written = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._file: Optional[gzip.GzipFile] = gzip.open(self.path, "ab")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append a single record to the cassette."""
+        line = json_backend.dumps(record, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                raise ValueError(f"Cassette {self.path} is closed")
+            self._file.write(line.encode("utf-8"))
+            self.records_written += 1
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._file.flush()
+                self._pending = 0
+
+    def flush(self) -> None:
+        """Flush buffered records to disk."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._pending = 0
+
+    def close(self) -> None:
+        """Flush and close the cassette. Safe to call more than once."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @property
+    def closed(self) -> bool:
+        """Whether the writer has been closed."""
+        return self._file is None
+
+    def __enter__(self) -> "CassetteWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def iter_cassette(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Stream records from a cassette without loading it into memory.
+
+    A cassette whose writer was never closed ends in a gzip member without
+    a trailer, possibly cut mid-record. Reading stops cleanly there: every
+    complete record before the cut is yielded and the partial one dropped.
+
+    Args:
+        path: Cassette file path
+
+    Yields:
+        One record dictionary per captured request
+    """
+    with gzip.open(Path(path), "rb") as f:
+        try:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Partial final record of a truncated cassette
+                    return
+                line = line.strip()
+                if line:
+                    yield json_backend.loads(line.decode("utf-8"))
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            # Truncated final member: the records before it were yielded
+            return
+
+
+class RecordingLLMClient(BaseLLMClient):
+    """Wrap a BaseLLMClient and record its traffic into a cassette.
+
+    The wrapped client is called unchanged; its response is returned as-is
+    after the prompt, model, params, content, tokens, cost and latency have
+    been appended to the cassette. Streams are forwarded chunk by chunk and
+    recorded with their assembled content once they end. Failed calls are
+    recorded with their error message and the exception is re-raised.
+    """
+
+    def __init__(
+        self,
+        client: BaseLLMClient,
+        cassette: Union[str, Path, CassetteWriter],
+        flush_every: int = 100,
+    ):
+        """Initialize the recording client.
+
+        Args:
+            client: The client whose traffic should be recorded
+            cassette: Cassette path or an already open CassetteWriter
+            flush_every: Records between flushes when opening a path
+        """
+        self.wrapped = client
+        if isinstance(cassette, CassetteWriter):
+            self.writer = cassette
+        else:
+            self.writer = CassetteWriter(cassette, flush_every=flush_every)
+        super().__init__(
+            name="recording_service", pricing_service=client.pricing_service
+        )
+
+    def _initialize_client(self, **kwargs) -> None:
+        """Use the wrapped client as the underlying client."""
+        self._client = self.wrapped
+
+    def get_client(self) -> BaseLLMClient:
+        """Get the wrapped client."""
+        return self.wrapped
+
+    def _ensure_imported(self) -> None:
+        """Delegate import checks to the wrapped client."""
+        self.wrapped._ensure_imported()
+
+    def supports_choices(self, model: str) -> bool:
+        """Whether the wrapped client enforces choices for the model."""
+        return self.wrapped.supports_choices(model)
+
+    def _request_record(
+        self, prompt: str, model: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Start a cassette record for a request."""
+        return {
+            "version": CASSETTE_FORMAT_VERSION,
+            "key": cassette_key(prompt, model, params),
+            "timestamp": time.time(),
+            "client": type(self.wrapped).__name__,
+            "model": model,
+            "prompt": prompt,
+            "params": params,
+        }
+
+    def generate(self, prompt: str, model: str, **params: Any) -> RawLLMResponse:
+        """Generate with the wrapped client and record the exchange."""
+        perf_util = PerfUtil("recording_generate", auto_print=False)
+        perf_util.start()
+        record = self._request_record(prompt, model, params)
+
+        try:
+            response = self.wrapped.generate(prompt, model, **params)
+        except Exception as e:
+            record["latency"] = perf_util.stop()
+            record["error"] = str(e)
+            self.writer.write(record)
+            raise
+
+        record["latency"] = perf_util.stop()
+        record.update(
+            {
+                "provider": response.provider,
+                "response_model": response.model,
+                "content": response.content,
+                "input_tokens": response.input_tokens,
+                "output_tokens": response.output_tokens,
+                "cached_tokens": response.cached_tokens,
+                "cost": response.cost,
+                "duration": response.duration,
+                "metadata": response.metadata or {},
+            }
+        )
+        self.writer.write(record)
+        return response
+
+    def generate_stream(self, prompt: str, model: str, **params: Any) -> Iterator[str]:
+        """Stream from the wrapped client and record the assembled response.
+
+        The record is written when the stream ends, fails or is closed early;
+        closing this generator closes the wrapped stream too, so generation
+        still stops. Streams report no token counts or cost, and a stream
+        closed before its end is recorded with ``"closed_early": True``.
+        """
+        perf_util = PerfUtil("recording_generate_stream", auto_print=False)
+        perf_util.start()
+        record = self._request_record(prompt, model, params)
+        record["stream"] = True
+        chunks: List[str] = []
+        stream = self.wrapped.generate_stream(prompt, model, **params)
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        except GeneratorExit:
+            record["closed_early"] = True
+            raise
+        except Exception as e:
+            record["error"] = str(e)
+            raise
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            record["latency"] = perf_util.stop()
+            record["content"] = "".join(chunks)
+            self.writer.write(record)
+
+    def close(self) -> None:
+        """Close the underlying cassette writer."""
+        self.writer.close()
+
+    def __enter__(self) -> "RecordingLLMClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -26,6 +26,7 @@ from .report_utils import (
     format_execution_results,
 )
 from .type_coercion import (
+    compile_validator,
     validate_type,
     validate_dict,
     TypeValidationError,
@@ -38,6 +39,7 @@ from .type_coercion import (
     TYPE_MAP,
 )
 from .typed_output import TypedOutputData
+from .embeddings import Embedder, HashedNgramEmbedder, cosine_similarity
 
 __all__ = [
     "Logger",
@@ -65,6 +67,7 @@ __all__ = [
     "generate_detailed_view",
     "format_execution_results",
     # Type validation utilities
+    "compile_validator",
     "validate_type",
     "validate_dict",
     "TypeValidationError",
@@ -77,4 +80,8 @@ __all__ = [
     "TYPE_MAP",
     # Typed output utilities
     "TypedOutputData",
+    # Embedding utilities
+    "Embedder",
+    "HashedNgramEmbedder",
+    "cosine_similarity",
 ]
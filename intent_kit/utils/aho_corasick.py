@@ -0,0 +1,83 @@
+"""
+Aho–Corasick multi-pattern string matching.
+
+Finds every occurrence of a fixed set of literal keywords in a single pass
+over the input, independent of how many keywords there are.
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+
+class AhoCorasick:
+    """Compiled automaton over a list of literal keywords.
+
+    Matches are reported as ``(start, end, keyword_index)`` where
+    ``keyword_index`` is the position of the keyword in the list the
+    automaton was built from.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        """Build the automaton.
+
+        Args:
+            keywords: Literal keywords to match (empty strings are ignored)
+        """
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, keyword in enumerate(self.keywords):
+            if keyword:
+                self._insert(keyword, index)
+        self._build_failure_links()
+
+    def _insert(self, keyword: str, index: int) -> None:
+        """Add a keyword to the trie."""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(index)
+
+    def _build_failure_links(self) -> None:
+        """Compute failure links breadth-first and merge inherited outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield every (possibly overlapping) keyword occurrence in text.
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            (start, end, keyword_index) tuples in order of end position
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                end = position + 1
+                yield end - len(self.keywords[index]), end, index
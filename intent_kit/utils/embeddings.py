@@ -0,0 +1,129 @@
+"""
+Local text embedding utilities for intent-kit.
+
+This module provides small, dependency-free embedders that run entirely in
+process, so inputs can be compared without a network round trip. Vectors are
+sparse ``Dict[int, float]`` mappings from feature index to weight and are
+L2-normalized, which makes ``cosine_similarity`` a plain dot product.
+"""
+
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Protocol, Sequence, runtime_checkable
+
+SparseVector = Dict[int, float]
+
+# Unicode word characters, so non-Latin scripts are embedded too
+_WORD_PATTERN = re.compile(r"[\w']+")
+
+
+@runtime_checkable
+class Embedder(Protocol):
+    """Protocol for pluggable text embedders."""
+
+    def fit(self, texts: Sequence[str]) -> None:
+        """Learn corpus statistics (no-op for stateless embedders)."""
+        ...
+
+    def embed(self, text: str) -> SparseVector:
+        """Embed a single text into an L2-normalized sparse vector."""
+        ...
+
+
+class HashedNgramEmbedder:
+    """TF-IDF over hashed word unigrams and character n-grams.
+
+    Features are hashed into ``n_features`` buckets with CRC32, so the
+    vocabulary never has to be stored and results are stable across
+    processes. Character n-grams are taken inside word boundaries, which
+    keeps the embedder tolerant to typos and inflections.
+    """
+
+    def __init__(
+        self,
+        n_features: int = 2**18,
+        char_ngram_range: tuple[int, int] = (3, 5),
+        use_words: bool = True,
+    ):
+        """Initialize the embedder.
+
+        Args:
+            n_features: Number of hash buckets
+            char_ngram_range: Inclusive (min, max) character n-gram lengths
+            use_words: Whether to include whole-word features
+        """
+        if n_features < 1:
+            raise ValueError("n_features must be at least 1")
+        low, high = char_ngram_range
+        if low < 1 or high < low:
+            raise ValueError(f"Invalid char_ngram_range: {char_ngram_range}")
+        self.n_features = n_features
+        self.char_ngram_range = char_ngram_range
+        self.use_words = use_words
+        self._idf: Dict[int, float] = {}
+        self._default_idf = 1.0
+
+    def _features(self, text: str) -> Iterable[str]:
+        """Yield the raw string features of a text."""
+        low, high = self.char_ngram_range
+        for word in _WORD_PATTERN.findall(text.lower()):
+            if self.use_words:
+                yield f"w:{word}"
+            padded = f" {word} "
+            for n in range(low, high + 1):
+                for start in range(len(padded) - n + 1):
+                    yield f"c:{padded[start : start + n]}"
+
+    def _counts(self, text: str) -> Counter:
+        """Count hashed features of a text."""
+        return Counter(
+            zlib.crc32(feature.encode("utf-8")) % self.n_features
+            for feature in self._features(text)
+        )
+
+    def fit(self, texts: Sequence[str]) -> None:
+        """Compute smoothed inverse document frequencies from a corpus."""
+        document_frequency: Counter = Counter()
+        for text in texts:
+            document_frequency.update(self._counts(text).keys())
+        n_docs = len(texts)
+        self._idf = {
+            index: math.log((1 + n_docs) / (1 + df)) + 1.0
+            for index, df in document_frequency.items()
+        }
+        # Unseen features get the weight of a feature that appears nowhere
+        self._default_idf = math.log(1 + n_docs) + 1.0
+
+    def embed(self, text: str) -> SparseVector:
+        """Embed a text as an L2-normalized sublinear TF-IDF vector."""
+        vector = {
+            index: (1.0 + math.log(count)) * self._idf.get(index, self._default_idf)
+            for index, count in self._counts(text).items()
+        }
+        return normalize(vector)
+
+
+def normalize(vector: SparseVector) -> SparseVector:
+    """Return an L2-normalized copy of a sparse vector."""
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    if norm == 0.0:
+        return {}
+    return {index: value / norm for index, value in vector.items()}
+
+
+def cosine_similarity(a: SparseVector, b: SparseVector) -> float:
+    """Cosine similarity of two L2-normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(index, 0.0) for index, value in a.items())
+
+
+def centroid(vectors: List[SparseVector]) -> SparseVector:
+    """Return the normalized mean of a list of sparse vectors."""
+    total: SparseVector = {}
+    for vector in vectors:
+        for index, value in vector.items():
+            total[index] = total.get(index, 0.0) + value
+    return normalize(total)
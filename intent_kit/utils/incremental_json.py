@@ -0,0 +1,143 @@
+"""
+Incremental parsing of a streamed JSON object.
+
+LLM extractors answer with a single JSON object. When the answer is streamed,
+each top-level member can be decoded as soon as its value is closed, long
+before the whole completion has arrived, so callers can validate parameters
+on the fly and stop generation once every field they need is present.
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+# Parser states while inside the top-level object
+_EXPECT_KEY = "key"
+_EXPECT_COLON = "colon"
+_EXPECT_VALUE = "value"
+_IN_VALUE = "in_value"
+_EXPECT_SEPARATOR = "separator"
+
+
+class IncrementalJSONObjectParser:
+    """Streaming parser that yields top-level members of a JSON object.
+
+    Text before the opening brace (such as a code fence or preamble) is
+    skipped. Feed chunks as they arrive; ``feed`` returns the ``(key, value)``
+    pairs completed by that chunk. String, object and array values complete
+    at their closing character; numbers and literals complete at the
+    following comma or closing brace.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._started = False
+        self._state = _EXPECT_KEY
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._token_start = 0
+        self._key: Optional[str] = None
+        self.done = False
+        self.members: dict = {}
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk of streamed text.
+
+        Args:
+            chunk: Next piece of the model output
+
+        Returns:
+            Members completed by this chunk, in order
+
+        Raises:
+            ValueError: If a completed member is not valid JSON
+        """
+        self._text += chunk
+        completed: List[Tuple[str, Any]] = []
+        text = self._text
+        while self._pos < len(text) and not self.done:
+            char = text[self._pos]
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._on_string_closed(completed)
+                self._pos += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._state in (_EXPECT_KEY, _EXPECT_VALUE):
+                    self._token_start = self._pos
+                    if self._state == _EXPECT_VALUE:
+                        self._state = _IN_VALUE
+            elif self._state == _EXPECT_COLON:
+                if char == ":":
+                    self._state = _EXPECT_VALUE
+            elif self._state == _EXPECT_VALUE:
+                if not char.isspace():
+                    self._token_start = self._pos
+                    self._state = _IN_VALUE
+                    if char in "{[":
+                        self._depth += 1
+            elif self._state == _IN_VALUE:
+                if char in "{[":
+                    self._depth += 1
+                elif char in "}]":
+                    if self._depth == 1:
+                        # Closing brace of the top-level object ends a scalar
+                        self._complete(self._pos, completed)
+                        self.done = True
+                    else:
+                        self._depth -= 1
+                        if self._depth == 1:
+                            self._complete(self._pos + 1, completed)
+                elif char == "," and self._depth == 1:
+                    self._complete(self._pos, completed)
+                    self._state = _EXPECT_KEY
+            elif self._state == _EXPECT_SEPARATOR:
+                if char == ",":
+                    self._state = _EXPECT_KEY
+                elif char == "}":
+                    self.done = True
+            elif self._state == _EXPECT_KEY and char == "}":
+                self.done = True
+            self._pos += 1
+        return completed
+
+    def _on_string_closed(self, completed: List[Tuple[str, Any]]) -> None:
+        """Handle the end of a string token at the current position."""
+        if self._state == _EXPECT_KEY and self._depth == 1:
+            self._key = json.loads(self._text[self._token_start : self._pos + 1])
+            self._state = _EXPECT_COLON
+        elif self._state == _IN_VALUE and self._depth == 1:
+            self._complete(self._pos + 1, completed)
+
+    def _complete(self, end: int, completed: List[Tuple[str, Any]]) -> None:
+        """Decode the current value ending at ``end`` and record the member."""
+        raw = self._text[self._token_start : end].strip()
+        value = json.loads(raw)
+        if self._key is None:
+            raise json.JSONDecodeError(
+                "Expecting property name before value", self._text, self._token_start
+            )
+        self.members[self._key] = value
+        completed.append((self._key, value))
+        self._key = None
+        self._state = _EXPECT_SEPARATOR
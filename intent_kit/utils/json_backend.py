@@ -0,0 +1,173 @@
+"""
+JSON encoding and decoding with an optional fast backend.
+
+orjson or msgspec is used when installed (checked in that order) and the
+standard library ``json`` module otherwise. Set ``INTENT_KIT_JSON_BACKEND`` to
+``orjson``, ``msgspec`` or ``json`` to force a backend.
+
+The fast backends are drop-in: any input they reject (NaN literals, integers
+beyond 64 bits, unsupported objects) is retried with the standard library, so
+decoded values and raised exceptions match ``json`` exactly. Encoded text can
+differ from ``json``: non-ASCII characters are not escaped, some floats are
+spelled differently and NaN or infinities encode as null. Encoded output is
+therefore only comparable between processes using the same backend.
+canonical_dumps, which fingerprints are built from, always uses the standard
+library so fingerprints match across installs.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+try:
+    import msgspec  # type: ignore[import-not-found]
+except ImportError:
+    msgspec = None  # type: ignore
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+Default = Optional[Callable[[Any], Any]]
+
+
+def _std_dumps(
+    obj: Any, indent: bool = False, sort_keys: bool = False, default: Default = None
+) -> str:
+    """Encode with the standard library, compact unless indented."""
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys, default=default)
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, default=default)
+
+
+def _orjson_loads(data: Any) -> Any:
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
+def _orjson_dumps(
+    obj: Any, indent: bool = False, sort_keys: bool = False, default: Default = None
+) -> str:
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    try:
+        return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+    except TypeError:  # orjson.JSONEncodeError
+        return _std_dumps(obj, indent, sort_keys, default)
+
+
+def _msgspec_loads(data: Any) -> Any:
+    try:
+        return msgspec.json.decode(data)
+    except msgspec.DecodeError:
+        return json.loads(data)
+
+
+def _msgspec_dumps(
+    obj: Any, indent: bool = False, sort_keys: bool = False, default: Default = None
+) -> str:
+    try:
+        encoder = msgspec.json.Encoder(
+            enc_hook=default, order="sorted" if sort_keys else None
+        )
+        encoded = encoder.encode(obj)
+        if indent:
+            encoded = msgspec.json.format(encoded, indent=2)
+        return encoded.decode("utf-8")
+    except (TypeError, ValueError, msgspec.EncodeError):
+        return _std_dumps(obj, indent, sort_keys, default)
+
+
+_LOADERS: Dict[str, Callable[..., Any]] = {
+    "orjson": _orjson_loads,
+    "msgspec": _msgspec_loads,
+    "json": json.loads,
+}
+_DUMPERS: Dict[str, Callable[..., str]] = {
+    "orjson": _orjson_dumps,
+    "msgspec": _msgspec_dumps,
+    "json": _std_dumps,
+}
+
+
+def available_backends() -> list[str]:
+    """Return the backends that can be used in this environment."""
+    installed = {"orjson": orjson, "msgspec": msgspec, "json": json}
+    return [name for name in BACKENDS if installed[name] is not None]
+
+
+def use_backend(name: Optional[str] = None) -> str:
+    """Select the JSON backend.
+
+    Args:
+        name: Backend name, or None for the fastest installed backend
+
+    Returns:
+        The name of the selected backend
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    global backend_name, _loads, _dumps
+    available = available_backends()
+    if name is None:
+        name = available[0]
+    if name not in available:
+        raise ValueError(
+            f"JSON backend '{name}' is not available. Available: {available}"
+        )
+    backend_name = name
+    _loads = _LOADERS[name]
+    _dumps = _DUMPERS[name]
+    return name
+
+
+def loads(data: Any) -> Any:
+    """Decode a JSON document from str or bytes.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    return _loads(data)
+
+
+def dumps(
+    obj: Any, indent: bool = False, sort_keys: bool = False, default: Default = None
+) -> str:
+    """Encode an object as JSON text.
+
+    Args:
+        obj: Object to encode
+        indent: Pretty-print with two-space indentation instead of compact output
+        sort_keys: Sort object keys
+        default: Function returning a serializable version of unsupported objects
+
+    Returns:
+        The JSON text
+    """
+    return _dumps(obj, indent, sort_keys, default)
+
+
+def canonical_dumps(obj: Any, default: Default = None) -> str:
+    """
+    Encode an object as compact JSON with sorted keys, for fingerprints.
+
+    Always uses the standard library, whatever backend is selected, so the
+    output (and every fingerprint built from it) is the same on every install.
+    ``default`` is called for objects JSON cannot encode, as in ``json.dumps``.
+    """
+    return _std_dumps(obj, False, True, default)
+
+
+backend_name = ""
+_loads: Callable[..., Any] = json.loads
+_dumps: Callable[..., str] = _std_dumps
+use_backend(os.environ.get("INTENT_KIT_JSON_BACKEND") or None)
@@ -0,0 +1,131 @@
+"""
+Context rendering for LLM prompts.
+
+Nodes declare the context keys they read. Only those keys are rendered into
+prompts, one compact JSON line per key, under a token budget, so prompt size
+stays flat as the context accumulates services, metadata and history.
+"""
+
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+# Rough characters-per-token ratio used for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+
+CONTEXT_HEADER = "\nAvailable Context:\n"
+_ELLIPSIS = "..."
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def estimate_snapshot_tokens(ctx: Any) -> int:
+    """Estimate the tokens of a prompt section embedding the whole context.
+
+    Sums the length ``str(ctx.snapshot())`` would have, key by key, without
+    copying the context or building the string.
+    """
+    if ctx is None or not hasattr(ctx, "keys") or not hasattr(ctx, "get"):
+        return 0
+    chars = 0
+    count = 0
+    for key in ctx.keys():
+        # "'key': value" plus the ", " separating it from the next entry
+        chars += len(repr(key)) + len(repr(ctx.get(key))) + 4
+        count += 1
+    if not count:
+        return 0
+    # The braces take the place of the last separator
+    return math.ceil((len(CONTEXT_HEADER) + chars) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class RenderedContext:
+    """Context section of a prompt and what it saved over the full snapshot.
+
+    The snapshot estimate walks the whole context, so it is only computed when
+    ``snapshot_tokens`` or ``tokens_saved`` is first read.
+    """
+
+    text: str
+    tokens: int
+    truncated: bool = False
+    ctx: Any = field(default=None, repr=False, compare=False)
+    _snapshot_tokens: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def snapshot_tokens(self) -> int:
+        """Estimated tokens of embedding the whole context snapshot."""
+        if self._snapshot_tokens is None:
+            self._snapshot_tokens = estimate_snapshot_tokens(self.ctx)
+        return self._snapshot_tokens
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated prompt tokens saved compared with embedding the snapshot."""
+        return max(self.snapshot_tokens - self.tokens, 0)
+
+
+def _render_value(value: Any) -> str:
+    """Render a context value as compact, deterministic JSON."""
+    try:
+        return json.dumps(
+            value,
+            separators=(",", ":"),
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+    except (TypeError, ValueError):
+        return json.dumps(str(value), ensure_ascii=False)
+
+
+def render_context(
+    ctx: Any, keys: Sequence[str], max_tokens: Optional[int] = None
+) -> RenderedContext:
+    """Render the given context keys as a prompt section.
+
+    Keys are rendered in declaration order and missing keys are skipped. When
+    the budget runs out, the line that overflows is cut short with an ellipsis
+    and the remaining keys are dropped, so the same context always renders to
+    the same text.
+
+    Args:
+        ctx: Context to read from (anything with ``get``)
+        keys: Context keys to include, in order
+        max_tokens: Token budget for the section (None for unlimited)
+
+    Returns:
+        RenderedContext with the section text ("" when nothing is rendered)
+    """
+    lines = []
+    truncated = False
+    budget = None if max_tokens is None else max_tokens * CHARS_PER_TOKEN
+    if ctx is not None and hasattr(ctx, "get"):
+        used = len(CONTEXT_HEADER)
+        for key in keys:
+            value = ctx.get(key)
+            if value is None:
+                continue
+            line = f"- {key}: {_render_value(value)}"
+            if budget is not None and used + len(line) + 1 > budget:
+                remaining = budget - used - 1 - len(_ELLIPSIS)
+                if remaining > 0:
+                    lines.append(line[:remaining] + _ELLIPSIS)
+                truncated = True
+                break
+            lines.append(line)
+            used += len(line) + 1
+
+    if not lines:
+        return RenderedContext(text="", tokens=0, truncated=truncated, ctx=ctx)
+    text = CONTEXT_HEADER + "\n".join(lines)
+    return RenderedContext(
+        text=text, tokens=estimate_tokens(text), truncated=truncated, ctx=ctx
+    )
@@ -0,0 +1,60 @@
+"""
+Precompiled prompt templates with a static, cacheable prefix.
+
+A template is split into a prefix that never changes for a given node
+(instructions, labels, parameter schema) and a body holding the per-call
+values. Keeping the static text first lets provider-side prompt caching reuse
+the prefix across calls, and parsing the body once up front turns rendering
+into a plain concatenation.
+"""
+
+from string import Formatter
+from typing import Any, List, Optional, Tuple
+
+
+class PromptTemplate:
+    """Prompt compiled into a static prefix and a pre-parsed variable body.
+
+    The body uses ``str.format`` field syntax (``{user_input}``); literal
+    braces are written as ``{{`` and ``}}``. Fields are substituted with
+    ``str()`` and format specs or conversions are not supported.
+    """
+
+    def __init__(self, prefix: str, body: str):
+        """Compile the template.
+
+        Args:
+            prefix: Static text shared by every rendering
+            body: Variable part with ``{field}`` placeholders
+        """
+        self.prefix = prefix
+        self.body = body
+        self._segments: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in Formatter().parse(body):
+            if field is not None and (not field or spec or conversion):
+                raise ValueError(f"Unsupported template field in: {body!r}")
+            self._segments.append((literal, field))
+        self.fields = [field for _, field in self._segments if field is not None]
+
+    @property
+    def prefix_length(self) -> int:
+        """Number of leading characters that are identical across renderings."""
+        return len(self.prefix)
+
+    def render(self, **values: Any) -> str:
+        """Render the template with the given field values.
+
+        Args:
+            **values: Value for every field in the body
+
+        Returns:
+            The full prompt, starting with the static prefix
+        """
+        parts = [self.prefix]
+        for literal, field in self._segments:
+            parts.append(literal)
+            if field is not None:
+                if field not in values:
+                    raise KeyError(f"Missing template field: {field}")
+                parts.append(str(values[field]))
+        return "".join(parts)
@@ -0,0 +1,280 @@
+"""
+Single-pass scanning of LLM output for structured data.
+
+LLM answers wrap JSON in markdown fences, surround it with prose or nest it
+arbitrarily deep. ``scan_structured`` walks the text once, left to right,
+recording fenced blocks and every top-level JSON object or array it can decode.
+Values are decoded with ``json.JSONDecoder.raw_decode`` and skipped over rather
+than rescanned; a failed decode resumes where decoding failed, so unbalanced
+or malformed brackets cannot make the scan quadratic. The text utilities,
+``validate_raw_content`` and ``StructuredLLMResponse`` all pick their payload
+from the same scan, in the same priority order.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple, Type, Union
+
+from intent_kit.utils import json_backend
+
+_DECODER = json.JSONDecoder()
+
+# Fence markers and JSON container openers, the only positions the scan stops at
+_TOKEN = re.compile(r"```|[\[{]")
+_OPENER = re.compile(r"[\[{]")
+# Values are decoded from a window of the text, grown while a failure may be
+# caused by its edge: JSONDecodeError counts lines from the start of the
+# document, so decoding in place would make each failure O(position).
+_WINDOW = 256
+# Furthest the decoder looks past the character it reports (e.g. "Infinity")
+_LOOKAHEAD = 8
+# Optional language tag right after an opening fence
+_FENCE_INFO = re.compile(r"[ \t]*([A-Za-z][\w.+-]*)?[ \t]*\r?\n?")
+
+Kinds = Union[Type[Any], Tuple[Type[Any], ...]]
+
+
+@dataclass
+class FencedBlock:
+    """A markdown code block."""
+
+    lang: str  # Lowercased language tag, "" for untagged fences
+    content: str  # Stripped block content
+    value: Any = None  # Decoded content when the whole block is JSON
+    is_json: bool = False
+
+
+@dataclass
+class JSONCandidate:
+    """A JSON object or array decoded from the text."""
+
+    value: Any
+    start: int  # Offset of the value in the scanned text
+    fence: Optional[str] = None  # Language of the enclosing fence, if any
+    end: int = 0  # Offset just past the value
+
+
+@dataclass
+class StructuredScan:
+    """Fenced blocks and JSON values found in a text, in document order."""
+
+    text: str
+    blocks: List[FencedBlock] = field(default_factory=list)
+    values: List[JSONCandidate] = field(default_factory=list)
+
+    def block(self, *langs: str) -> Optional[FencedBlock]:
+        """Return the first fenced block tagged with one of the languages."""
+        for block in self.blocks:
+            if block.lang in langs:
+                return block
+        return None
+
+    def first_value(self, kinds: Kinds = (dict, list)) -> Optional[Any]:
+        """Return the preferred JSON value of the given kinds.
+
+        Values in ``json`` fences win, then values in untagged fences, then
+        the first matching value anywhere in the text.
+        """
+        candidate = self.first_candidate(kinds)
+        return candidate.value if candidate is not None else None
+
+    def first_candidate(self, kinds: Kinds = (dict, list)) -> Optional[JSONCandidate]:
+        """Return the preferred JSON candidate of the given kinds (see first_value)."""
+        for fence in ("json", ""):
+            for candidate in self.values:
+                if candidate.fence == fence and isinstance(candidate.value, kinds):
+                    return candidate
+        for candidate in self.values:
+            if isinstance(candidate.value, kinds):
+                return candidate
+        return None
+
+
+def _decode_at(text: str, start: int) -> Tuple[Any, int, bool]:
+    """Decode the JSON value at `start`, in time linear in what it reads.
+
+    Returns:
+        (value, end, ok); on failure, `end` is where scanning resumes: past
+        the text the failed attempt read (the failure position, the end of
+        the text for an unterminated string, or the whole window when nesting
+        is too deep to decode)
+    """
+    remaining = len(text) - start
+    window = _WINDOW
+    while True:
+        whole = window >= remaining
+        chunk = text[start:] if whole else text[start : start + window]
+        try:
+            value, end = _DECODER.raw_decode(chunk)
+        except json.JSONDecodeError as e:
+            unterminated = e.msg.startswith("Unterminated string")
+            if whole:
+                return None, len(text) if unterminated else start + max(e.pos, 1), False
+            if not unterminated and e.pos < window - _LOOKAHEAD:
+                return None, start + max(e.pos, 1), False
+            window *= 4
+            continue
+        except RecursionError:
+            return None, start + len(chunk), False
+        return value, start + end, True
+
+
+def _scan_block_values(
+    scan: StructuredScan, content: str, fence: str, offset: int, pos: int
+) -> None:
+    """Record the JSON objects and arrays in a fenced block's content from `pos`.
+
+    `offset` is the position of the content in the scanned text.
+    """
+    while True:
+        opener = _OPENER.search(content, pos)
+        if opener is None:
+            return
+        start = opener.start()
+        value, pos, ok = _decode_at(content, start)
+        if ok:
+            scan.values.append(
+                JSONCandidate(value, offset + start, fence, offset + pos)
+            )
+
+
+def scan_structured(text: str) -> StructuredScan:
+    """Scan a text once for fenced blocks and top-level JSON objects and arrays.
+
+    An unterminated fence extends to the end of the text, so truncated
+    answers still yield their block. A block whose content is a single JSON
+    value (scalars included) is decoded once and keeps that value.
+
+    Args:
+        text: Text to scan
+
+    Returns:
+        StructuredScan with blocks and JSON values in document order
+    """
+    scan = StructuredScan(text=text)
+    pos = 0
+    length = len(text)
+    while True:
+        match = _TOKEN.search(text, pos)
+        if match is None:
+            break
+        start = match.start()
+        if match.group() != "```":
+            value, pos, ok = _decode_at(text, start)
+            if ok:
+                scan.values.append(JSONCandidate(value, start, None, pos))
+            continue
+
+        info = _FENCE_INFO.match(text, match.end())
+        assert info is not None  # The pattern can match the empty string
+        lang = (info.group(1) or "").lower()
+        close = text.find("```", info.end())
+        end = length if close == -1 else close
+        pos = length if close == -1 else close + 3
+
+        # Decode the block on its own, so values cannot run past the fence.
+        # Its leading value is decoded once: it is the whole block, or the
+        # rest of the block is scanned from where it ended.
+        raw = text[info.end() : end]
+        content = raw.strip()
+        block = FencedBlock(lang, content)
+        scan.blocks.append(block)
+        if not content:
+            continue
+        offset = info.end() + len(raw) - len(raw.lstrip())
+        value, value_end, ok = _decode_at(content, 0)
+        if ok:
+            if isinstance(value, (dict, list)):
+                scan.values.append(
+                    JSONCandidate(value, offset, lang, offset + value_end)
+                )
+            if value_end == len(content):
+                block.value, block.is_json = value, True
+                continue
+        _scan_block_values(scan, content, lang, offset, value_end)
+    return scan
+
+
+@dataclass
+class StructuredPayload:
+    """The structured payload chosen from a text."""
+
+    source: str  # Chosen fence content, or the stripped text, for YAML parsing
+    value: Any = None  # Decoded JSON value when is_json is True
+    is_json: bool = False
+
+
+def _follows_mapping_key(text: str, start: int) -> bool:
+    """Tell whether a value sits after a ``key:`` or ``-`` marker on its line.
+
+    Such values are part of a YAML document (``items: [1, 2]``) rather than a
+    JSON answer embedded in prose.
+    """
+    line_start = text.rfind("\n", 0, start) + 1
+    prefix = text[line_start:start].strip()
+    return prefix.endswith(":") or prefix == "-"
+
+
+def _whole_text_value(
+    scan: StructuredScan, text: str, source: str
+) -> Optional[StructuredPayload]:
+    """Return the payload when the stripped text is a single JSON value.
+
+    Objects and arrays were already decoded by the scan; only scalars are
+    decoded here.
+    """
+    if not source:
+        return None
+    if source[0] in "[{":
+        start = len(text) - len(text.lstrip())
+        for candidate in scan.values:
+            if candidate.start == start:
+                if candidate.end == start + len(source):
+                    return StructuredPayload(source, candidate.value, True)
+                break
+        return None
+    try:
+        return StructuredPayload(source, json_backend.loads(source), True)
+    except ValueError:
+        return None
+
+
+def locate_structured(text: str) -> StructuredPayload:
+    """Choose the structured payload of an LLM answer.
+
+    The source is the first ``json`` fence, else the first ``yaml`` fence,
+    else the first fence of any kind, else the whole text. A source that is
+    entirely JSON (including scalars) is decoded as such. Otherwise the
+    preferred embedded JSON object or array is used, unless the source is a
+    YAML fence or the value is a YAML mapping or list item; those are left
+    for the caller's YAML fallback.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        StructuredPayload with the decoded value, or the source to parse as YAML
+    """
+    scan = scan_structured(text)
+    block = (
+        scan.block("json")
+        or scan.block("yaml", "yml")
+        or (scan.blocks[0] if scan.blocks else None)
+    )
+    if block is not None:
+        source = block.content
+        if block.is_json:
+            return StructuredPayload(source, block.value, True)
+    else:
+        source = text.strip()
+        whole = _whole_text_value(scan, text, source)
+        if whole is not None:
+            return whole
+
+    if block is not None and block.lang in ("yaml", "yml"):
+        return StructuredPayload(source)
+    candidate = scan.first_candidate()
+    if candidate is not None and not _follows_mapping_key(text, candidate.start):
+        return StructuredPayload(source, candidate.value, True)
+    return StructuredPayload(source)
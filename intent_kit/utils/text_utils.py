@@ -9,6 +9,7 @@ import json
 import re
 from typing import Any, Dict, List, Optional, Tuple
 from intent_kit.utils.logger import Logger
+from intent_kit.utils.structured_text import scan_structured
 
 # Create a module-level logger
 _logger = Logger(__name__)
@@ -18,6 +19,9 @@ def _extract_json_only(text: str) -> Optional[Dict[str, Any]]:
     """
     Extract JSON from text without manual extraction fallback.
 
+    Objects in ```json blocks are preferred, then objects in untagged blocks,
+    then the first object anywhere in the text, at any nesting depth.
+
     Args:
         text: Text that may contain JSON
 
@@ -27,78 +31,18 @@ def _extract_json_only(text: str) -> Optional[Dict[str, Any]]:
     if not text or not isinstance(text, str):
         return None
 
-    # Try to find JSON in ```json blocks first
-    json_block_pattern = r"```json\s*\n(.*?)\n```"
-    json_blocks = re.findall(json_block_pattern, text, re.DOTALL)
-
-    for block in json_blocks:
-        try:
-            parsed = json.loads(block.strip())
-            if isinstance(parsed, dict):
-                return parsed
-        except json.JSONDecodeError as e:
-            _logger.debug_structured(
-                {
-                    "error_type": "JSONDecodeError",
-                    "error_message": str(e),
-                    "block_content": (
-                        block[:100] + "..." if len(block) > 100 else block
-                    ),
-                    "source": "json_block",
-                },
-                "JSON Block Parse Failed",
-            )
-
-    # Try to find JSON in ``` blocks (without json specifier)
-    code_block_pattern = r"```\s*\n(.*?)\n```"
-    code_blocks = re.findall(code_block_pattern, text, re.DOTALL)
-
-    for block in code_blocks:
-        try:
-            parsed = json.loads(block.strip())
-            if isinstance(parsed, dict):
-                return parsed
-        except json.JSONDecodeError as e:
-            _logger.debug_structured(
-                {
-                    "error_type": "JSONDecodeError",
-                    "error_message": str(e),
-                    "block_content": (
-                        block[:100] + "..." if len(block) > 100 else block
-                    ),
-                    "source": "code_block",
-                },
-                "Code Block Parse Failed",
-            )
-
-    # Try to find JSON object pattern in the entire text
-    json_match = re.search(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", text, re.DOTALL)
-    if json_match:
-        json_str = json_match.group(0)
-        try:
-            parsed = json.loads(json_str)
-            if isinstance(parsed, dict):
-                return parsed
-        except json.JSONDecodeError as e:
-            _logger.debug_structured(
-                {
-                    "error_type": "JSONDecodeError",
-                    "error_message": str(e),
-                    "json_str": (
-                        json_str[:100] + "..." if len(json_str) > 100 else json_str
-                    ),
-                    "source": "regex_match",
-                },
-                "Regex JSON Parse Failed",
-            )
-
-    return None
+    result = scan_structured(text).first_value(dict)
+    if result is None:
+        _logger.debug(f"No JSON object found in text of length {len(text)}")
+    return result
 
 
 def _extract_json_array_only(text: str) -> Optional[List[Any]]:
     """
     Extract JSON array from text without manual extraction fallback.
 
+    Arrays are looked up in the same order as objects in _extract_json_only.
+
     Args:
         text: Text that may contain JSON array
 
@@ -108,74 +52,10 @@ def _extract_json_array_only(text: str) -> Optional[List[Any]]:
     if not text or not isinstance(text, str):
         return None
 
-    # Try to find JSON array in ```json blocks first
-    json_block_pattern = r"```json\s*\n(.*?)\n```"
-    json_blocks = re.findall(json_block_pattern, text, re.DOTALL)
-
-    for block in json_blocks:
-        try:
-            parsed = json.loads(block.strip())
-            if isinstance(parsed, list):
-                return parsed
-        except json.JSONDecodeError as e:
-            _logger.debug_structured(
-                {
-                    "error_type": "JSONDecodeError",
-                    "error_message": str(e),
-                    "block_content": (
-                        block[:100] + "..." if len(block) > 100 else block
-                    ),
-                    "source": "json_block",
-                },
-                "JSON Block Parse Failed",
-            )
-
-    # Try to find JSON array in ``` blocks (without json specifier)
-    code_block_pattern = r"```\s*\n(.*?)\n```"
-    code_blocks = re.findall(code_block_pattern, text, re.DOTALL)
-
-    for block in code_blocks:
-        try:
-            parsed = json.loads(block.strip())
-            if isinstance(parsed, list):
-                return parsed
-        except json.JSONDecodeError as e:
-            _logger.debug_structured(
-                {
-                    "error_type": "JSONDecodeError",
-                    "error_message": str(e),
-                    "block_content": (
-                        block[:100] + "..." if len(block) > 100 else block
-                    ),
-                    "source": "code_block",
-                },
-                "Code Block Parse Failed",
-            )
-
-    # Try to find JSON array pattern in the entire text
-    json_array_match = re.search(
-        r"\[[^\[\]]*(?:\{[^{}]*\}[^\[\]]*)*\]", text, re.DOTALL
-    )
-    if json_array_match:
-        json_str = json_array_match.group(0)
-        try:
-            parsed = json.loads(json_str)
-            if isinstance(parsed, list):
-                return parsed
-        except json.JSONDecodeError as e:
-            _logger.debug_structured(
-                {
-                    "error_type": "JSONDecodeError",
-                    "error_message": str(e),
-                    "json_str": (
-                        json_str[:100] + "..." if len(json_str) > 100 else json_str
-                    ),
-                    "source": "regex_match",
-                },
-                "Regex JSON Array Parse Failed",
-            )
-
-    return None
+    result = scan_structured(text).first_value(list)
+    if result is None:
+        _logger.debug(f"No JSON array found in text of length {len(text)}")
+    return result
 
 
 def extract_json_from_text(text: Optional[str]) -> Optional[Dict[str, Any]]:
@@ -400,7 +280,7 @@ def extract_structured_data(
 
 def _manual_json_extraction(text: str) -> Optional[Dict[str, Any]]:
     """
-    Manually extract JSON object from text using regex patterns.
+    Manually extract a loosely formatted object from text using regex patterns.
 
     Args:
         text: Text to extract from
@@ -408,16 +288,8 @@ def _manual_json_extraction(text: str) -> Optional[Dict[str, Any]]:
     Returns:
         Extracted JSON object or None
     """
-    # Look for object patterns
-    object_pattern = r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}"
-    match = re.search(object_pattern, text, re.DOTALL)
-    if match:
-        try:
-            return json.loads(match.group(0))
-        except json.JSONDecodeError:
-            pass
-
-    # Try to extract from common patterns first
+    # Valid JSON objects are found by _extract_json_only; this handles
+    # loosely formatted ones. Try to extract from common patterns first
     # Pattern: { key: value, key2: value2 }
     brace_pattern = re.search(r"\{([^}]+)\}", text)
     if brace_pattern:
@@ -436,7 +308,7 @@ def _manual_json_extraction(text: str) -> Optional[Dict[str, Any]]:
 
 def _manual_array_extraction(text: str) -> Optional[List[Any]]:
     """
-    Manually extract JSON array from text using regex patterns.
+    Manually extract a loosely formatted array from text using regex patterns.
 
     Args:
         text: Text to extract from
@@ -444,16 +316,8 @@ def _manual_array_extraction(text: str) -> Optional[List[Any]]:
     Returns:
         Extracted JSON array or None
     """
-    # Look for array patterns
-    array_pattern = r"\[[^\[\]]*(?:\{[^{}]*\}[^\[\]]*)*\]"
-    match = re.search(array_pattern, text, re.DOTALL)
-    if match:
-        try:
-            return json.loads(match.group(0))
-        except json.JSONDecodeError:
-            pass
-
-    # Extract quoted strings
+    # Valid JSON arrays are found by _extract_json_array_only; this handles
+    # loosely formatted lists. Extract quoted strings
     quoted_strings = re.findall(r'"([^"]*)"', text)
     if quoted_strings:
         return [s.strip() for s in quoted_strings if s.strip()]
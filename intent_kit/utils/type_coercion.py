@@ -76,12 +76,14 @@ from __future__ import annotations
 
 import inspect
 import enum
-import re
-import json
+import threading
+from contextlib import contextmanager
 from dataclasses import is_dataclass, fields, MISSING
 from collections.abc import Mapping as ABCMapping
 from typing import (
     Any,
+    Callable,
+    Iterator,
     Type,
     TypeVar,
     Union,
@@ -91,6 +93,8 @@ from typing import (
     Literal,
 )
 
+from intent_kit.utils.structured_text import locate_structured
+
 # Try to import yaml at module load time
 try:
     import yaml
@@ -102,6 +106,16 @@ except ImportError:
 
 T = TypeVar("T")
 
+Coercer = Callable[[Any], Any]
+
+# Compiled coercers and public validators, keyed by _cache_key(type specification).
+# Both caches and _IN_PROGRESS are only written while holding _COMPILE_LOCK.
+_COERCERS: dict[Any, Coercer] = {}
+_VALIDATORS: dict[Any, Coercer] = {}
+_COMPILE_LOCK = threading.RLock()
+# Forwarding coercers for classes being compiled
+_IN_PROGRESS: dict[Any, Coercer] = {}
+
 # Type mapping for string type names to actual types
 TYPE_MAP = {
     "str": str,
@@ -197,40 +211,14 @@ def _parse_string_to_structured(content_str: str) -> Union[dict, list, Any]:
     Returns:
         Structured data (dict, list, or wrapped in dict if parsing fails)
     """
-    # Clean the string - remove common LLM artifacts
-    cleaned_str = content_str.strip()
-
-    # Remove markdown code blocks if present
-    json_block_pattern = re.compile(r"```json\s*([\s\S]*?)\s*```", re.IGNORECASE)
-    yaml_block_pattern = re.compile(r"```yaml\s*([\s\S]*?)\s*```", re.IGNORECASE)
-    generic_block_pattern = re.compile(r"```\s*([\s\S]*?)\s*```")
-
-    # Try to extract from JSON code block first
-    match = json_block_pattern.search(cleaned_str)
-    if match:
-        cleaned_str = match.group(1).strip()
-    else:
-        # Try YAML code block
-        match = yaml_block_pattern.search(cleaned_str)
-        if match:
-            cleaned_str = match.group(1).strip()
-        else:
-            # Try generic code block
-            match = generic_block_pattern.search(cleaned_str)
-            if match:
-                cleaned_str = match.group(1).strip()
-
-    # Try to parse as JSON first
-    try:
-        result = json.loads(cleaned_str)
-        return result
-    except (json.JSONDecodeError, ValueError):
-        pass
+    payload = locate_structured(content_str)
+    if payload.is_json:
+        return payload.value
 
     # Try to parse as YAML
     if YAML_AVAILABLE and yaml is not None:
         try:
-            parsed = yaml.safe_load(cleaned_str)
+            parsed = yaml.safe_load(payload.source)
             # Only return YAML result if it's a dict or list, otherwise wrap in dict
             if isinstance(parsed, (dict, list)):
                 return parsed
@@ -257,135 +245,338 @@ def validate_type(data: Any, expected_type: Any) -> Any:
     Raises:
         TypeValidationError: If data cannot be coerced into the expected type
     """
-    try:
-        return _coerce_value(data, expected_type)
-    except TypeValidationError:
-        raise
-    except Exception as e:
-        raise TypeValidationError(
-            f"Unexpected error during type validation: {e}", data, expected_type
-        ) from e
+    return _validator_for(expected_type)(data)
 
 
 def _coerce_value(val: Any, tp: Any) -> Any:
-    """Internal function to coerce a value into a specific type."""
+    """Internal function to coerce a value into a specific type.
+
+    Uses the compiled coercer for the type, so there is one coercion engine;
+    unlike the public validator, unexpected exceptions are not wrapped.
+    """
+    return _coercer_for(tp)(val)
+
+
+def compile_validator(type_spec: Union[Type[Any], str, Any]) -> Coercer:
+    """
+    Build a validator function specialized for a type specification.
+
+    The type is introspected once (typing origins and arguments, enum and
+    dataclass fields, constructor signatures) and turned into a closure that
+    only does the per-value work. Validators are cached, so compiling the
+    same type again returns the same function. The validator behaves exactly
+    like ``validate_type(value, type_spec)``.
+
+    Args:
+        type_spec: A Python type, typing construct (``List[int]``,
+            ``Optional[str]``, ``Literal[...]``, ...) or string type name
+
+    Returns:
+        Function that validates and coerces a value into the type
+
+    Raises:
+        ValueError: If a string type name is unknown
+    """
+    if isinstance(type_spec, str):
+        type_spec = resolve_type(type_spec)
+    return _validator_for(type_spec)
+
+
+def _cache_key(tp: Any) -> Any:
+    """Return a cache key that tells apart type specifications typing equates.
+
+    typing considers ``Union[str, int] == Union[int, str]`` (and
+    ``Literal[1] == Literal[True]`` hashes alike), but union members are tried
+    in order, so the key keeps argument order and literal value types.
+    """
+    origin = get_origin(tp)
+    if origin is None:
+        return tp
+    args = get_args(tp)
+    if origin is Literal:
+        return (Literal, tuple((type(arg), arg) for arg in args))
+    return (origin, tuple(_cache_key(arg) for arg in args))
+
+
+def _validator_for(tp: Any) -> Coercer:
+    """Return the cached public validator for a type, compiling it if needed."""
+    key = _cache_key(tp)
+    try:
+        validator = _VALIDATORS.get(key)
+    except TypeError:  # Unhashable type specification, compile without caching
+        with _COMPILE_LOCK:
+            return _wrap_coercer(_compile_coercer(tp), tp)
+    if validator is None:
+        with _COMPILE_LOCK:
+            validator = _VALIDATORS.get(key)
+            if validator is None:
+                validator = _wrap_coercer(_coercer_for(tp), tp)
+                _VALIDATORS[key] = validator
+    return validator
+
+
+def _wrap_coercer(coercer: Coercer, tp: Any) -> Coercer:
+    """Turn unexpected exceptions raised by a coercer into TypeValidationError."""
+
+    def validator(data: Any) -> Any:
+        try:
+            return coercer(data)
+        except TypeValidationError:
+            raise
+        except Exception as e:
+            raise TypeValidationError(
+                f"Unexpected error during type validation: {e}", data, tp
+            ) from e
+
+    return validator
+
+
+def _coercer_for(tp: Any) -> Coercer:
+    """Return the cached coercer for a type, compiling it if needed."""
+    key = _cache_key(tp)
+    try:
+        coercer = _COERCERS.get(key)
+    except TypeError:
+        with _COMPILE_LOCK:
+            return _compile_coercer(tp)
+    if coercer is None:
+        with _COMPILE_LOCK:
+            coercer = _COERCERS.get(key) or _IN_PROGRESS.get(key)
+            if coercer is None:
+                coercer = _compile_coercer(tp)
+                _COERCERS[key] = coercer
+    return coercer
+
+
+def _compile_coercer(tp: Any) -> Coercer:
+    """Compile the coercer for one type; call ``_coercer_for`` to use the cache."""
     origin = get_origin(tp)
     args = get_args(tp)
 
-    # Handle NoneType
     if tp is type(None):  # noqa: E721
-        if val is None:
-            return None
-        raise TypeValidationError(f"Expected None, got {type(val).__name__}", val, tp)
 
-    # Handle Any/object
+        def coerce_none(val: Any) -> Any:
+            if val is None:
+                return None
+            raise TypeValidationError(
+                f"Expected None, got {type(val).__name__}", val, tp
+            )
+
+        return coerce_none
+
     if tp is Any or tp is object:
-        return val
+        return lambda val: val
 
-    # Handle Union/Optional
     if origin is Union:
-        last_err: Exception | None = None
-        for arg_type in args:
-            try:
-                return _coerce_value(val, arg_type)
-            except TypeValidationError as e:
-                last_err = e
-        raise last_err or TypeValidationError(
-            f"Value {val!r} does not match any type in {tp!r}", val, tp
-        )
+        options = [_coercer_for(arg_type) for arg_type in args]
+
+        def coerce_union(val: Any) -> Any:
+            last_err: Exception | None = None
+            for option in options:
+                try:
+                    return option(val)
+                except TypeValidationError as e:
+                    last_err = e
+            raise last_err or TypeValidationError(
+                f"Value {val!r} does not match any type in {tp!r}", val, tp
+            )
+
+        return coerce_union
 
-    # Handle Literal
     if origin is Literal:
-        if val in args:
-            return val
-        raise TypeValidationError(f"Expected one of {args}, got {val!r}", val, tp)
 
-    # Handle Enums
+        def coerce_literal(val: Any) -> Any:
+            if val in args:
+                return val
+            raise TypeValidationError(f"Expected one of {args}, got {val!r}", val, tp)
+
+        return coerce_literal
+
     if isinstance(tp, type) and issubclass(tp, enum.Enum):
-        if isinstance(val, tp):
-            return val
-        # Try value then name
-        try:
-            return tp(val)  # type: ignore[call-arg]
-        except Exception:
+
+        def coerce_enum(val: Any) -> Any:
+            if isinstance(val, tp):
+                return val
             try:
-                return tp[str(val)]  # type: ignore[index]
+                return tp(val)
             except Exception:
-                raise TypeValidationError(
-                    f"Cannot coerce {val!r} to enum {tp.__name__}", val, tp
-                )
+                try:
+                    return tp[str(val)]
+                except Exception:
+                    raise TypeValidationError(
+                        f"Cannot coerce {val!r} to enum {tp.__name__}", val, tp
+                    )
+
+        return coerce_enum
+
+    if tp is bool:
 
-    # Handle primitives
-    if tp in (str, int, float, bool):
-        # If already correct primitive type, return as is (do not coerce)
-        if isinstance(val, tp):
-            return val
-        if tp is bool:
-            # Handle common truthy/falsy values
+        def coerce_bool(val: Any) -> Any:
+            if isinstance(val, bool):
+                return val
             if val in (True, False, 1, 0):
                 return bool(val)
             if isinstance(val, str):
-                if val.lower() in ("true", "1", "yes", "on"):
+                lowered = val.lower()
+                if lowered in ("true", "1", "yes", "on"):
                     return True
-                if val.lower() in ("false", "0", "no", "off"):
+                if lowered in ("false", "0", "no", "off"):
                     return False
             raise TypeValidationError(
                 f"Expected bool, got {type(val).__name__}", val, tp
             )
-        try:
-            return tp(val)  # type: ignore[call-arg]
-        except Exception:
-            raise TypeValidationError(f"Expected {tp.__name__}, got {val!r}", val, tp)
 
-    # Handle collections
+        return coerce_bool
+
+    if tp in (str, int, float):
+
+        def coerce_primitive(val: Any) -> Any:
+            if isinstance(val, tp):
+                return val
+            try:
+                return tp(val)
+            except Exception:
+                raise TypeValidationError(
+                    f"Expected {tp.__name__}, got {val!r}", val, tp
+                )
+
+        return coerce_primitive
+
     if origin in (list, tuple, set, frozenset):
-        if not isinstance(val, (list, tuple, set, frozenset)):
-            origin_name = origin.__name__ if origin else "collection"
-            raise TypeValidationError(
-                f"Expected {origin_name}, got {type(val).__name__}", val, tp
-            )
-        elem_type = args[0] if args else Any
-        coerced = [_coerce_value(v, elem_type) for v in list(val)]
-        if origin is list:
-            return coerced
-        if origin is tuple:
-            return tuple(coerced)
-        if origin is set:
-            return set(coerced)
-        if origin is frozenset:
-            return frozenset(coerced)
-
-    # Handle dict
+        coerce_elem = _coercer_for(args[0] if args else Any)
+        collection_type = origin
+
+        def coerce_collection(val: Any) -> Any:
+            if not isinstance(val, (list, tuple, set, frozenset)):
+                raise TypeValidationError(
+                    f"Expected {collection_type.__name__}, got {type(val).__name__}",
+                    val,
+                    tp,
+                )
+            coerced = [coerce_elem(v) for v in list(val)]
+            return coerced if collection_type is list else collection_type(coerced)
+
+        return coerce_collection
+
     if origin is dict:
         key_type, val_type = args if args else (Any, Any)
-        if not isinstance(val, ABCMapping):
-            raise TypeValidationError(
-                f"Expected dict, got {type(val).__name__}", val, tp
-            )
-        return {
-            _coerce_value(k, key_type): _coerce_value(v, val_type)
-            for k, v in val.items()
-        }
+        coerce_key = _coercer_for(key_type)
+        coerce_item = _coercer_for(val_type)
+
+        def coerce_dict(val: Any) -> Any:
+            if not isinstance(val, ABCMapping):
+                raise TypeValidationError(
+                    f"Expected dict, got {type(val).__name__}", val, tp
+                )
+            return {coerce_key(k): coerce_item(v) for k, v in val.items()}
+
+        return coerce_dict
 
-    # Handle dataclasses
     if is_dataclass(tp) and isinstance(tp, type):
-        if not isinstance(val, ABCMapping):
-            raise TypeValidationError(
-                f"Expected object (mapping) for {tp.__name__}", val, tp
-            )
+        return _compile_dataclass_coercer(tp)
+
+    if inspect.isclass(tp) and isinstance(tp, type):
+        if tp is dict:
+
+            def coerce_plain_dict(val: Any) -> Any:
+                if isinstance(val, ABCMapping):
+                    return dict(val)
+                raise TypeValidationError(
+                    f"Expected dict, got {type(val).__name__}", val, tp
+                )
+
+            return coerce_plain_dict
+        return _compile_class_coercer(tp)
+
+    if callable(tp):
+
+        def coerce_callable(val: Any) -> Any:
+            try:
+                return tp(val)
+            except Exception:
+                pass
+            raise TypeValidationError(f"Don't know how to coerce into {tp!r}", val, tp)
+
+        return coerce_callable
+
+    def coerce_unknown(val: Any) -> Any:
+        raise TypeValidationError(f"Don't know how to coerce into {tp!r}", val, tp)
+
+    return coerce_unknown
+
+
+def _require_mapping(val: Any, tp: Any) -> None:
+    """Raise unless a value can be read as the fields of class ``tp``."""
+    if not isinstance(val, ABCMapping):
+        raise TypeValidationError(
+            f"Expected object (mapping) for {tp.__name__}", val, tp
+        )
+
+
+def _retry_introspection(
+    tp: Any, introspect: Callable[[], Any], compile: Callable[[Any], Coercer]
+) -> Coercer:
+    """Coercer for a class whose annotations or signature failed to introspect.
+
+    Each call repeats the introspection, so its error is raised per value (and
+    wrapped by the validator); once it succeeds, e.g. after a forward
+    reference is defined, the value is coerced with a freshly compiled coercer.
+    """
+
+    def coerce_retry(val: Any) -> Any:
+        _require_mapping(val, tp)
+        introspect()
+        with _COMPILE_LOCK:
+            coercer = compile(tp)
+        return coercer(val)
+
+    return coerce_retry
+
+
+@contextmanager
+def _forwarding(tp: Any) -> Iterator[None]:
+    """Let a class refer to itself while its member coercers compile.
+
+    References to ``tp`` resolve to a coercer that forwards to the finished
+    one, so self-referencing classes compile instead of recursing forever.
+    Callers hold ``_COMPILE_LOCK``.
+    """
+    _IN_PROGRESS[tp] = lambda val: _COERCERS[tp](val)
+    try:
+        yield
+    finally:
+        del _IN_PROGRESS[tp]
+
+
+def _compile_dataclass_coercer(tp: Any) -> Coercer:
+    """Compile a coercer that builds a dataclass from a mapping."""
+    try:
         type_hints = get_type_hints(tp)
+    except Exception:
+        return _retry_introspection(
+            tp, lambda: get_type_hints(tp), _compile_dataclass_coercer
+        )
+
+    field_list = fields(tp)
+    with _forwarding(tp):
+        field_coercers = [
+            (field.name, _coercer_for(type_hints.get(field.name, field.type)))
+            for field in field_list
+        ]
+    required_names = {
+        field.name
+        for field in field_list
+        if field.default is MISSING
+        and getattr(field, "default_factory", MISSING) is MISSING
+    }
+    field_names = {field.name for field in field_list}
+
+    def coerce_dataclass(val: Any) -> Any:
+        _require_mapping(val, tp)
         out_kwargs: dict[str, Any] = {}
-        required_names = set()
-
-        for field in fields(tp):
-            field_type = type_hints.get(field.name, field.type)
-            if (
-                field.default is MISSING
-                and getattr(field, "default_factory", MISSING) is MISSING
-            ):
-                required_names.add(field.name)
-            if field.name in val:
-                out_kwargs[field.name] = _coerce_value(val[field.name], field_type)
+        for name, coerce_field in field_coercers:
+            if name in val:
+                out_kwargs[name] = coerce_field(val[name])
 
         missing = required_names - set(out_kwargs)
         if missing:
@@ -394,70 +585,78 @@ def _coerce_value(val: Any, tp: Any) -> Any:
                 val,
                 tp,
             )
-
-        # Check for extra keys
-        extra = set(val.keys()) - {f.name for f in fields(tp)}
+        extra = set(val.keys()) - field_names
         if extra:
             raise TypeValidationError(
                 f"Unexpected fields for {tp.__name__}: {sorted(extra)}", val, tp
             )
+        return tp(**out_kwargs)
 
-        return tp(**out_kwargs)  # type: ignore[misc]
+    return coerce_dataclass
 
-    # Handle plain classes
-    if inspect.isclass(tp) and isinstance(tp, type):
-        # Special handling for dict type
-        if tp is dict:
-            if isinstance(val, ABCMapping):
-                return dict(val)  # Convert to dict directly
-            else:
-                raise TypeValidationError(
-                    f"Expected dict, got {type(val).__name__}", val, tp
-                )
 
-        if not isinstance(val, ABCMapping):
+def _compile_class_coercer(tp: Any) -> Coercer:
+    """Compile a coercer that builds a plain class from its __init__ signature."""
+
+    def introspect() -> tuple[list[inspect.Parameter], dict[str, Any]]:
+        params = list(inspect.signature(tp.__init__).parameters.values())[1:]
+        return params, get_type_hints(tp.__init__)
+
+    try:
+        params, anno = introspect()
+    except Exception:
+        return _retry_introspection(tp, introspect, _compile_class_coercer)
+
+    unsupported = next(
+        (
+            param
+            for param in params
+            if param.kind not in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)
+        ),
+        None,
+    )
+    if unsupported is not None:
+        kind = unsupported.kind
+
+        def coerce_unsupported(val: Any) -> Any:
+            _require_mapping(val, tp)
             raise TypeValidationError(
-                f"Expected object (mapping) for {tp.__name__}", val, tp
+                f"Unsupported parameter kind: {kind} on {tp.__name__}.__init__",
+                val,
+                tp,
             )
-        sig = inspect.signature(tp.__init__)
-        params = list(sig.parameters.values())[1:]  # skip self
-        anno = get_type_hints(tp.__init__)
-        kwargs: dict[str, Any] = {}
 
-        for param in params:
-            if param.kind not in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY):
+        return coerce_unsupported
+
+    with _forwarding(tp):
+        param_coercers = [
+            (
+                param.name,
+                _coercer_for(anno.get(param.name, Any)),
+                param.default is inspect._empty,
+            )
+            for param in params
+        ]
+    param_names = {param.name for param in params}
+
+    def coerce_class(val: Any) -> Any:
+        _require_mapping(val, tp)
+        kwargs: dict[str, Any] = {}
+        for name, coerce_param, required in param_coercers:
+            if name in val:
+                kwargs[name] = coerce_param(val[name])
+            elif required:
                 raise TypeValidationError(
-                    f"Unsupported parameter kind: {param.kind} on {tp.__name__}.__init__",
-                    val,
-                    tp,
+                    f"Missing required param '{name}' for {tp.__name__}", val, tp
                 )
-            if param.name in val:
-                target_type = anno.get(param.name, Any)
-                kwargs[param.name] = _coerce_value(val[param.name], target_type)
-            else:
-                if param.default is inspect._empty:
-                    raise TypeValidationError(
-                        f"Missing required param '{param.name}' for {tp.__name__}",
-                        val,
-                        tp,
-                    )
-
-        extra = set(val.keys()) - {p.name for p in params}
+        extra = set(val.keys()) - param_names
         if extra:
             raise TypeValidationError(
                 f"Unexpected fields for {tp.__name__}: {sorted(extra)}", val, tp
             )
-
         return tp(**kwargs)
 
-    # Fallback: try callable cast
-    if callable(tp):
-        try:
-            return tp(val)  # type: ignore[call-arg]
-        except Exception:
-            pass
-
-    raise TypeValidationError(f"Don't know how to coerce into {tp!r}", val, tp)
+    return coerce_class
 
 
 def validate_dict(data: dict[str, Any], schema: dict[str, Any]) -> dict[str, Any]:
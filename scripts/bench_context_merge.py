@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark successive context merges: copying, in-place and bulk.
+
+Run with ``python -m scripts.bench_context_merge``.
+"""
+
+import argparse
+import time
+from typing import List, Optional
+
+from intent_kit.core.context import ContextPatch, DefaultContext
+from intent_kit.core.context.policies import apply_merge
+
+
+def copying_appends(n: int) -> int:
+    """The previous behaviour: every append_list merge copies the list."""
+    value: Optional[List[int]] = None
+    for i in range(n):
+        value = apply_merge(
+            policy="append_list", existing=value, incoming=[i], key="user.history"
+        )
+    return len(value or [])
+
+
+def context_appends(n: int) -> int:
+    """One apply_patch per turn; the owned list is extended in place."""
+    ctx = DefaultContext()
+    for i in range(n):
+        ctx.apply_patch(
+            ContextPatch(
+                data={"user.history": [i]}, policy={"user.history": "append_list"}
+            )
+        )
+    return len(ctx.get("user.history"))
+
+
+def context_appends_with_snapshots(n: int, every: int = 100) -> int:
+    """As above, with a snapshot every `every` turns forcing a copy-on-write."""
+    ctx = DefaultContext()
+    for i in range(n):
+        ctx.apply_patch(
+            ContextPatch(
+                data={"user.history": [i]}, policy={"user.history": "append_list"}
+            )
+        )
+        if i % every == 0:
+            ctx.snapshot()
+    return len(ctx.get("user.history"))
+
+
+def bulk_appends(n: int) -> int:
+    """All patches at once through apply_patches."""
+    ctx = DefaultContext()
+    ctx.apply_patches(
+        ContextPatch(data={"user.history": [i]}, policy={"user.history": "append_list"})
+        for i in range(n)
+    )
+    return len(ctx.get("user.history"))
+
+
+def counter_reduces(n: int) -> int:
+    """One reduce merge per turn with the counter reducer."""
+    ctx = DefaultContext()
+    ctx.register_reducer("stats.intents", "counter")
+    for i in range(n):
+        ctx.apply_patch(
+            ContextPatch(
+                data={"stats.intents": f"intent{i % 50}"},
+                policy={"stats.intents": "reduce"},
+            )
+        )
+    return sum(ctx.get("stats.intents").values())
+
+
+def bulk_counter_reduces(n: int) -> int:
+    """The same counter merges through apply_patches."""
+    ctx = DefaultContext()
+    ctx.register_reducer("stats.intents", "counter")
+    ctx.apply_patches(
+        ContextPatch(
+            data={"stats.intents": f"intent{i % 50}"},
+            policy={"stats.intents": "reduce"},
+        )
+        for i in range(n)
+    )
+    return sum(ctx.get("stats.intents").values())
+
+
+def main():
+    """Time every strategy for the same number of successive merges."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--merges", type=int, default=10000, help="merges per case")
+    args = parser.parse_args()
+
+    cases = [
+        ("append_list, copying", copying_appends),
+        ("append_list, in place", context_appends),
+        ("append_list, snapshots", context_appends_with_snapshots),
+        ("append_list, bulk", bulk_appends),
+        ("reduce counter", counter_reduces),
+        ("reduce counter, bulk", bulk_counter_reduces),
+    ]
+    print(f"{'case':<24} {'total':>10} {'per merge':>10}")
+    for name, func in cases:
+        start = time.perf_counter()
+        result = func(args.merges)
+        elapsed = time.perf_counter() - start
+        assert result == args.merges
+        print(
+            f"{name:<24} {elapsed * 1e3:>8.1f}ms "
+            f"{elapsed / args.merges * 1e6:>8.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
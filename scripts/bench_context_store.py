@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark ContextStore throughput over thousands of sessions.
+
+Run with ``python -m scripts.bench_context_store``.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from intent_kit.core.context import ContextStore, DefaultContext
+
+
+def populate(store: ContextStore, sessions: int, keys: int) -> int:
+    """First save of every session: all keys written."""
+    for s in range(sessions):
+        ctx = store.load(f"session-{s}")
+        for k in range(keys):
+            ctx.set(f"user.field{k}", {"value": k, "text": "x" * 32})
+        store.save(ctx)
+    return sessions
+
+
+def delta_turns(store: ContextStore, sessions: int, keys: int) -> int:
+    """One turn per session: lazy load, read one key, write one, save the delta."""
+    for s in range(sessions):
+        ctx = store.load(f"session-{s}")
+        turns = ctx.get("user.turns") or 0
+        ctx.set("user.turns", turns + 1)
+        store.save(ctx)
+    return sessions
+
+
+def full_turns(store: ContextStore, sessions: int, keys: int) -> int:
+    """The same turn, rewriting the whole session as an in-memory context would."""
+    for s in range(sessions):
+        loaded = store.load(f"session-{s}", lazy=False)
+        ctx = DefaultContext()
+        ctx.merge_from(loaded.snapshot())
+        ctx.set("user.turns", (ctx.get("user.turns") or 0) + 1)
+        store.save(ctx, session_id=f"session-{s}")
+    return sessions
+
+
+def threaded_delta_turns(store: ContextStore, sessions: int, keys: int) -> int:
+    """Delta turns from 4 threads, each with its own slice of sessions."""
+
+    def run(offset: int) -> None:
+        for s in range(offset, sessions, 4):
+            ctx = store.load(f"session-{s}")
+            ctx.set("user.turns", (ctx.get("user.turns") or 0) + 1)
+            store.save(ctx)
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(run, range(4)))
+    return sessions
+
+
+def main():
+    """Time populating and updating every session."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=2000, help="sessions")
+    parser.add_argument("--keys", type=int, default=50, help="keys per session")
+    args = parser.parse_args()
+
+    cases = [
+        ("populate", populate),
+        ("delta turn", delta_turns),
+        ("full rewrite turn", full_turns),
+        ("delta turn, 4 threads", threaded_delta_turns),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        with ContextStore(os.path.join(tmp, "sessions.db")) as store:
+            print(f"{'case':<24} {'total':>10} {'sessions/s':>12}")
+            for name, func in cases:
+                start = time.perf_counter()
+                count = func(store, args.sessions, args.keys)
+                elapsed = time.perf_counter() - start
+                print(f"{name:<24} {elapsed * 1e3:>8.1f}ms {count / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark the JSON backends on LLM outputs, context snapshots and records.
+
+Run with ``python -m scripts.bench_json``. Install ``orjson`` or ``msgspec``
+to compare them with the standard library.
+"""
+
+import argparse
+import json
+import timeit
+
+from intent_kit.utils import json_backend
+
+
+def llm_output() -> str:
+    """An extraction answer with nested parameters, as returned by a model."""
+    return json.dumps(
+        {
+            "intent": "book_trip",
+            "confidence": 0.93,
+            "params": {
+                "travellers": [
+                    {"name": f"Traveller {i}", "age": 20 + i, "seat": f"{i}A"}
+                    for i in range(6)
+                ],
+                "itinerary": [
+                    {"from": "SFO", "to": "ZRH", "date": "2025-03-0%d" % (i + 1)}
+                    for i in range(4)
+                ],
+                "notes": "Window seats where possible; vegetarian meals. " * 4,
+            },
+        },
+        indent=2,
+    )
+
+
+def context_snapshot() -> dict:
+    """Fingerprint input of a context after a few dozen turns."""
+    return {
+        f"turn.{i}": {
+            "user_input": f"message number {i} about order #{1000 + i}",
+            "chosen_label": "order_status" if i % 2 else "refund",
+            "extracted_params": {"order_id": 1000 + i, "amount": i * 1.25},
+        }
+        for i in range(40)
+    }
+
+
+def main():
+    """Time loads and dumps for every installed backend."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5000, help="calls per case")
+    args = parser.parse_args()
+
+    output = llm_output()
+    snapshot = context_snapshot()
+    record = {"prompt": output, "content": output, "metadata": snapshot}
+    cases = [
+        ("parse LLM output", lambda: json_backend.loads(output)),
+        ("encode context", lambda: json_backend.dumps(snapshot, sort_keys=True)),
+        ("serialize record", lambda: json_backend.dumps(record, default=str)),
+    ]
+
+    previous = json_backend.backend_name
+    timings = {}
+    try:
+        for backend in json_backend.available_backends():
+            json_backend.use_backend(backend)
+            for name, func in cases:
+                timings[(backend, name)] = timeit.timeit(func, number=args.number)
+    finally:
+        json_backend.use_backend(previous)
+
+    per_call = 1e6 / args.number
+    print(f"{'case':<22} {'backend':<8} {'per call':>10} {'vs json':>8}")
+    for name, _ in cases:
+        baseline = timings[("json", name)]
+        for backend in json_backend.available_backends():
+            elapsed = timings[(backend, name)]
+            print(
+                f"{name:<22} {backend:<8} {elapsed * per_call:>8.1f}us "
+                f"{baseline / elapsed:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
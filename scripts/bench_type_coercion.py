@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Microbenchmark: cached compiled validators versus compiling on every call.
+
+Run with ``python -m scripts.bench_type_coercion``.
+"""
+
+import argparse
+import enum
+import timeit
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from intent_kit.utils.type_coercion import (
+    _compile_coercer,
+    _wrap_coercer,
+    compile_validator,
+    resolve_type,
+)
+
+
+class Priority(enum.Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+@dataclass
+class LineItem:
+    sku: str
+    quantity: int
+    price: float
+
+
+@dataclass
+class Order:
+    order_id: int
+    priority: Priority
+    items: List[LineItem]
+    status: Literal["open", "shipped", "closed"] = "open"
+    notes: Optional[str] = None
+    tags: Dict[str, List[str]] = field(default_factory=dict)
+
+
+# (name, type spec, value) cases, from a flat extractor schema to nested data
+CASES: List[Tuple[str, Any, Any]] = [
+    ("schema str 'int'", "int", "42"),
+    ("schema float", float, "3.5"),
+    ("schema bool", bool, "yes"),
+    ("List[int]", List[int], ["1", "2", "3", "4", "5"]),
+    ("Dict[str, float]", Dict[str, float], {"a": "1.5", "b": 2, "c": "3"}),
+    ("Optional[int]", Optional[int], "7"),
+    (
+        "Order dataclass",
+        Order,
+        {
+            "order_id": "1001",
+            "priority": "high",
+            "items": [
+                {"sku": "A-1", "quantity": "2", "price": "9.99"},
+                {"sku": "B-2", "quantity": 1, "price": 20},
+            ],
+            "status": "shipped",
+            "tags": {"gift": ["wrap", "card"]},
+        },
+    ),
+]
+
+
+def interpreted(type_spec: Any, value: Any) -> Any:
+    """Resolve the type name and introspect the type again for every value.
+
+    Nested types still come from the cache, so this understates the cost of
+    the previous fully per-call introspection.
+    """
+    if isinstance(type_spec, str):
+        type_spec = resolve_type(type_spec)
+    return _wrap_coercer(_compile_coercer(type_spec), type_spec)(value)
+
+
+def main():
+    """Time both paths for every case and print the speedup."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000, help="calls per case")
+    args = parser.parse_args()
+
+    print(f"{'case':<20} {'interpreted':>12} {'compiled':>12} {'speedup':>8}")
+    for name, type_spec, value in CASES:
+        validator = compile_validator(type_spec)
+        assert validator(value) == interpreted(type_spec, value)
+
+        slow = timeit.timeit(lambda: interpreted(type_spec, value), number=args.number)
+        # Look the validator up on every call, as nodes do
+        fast = timeit.timeit(
+            lambda: compile_validator(type_spec)(value), number=args.number
+        )
+        per_call = 1e6 / args.number
+        print(
+            f"{name:<20} {slow * per_call:>10.2f}us {fast * per_call:>10.2f}us "
+            f"{slow / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 import pytest
 from intent_kit.core.context import DictBackedContext
+from intent_kit.core.context.fingerprint import digest_fingerprint
 
 
 class TestDictBackedContext:
@@ -77,8 +78,8 @@ class TestDictBackedContext:
         fp = ctx.fingerprint()
 
         # Should include backing data
-        assert "Alice" in fp
-        assert "25" in fp
+        assert fp == digest_fingerprint(backing_dict)
+        assert fp != DictBackedContext(backing={}).fingerprint()
 
     def test_merge_from_updates_internal_context(self):
         """Test that merge_from updates the internal context."""
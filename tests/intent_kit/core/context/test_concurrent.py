@@ -0,0 +1,221 @@
+"""Tests for the thread- and asyncio-safe ConcurrentContext."""
+
+import asyncio
+import sys
+import threading
+
+import pytest
+from intent_kit.core.context import ConcurrentContext, ContextPatch
+from intent_kit.core.exceptions import ContextConflictError, ContextVersionError
+
+THREADS = 16
+ITERATIONS = 300
+
+
+@pytest.fixture
+def fast_switching():
+    """Switch threads as often as possible to provoke interleavings."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(target, count=THREADS):
+    """Start `count` threads running target(index) together; re-raise failures."""
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def worker(index):
+        barrier.wait()
+        try:
+            target(index)
+        except Exception as e:  # surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+
+class TestVersions:
+    """Test version stamps and optimistic patches."""
+
+    def test_versions_change_on_every_write(self):
+        """Each write gets a new, never reused version; absent keys are 0."""
+        ctx = ConcurrentContext()
+        assert ctx.get_versioned("user.name") == (None, 0)
+
+        ctx.set("user.name", "Alice")
+        _, first = ctx.get_versioned("user.name")
+        ctx.set("user.name", "Alice")
+        value, second = ctx.get_versioned("user.name")
+
+        assert value == "Alice"
+        assert 0 < first < second == ctx.version
+        ctx.delete("user.name")
+        assert ctx.get_version("user.name") == 0
+        ctx.set("user.name", "Bob")
+        assert ctx.get_version("user.name") > second
+
+    def test_stale_patch_is_rejected_atomically(self):
+        """A patch with an outdated version writes none of its keys."""
+        ctx = ConcurrentContext()
+        ctx.set("user.count", 1)
+        _, version = ctx.get_versioned("user.count")
+        ctx.set("user.count", 2)
+
+        with pytest.raises(ContextVersionError, match="user.count"):
+            ctx.apply_patch(
+                ContextPatch(
+                    data={"user.count": 2, "user.other": True},
+                    versions={"user.count": version},
+                )
+            )
+        assert ctx.snapshot() == {"user.count": 2}
+        assert issubclass(ContextVersionError, ContextConflictError)
+
+    def test_current_patch_is_applied(self):
+        """A patch whose versions are current goes through, including absent keys."""
+        ctx = ConcurrentContext()
+        ctx.set("user.count", 1)
+        ctx.apply_patch(
+            ContextPatch(
+                data={"user.count": 2, "user.new": "x"},
+                versions={"user.count": ctx.get_version("user.count"), "user.new": 0},
+            )
+        )
+        assert ctx.snapshot() == {"user.count": 2, "user.new": "x"}
+
+    def test_update_gives_up_after_max_retries(self):
+        """update() raises when the key keeps changing under it."""
+        ctx = ConcurrentContext()
+
+        def interfere(value):
+            ctx.set("user.count", object())
+            return 1
+
+        with pytest.raises(ContextVersionError, match="after 2 retries"):
+            ctx.update("user.count", interfere, max_retries=2)
+
+    def test_append_list_never_extends_stored_lists(self):
+        """Lists a lock-free reader may hold are never mutated."""
+        ctx = ConcurrentContext()
+        patch = ContextPatch(data={"user.log": [1]}, policy={"user.log": "append_list"})
+        ctx.apply_patch(patch)
+        held = ctx._view["user.log"]
+        ctx.apply_patch(patch)
+
+        assert held == [1]
+        assert ctx.get("user.log") == [1, 1]
+
+
+@pytest.mark.usefixtures("fast_switching")
+class TestNoLostUpdates:
+    """Stress tests: concurrent writers never lose each other's updates."""
+
+    def test_update_counter(self):
+        """Optimistic read-modify-write increments all land."""
+        ctx = ConcurrentContext()
+
+        def increment(_):
+            for _ in range(ITERATIONS):
+                ctx.update("stats.count", lambda v: (v or 0) + 1, max_retries=10**6)
+
+        run_threads(increment)
+        assert ctx.get("stats.count") == THREADS * ITERATIONS
+
+    def test_append_list_patches(self):
+        """Merging patches from many threads keeps every item exactly once."""
+        ctx = ConcurrentContext()
+
+        def append(index):
+            for i in range(ITERATIONS):
+                ctx.apply_patch(
+                    ContextPatch(
+                        data={"user.log": [(index, i)]},
+                        policy={"user.log": "append_list"},
+                    )
+                )
+
+        run_threads(append)
+        log = ctx.get("user.log")
+        assert len(log) == THREADS * ITERATIONS
+        assert set(log) == {(t, i) for t in range(THREADS) for i in range(ITERATIONS)}
+
+    def test_reduce_patches(self):
+        """Reducer merges are read-modify-writes under the lock."""
+        ctx = ConcurrentContext()
+        ctx.register_reducer("stats.*", "sum")
+
+        def add(_):
+            for _ in range(ITERATIONS):
+                ctx.apply_patch(
+                    ContextPatch(
+                        data={"stats.total": 1}, policy={"stats.total": "reduce"}
+                    )
+                )
+
+        run_threads(add)
+        assert ctx.get("stats.total") == THREADS * ITERATIONS
+
+    def test_readers_during_writes(self):
+        """Snapshots, key listings and fingerprints stay consistent under writes."""
+        ctx = ConcurrentContext()
+
+        def work(index):
+            for i in range(ITERATIONS):
+                if index % 2:
+                    # Both keys are always written together
+                    ctx.apply_patch(
+                        ContextPatch(data={"user.a": (index, i), "user.b": (index, i)})
+                    )
+                    ctx.add_error(where="stress", err=str(i))
+                else:
+                    snapshot = ctx.snapshot()
+                    assert snapshot.get("user.a") == snapshot.get("user.b")
+                    assert sorted(ctx.keys()) == ctx.keys_with_prefix("")
+                    ctx.fingerprint()
+                    ctx.get_errors(limit=5)
+
+        run_threads(work)
+        assert ctx.get("user.a") == ctx.get("user.b")
+        assert ctx.telemetry("errors").total == THREADS // 2 * ITERATIONS
+        # The rolling fingerprint matches one computed from scratch
+        fresh = ConcurrentContext()
+        fresh.merge_from(ctx.snapshot())
+        assert ctx.fingerprint() == fresh.fingerprint()
+
+
+class TestAsyncio:
+    """Tasks that await between reading and writing."""
+
+    def test_optimistic_writes_across_awaits(self):
+        """A task whose read went stale during an await retries instead of clobbering."""
+        ctx = ConcurrentContext()
+        tasks, iterations = 20, 50
+
+        async def increment():
+            for _ in range(iterations):
+                while True:
+                    value, version = ctx.get_versioned("stats.count", 0)
+                    await asyncio.sleep(0)
+                    try:
+                        ctx.apply_patch(
+                            ContextPatch(
+                                data={"stats.count": value + 1},
+                                versions={"stats.count": version},
+                            )
+                        )
+                        break
+                    except ContextVersionError:
+                        continue
+
+        async def main():
+            await asyncio.gather(*(increment() for _ in range(tasks)))
+
+        asyncio.run(main())
+        assert ctx.get("stats.count") == tasks * iterations
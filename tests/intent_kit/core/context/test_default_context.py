@@ -185,16 +185,24 @@ class TestDefaultContext:
         ctx = DefaultContext()
         ctx.add_error(where="test", err="test error", meta={"key": "value"})
 
-        # add_error only logs, doesn't store in context
-        # This is the current implementation behavior
+        # Errors are retained in a ring buffer, not as context keys
+        assert list(ctx.keys()) == []
+        (error,) = ctx.get_errors()
+        assert error["where"] == "test"
+        assert error["error"] == "test error"
+        assert error["meta"] == {"key": "value"}
 
     def test_track_operation(self):
         """Test track_operation method."""
         ctx = DefaultContext()
         ctx.track_operation(name="test_op", status="success", meta={"key": "value"})
 
-        # track_operation only logs, doesn't store in context
-        # This is the current implementation behavior
+        # Operations are retained in a ring buffer, not as context keys
+        assert list(ctx.keys()) == []
+        assert ctx.snapshot() == {}
+        (operation,) = ctx.get_operations(name="test_op")
+        assert operation["status"] == "success"
+        assert ctx.get_operations(status="failed") == []
 
     def test_context_patch_with_tags(self):
         """Test ContextPatch with tags."""
@@ -225,3 +233,288 @@ class TestDefaultContext:
         ctx.apply_patch(patch)
 
         assert ctx.get("test_key") == "test_value"
+
+
+class TestIncrementalFingerprint:
+    """The rolling fingerprint must equal a full recomputation."""
+
+    INCLUDES = [None, ["user.*"], ["shared.*", "user.n*"], ["*"], ["tmp.*", "a?.x"]]
+    KEYS = [
+        "user.name",
+        "user.n2",
+        "user.prefs",
+        "shared.data",
+        "tmp.scratch",
+        "private.token",
+        "ab.x",
+        "other.info",
+    ]
+
+    @staticmethod
+    def select(snapshot, include):
+        """The selection fingerprints cover, computed independently."""
+        import fnmatch
+
+        from intent_kit.core.context.default import DEFAULT_EXCLUDED_FP_PREFIXES
+
+        if include:
+            keys = {k for p in include for k in fnmatch.filter(snapshot, p)}
+        else:
+            keys = {k for k in snapshot if k.startswith(("user.", "shared."))}
+        return {
+            k: snapshot[k]
+            for k in sorted(keys)
+            if not k.startswith(tuple(DEFAULT_EXCLUDED_FP_PREFIXES))
+        }
+
+    @classmethod
+    def recompute(cls, ctx, include):
+        """Fingerprint a fresh context rebuilt from a snapshot of `ctx`."""
+        from intent_kit.core.context.fingerprint import digest_fingerprint
+
+        snapshot = ctx.snapshot()
+        fresh = DefaultContext()
+        for key, value in snapshot.items():
+            fresh.set(key, value)
+        rebuilt = fresh.fingerprint(include)
+        assert rebuilt == digest_fingerprint(cls.select(snapshot, include))
+        return rebuilt
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_full_recomputation(self, seed):
+        """Random writes through every entry point keep the digests exact."""
+        import random
+
+        from intent_kit.core.context.fingerprint import canonical_fingerprint
+
+        rng = random.Random(seed)
+        ctx = DefaultContext()
+        values = [1, 2.5, "a", "b", None, True, [1, 2], {"k": [1, {"z": None}]}]
+        # canonical JSON (the previous fingerprint format) -> digest, and back
+        digests: dict = {}
+        canonicals: dict = {}
+
+        for _ in range(200):
+            key = rng.choice(self.KEYS)
+            value = rng.choice(values)
+            op = rng.randrange(5)
+            if op == 0:
+                ctx.set(key, value)
+            elif op == 1 and not key.startswith("private."):
+                policy = "append_list" if isinstance(ctx.get(key), list) else None
+                patch = ContextPatch(data={key: [value] if policy else value})
+                if policy:
+                    patch["policy"] = {key: policy}
+                ctx.apply_patch(patch)
+            elif op == 2:
+                ctx.merge_from({key: value, rng.choice(self.KEYS): value})
+            elif op == 3:
+                ctx.track_operation(name=key, status="completed")
+            else:
+                include = rng.choice(self.INCLUDES)
+                fp = ctx.fingerprint(include)
+                assert fp == self.recompute(ctx, include)
+                # Digests tell states apart exactly when the canonical JSON did
+                canonical = canonical_fingerprint(self.select(ctx.snapshot(), include))
+                assert digests.setdefault(canonical, fp) == fp
+                assert canonicals.setdefault(fp, canonical) == canonical
+
+        for include in self.INCLUDES:
+            assert ctx.fingerprint(include) == self.recompute(ctx, include)
+
+    def test_order_independent_and_reversible(self):
+        """Equal contents give equal fingerprints whatever the write history."""
+        ctx1 = DefaultContext()
+        ctx1.set("user.a", 1)
+        ctx1.set("user.b", 2)
+        fp = ctx1.fingerprint()
+
+        ctx2 = DefaultContext()
+        ctx2.fingerprint()
+        ctx2.set("user.b", 2)
+        ctx2.set("user.a", "changed")
+        assert ctx2.fingerprint() != fp
+        ctx2.set("user.a", 1)
+        assert ctx2.fingerprint() == fp
+
+    def test_untracked_include_sets_fall_back(self, monkeypatch):
+        """Include sets beyond the tracking cap are digested from scratch."""
+        monkeypatch.setattr(
+            "intent_kit.core.context.default.MAX_TRACKED_FP_SELECTIONS", 1
+        )
+        ctx = DefaultContext()
+        ctx.set("user.a", 1)
+        ctx.set("shared.b", 2)
+        ctx.fingerprint()
+        for include in (["shared.*"], ["user.*"]):
+            assert ctx.fingerprint(include) == self.recompute(ctx, include)
+        assert len(ctx._fp_selections) == 1
+
+
+class TestContextKeyIndex:
+    """Prefix scans, glob selection and deletion through the key index."""
+
+    def make(self):
+        ctx = DefaultContext()
+        for key in ("user.b", "user.a", "shared.x", "errors.n1", "errors.n2"):
+            ctx.set(key, key)
+        return ctx
+
+    def test_keys_stay_sorted(self):
+        """keys() reflects writes and deletions in sorted order."""
+        ctx = self.make()
+        assert list(ctx.keys()) == sorted(ctx.snapshot())
+        ctx.set("aaa", 1)
+        ctx.delete("user.b")
+        assert list(ctx.keys()) == [
+            "aaa",
+            "errors.n1",
+            "errors.n2",
+            "shared.x",
+            "user.a",
+        ]
+
+    def test_prefix_and_select(self):
+        """Prefix scans and globs return matching keys only."""
+        ctx = self.make()
+        assert ctx.keys_with_prefix("errors.") == ["errors.n1", "errors.n2"]
+        assert ctx.select_keys(["user.*", "*.x"]) == ["shared.x", "user.a", "user.b"]
+        assert ctx.snapshot(include=["user.*"]) == {
+            "user.a": "user.a",
+            "user.b": "user.b",
+        }
+
+    def test_delete_namespace_updates_fingerprint(self):
+        """Deleting keys updates keys(), has() and the rolling fingerprint."""
+        ctx = self.make()
+        before = ctx.fingerprint(["errors.*"])
+        assert ctx.delete_namespace("errors") == 2
+        assert not ctx.has("errors.n1")
+        assert ctx.keys_with_prefix("errors.") == []
+        assert ctx.fingerprint(["errors.*"]) != before
+        assert ctx.fingerprint(["errors.*"]) == DefaultContext().fingerprint(
+            ["errors.*"]
+        )
+        assert ctx.delete("errors.n1") is False
+
+
+class TestTelemetryRetention:
+    """Errors and operations are kept in bounded ring buffers."""
+
+    def test_buffers_are_bounded(self):
+        """Only the newest `telemetry_capacity` records are retained."""
+        ctx = DefaultContext(telemetry_capacity=3)
+        ctx.set("user.name", "Alice")
+        fp = ctx.fingerprint(["*"])
+        for i in range(10):
+            ctx.track_operation(name=f"op{i}", status="completed")
+            ctx.add_error(where=f"node{i % 2}", err=str(i))
+
+        assert [op["name"] for op in ctx.get_operations()] == ["op7", "op8", "op9"]
+        assert ctx.telemetry("operations").dropped == 7
+        assert [e["error"] for e in ctx.get_errors(where="node1")] == ["7", "9"]
+        assert [e["error"] for e in ctx.get_errors(limit=1)] == ["9"]
+        assert ctx.snapshot() == {"user.name": "Alice"}
+        assert ctx.fingerprint(["*"]) == fp
+
+    def test_resize(self):
+        """Shrinking a buffer keeps the newest records."""
+        ctx = DefaultContext()
+        for i in range(5):
+            ctx.add_error(where="w", err=str(i))
+        ctx.telemetry("errors").resize(2)
+        assert [e["error"] for e in ctx.get_errors()] == ["3", "4"]
+        with pytest.raises(ValueError):
+            DefaultContext(telemetry_capacity=0)
+
+
+class TestMergeOwnership:
+    """append_list grows owned lists in place without leaking into snapshots."""
+
+    def append(self, ctx, key, items):
+        ctx.apply_patch(ContextPatch(data={key: items}, policy={key: "append_list"}))
+
+    def test_snapshots_and_reads_are_protected(self):
+        """Values handed out by snapshot() or get() never change afterwards."""
+        ctx = DefaultContext()
+        self.append(ctx, "user.history", [1])
+        self.append(ctx, "user.history", [2])
+        snap = ctx.snapshot()
+        self.append(ctx, "user.history", [3])
+        seen = ctx.get("user.history")
+        self.append(ctx, "user.history", [4])
+
+        assert snap["user.history"] == [1, 2]
+        assert seen == [1, 2, 3]
+        assert ctx.get("user.history") == [1, 2, 3, 4]
+
+    def test_appends_reuse_owned_list(self):
+        """Successive appends extend the same list object."""
+        ctx = DefaultContext()
+        self.append(ctx, "user.history", [0])
+        first = ctx._data["user.history"]
+        for i in range(1, 5):
+            self.append(ctx, "user.history", [i])
+        assert ctx._data["user.history"] is first
+        assert first == [0, 1, 2, 3, 4]
+
+    def test_set_values_are_not_mutated(self):
+        """Lists passed in by callers are copied before the first append."""
+        ctx = DefaultContext()
+        mine = [1]
+        ctx.set("user.history", mine)
+        self.append(ctx, "user.history", [2])
+        self.append(ctx, "user.history", [3])
+        assert mine == [1]
+        assert ctx.get("user.history") == [1, 2, 3]
+
+    def test_fingerprint_follows_in_place_appends(self):
+        """In-place appends still update the rolling fingerprint."""
+        ctx = DefaultContext()
+        self.append(ctx, "user.history", [1])
+        fp = ctx.fingerprint()
+        self.append(ctx, "user.history", [2])
+        flat = DefaultContext()
+        flat.set("user.history", [1, 2])
+        assert ctx.fingerprint() != fp
+        assert ctx.fingerprint() == flat.fingerprint()
+
+    def test_apply_patches_matches_sequential(self):
+        """Bulk application equals applying each patch in turn."""
+        patches = [
+            ContextPatch(
+                data={"user.h": [i], "user.n": i}, policy={"user.h": "append_list"}
+            )
+            for i in range(5)
+        ]
+        patches.append(ContextPatch(data={"user.h": ["reset"]}))
+        patches.append(
+            ContextPatch(data={"user.h": ["x"]}, policy={"user.h": "append_list"})
+        )
+        one, many = DefaultContext(), DefaultContext()
+        for patch in patches:
+            one.apply_patch(patch)
+        many.apply_patches(patches)
+        assert (
+            many.snapshot() == one.snapshot() == {"user.h": ["reset", "x"], "user.n": 4}
+        )
+
+    def test_context_reducers(self):
+        """Per-context reducers back the reduce policy."""
+        ctx = DefaultContext()
+        ctx.register_reducer("metrics.*", "sum")
+        ctx.apply_patches(
+            ContextPatch(
+                data={"metrics.tokens": n}, policy={"metrics.tokens": "reduce"}
+            )
+            for n in (10, 20, 30)
+        )
+        assert ctx.get("metrics.tokens") == 60
+        with pytest.raises(ContextConflictError, match="Reducer not registered"):
+            ctx.apply_patch(ContextPatch(data={"other": 1}, policy={"other": "reduce"}))
+        with pytest.raises(ContextConflictError, match="Merge failed"):
+            ctx.apply_patch(
+                ContextPatch(
+                    data={"metrics.tokens": "x"}, policy={"metrics.tokens": "reduce"}
+                )
+            )
@@ -0,0 +1,104 @@
+"""Tests for the sorted dotted-key index."""
+
+import fnmatch
+import random
+
+import pytest
+from intent_kit.core.context.key_index import KeyIndex, glob_prefix
+
+KEYS = [
+    "user.name",
+    "user.prefs.theme",
+    "user_agent",
+    "shared.data",
+    "errors.node_a",
+    "errors.node_b",
+    "operations.classify.started",
+    "operations.classify.completed",
+    "tmp.x",
+]
+
+
+class TestKeyIndex:
+    """Test KeyIndex maintenance and queries."""
+
+    def test_sorted_iteration_and_membership(self):
+        """Keys iterate in sorted order as they are added and removed."""
+        index = KeyIndex(KEYS[:3])
+        assert index.add("a.b") is True
+        assert index.add("a.b") is False
+        assert index.discard("user_agent") is True
+        assert index.discard("missing") is False
+
+        assert list(index) == ["a.b", "user.name", "user.prefs.theme"]
+        assert "a.b" in index and "user_agent" not in index
+        assert len(index) == 3
+
+    def test_prefix_and_namespace(self):
+        """Prefix scans return only keys sharing the prefix."""
+        index = KeyIndex(KEYS)
+        assert index.prefix("user") == ["user.name", "user.prefs.theme", "user_agent"]
+        assert index.namespace("user") == ["user.name", "user.prefs.theme"]
+        assert index.namespace("nothing") == []
+
+    def test_discard_prefix(self):
+        """Namespace removal drops a contiguous run of keys."""
+        index = KeyIndex(KEYS)
+        removed = index.discard_prefix("errors.")
+        assert removed == ["errors.node_a", "errors.node_b"]
+        assert "errors.node_a" not in index
+        assert list(index) == sorted(set(KEYS) - set(removed))
+
+    @pytest.mark.parametrize(
+        "pattern, prefix",
+        [
+            ("user.*", "user."),
+            ("*.name", ""),
+            ("errors.node_?", "errors.node_"),
+            ("a[bc].x", "a"),
+            ("exact.key", "exact.key"),
+        ],
+    )
+    def test_glob_prefix(self, pattern, prefix):
+        """The literal prefix stops at the first wildcard."""
+        assert glob_prefix(pattern) == prefix
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            "user.*",
+            "*.name",
+            "operations.*.started",
+            "errors.node_?",
+            "user.nam[ef]",
+            "shared.data",
+            "missing",
+            "*",
+        ],
+    )
+    def test_glob_matches_fnmatch(self, pattern):
+        """Glob selection agrees with fnmatch.filter."""
+        index = KeyIndex(KEYS)
+        assert index.glob(pattern) == sorted(fnmatch.filter(KEYS, pattern))
+
+    def test_select_randomized(self):
+        """Multi-pattern selection agrees with fnmatch under random edits."""
+        rng = random.Random(7)
+        names = [f"{ns}.{leaf}" for ns in ("user", "shared", "ops") for leaf in "abcd"]
+        present = set()
+        index = KeyIndex()
+        patterns = ["user.*", "*.a", "ops.[bc]", "shared.?"]
+        for _ in range(300):
+            key = rng.choice(names)
+            if rng.random() < 0.6:
+                index.add(key)
+                present.add(key)
+            else:
+                index.discard(key)
+                present.discard(key)
+            chosen = rng.sample(patterns, rng.randint(1, 3))
+            expected = set()
+            for pattern in chosen:
+                expected.update(fnmatch.filter(present, pattern))
+            assert index.select(chosen) == sorted(expected)
+        assert list(index) == sorted(present)
@@ -0,0 +1,227 @@
+"""Tests for the copy-on-write LayeredContext."""
+
+import pytest
+from intent_kit.core.context import ContextPatch, DefaultContext, LayeredContext
+from intent_kit.core.context.layered import MAX_LOCAL_LAYERS
+from intent_kit.core.exceptions import ContextConflictError
+
+
+def make_base():
+    base = DefaultContext()
+    base.set("shared.tenant", "acme")
+    base.set("user.name", "Alice")
+    base.set("user.tags", ["a"])
+    return base
+
+
+class TestLayeredContext:
+    """Test LayeredContext reads, writes, snapshots, forks and commits."""
+
+    def test_reads_fall_through_and_writes_stay_local(self):
+        """Children see the parent but never write to it."""
+        base = make_base()
+        child = base.fork()
+
+        assert isinstance(child, LayeredContext)
+        assert child.get("user.name") == "Alice"
+        child.set("user.name", "Bob")
+        child.set("tmp.scratch", 1)
+
+        assert child.get("user.name") == "Bob"
+        assert child.has("tmp.scratch")
+        assert base.get("user.name") == "Alice"
+        assert not base.has("tmp.scratch")
+        assert list(child.keys()) == sorted(
+            ["shared.tenant", "tmp.scratch", "user.name", "user.tags"]
+        )
+        assert child.changes() == {"user.name": "Bob", "tmp.scratch": 1}
+
+    def test_apply_patch_merges_with_inherited_values(self):
+        """Merge policies see the value inherited from the parent."""
+        child = make_base().fork()
+        child.apply_patch(
+            ContextPatch(data={"user.tags": ["b"]}, policy={"user.tags": "append_list"})
+        )
+        assert child.get("user.tags") == ["a", "b"]
+
+    def test_snapshot_is_frozen_view(self):
+        """Snapshots share layers but do not see later writes."""
+        child = make_base().fork()
+        child.set("user.name", "Bob")
+        snap = child.snapshot()
+        child.set("user.name", "Carol")
+
+        assert snap["user.name"] == "Bob"
+        assert child.get("user.name") == "Carol"
+        assert dict(snap) == {
+            "shared.tenant": "acme",
+            "user.name": "Bob",
+            "user.tags": ["a"],
+        }
+        with pytest.raises(TypeError):
+            snap["user.name"] = "Mallory"  # type: ignore[index]
+
+    def test_fork_is_isolated_both_ways(self):
+        """Siblings and parents do not see each other's later writes."""
+        parent = make_base().fork()
+        parent.set("user.step", 1)
+        child = parent.fork()
+        parent.set("user.step", 2)
+        child.set("user.other", True)
+
+        assert child.get("user.step") == 1
+        assert parent.get("user.step") == 2
+        assert not parent.has("user.other")
+
+    def test_local_layers_are_compacted(self):
+        """Repeated snapshots do not grow the read chain without bound."""
+        ctx = LayeredContext({"shared.x": 0})
+        snaps = []
+        for i in range(MAX_LOCAL_LAYERS * 3):
+            ctx.set("user.i", i)
+            snaps.append(ctx.snapshot())
+
+        assert ctx.depth <= MAX_LOCAL_LAYERS + 2
+        assert [s["user.i"] for s in snaps] == list(range(MAX_LOCAL_LAYERS * 3))
+
+    def test_commit_applies_single_patch(self):
+        """commit() applies the overlay to the parent as one patch."""
+        base = make_base()
+        child = base.fork()
+        child.set("user.name", "Bob")
+        child.snapshot()
+        child.set("shared.plan", "pro")
+        child.set("private.token", "secret")
+
+        patch = child.commit(provenance="request-1")
+
+        assert patch["data"] == {"user.name": "Bob", "shared.plan": "pro"}
+        assert patch["provenance"] == "request-1"
+        assert base.get("user.name") == "Bob"
+        assert base.get("shared.plan") == "pro"
+        assert not base.has("private.token")
+        assert child.changes() == {}
+        assert child.get("shared.plan") == "pro"
+
+    def test_commit_into_layered_parent(self):
+        """Nested commits land in the parent's overlay, not the base."""
+        base = make_base()
+        session = base.fork()
+        request = session.fork()
+        request.set("user.name", "Bob")
+        request.commit(policy={"user.name": "first_write_wins"})
+
+        assert session.get("user.name") == "Alice"
+        request.set("user.mood", "happy")
+        request.commit()
+
+        assert session.get("user.mood") == "happy"
+        assert not base.has("user.mood")
+
+    def test_commit_requires_parent_context(self):
+        """Mapping parents are read-only."""
+        ctx = LayeredContext({"user.name": "Alice"})
+        ctx.set("user.name", "Bob")
+        with pytest.raises(ValueError):
+            ctx.commit()
+
+    def test_commit_surfaces_conflicts(self):
+        """Parent merge conflicts propagate from commit()."""
+        child = make_base().fork()
+        child.set("user.tags", "not-a-list")
+        with pytest.raises(ContextConflictError):
+            child.commit(policy={"user.tags": "append_list"})
+
+    def test_fingerprint_matches_flat_context(self):
+        """Layering does not change the fingerprint of the visible state."""
+        child = make_base().fork()
+        child.fingerprint()
+        child.set("user.name", "Bob")
+        child.snapshot()
+        child.set("tmp.x", 1)
+
+        flat = DefaultContext()
+        flat.merge_from(child.snapshot())
+        assert child.fingerprint() == flat.fingerprint()
+        assert child.fingerprint(["*"]) == flat.fingerprint(["*"])
+
+    def test_delete_inherited_keys(self):
+        """Deleting inherited keys hides them locally and on commit."""
+        base = make_base()
+        child = base.fork()
+        child.fingerprint()
+
+        assert child.delete_namespace("user") == 2
+        assert not child.has("user.name")
+        assert child.get("user.name", "gone") == "gone"
+        assert list(child.keys()) == ["shared.tenant"]
+        assert dict(child.snapshot()) == {"shared.tenant": "acme"}
+        assert child.deleted_keys() == ["user.name", "user.tags"]
+        flat = DefaultContext()
+        flat.set("shared.tenant", "acme")
+        assert child.fingerprint() == flat.fingerprint()
+        assert base.get("user.name") == "Alice"
+
+        child.set("user.name", "Bob")
+        assert child.get("user.name") == "Bob"
+        child.commit()
+        assert base.get("user.name") == "Bob"
+        assert not base.has("user.tags")
+
+    def test_commit_forwards_telemetry(self):
+        """Errors and operations recorded in a fork reach the parent on commit."""
+        base = DefaultContext(telemetry_capacity=4)
+        child = base.fork()
+        child.add_error(where="node", err="boom")
+        child.track_operation(name="op", status="completed")
+
+        assert child.telemetry("errors").capacity == 4
+        assert base.get_errors() == []
+        child.commit()
+        assert [e["error"] for e in base.get_errors()] == ["boom"]
+        assert [o["name"] for o in base.get_operations()] == ["op"]
+        assert child.get_errors() == []
+
+    def test_appends_do_not_leak_into_snapshots_or_forks(self):
+        """Frozen layers are never extended in place."""
+        ctx = LayeredContext(make_base())
+        append = {"policy": {"user.log": "append_list"}}
+        ctx.apply_patch(ContextPatch(data={"user.log": [1]}, **append))
+        snap = ctx.snapshot()
+        child = ctx.fork()
+        ctx.apply_patch(ContextPatch(data={"user.log": [2]}, **append))
+        child.apply_patch(ContextPatch(data={"user.log": [3]}, **append))
+
+        assert snap["user.log"] == [1]
+        assert ctx.get("user.log") == [1, 2]
+        assert child.get("user.log") == [1, 3]
+
+    def test_sibling_forks_of_default_context_are_isolated(self):
+        """One fork's commit is not visible to a sibling forked before it."""
+        base = make_base()
+        first = base.fork()
+        second = base.fork()
+        first.set("user.name", "Bob")
+        first.commit()
+        base.set("shared.plan", "pro")
+        base.delete("user.tags")
+
+        assert base.get("user.name") == "Bob"
+        assert second.get("user.name") == "Alice"
+        assert not second.has("shared.plan")
+        assert second.get("user.tags") == ["a"]
+        assert base.fork().get("user.name") == "Bob"
+
+    def test_parent_appends_do_not_reach_forks(self):
+        """In-place appends on the parent stop once it has been forked."""
+        base = DefaultContext()
+        append = {"policy": {"user.history": "append_list"}}
+        base.apply_patch(ContextPatch(data={"user.history": [1]}, **append))
+        child = base.fork()
+        seen = child.get("user.history")
+        base.apply_patch(ContextPatch(data={"user.history": [2]}, **append))
+        base.apply_patch(ContextPatch(data={"user.history": [3]}, **append))
+
+        assert seen == [1]
+        assert child.get("user.history") == [1]
+        assert base.get("user.history") == [1, 2, 3]
@@ -1,7 +1,13 @@
 """Tests for context merge policies."""
 
 import pytest
-from intent_kit.core.context.policies import apply_merge
+from intent_kit.core.context.policies import (
+    apply_merge,
+    apply_merge_many,
+    register_reducer,
+    top_k,
+    unregister_reducer,
+)
 from intent_kit.core.exceptions import ContextConflictError
 
 
@@ -162,3 +168,117 @@ class TestMergePolicies:
             policy="first_write_wins", existing=True, incoming=False, key="test_key"
         )
         assert result
+
+
+class TestReducers:
+    """Test the reducer registry behind the reduce policy."""
+
+    @pytest.fixture(autouse=True)
+    def cleanup(self):
+        yield
+        for key in ("metrics.total", "metrics.*", "custom"):
+            unregister_reducer(key)
+
+    def reduce(self, key, existing, incoming):
+        return apply_merge(
+            policy="reduce", existing=existing, incoming=incoming, key=key
+        )
+
+    @pytest.mark.parametrize(
+        "name, values, expected",
+        [
+            ("sum", [1, 2, 3.5], 6.5),
+            ("max", [3, 9, 4], 9),
+            ("min", [3, 9, 4], 3),
+            ("counter", ["a", ["a", "b"], {"b": 2}], {"a": 2, "b": 3}),
+            ("set_union", [["a", "b"], "c", ["b", "d"]], ["a", "b", "c", "d"]),
+        ],
+    )
+    def test_builtin_reducers(self, name, values, expected):
+        """Builtins fold from None and agree with their bulk form."""
+        register_reducer("metrics.total", name)
+        folded = None
+        for value in values:
+            folded = self.reduce("metrics.total", folded, value)
+        assert folded == expected
+        bulk = apply_merge_many(
+            policy="reduce", existing=None, incoming_values=values, key="metrics.total"
+        )
+        assert bulk == expected
+
+    def test_top_k(self):
+        """top_k keeps the largest items, largest first."""
+        register_reducer("metrics.*", top_k(2, key=lambda item: item["score"]))
+        best = self.reduce("metrics.best", None, [{"score": 1}, {"score": 5}])
+        best = self.reduce("metrics.best", best, {"score": 3})
+        assert best == [{"score": 5}, {"score": 3}]
+
+    def test_custom_callable_and_local_precedence(self):
+        """Custom callables work and local reducers win over global ones."""
+        register_reducer(
+            "custom", lambda existing, incoming: (existing or "") + incoming
+        )
+        assert self.reduce("custom", "ab", "c") == "abc"
+        local = {"custom": top_k(1)}
+        result = apply_merge(
+            policy="reduce", existing=[1], incoming=[4, 2], key="custom", reducers=local
+        )
+        assert result == [4]
+
+    def test_unknown_builtin(self):
+        """Unknown builtin names are rejected at registration."""
+        with pytest.raises(ValueError, match="Unknown reducer"):
+            register_reducer("custom", "median")
+
+
+class TestBulkMerges:
+    """apply_merge_many must equal folding apply_merge."""
+
+    @pytest.mark.parametrize(
+        "policy, existing, values",
+        [
+            ("last_write_wins", 1, [2, 3]),
+            ("first_write_wins", None, [None, 2, 3]),
+            ("append_list", [0], [[1], [2, 3], []]),
+            ("merge_dict", {"a": 1}, [{"b": 2}, {"a": 3}]),
+        ],
+    )
+    def test_matches_fold(self, policy, existing, values):
+        folded = existing
+        for value in values:
+            folded = apply_merge(
+                policy=policy, existing=folded, incoming=value, key="k"
+            )
+        bulk = apply_merge_many(
+            policy=policy, existing=existing, incoming_values=values, key="k"
+        )
+        assert bulk == folded
+
+    def test_append_list_in_place(self):
+        """in_place extends the existing list instead of copying it."""
+        existing = [1]
+        merged = apply_merge(
+            policy="append_list",
+            existing=existing,
+            incoming=[2],
+            key="k",
+            in_place=True,
+        )
+        assert merged is existing and existing == [1, 2]
+        copied = apply_merge(
+            policy="append_list", existing=existing, incoming=[3], key="k"
+        )
+        assert copied is not existing and existing == [1, 2]
+
+    def test_append_list_bulk_validates_before_mutating(self):
+        """A bad incoming value leaves the existing list untouched."""
+        existing = [1]
+        with pytest.raises(ContextConflictError):
+            apply_merge_many(
+                policy="append_list",
+                existing=existing,
+                incoming_values=[[2], "oops"],
+                key="k",
+                in_place=True,
+            )
+        assert existing == [1]
@@ -0,0 +1,113 @@
+"""Tests for per-key provenance tracking."""
+
+import pytest
+from intent_kit.core.context import ContextPatch, DefaultContext
+from intent_kit.core.exceptions import ContextConflictError
+from intent_kit.core.context.provenance import ProvenanceTracker
+
+
+class TestProvenanceTracker:
+    """Test the interned last-writer records."""
+
+    def test_interns_writers(self):
+        """Each writer id is stored once, however many keys it writes."""
+        tracker = ProvenanceTracker()
+        a = tracker.intern("node_a")
+        assert tracker.intern("node_a") == a
+        assert tracker.intern(None) == tracker.intern("unknown") != a
+
+        tracker.record("user.name", a, 3, 1.0)
+        tracker.record("user.age", a, -1, 2.0)
+        record = tracker.get("user.name")
+        assert (record.writer, record.step, record.timestamp) == ("node_a", 3, 1.0)
+        assert tracker.get("user.age").step is None
+        assert tracker.get("missing") is None
+        assert tracker.keys_written_by("node_a") == ["user.age", "user.name"]
+        assert tracker.keys_written_by("nobody") == []
+
+    def test_queries(self):
+        """last_writers filters by glob; writer_counts ranks writers."""
+        tracker = ProvenanceTracker()
+        a, b = tracker.intern("a"), tracker.intern("b")
+        for key in ("user.x", "user.y", "tmp.z"):
+            tracker.record(key, a, 1, 0.0)
+        tracker.record("user.y", b, 2, 0.0)
+
+        assert tracker.last_writers(["user.*"]) == {"user.x": "a", "user.y": "b"}
+        assert tracker.writer_counts() == {"a": 2, "b": 1}
+        tracker.forget("tmp.z")
+        assert len(tracker) == 2
+
+
+class TestContextProvenance:
+    """Test provenance recorded by DefaultContext writes."""
+
+    def test_disabled_by_default(self):
+        """Without track_provenance nothing is recorded."""
+        ctx = DefaultContext()
+        ctx.set("user.name", "Alice", modified_by="node_a")
+        assert ctx.provenance_tracker is None
+        assert ctx.provenance("user.name") is None
+        assert ctx.last_writers() == {}
+
+    def test_set_and_patches(self):
+        """set() records modified_by; patches record provenance and step."""
+        ctx = DefaultContext(track_provenance=True)
+        ctx.set("user.name", "Alice", modified_by="extract_name")
+        ctx.set("user.city", "Paris")
+        ctx.apply_patches(
+            [
+                ContextPatch(data={"user.name": "Bob"}, provenance="node_a", step=4),
+                ContextPatch(
+                    data={"user.log": [1], "user.name": "Carol"},
+                    policy={"user.log": "append_list"},
+                    provenance="node_b",
+                    step=5,
+                ),
+            ]
+        )
+
+        record = ctx.provenance("user.name")
+        assert (record.writer, record.step) == ("node_b", 5)
+        assert ctx.provenance("user.city").writer == "unknown"
+        assert ctx.provenance("user.city").step is None
+        assert ctx.last_writers(["user.*"]) == {
+            "user.city": "unknown",
+            "user.log": "node_b",
+            "user.name": "node_b",
+        }
+
+    def test_failed_patch_records_nothing(self):
+        """Atomic patches leave provenance untouched when they fail."""
+        ctx = DefaultContext(track_provenance=True)
+        ctx.set("user.log", "not-a-list", modified_by="setup")
+        with pytest.raises(ContextConflictError):
+            ctx.apply_patch(
+                ContextPatch(
+                    data={"user.log": [1]},
+                    policy={"user.log": "append_list"},
+                    provenance="node_a",
+                )
+            )
+        assert ctx.provenance("user.log").writer == "setup"
+
+    def test_delete_and_merge_from(self):
+        """Deleting forgets a key; merge_from is recorded as the writer."""
+        ctx = DefaultContext(track_provenance=True)
+        ctx.set("user.name", "Alice", modified_by="a")
+        ctx.delete("user.name")
+        assert ctx.provenance("user.name") is None
+
+        ctx.merge_from({"user.age": 30})
+        assert ctx.provenance("user.age").writer == "merge_from"
+
+    def test_layered_commit_keeps_writers(self):
+        """Committing a fork copies its writers into the parent."""
+        base = DefaultContext(track_provenance=True)
+        base.set("user.name", "Alice", modified_by="setup")
+        child = base.fork()
+        child.set("user.name", "Bob", modified_by="node_a")
+        assert base.provenance("user.name").writer == "setup"
+
+        child.commit()
+        assert base.provenance("user.name").writer == "node_a"
@@ -0,0 +1,202 @@
+"""Tests for compact binary context serialization."""
+
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+from intent_kit.core.context import DefaultContext
+from intent_kit.core.context.serialization import (
+    DEFAULT_REGISTRY,
+    TypeRegistry,
+    decode_context,
+    encode_context,
+    pack,
+    unpack,
+)
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+    def __eq__(self, other):
+        return isinstance(other, Point) and (self.x, self.y) == (other.x, other.y)
+
+
+class LLMServiceStub:
+    """Stands in for a process-local service object."""
+
+
+class TestPack:
+    """Test the MessagePack encoder and decoder."""
+
+    @pytest.mark.parametrize(
+        "value, encoded",
+        [
+            ({"compact": True, "schema": 0}, b"\x82\xa7compact\xc3\xa6schema\x00"),
+            (None, b"\xc0"),
+            (-1, b"\xff"),
+            (-33, b"\xd0\xdf"),
+            (200, b"\xcc\xc8"),
+            (1.5, b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00"),
+            ([1, "a"], b"\x92\x01\xa1a"),
+            (b"\x00", b"\xc4\x01\x00"),
+        ],
+    )
+    def test_wire_format(self, value, encoded):
+        """Encodings match the MessagePack specification."""
+        assert pack(value) == encoded
+        assert unpack(encoded) == value
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            0,
+            127,
+            128,
+            2**16,
+            2**32,
+            2**64 - 1,
+            -(2**7),
+            -(2**15) - 1,
+            -(2**31) - 1,
+            -(2**63),
+            "",
+            "é" * 40,
+            "x" * 70000,
+            list(range(20)),
+            {str(i): i for i in range(20)},
+            [{"nested": [True, False, None, 0.25]}],
+            (1, (2, 3)),
+            {1, 2, 3},
+            frozenset({"a"}),
+            datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+            date(2024, 5, 1),
+        ],
+    )
+    def test_round_trip(self, value):
+        """Values, including registered extension types, decode unchanged."""
+        decoded = unpack(pack(value))
+        assert decoded == value
+        assert type(decoded) is type(value)
+
+    def test_unsupported_values(self):
+        """Unregistered types and integers beyond 64 bits are rejected."""
+        with pytest.raises(TypeError, match="register_type"):
+            pack(object())
+        with pytest.raises(OverflowError):
+            pack(2**64)
+
+    def test_malformed_data(self):
+        """Truncated, trailing or unknown-extension data raises ValueError."""
+        with pytest.raises(ValueError, match="Truncated"):
+            unpack(pack("hello")[:-1])
+        with pytest.raises(ValueError, match="Malformed"):
+            unpack(pack(1.5)[:-1])
+        with pytest.raises(ValueError, match="Trailing"):
+            unpack(pack(1) + b"\x00")
+        with pytest.raises(ValueError, match="Unknown extension"):
+            unpack(b"\xd4\x63\x00")
+
+    def test_local_registry(self):
+        """Types registered locally fall back to the default registry."""
+        registry = TypeRegistry(parent=DEFAULT_REGISTRY)
+        registry.register(Point, 16, lambda p: [p.x, p.y], lambda v: Point(*v))
+        value = {"points": (Point(1, 2),)}
+
+        assert unpack(pack(value, registry), registry) == value
+        with pytest.raises(TypeError):
+            pack(value)
+        with pytest.raises(ValueError, match="already used"):
+            registry.register(LLMServiceStub, 16, str, str)
+
+
+class TestContextEnvelope:
+    """Test encoding contexts, runtime references and deltas."""
+
+    def make_context(self):
+        ctx = DefaultContext()
+        ctx.set("user.name", "Alice")
+        ctx.set("user.tags", ("vip", "beta"))
+        ctx.set("user.history", [{"intent": "greet", "turn": i} for i in range(10)])
+        ctx.set("llm_service", LLMServiceStub())
+        ctx.set("metadata", {"name": "demo"})
+        return ctx
+
+    def test_round_trip_with_runtime_references(self):
+        """Runtime objects are referenced by key and supplied by the receiver."""
+        ctx = self.make_context()
+        service = LLMServiceStub()
+
+        data = encode_context(ctx)
+        state = decode_context(data, runtime={"llm_service": service})
+
+        assert state["llm_service"] is service
+        assert "metadata" not in state
+        expected = dict(ctx.snapshot())
+        del expected["llm_service"], expected["metadata"]
+        del state["llm_service"]
+        assert state == expected
+
+    def test_non_portable_modes(self):
+        """Unencodable values are referenced, skipped or rejected."""
+        snapshot = {"user.name": "Alice", "user.client": object()}
+
+        referenced = encode_context(snapshot)
+        assert decode_context(referenced, runtime={"user.client": 1}) == {
+            "user.name": "Alice",
+            "user.client": 1,
+        }
+        skipped = encode_context(snapshot, non_portable="skip")
+        assert decode_context(skipped, runtime={"user.client": 1}) == {
+            "user.name": "Alice"
+        }
+        with pytest.raises(TypeError, match="user.client"):
+            encode_context(snapshot, non_portable="error")
+        with pytest.raises(ValueError, match="non_portable"):
+            encode_context(snapshot, non_portable="ignore")
+
+    def test_smaller_than_json(self):
+        """The binary form is more compact than JSON for the same values."""
+        ctx = self.make_context()
+        portable = {
+            k: list(v) if isinstance(v, tuple) else v
+            for k, v in ctx.snapshot().items()
+            if k != "llm_service"
+        }
+        assert len(encode_context(ctx)) < len(json.dumps(portable))
+
+    def test_delta(self):
+        """Deltas carry only changed and deleted keys and rebuild the state."""
+        ctx = self.make_context()
+        base = dict(ctx.snapshot())
+        ctx.set("user.name", "Bob")
+        ctx.delete("user.tags")
+        ctx.set("user.city", "Paris")
+
+        full = encode_context(ctx)
+        delta = encode_context(ctx, base=base)
+        assert len(delta) < len(full) / 4
+
+        state = decode_context(delta, base=base)
+        assert state == dict(ctx.snapshot())
+        # Unchanged runtime objects are kept from the base
+        assert state["llm_service"] is base["llm_service"]
+
+        with pytest.raises(ValueError, match="base"):
+            decode_context(delta)
+
+    def test_delta_treats_type_changes_as_changes(self):
+        """1 -> True is a change even though the values compare equal."""
+        base = {"user.flag": 1}
+        state = decode_context(
+            encode_context({"user.flag": True}, base=base), base=base
+        )
+        assert state["user.flag"] is True
+
+    def test_rejects_other_payloads(self):
+        """Decoding checks the envelope shape and format version."""
+        with pytest.raises(ValueError, match="Not an encoded context"):
+            decode_context(pack({"user.name": "Alice"}))
+        with pytest.raises(ValueError, match="version"):
+            decode_context(pack([99, False, {}, [], []]))
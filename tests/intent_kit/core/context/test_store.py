@@ -0,0 +1,201 @@
+"""Tests for the SQLite-backed ContextStore."""
+
+import threading
+
+import pytest
+from intent_kit.core.context import (
+    ContextPatch,
+    ContextStore,
+    DefaultContext,
+    StoredContext,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    with ContextStore(str(tmp_path / "sessions.db"), ttl=60, clock=clock) as store:
+        yield store
+
+
+def seeded(store, session_id="s1"):
+    ctx = store.load(session_id)
+    ctx.set("user.name", "Alice")
+    ctx.set("user.tags", ["a", "b"])
+    ctx.set("shared.count", 3)
+    store.save(ctx)
+    return ctx
+
+
+class TestContextStore:
+    """Test loading, delta saves, lazy loading and expiry."""
+
+    def test_round_trip(self, store, clock):
+        """Saved state loads back, in another store on the same file."""
+        seeded(store)
+        with ContextStore(store.path, clock=clock) as other:
+            ctx = other.load("s1")
+            assert isinstance(ctx, StoredContext)
+            assert ctx.snapshot() == {
+                "user.name": "Alice",
+                "user.tags": ["a", "b"],
+                "shared.count": 3,
+            }
+        assert store.load("unknown").snapshot() == {}
+
+    def test_wal_mode(self, store):
+        """Pooled connections use write-ahead logging."""
+        with store._pool.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_saves_only_changes(self, store):
+        """A save writes the keys written or deleted since the last save."""
+        ctx = seeded(store)
+        assert store.save(ctx) == 0
+
+        ctx = store.load("s1")
+        ctx.set("user.name", "Bob")
+        ctx.delete("user.tags")
+        ctx.apply_patch(
+            ContextPatch(data={"user.log": [1]}, policy={"user.log": "append_list"})
+        )
+        assert ctx.dirty_keys == ["user.log", "user.name"]
+        assert ctx.deleted_keys == ["user.tags"]
+        assert store.save(ctx) == 3
+        assert ctx.dirty_keys == [] and ctx.deleted_keys == []
+
+        assert store.load("s1").snapshot() == {
+            "user.name": "Bob",
+            "user.log": [1],
+            "shared.count": 3,
+        }
+
+    def test_lazy_loading(self, store, monkeypatch):
+        """Values are fetched on first access, once."""
+        seeded(store)
+        fetched = []
+        original = store._fetch
+
+        def fetch(session_id, keys):
+            fetched.append(sorted(keys))
+            return original(session_id, keys)
+
+        monkeypatch.setattr(store, "_fetch", fetch)
+        ctx = store.load("s1")
+
+        assert sorted(ctx.keys()) == ["shared.count", "user.name", "user.tags"]
+        assert ctx.has("user.tags")
+        assert fetched == []
+        assert ctx.get("user.name") == "Alice"
+        assert ctx.get("user.name") == "Alice"
+        assert fetched == [["user.name"]]
+
+        ctx.delete("user.tags")
+        ctx.set("shared.count", 4)
+        assert ctx.snapshot() == {"user.name": "Alice", "shared.count": 4}
+        assert fetched == [["user.name"]]
+
+    def test_eager_loading(self, store, monkeypatch):
+        """lazy=False reads every value up front."""
+        seeded(store)
+        monkeypatch.setattr(store, "_fetch", None)
+        ctx = store.load("s1", lazy=False)
+        assert ctx.get("user.tags") == ["a", "b"]
+        assert ctx.dirty_keys == []
+
+    def test_lazy_fingerprint_matches_eager(self, store):
+        """Fingerprints do not depend on how values were loaded."""
+        seeded(store)
+        assert (
+            store.load("s1").fingerprint() == store.load("s1", lazy=False).fingerprint()
+        )
+
+    def test_unpersisted_keys(self, store):
+        """tmp.* keys and values JSON cannot encode are skipped."""
+        ctx = store.load("s1")
+        ctx.set("tmp.scratch", 1)
+        ctx.set("llm_service", object())
+        ctx.set("user.name", "Alice")
+        assert store.save(ctx) == 1
+        assert store.load("s1").snapshot() == {"user.name": "Alice"}
+
+    def test_save_other_context(self, store):
+        """Other contexts replace the session's state and need a session id."""
+        seeded(store)
+        ctx = DefaultContext()
+        ctx.set("user.name", "Carol")
+        with pytest.raises(ValueError, match="session_id"):
+            store.save(ctx)
+
+        store.save(ctx, session_id="s1")
+        assert store.load("s1").snapshot() == {"user.name": "Carol"}
+
+        # A StoredContext saved under another id is copied in full
+        store.save(store.load("s1"), session_id="s2")
+        assert store.load("s2").snapshot() == {"user.name": "Carol"}
+
+    def test_ttl_expiry(self, store, clock):
+        """Sessions expire ttl seconds after their last save."""
+        seeded(store, "s1")
+        clock.now += 30
+        seeded(store, "s2")
+        clock.now += 40
+
+        assert store.sessions() == ["s2"]
+        assert store.load("s1").snapshot() == {}
+        assert store.load("s2").get("user.name") == "Alice"
+
+        clock.now += 60
+        seeded(store, "s3")
+        assert store.purge_expired() == 1
+        assert store.sessions() == ["s3"]
+
+    def test_delete_session(self, store):
+        """Deleted sessions load empty."""
+        seeded(store)
+        assert store.delete_session("s1") is True
+        assert store.delete_session("s1") is False
+        assert store.load("s1").snapshot() == {}
+
+    def test_rejects_in_memory_database(self):
+        """Each pooled connection would see its own empty database."""
+        with pytest.raises(ValueError, match="database file"):
+            ContextStore(":memory:")
+
+    def test_concurrent_sessions(self, store):
+        """Threads sharing a store save and load their sessions independently."""
+        errors = []
+
+        def worker(index):
+            try:
+                for turn in range(20):
+                    ctx = store.load(f"s{index}")
+                    ctx.set("user.turns", (ctx.get("user.turns") or 0) + 1)
+                    ctx.set(f"user.turn{turn}", turn)
+                    store.save(ctx)
+            except Exception as e:  # surfaced below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors, errors
+        for index in range(8):
+            ctx = store.load(f"s{index}")
+            assert ctx.get("user.turns") == 20
+            assert len(ctx.keys_with_prefix("user.turn")) == 21
@@ -0,0 +1,128 @@
+"""Tests for ContextTransaction."""
+
+import pytest
+from intent_kit.core.context import ContextPatch, ContextTransaction, DefaultContext
+from intent_kit.core.exceptions import ContextConflictError
+
+
+def patch(provenance, data, policy=None):
+    p = ContextPatch(data=data, provenance=provenance)
+    if policy:
+        p["policy"] = policy
+    return p
+
+
+class TestContextTransaction:
+    """Test staging, conflict detection and atomic commits."""
+
+    def test_commit_applies_in_staging_order(self):
+        """Patches apply in the order staged, not sorted by provenance."""
+        ctx = DefaultContext()
+        tx = ContextTransaction(ctx)
+        for provenance in ("node_b", "node_a"):
+            name = provenance[-1]
+            tx.stage(
+                patch(
+                    provenance,
+                    {"user.last": name, "user.log": [name]},
+                    policy={"user.log": "append_list"},
+                )
+            )
+        applied = tx.commit()
+        assert [p["provenance"] for p in applied] == ["node_b", "node_a"]
+        assert ctx.snapshot() == {"user.last": "a", "user.log": ["b", "a"]}
+
+    def test_nothing_written_before_commit(self):
+        """Staged patches are invisible until commit()."""
+        ctx = DefaultContext()
+        with ContextTransaction(ctx) as tx:
+            tx.stage(patch("a", {"user.name": "Alice"}))
+            assert not ctx.has("user.name")
+            assert len(tx) == 1
+        assert ctx.get("user.name") == "Alice"
+
+    def test_context_manager_discards_on_error(self):
+        """An exception inside the block drops the staged patches."""
+        ctx = DefaultContext()
+        with pytest.raises(RuntimeError):
+            with ContextTransaction(ctx) as tx:
+                tx.stage(patch("a", {"user.name": "Alice"}))
+                raise RuntimeError("boom")
+        assert not ctx.has("user.name")
+
+    @pytest.mark.parametrize(
+        "staged, expected",
+        [
+            ([patch("a", {"k": 1}), patch("b", {"k": 2})], {"k": ["a", "b"]}),
+            ([patch("a", {"k": 1}), patch("b", {"k": 1})], {}),
+            ([patch("a", {"k": 1}), patch("a", {"k": 2})], {}),
+            (
+                [
+                    patch("a", {"k": [1]}, {"k": "append_list"}),
+                    patch("b", {"k": [2]}, {"k": "append_list"}),
+                ],
+                {},
+            ),
+            (
+                [
+                    patch("a", {"k": {"x": 1}}, {"k": "merge_dict"}),
+                    patch("b", {"k": {"y": 2}}, {"k": "merge_dict"}),
+                ],
+                {},
+            ),
+            (
+                [
+                    patch("a", {"k": {"x": 1}}, {"k": "merge_dict"}),
+                    patch("b", {"k": {"x": 2}}, {"k": "merge_dict"}),
+                ],
+                {"k": ["a", "b"]},
+            ),
+            (
+                [patch("a", {"k": [1]}, {"k": "append_list"}), patch("b", {"k": [2]})],
+                {"k": ["a", "b"]},
+            ),
+        ],
+    )
+    def test_conflicts(self, staged, expected):
+        """Only order-dependent writes from different provenances conflict."""
+        tx = ContextTransaction(DefaultContext())
+        for p in staged:
+            tx.stage(p)
+        assert tx.conflicts() == expected
+
+    def test_strict_mode_raises_and_writes_nothing(self):
+        """Strict transactions refuse conflicting writes."""
+        ctx = DefaultContext()
+        tx = ContextTransaction(ctx, strict=True)
+        tx.stage(patch("a", {"user.name": "Alice", "user.age": 30}))
+        tx.stage(patch("b", {"user.name": "Bob"}))
+        with pytest.raises(ContextConflictError, match="user.name <- a, b"):
+            tx.commit()
+        assert ctx.snapshot() == {}
+        assert len(tx) == 0
+
+    def test_failed_merge_is_atomic(self):
+        """A merge failure leaves every key of the batch unwritten."""
+        ctx = DefaultContext()
+        ctx.set("user.tags", "not-a-list")
+        tx = ContextTransaction(ctx)
+        tx.stage(patch("a", {"user.name": "Alice"}))
+        tx.stage(patch("b", {"user.tags": ["x"]}, {"user.tags": "append_list"}))
+        with pytest.raises(ContextConflictError):
+            tx.commit()
+        assert ctx.snapshot() == {"user.tags": "not-a-list"}
+
+    def test_apply_patch_is_atomic(self):
+        """apply_patch itself no longer leaves a patch half-applied."""
+        ctx = DefaultContext()
+        ctx.set("user.log", [1])
+        ctx.apply_patch(patch("a", {"user.log": [2]}, {"user.log": "append_list"}))
+        with pytest.raises(ContextConflictError):
+            ctx.apply_patch(
+                patch(
+                    "a",
+                    {"user.log": [3], "user.name": "Alice", "user.bad": 1},
+                    {"user.log": "append_list", "user.bad": "reduce"},
+                )
+            )
+        assert ctx.snapshot() == {"user.log": [1, 2]}
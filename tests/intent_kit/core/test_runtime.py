@@ -0,0 +1,69 @@
+"""Tests for the execution environment passed to nodes."""
+
+from dataclasses import FrozenInstanceError
+from types import SimpleNamespace
+
+import pytest
+
+from intent_kit.core.context import DefaultContext
+from intent_kit.core.runtime import ExecutionEnvironment, resolve_environment
+
+
+class TestExecutionEnvironment:
+    """ExecutionEnvironment construction and immutability."""
+
+    def test_for_dag_takes_metadata(self):
+        """The DAG's metadata becomes the environment's, default config included."""
+        service = object()
+        dag = SimpleNamespace(metadata={"default_llm_config": {"model": "m"}})
+        env = ExecutionEnvironment.for_dag(dag, llm_service=service)  # type: ignore[arg-type]
+        assert env.llm_service is service
+        assert env.default_llm_config == {"model": "m"}
+
+    def test_defaults(self):
+        env = ExecutionEnvironment()
+        assert env.llm_service is None
+        assert env.default_llm_config == {}
+        assert env.get_service("db", "fallback") == "fallback"
+
+    def test_immutable(self):
+        """Fields cannot be reassigned and the mappings are read-only."""
+        metadata = {"default_llm_config": {"model": "m"}}
+        env = ExecutionEnvironment(metadata=metadata, services={"db": 1})
+        with pytest.raises(FrozenInstanceError):
+            env.llm_service = None  # type: ignore[misc]
+        with pytest.raises(TypeError):
+            env.services["db"] = 2  # type: ignore[index]
+        metadata["other"] = 1
+        assert "other" not in env.metadata
+
+    def test_with_services(self):
+        """with_services returns a new environment and leaves the original alone."""
+        env = ExecutionEnvironment(services={"db": 1})
+        extended = env.with_services(cache=2)
+        assert dict(extended.services) == {"db": 1, "cache": 2}
+        assert dict(env.services) == {"db": 1}
+
+
+class TestLegacyContext:
+    """Environments for nodes executed with runtime objects in the context."""
+
+    def test_from_context(self):
+        service = object()
+        ctx = DefaultContext()
+        ctx.set("llm_service", service)
+        ctx.set("metadata", {"default_llm_config": {"model": "m"}})
+        env = ExecutionEnvironment.from_context(ctx)
+        assert env.llm_service is service
+        assert env.default_llm_config == {"model": "m"}
+
+    def test_from_context_without_runtime_keys(self):
+        env = ExecutionEnvironment.from_context(DefaultContext())
+        assert env == ExecutionEnvironment()
+
+    def test_resolve_prefers_given_environment(self):
+        ctx = DefaultContext()
+        ctx.set("llm_service", object())
+        env = ExecutionEnvironment()
+        assert resolve_environment(ctx, env) is env
+        assert resolve_environment(ctx).llm_service is ctx.get("llm_service")
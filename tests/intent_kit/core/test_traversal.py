@@ -1,10 +1,16 @@
 """Tests for the DAG traversal engine."""
 
 import pytest
-from typing import Any
+from typing import Any, Optional
+from unittest.mock import Mock, patch
 
 from intent_kit.core.traversal import run_dag
-from intent_kit.core import DAGBuilder, ExecutionResult, NodeProtocol
+from intent_kit.core import (
+    DAGBuilder,
+    ExecutionEnvironment,
+    ExecutionResult,
+    NodeProtocol,
+)
 from intent_kit.core.exceptions import TraversalLimitError, TraversalError
 from intent_kit.core.context import DefaultContext as Context
 
@@ -15,10 +21,34 @@ class MockNode(NodeProtocol):
     def __init__(self, result: ExecutionResult):
         self.result = result
 
-    def execute(self, user_input: str, ctx: Any) -> ExecutionResult:
+    def execute(
+        self,
+        user_input: str,
+        ctx: Any,
+        env: Optional[ExecutionEnvironment] = None,
+    ) -> ExecutionResult:
         return self.result
 
 
+class LegacyNode:
+    """Node written against the protocol before execution environments."""
+
+    def __init__(self):
+        self.calls: list = []
+
+    def execute(self, user_input: str, ctx: Any) -> ExecutionResult:
+        self.calls.append(user_input)
+        return ExecutionResult(data="done", next_edges=None, terminate=True)
+
+    @property
+    def context_read_keys(self) -> list:
+        return []
+
+    @property
+    def context_write_keys(self) -> list:
+        return []
+
+
 class TestTraversalEngine:
     """Test the DAG traversal engine."""
 
@@ -55,6 +85,21 @@ class TestTraversalEngine:
         assert result.terminate is True
         assert result.data == "result_c"
 
+    def test_legacy_two_argument_node(self):
+        """Nodes whose execute takes no env are still called."""
+        builder = DAGBuilder()
+        builder.add_node("A", "action", action=lambda **kwargs: "unused")
+        builder.set_entrypoints(["A"])
+        dag = builder.build()
+        node = LegacyNode()
+
+        with patch("intent_kit.core.traversal._create_node", return_value=node):
+            result, _ = run_dag(dag, "test input", ctx=Context())
+
+        assert node.calls == ["test input"]
+        assert result is not None
+        assert result.data == "done"
+
     def test_fan_out_execution(self):
         """Test that fan-out executes both branches."""
         # Create a fan-out DAG: A -> B, A -> C
@@ -415,3 +460,196 @@ class TestTraversalEngine:
         assert result is not None
         assert result.terminate is True
         assert result.data == "result_b"
+
+
+class RecordingContext(Context):
+    """Context recording the provenances of every batch of applied patches."""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def apply_patches(self, patches):
+        patches = list(patches)
+        self.batches.append([p.get("provenance") for p in patches])
+        super().apply_patches(patches)
+
+
+class TestFrontierCommits:
+    """Patches are applied once, per frontier, in node order."""
+
+    def test_patches_applied_once(self):
+        """A node's patch is not re-applied before its successors run."""
+        builder = DAGBuilder()
+        builder.add_node(
+            "A",
+            "action",
+            action=lambda **kwargs: "result_a",
+            terminate_on_success=False,
+        )
+        builder.add_node(
+            "B",
+            "action",
+            action=lambda **kwargs: "result_b",
+            terminate_on_success=False,
+        )
+        builder.add_node(
+            "C", "action", action=lambda **kwargs: "result_c", terminate_on_success=True
+        )
+        builder.add_edge("A", "B", "next")
+        builder.add_edge("B", "C", "next")
+        builder.set_entrypoints(["A"])
+        ctx = RecordingContext()
+
+        run_dag(builder.build(), "test input", ctx=ctx)
+
+        assert ctx.batches == [["A"], ["B"], ["C"]]
+        assert ctx.get("action_result") == "result_c"
+
+    def test_frontier_committed_together_in_step_order(self):
+        """Entrypoints form one frontier, committed in one batch in step order."""
+        builder = DAGBuilder()
+        seen = {}
+
+        def record(name):
+            def action(action_name=None, **kwargs):
+                seen[name] = action_name
+                return f"result_{name}"
+
+            return action
+
+        for name in ("B", "A", "C"):
+            builder.add_node(
+                name,
+                "action",
+                action=record(name),
+                context_read=["action_name"],
+                terminate_on_success=name == "C",
+            )
+        builder.add_edge("A", "C", "next")
+        builder.add_edge("B", "C", "next")
+        builder.set_entrypoints(["B", "A"])
+        ctx = RecordingContext()
+
+        result, ctx = run_dag(builder.build(), "test input", ctx=ctx)
+
+        assert ctx.batches == [["B", "A"], ["C"]]
+        # Siblings do not see each other's writes; C sees the committed frontier
+        assert seen["A"] is None and seen["B"] is None
+        assert seen["C"] == "A"
+        assert result.data == "result_C"
+
+    def test_failed_frontier_commits_nothing(self):
+        """A frontier that raises discards its patches; earlier ones stay."""
+        builder = DAGBuilder()
+
+        def fail(**kwargs):
+            raise RuntimeError("boom")
+
+        builder.add_node(
+            "A",
+            "action",
+            action=lambda **kwargs: "result_a",
+            terminate_on_success=False,
+        )
+        builder.add_node(
+            "B",
+            "action",
+            action=lambda **kwargs: "result_b",
+            terminate_on_success=False,
+        )
+        builder.add_node("C", "action", action=fail)
+        builder.add_edge("A", "B", "next")
+        builder.add_edge("A", "C", "next")
+        builder.set_entrypoints(["A"])
+        ctx = RecordingContext()
+
+        with pytest.raises(TraversalError, match="boom"):
+            run_dag(builder.build(), "test input", ctx=ctx)
+
+        assert ctx.batches == [["A"]]
+        assert ctx.get("action_result") == "result_a"
+
+    def test_provenance_records_node_and_step(self):
+        """With provenance tracking, each key names the node and step that wrote it."""
+        builder = DAGBuilder()
+        builder.add_node(
+            "A",
+            "action",
+            action=lambda **kwargs: "result_a",
+            terminate_on_success=False,
+        )
+        builder.add_node(
+            "B", "action", action=lambda **kwargs: "result_b", terminate_on_success=True
+        )
+        builder.add_edge("A", "B", "next")
+        builder.set_entrypoints(["A"])
+        ctx = Context(track_provenance=True)
+
+        run_dag(builder.build(), "test input", ctx=ctx)
+
+        record = ctx.provenance("action_result")
+        assert (record.writer, record.step) == ("B", 2)
+        assert ctx.provenance("llm_service") is None
+
+
+class TestRuntimeEnvironment:
+    """Runtime services reach nodes through the environment, not the context."""
+
+    def _classifier_dag(self):
+        builder = DAGBuilder()
+        builder.with_default_llm_config({"provider": "openai", "model": "gpt-4"})
+        builder.add_node("A", "classifier", output_labels=["greet"])
+        builder.add_node(
+            "B", "action", action=lambda **kwargs: "hi", terminate_on_success=True
+        )
+        builder.add_edge("A", "B", "greet")
+        builder.set_entrypoints(["A"])
+        return builder.build()
+
+    def _llm_service(self):
+        service = Mock()
+        service.get_client.return_value.generate.return_value = Mock(content="greet")
+        return service
+
+    def test_context_holds_no_runtime_objects(self):
+        """The LLM service and metadata are used but never written to the context."""
+        service = self._llm_service()
+        result, ctx = run_dag(self._classifier_dag(), "hello", llm_service=service)
+
+        assert result.data == "hi"
+        assert service.get_client.called
+        assert not ctx.has("llm_service")
+        assert not ctx.has("metadata")
+
+    def test_shared_environment(self):
+        """One environment serves many requests and is handed to every node."""
+        dag = self._classifier_dag()
+        service = self._llm_service()
+        env = ExecutionEnvironment.for_dag(dag, llm_service=service)
+
+        for _ in range(3):
+            result, _ = run_dag(dag, "hello", env=env)
+            assert result.data == "hi"
+        assert service.get_client.call_count == 3
+
+    def test_action_services(self):
+        """Action nodes receive requested services as keyword arguments."""
+        db = object()
+        seen = []
+        builder = DAGBuilder()
+        builder.add_node(
+            "A",
+            "action",
+            action=lambda db, **kwargs: seen.append(db) or "done",
+            services=["db"],
+        )
+        builder.set_entrypoints(["A"])
+        dag = builder.build()
+        env = ExecutionEnvironment.for_dag(dag, services={"db": db})
+
+        result, ctx = run_dag(dag, "test input", env=env)
+
+        assert result.data == "done"
+        assert seen == [db]
+        assert "db" not in ctx.keys()
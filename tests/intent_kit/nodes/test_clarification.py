@@ -224,10 +224,12 @@ class TestClarificationNode:
             name="test_clarification",
             description="Test clarification",
             available_options=["option1", "option2"],
+            context_read=["user_id"],
         )
 
         mock_ctx = Mock()
-        mock_ctx.snapshot.return_value = {"user_id": "123"}
+        mock_ctx.snapshot.return_value = {"user_id": "123", "metadata": {}}
+        mock_ctx.get.return_value = "123"
 
         prompt = node._build_clarification_prompt("test input", mock_ctx)
 
@@ -236,7 +238,8 @@ class TestClarificationNode:
         assert "Clarification Task: test_clarification" in prompt
         assert "Description: Test clarification" in prompt
         assert "Available Context:" in prompt
-        assert "{'user_id': '123'}" in prompt
+        assert '- user_id: "123"' in prompt
+        assert "metadata" not in prompt
         assert "Available Options:" in prompt
         assert "- option1" in prompt
         assert "- option2" in prompt
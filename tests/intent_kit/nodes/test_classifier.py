@@ -1,7 +1,10 @@
 """Tests for ClassifierNode."""
 
+import pytest
 from unittest.mock import Mock, patch
 from intent_kit.nodes.classifier import ClassifierNode
+from intent_kit.nodes.local_classifiers import ClassificationScore
+from intent_kit.services.ai.llm_response import RawLLMResponse
 from intent_kit.core.types import ExecutionResult
 from intent_kit.core.context import DefaultContext
 
@@ -426,3 +429,674 @@ class TestClassifierNode:
 
         assert result.data == "greet"
         assert result.next_edges == ["greet"]
+
+
+class TestClassifierNodeBatch:
+    """Test cases for ClassifierNode.execute_batch."""
+
+    def _context(self, responses):
+        mock_service = Mock()
+        mock_client = Mock()
+        mock_client.generate.side_effect = responses
+        mock_service.get_client.return_value = mock_client
+        context = DefaultContext()
+        context.set("llm_service", mock_service)
+        context.set(
+            "metadata", {"default_llm_config": {"provider": "openai", "model": "gpt-4"}}
+        )
+        return context, mock_client
+
+    def test_batch_uses_single_request(self):
+        """All inputs in a chunk are classified with one LLM call."""
+        context, mock_client = self._context(
+            [
+                RawLLMResponse(
+                    content='{"1": "greet", "2": "weather", "3": "help"}',
+                    model="gpt-4",
+                    provider="openai",
+                    input_tokens=100,
+                    output_tokens=20,
+                    cost=0.03,
+                )
+            ]
+        )
+        node = ClassifierNode(
+            name="test_classifier", output_labels=["greet", "weather", "help"]
+        )
+
+        results = node.execute_batch(["Hello", "Is it raining?", "help"], context)
+
+        assert mock_client.generate.call_count == 1
+        prompt = mock_client.generate.call_args[0][0]
+        assert "1. Hello" in prompt
+        assert "2. Is it raining?" in prompt
+        assert [r.data for r in results] == ["greet", "weather", "help"]
+        assert sum(r.metrics["input_tokens"] for r in results) == 100
+        assert sum(r.metrics["output_tokens"] for r in results) == 20
+        assert abs(sum(r.metrics["cost"] for r in results) - 0.03) < 1e-12
+        assert all(r.metrics["batch_size"] == 3 for r in results)
+
+    def test_batch_retries_labels_outside_output_labels(self):
+        """ "unknown" and hallucinated labels are classified individually."""
+        context, mock_client = self._context(
+            [
+                RawLLMResponse(
+                    content='{"1": "greet", "2": "unknown", "3": "sports"}',
+                    model="gpt-4",
+                    provider="openai",
+                ),
+                RawLLMResponse(content="weather", model="gpt-4", provider="openai"),
+                RawLLMResponse(content="unknown", model="gpt-4", provider="openai"),
+            ]
+        )
+        node = ClassifierNode(
+            name="test_classifier", output_labels=["greet", "weather", "help"]
+        )
+
+        results = node.execute_batch(["Hello", "Is it raining?", "asdf"], context)
+
+        assert mock_client.generate.call_count == 3
+        assert "Is it raining?" in mock_client.generate.call_args_list[1][0][0]
+        assert "asdf" in mock_client.generate.call_args_list[2][0][0]
+        assert [r.data for r in results] == ["greet", "weather", ""]
+        assert results[2].next_edges == ["clarification"]
+
+    def test_batch_falls_back_for_unparsed_items(self):
+        """Items missing from the batch response are classified individually."""
+        context, mock_client = self._context(
+            [
+                RawLLMResponse(
+                    content='{"1": "greet"}', model="gpt-4", provider="openai"
+                ),
+                RawLLMResponse(content="weather", model="gpt-4", provider="openai"),
+            ]
+        )
+        node = ClassifierNode(
+            name="test_classifier", output_labels=["greet", "weather", "help"]
+        )
+
+        results = node.execute_batch(["Hello", "Is it raining?"], context)
+
+        assert mock_client.generate.call_count == 2
+        fallback_prompt = mock_client.generate.call_args_list[1][0][0]
+        assert "Is it raining?" in fallback_prompt
+        assert [r.data for r in results] == ["greet", "weather"]
+
+    def test_batch_respects_batch_size(self):
+        """Inputs are split into chunks of at most batch_size."""
+        context, mock_client = self._context(
+            [
+                RawLLMResponse(
+                    content='{"1": "greet", "2": "greet"}',
+                    model="gpt-4",
+                    provider="openai",
+                ),
+                RawLLMResponse(
+                    content='{"1": "help"}', model="gpt-4", provider="openai"
+                ),
+            ]
+        )
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather", "help"],
+            batch_size=2,
+        )
+
+        results = node.execute_batch(["hi", "hello", "help me"], context)
+
+        assert mock_client.generate.call_count == 2
+        assert [r.data for r in results] == ["greet", "greet", "help"]
+
+    def test_batch_with_classification_func(self):
+        """A custom classification function is applied per input."""
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            classification_func=lambda text, ctx: (
+                "weather" if "rain" in text else "greet"
+            ),
+        )
+
+        results = node.execute_batch(["hi", "rain?"], DefaultContext())
+
+        assert [r.data for r in results] == ["greet", "weather"]
+
+    def test_invalid_batch_size(self):
+        """batch_size must be positive."""
+        with pytest.raises(ValueError):
+            ClassifierNode(name="c", output_labels=["a"], batch_size=0)
+
+
+class StubLocalClassifier:
+    """Local classifier returning a fixed score."""
+
+    def __init__(self, label, confidence):
+        self.score = ClassificationScore(label=label, confidence=confidence)
+
+    def classify(self, user_input):
+        return self.score
+
+
+class TestClassifierNodeLocalClassifier:
+    """Test cases for ClassifierNode with a local classifier."""
+
+    def _context(self, content="weather"):
+        mock_service = Mock()
+        mock_client = Mock()
+        mock_client.generate.return_value = RawLLMResponse(
+            content=content, model="gpt-4", provider="openai"
+        )
+        mock_service.get_client.return_value = mock_client
+        context = DefaultContext()
+        context.set("llm_service", mock_service)
+        context.set(
+            "metadata", {"default_llm_config": {"provider": "openai", "model": "gpt-4"}}
+        )
+        return context, mock_client
+
+    def test_confident_local_result_skips_llm(self):
+        context, mock_client = self._context()
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            local_classifier=StubLocalClassifier("greet", 0.9),
+        )
+
+        result = node.execute("Hello", context)
+
+        assert result.data == "greet"
+        assert result.metrics["local_hits"] == 1
+        assert result.metrics["local_confidence"] == 0.9
+        mock_client.generate.assert_not_called()
+
+    def test_uncertain_local_result_escalates(self):
+        context, mock_client = self._context("weather")
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            local_classifier=StubLocalClassifier("greet", 0.1),
+            confidence_threshold=0.5,
+        )
+
+        result = node.execute("Is it raining?", context)
+
+        assert result.data == "weather"
+        assert result.metrics["llm_escalations"] == 1
+        assert "local_hits" not in result.metrics
+        mock_client.generate.assert_called_once()
+
+    def test_uncertain_without_llm_routes_to_clarification(self):
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            local_classifier=StubLocalClassifier("greet", 0.1),
+        )
+
+        result = node.execute("???", DefaultContext())
+
+        assert result.data == ""
+        assert result.next_edges == ["clarification"]
+        assert result.terminate is False
+
+    def test_batch_only_sends_escalated_inputs(self):
+        class KeywordStub:
+            def classify(self, user_input):
+                if "hello" in user_input:
+                    return ClassificationScore(label="greet", confidence=1.0)
+                return ClassificationScore(label=None, confidence=0.0)
+
+        context, mock_client = self._context('{"1": "weather"}')
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            local_classifier=KeywordStub(),
+        )
+
+        results = node.execute_batch(["hello", "rain?", "hello again"], context)
+
+        assert [r.data for r in results] == ["greet", "weather", "greet"]
+        mock_client.generate.assert_called_once()
+        prompt = mock_client.generate.call_args[0][0]
+        assert "1. rain?" in prompt
+        assert "hello" not in prompt.split("User Inputs:")[1]
+        assert results[1].metrics["llm_escalations"] == 1
+
+    def test_batch_fallback_counts_escalation_once(self):
+        context, mock_client = self._context("weather")
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            local_classifier=StubLocalClassifier(None, 0.0),
+        )
+
+        results = node.execute_batch(["rain?"], context)
+
+        # The batch answer is not JSON, so the input is re-run through execute
+        assert mock_client.generate.call_count == 2
+        assert results[0].data == "weather"
+        assert results[0].metrics["llm_escalations"] == 1
+
+    def test_rules_match_skips_llm(self):
+        context, mock_client = self._context("greet")
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            rules={"weather": ["weather", "forecast"], "greet": ["hello"]},
+        )
+
+        result = node.execute("What's the forecast?", context)
+
+        assert result.data == "weather"
+        assert result.metrics["local_hits"] == 1
+        mock_client.generate.assert_not_called()
+
+    def test_rules_without_match_fall_back_to_llm(self):
+        context, mock_client = self._context("greet")
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            rules={"weather": ["weather", "forecast"]},
+        )
+
+        result = node.execute("Good morning!", context)
+
+        assert result.data == "greet"
+        mock_client.generate.assert_called_once()
+
+    def test_rules_and_local_classifier_are_exclusive(self):
+        with pytest.raises(ValueError):
+            ClassifierNode(
+                name="test_classifier",
+                output_labels=["greet"],
+                rules={"greet": ["hello"]},
+                local_classifier=StubLocalClassifier("greet", 1.0),
+            )
+
+
+class TestClassifierNodeCascade:
+    """Test cases for ClassifierNode cascades."""
+
+    def _context(self, clients):
+        mock_service = Mock()
+        mock_service.get_client.side_effect = lambda config: clients[config["model"]]
+        context = DefaultContext()
+        context.set("llm_service", mock_service)
+        return context
+
+    def _client(self, *contents):
+        client = Mock()
+        client.generate.side_effect = [
+            RawLLMResponse(
+                content=content,
+                model="m",
+                provider="openai",
+                input_tokens=10,
+                output_tokens=2,
+                cost=0.01,
+            )
+            for content in contents
+        ]
+        return client
+
+    def test_rules_tier_short_circuits(self):
+        small = self._client()
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            cascade=[
+                {"type": "rules", "name": "rules", "rules": {"weather": ["rain"]}},
+                {"name": "small", "llm_config": {"model": "small"}},
+            ],
+        )
+
+        result = node.execute("will it rain", self._context({"small": small}))
+
+        assert result.data == "weather"
+        assert result.metrics["cascade_tier"] == "rules"
+        assert result.metrics["cascade.rules.hits"] == 1
+        assert "cascade.small.calls" not in result.metrics
+        small.generate.assert_not_called()
+
+    def test_uncertain_small_model_escalates_to_large(self):
+        small = self._client('{"label": "greet", "confidence": 0.3}')
+        large = self._client('{"label": "weather", "confidence": 0.95}')
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            cascade=[
+                {"type": "rules", "name": "rules", "rules": {"weather": ["rain"]}},
+                {"name": "small", "llm_config": {"model": "small"}, "threshold": 0.8},
+                {"name": "large", "llm_config": {"model": "large"}},
+            ],
+        )
+
+        result = node.execute(
+            "is it nice out?", self._context({"small": small, "large": large})
+        )
+
+        assert result.data == "weather"
+        assert result.metrics["cascade_tier"] == "large"
+        assert result.metrics["cascade.rules.calls"] == 1
+        assert "cascade.rules.hits" not in result.metrics
+        assert result.metrics["cascade.small.calls"] == 1
+        assert "cascade.small.hits" not in result.metrics
+        assert result.metrics["cascade.small.confidence"] == 0.3
+        assert result.metrics["cascade.small.cost"] == 0.01
+        assert result.metrics["cascade.large.hits"] == 1
+        assert result.metrics["cascade.large.input_tokens"] == 10
+        assert result.metrics["cascade.large.latency"] >= 0
+
+    def test_agreement_confidence(self):
+        small = self._client("greet", "weather", "greet", "greet")
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            cascade=[
+                {
+                    "name": "small",
+                    "llm_config": {"model": "small"},
+                    "confidence": "agreement",
+                    "samples": 4,
+                    "threshold": 0.7,
+                },
+            ],
+        )
+
+        result = node.execute("hey", self._context({"small": small}))
+
+        assert result.data == "greet"
+        assert result.metrics["cascade.small.confidence"] == 0.75
+        assert result.metrics["cascade.small.output_tokens"] == 8
+        assert small.generate.call_count == 4
+
+    def test_no_confident_tier_routes_to_clarification(self):
+        small = self._client('{"label": "greet", "confidence": 0.2}')
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            cascade=[
+                {"name": "small", "llm_config": {"model": "small"}, "threshold": 0.5}
+            ],
+        )
+
+        result = node.execute("hmm", self._context({"small": small}))
+
+        assert result.data == ""
+        assert result.next_edges == ["clarification"]
+
+    def test_unparseable_tier_escalates(self):
+        small = self._client("not json at all")
+        large = self._client('{"label": "greet", "confidence": 1}')
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            cascade=[
+                {"name": "small", "llm_config": {"model": "small"}, "threshold": 0.5},
+                {"name": "large", "llm_config": {"model": "large"}},
+            ],
+        )
+
+        result = node.execute("hello", self._context({"small": small, "large": large}))
+
+        assert result.data == "greet"
+        assert result.metrics["cascade_tier"] == "large"
+
+    def test_invalid_cascade_config(self):
+        with pytest.raises(ValueError):
+            ClassifierNode(
+                name="c", output_labels=["a"], cascade=[{"type": "telepathy"}]
+            )
+        with pytest.raises(ValueError):
+            ClassifierNode(
+                name="c",
+                output_labels=["a"],
+                cascade=[{"llm_config": {"model": "m"}, "confidence": "vibes"}],
+            )
+        with pytest.raises(ValueError):
+            ClassifierNode(
+                name="c",
+                output_labels=["a"],
+                rules={"a": ["a"]},
+                cascade=[{"llm_config": {"model": "m"}}],
+            )
+
+
+class TestClassifierNodeMinimalOutput:
+    """Test cases for ClassifierNode minimal-output mode."""
+
+    def _context(self, *contents):
+        client = Mock()
+        client.generate.side_effect = [
+            RawLLMResponse(content=content, model="m", provider="openai")
+            for content in contents
+        ]
+        mock_service = Mock()
+        mock_service.get_client.return_value = client
+        context = DefaultContext()
+        context.set("llm_service", mock_service)
+        return context, client
+
+    def test_passes_generation_params(self):
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather_forecast"],
+            llm_config={"model": "m"},
+            minimal_output=True,
+        )
+        context, client = self._context("weather_forecast")
+
+        result = node.execute("will it rain", context)
+
+        assert result.data == "weather_forecast"
+        params = client.generate.call_args.kwargs
+        assert params["model"] == "m"
+        assert params["max_tokens"] == len("weather_forecast") + 2
+        assert params["temperature"] == 0.0
+        assert params["stop"] == ["\n"]
+        assert params["choices"] == ["greet", "weather_forecast", "unknown"]
+
+    def test_token_budget_covers_non_ascii_labels(self):
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["天気予報", "greet"],
+            llm_config={"model": "m"},
+            minimal_output=True,
+        )
+        context, client = self._context("天気予報")
+
+        result = node.execute("明日は雨?", context)
+
+        assert result.data == "天気予報"
+        # A token holds at least one byte, whatever the tokenizer merges
+        assert client.generate.call_args.kwargs["max_tokens"] == 12 + 2
+
+    def test_requires_exact_label(self):
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            llm_config={"model": "m"},
+            minimal_output=True,
+        )
+        context, _ = self._context("the weather")
+
+        result = node.execute("will it rain", context)
+
+        assert result.data == ""
+        assert result.next_edges == ["clarification"]
+
+    def test_default_mode_sends_no_generation_limits(self):
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            llm_config={"model": "m"},
+        )
+        context, client = self._context("the weather")
+
+        result = node.execute("will it rain", context)
+
+        assert result.data == "weather"
+        client.generate.assert_called_once()
+        assert set(client.generate.call_args.kwargs) == {"model", "cache_prefix"}
+
+    def test_batch_passes_generation_params(self):
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            llm_config={"model": "m"},
+            minimal_output=True,
+        )
+        context, client = self._context('{"1": "greet", "2": "the weather"}', "weather")
+
+        results = node.execute_batch(["hi", "will it rain"], context)
+
+        # Minimal mode needs exact labels, so "the weather" is retried alone
+        assert [r.data for r in results] == ["greet", "weather"]
+        batch_params = client.generate.call_args_list[0].kwargs
+        assert batch_params["temperature"] == 0.0
+        assert batch_params["max_tokens"] == 2 * (len("unknown") + 2 + 1 + 4) + 4
+        assert "stop" not in batch_params and "choices" not in batch_params
+        assert client.generate.call_args_list[1].kwargs["stop"] == ["\n"]
+
+
+class TestClassifierNodePromptContext:
+    """Test cases for context rendering in classifier prompts."""
+
+    def test_prompt_excludes_undeclared_context(self):
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            context_read=["user.name"],
+            report_prompt_savings=True,
+        )
+        context = DefaultContext()
+        context.set("llm_service", Mock())
+        context.set("metadata", {"default_llm_config": {"model": "m"}})
+        context.set("user.name", "Alice")
+        context.set("operations.total", 12)
+
+        metrics: dict = {}
+        prompt = node._build_classification_prompt("hi", context, metrics)
+
+        assert '- user.name: "Alice"' in prompt
+        assert "llm_service" not in prompt
+        assert "operations.total" not in prompt
+        assert metrics["prompt_tokens_saved"] > 0
+
+    def test_execute_reports_prompt_tokens_saved(self):
+        client = Mock()
+        client.generate.return_value = RawLLMResponse(
+            content="greet", model="m", provider="openai"
+        )
+        mock_service = Mock()
+        mock_service.get_client.return_value = client
+        context = DefaultContext()
+        context.set("llm_service", mock_service)
+        context.set("history", ["earlier turn"] * 500)
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            llm_config={"model": "m"},
+            report_prompt_savings=True,
+        )
+
+        result = node.execute("hello", context)
+
+        assert result.data == "greet"
+        assert result.metrics["prompt_tokens_saved"] > 500
+        assert "earlier turn" not in client.generate.call_args[0][0]
+
+    def test_prompt_savings_not_measured_by_default(self):
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            context_read=["user.name"],
+        )
+        context = DefaultContext()
+        context.set("user.name", "Alice")
+
+        metrics: dict = {}
+        with patch(
+            "intent_kit.utils.prompt_context.estimate_snapshot_tokens"
+        ) as estimate:
+            node._build_classification_prompt("hi", context, metrics)
+
+        estimate.assert_not_called()
+        assert "prompt_tokens_saved" not in metrics
+
+
+class TestClassifierNodePromptTemplates:
+    """Test cases for precompiled classifier prompt templates."""
+
+    def test_prompts_share_static_prefix(self):
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            context_read=["user.name"],
+        )
+        first_ctx = DefaultContext()
+        first_ctx.set("user.name", "Alice")
+
+        first = node._build_classification_prompt("hello", first_ctx)
+        second = node._build_classification_prompt("is it sunny", DefaultContext())
+
+        prefix_length = node._classification_template().prefix_length
+        assert first[:prefix_length] == second[:prefix_length]
+        assert "hello" not in first[:prefix_length]
+        assert "Alice" not in first[:prefix_length]
+        assert first.endswith("User Input: hello\n\nReturn only the category name:")
+
+    def test_template_is_compiled_once(self):
+        node = ClassifierNode(name="test_classifier", output_labels=["greet"])
+
+        assert node._classification_template() is node._classification_template()
+
+    def test_template_recompiles_when_labels_change(self):
+        node = ClassifierNode(name="test_classifier", output_labels=["greet"])
+        node._build_classification_prompt("hi", DefaultContext())
+
+        node.output_labels = ["greet", "weather"]
+        prompt = node._build_classification_prompt("hi", DefaultContext())
+
+        assert "- weather" in prompt
+
+    def test_sends_cache_prefix_and_reports_cached_tokens(self):
+        client = Mock()
+        client.generate.return_value = RawLLMResponse(
+            content="greet", model="m", provider="anthropic", cached_tokens=120
+        )
+        mock_service = Mock()
+        mock_service.get_client.return_value = client
+        context = DefaultContext()
+        context.set("llm_service", mock_service)
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            llm_config={"model": "m"},
+        )
+
+        result = node.execute("hello", context)
+
+        assert result.metrics["cached_tokens"] == 120
+        params = client.generate.call_args.kwargs
+        assert params["cache_prefix"] == node._classification_template().prefix_length
+
+    def test_legacy_client_signature_gets_no_cache_prefix(self):
+        """Clients with generate(prompt, model) are called without new params."""
+
+        class LegacyClient:
+            def generate(self, prompt, model):
+                return RawLLMResponse(content="weather", model=model, provider="x")
+
+        mock_service = Mock()
+        mock_service.get_client.return_value = LegacyClient()
+        context = DefaultContext()
+        context.set("llm_service", mock_service)
+        node = ClassifierNode(
+            name="test_classifier",
+            output_labels=["greet", "weather"],
+            llm_config={"model": "m"},
+            minimal_output=True,
+        )
+
+        assert node.execute("will it rain", context).data == "weather"
+        assert [r.data for r in node.execute_batch(["rain?"], context)] == ["weather"]
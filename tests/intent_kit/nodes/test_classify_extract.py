@@ -0,0 +1,170 @@
+"""Tests for ClassifyExtractNode."""
+
+import json
+
+import pytest
+from unittest.mock import Mock
+
+from intent_kit.core import DAGBuilder
+from intent_kit.core.context import DefaultContext
+from intent_kit.core.traversal import run_dag
+from intent_kit.nodes.classify_extract import ClassifyExtractNode
+from intent_kit.services.ai.llm_response import RawLLMResponse
+
+
+def _context(*contents):
+    client = Mock()
+    client.generate.side_effect = [
+        RawLLMResponse(
+            content=content,
+            model="m",
+            provider="openai",
+            input_tokens=50,
+            output_tokens=10,
+            cost=0.002,
+        )
+        for content in contents
+    ]
+    service = Mock()
+    service.get_client.return_value = client
+    ctx = DefaultContext()
+    ctx.set("llm_service", service)
+    return ctx, client
+
+
+def _node(**kwargs):
+    return ClassifyExtractNode(
+        name="intent",
+        param_schemas={
+            "greet": {"name": str},
+            "weather": {"location": str, "days": "int"},
+            "help": {},
+        },
+        llm_config={"model": "m"},
+        **kwargs,
+    )
+
+
+class TestClassifyExtractNode:
+    """Test cases for ClassifyExtractNode."""
+
+    def test_routes_and_extracts_in_one_call(self):
+        ctx, client = _context(
+            json.dumps(
+                {"label": "weather", "params": {"location": "Paris", "days": "3"}}
+            )
+        )
+
+        result = _node().execute("weather in Paris for 3 days", ctx)
+
+        assert client.generate.call_count == 1
+        assert result.next_edges == ["weather"]
+        assert result.terminate is False
+        assert result.data == {
+            "label": "weather",
+            "params": {"location": "Paris", "days": 3},
+        }
+        assert result.context_patch["chosen_label"] == "weather"
+        assert result.context_patch["extracted_params"] == {
+            "location": "Paris",
+            "days": 3,
+        }
+        assert result.metrics["input_tokens"] == 50
+        assert result.metrics["cost"] == 0.002
+
+    def test_fills_defaults_and_drops_foreign_params(self):
+        ctx, _ = _context('{"label": "Weather", "params": {"name": "Bob"}}')
+
+        result = _node().execute("weather?", ctx)
+
+        assert result.next_edges == ["weather"]
+        assert result.context_patch["extracted_params"] == {
+            "location": "",
+            "days": 0,
+        }
+
+    def test_unknown_label_routes_to_clarification(self):
+        ctx, _ = _context('{"label": "unknown", "params": {}}')
+
+        result = _node().execute("asdf", ctx)
+
+        assert result.next_edges == ["clarification"]
+        assert result.context_patch == {"chosen_label": ""}
+
+    def test_unparseable_response_routes_to_clarification(self):
+        ctx, _ = _context("I am not sure")
+
+        result = _node().execute("asdf", ctx)
+
+        assert result.next_edges == ["clarification"]
+
+    def test_missing_llm_terminates(self):
+        result = _node().execute("hello", DefaultContext())
+
+        assert result.terminate is True
+        assert result.context_patch["error_type"] == "ClassificationError"
+
+    def test_prompt_lists_schemas_in_static_prefix(self):
+        node = _node(context_read=["user.name"])
+        ctx = DefaultContext()
+        ctx.set("user.name", "Alice")
+
+        prompt = node._build_prompt("hi there", ctx)
+        prefix = prompt[: node._prompt_template().prefix_length]
+
+        assert "- greet: name (str)" in prefix
+        assert "- weather: location (str), days (int)" in prefix
+        assert "- help: no parameters" in prefix
+        assert "hi there" not in prefix
+        assert '- user.name: "Alice"' in prompt
+
+    def test_legacy_client_signature_gets_no_cache_prefix(self):
+        class LegacyClient:
+            def generate(self, prompt, model):
+                return RawLLMResponse(
+                    content='{"label": "help", "params": {}}',
+                    model=model,
+                    provider="x",
+                )
+
+        service = Mock()
+        service.get_client.return_value = LegacyClient()
+        ctx = DefaultContext()
+        ctx.set("llm_service", service)
+
+        result = _node().execute("help", ctx)
+
+        assert result.next_edges == ["help"]
+
+    def test_requires_labels(self):
+        with pytest.raises(ValueError):
+            ClassifyExtractNode(name="intent", param_schemas={})
+
+
+class TestClassifyExtractDAG:
+    """Test ClassifyExtractNode inside a DAG."""
+
+    def test_single_llm_call_feeds_action(self):
+        builder = DAGBuilder()
+        builder.add_node(
+            "intent",
+            "classify_extract",
+            param_schemas={"greet": {"name": "str"}},
+            llm_config={"model": "m"},
+        )
+        builder.add_node("greet_action", "action", action=lambda name: f"Hello {name}!")
+        builder.add_node(
+            "clarification", "clarification", clarification_message="Say hello!"
+        )
+        builder.add_edge("intent", "greet_action", "greet")
+        builder.add_edge("intent", "clarification", "clarification")
+        builder.set_entrypoints(["intent"])
+        dag = builder.build()
+
+        ctx, client = _context('{"label": "greet", "params": {"name": "Alice"}}')
+        result, _ = run_dag(
+            dag, "Hi, I'm Alice", ctx=ctx, llm_service=ctx.get("llm_service")
+        )
+
+        assert result.data == "Hello Alice!"
+        assert client.generate.call_count == 1
@@ -7,6 +7,8 @@ from unittest.mock import Mock, patch
 from intent_kit.nodes.extractor import ExtractorNode
 from intent_kit.core.types import ExecutionResult
 from intent_kit.utils.type_coercion import TypeValidationError
+from intent_kit.core.context import DefaultContext
+from intent_kit.services.ai.llm_response import RawLLMResponse
 
 
 class TestExtractorNode:
@@ -113,8 +115,7 @@ class TestExtractorNode:
         assert result.data is None
         assert result.next_edges is None
         assert result.terminate is True
-        # The actual error is about NoneType not having get attribute
-        assert "NoneType" in result.context_patch["error"]
+        assert "LLM service and config required" in result.context_patch["error"]
 
     def test_execute_no_llm_config(self):
         """Test execution when LLM config is not available."""
@@ -133,8 +134,7 @@ class TestExtractorNode:
         assert result.data is None
         assert result.next_edges is None
         assert result.terminate is True
-        # The actual error is about Mock object not being string content
-        assert "Expected string content" in result.context_patch["error"]
+        assert "LLM service and config required" in result.context_patch["error"]
 
     def test_execute_no_model(self):
         """Test execution when model is not specified in config."""
@@ -217,10 +217,12 @@ class TestExtractorNode:
             name="test_extractor",
             param_schema=param_schema,
             description="Extract user information",
+            context_read=["user_id"],
         )
 
         mock_ctx = Mock()
-        mock_ctx.snapshot.return_value = {"user_id": "123"}
+        mock_ctx.snapshot.return_value = {"user_id": "123", "metadata": {}}
+        mock_ctx.get.return_value = "123"
 
         prompt = node._build_prompt("My name is John and I am 30", mock_ctx)
 
@@ -231,7 +233,8 @@ class TestExtractorNode:
         assert "- name (str)" in prompt
         assert "- age (int)" in prompt
         assert "Available Context:" in prompt
-        assert "{'user_id': '123'}" in prompt
+        assert '- user_id: "123"' in prompt
+        assert "metadata" not in prompt
 
     def test_build_prompt_with_string_types(self):
         """Test building prompt with string type specifications."""
@@ -445,3 +448,241 @@ class TestExtractorNode:
         assert result.terminate is True
         assert "LLM error" in result.context_patch["error"]
         assert result.context_patch["extraction_success"] is False
+
+    def test_legacy_client_signature_gets_no_cache_prefix(self):
+        """Clients with generate(prompt, model) are called without new params."""
+
+        class LegacyClient:
+            def generate(self, prompt, model):
+                return RawLLMResponse(
+                    content='{"name": "John"}', model=model, provider="x"
+                )
+
+            def generate_stream(self, prompt, model):
+                yield '{"name": "John"}'
+
+        service = Mock()
+        service.get_client.return_value = LegacyClient()
+        ctx = DefaultContext()
+        ctx.set("llm_service", service)
+
+        for stream in (False, True):
+            node = ExtractorNode(
+                name="test_extractor",
+                param_schema={"name": str},
+                llm_config={"model": "m"},
+                stream=stream,
+            )
+
+            result = node.execute("My name is John", ctx)
+
+            assert result.data == {"name": "John"}
+
+
+class TestExtractorNodeRuleFastPath:
+    """Test rule-based extraction before the LLM."""
+
+    def _context(self, content):
+        client = Mock()
+        client.generate.return_value = RawLLMResponse(
+            content=content, model="m", provider="openai", input_tokens=40
+        )
+        service = Mock()
+        service.get_client.return_value = client
+        ctx = DefaultContext()
+        ctx.set("llm_service", service)
+        return ctx, client
+
+    def test_skips_llm_when_rules_resolve_everything(self):
+        node = ExtractorNode(
+            name="order",
+            param_schema={"order_id": int, "email": str},
+            param_extractors={
+                "order_id": r"#(\d+)",
+                "email": {"builtin": "email"},
+            },
+        )
+
+        result = node.execute("order #77 for ann@example.com", DefaultContext())
+
+        assert result.data == {"order_id": 77, "email": "ann@example.com"}
+        assert result.next_edges == ["success"]
+        assert result.metrics == {"rule_params": 2, "llm_params": 0, "llm_skipped": 1}
+
+    def test_llm_prompted_only_for_unresolved(self):
+        node = ExtractorNode(
+            name="order",
+            param_schema={"order_id": int, "reason": str},
+            param_extractors={"order_id": r"#(\d+)"},
+            llm_config={"model": "m"},
+        )
+        ctx, client = self._context('{"reason": "damaged", "order_id": 1}')
+
+        result = node.execute("return order #77, it arrived damaged", ctx)
+
+        assert result.data == {"order_id": 77, "reason": "damaged"}
+        prompt = client.generate.call_args[0][0]
+        assert "- reason (str)" in prompt
+        assert "order_id (int)" not in prompt
+        assert result.metrics["rule_params"] == 1
+        assert result.metrics["llm_params"] == 1
+        assert result.metrics["llm_skipped"] == 0
+        assert result.metrics["input_tokens"] == 40
+
+    def test_uncoercible_rule_value_falls_back_to_llm(self):
+        node = ExtractorNode(
+            name="order",
+            param_schema={"quantity": int},
+            param_extractors={"quantity": lambda text: "a dozen"},
+            llm_config={"model": "m"},
+        )
+        ctx, client = self._context('{"quantity": 12}')
+
+        result = node.execute("a dozen eggs", ctx)
+
+        assert result.data == {"quantity": 12}
+        client.generate.assert_called_once()
+
+    def test_llm_params_coerced_to_schema(self):
+        """Non-streamed answers are coerced to the schema like streamed ones."""
+        node = ExtractorNode(
+            name="order",
+            param_schema={"order_id": int, "gift": bool},
+            llm_config={"model": "m"},
+        )
+        ctx, _ = self._context('{"order_id": "77", "gift": "yes", "note": "x"}')
+
+        result = node.execute("order 77 is a gift", ctx)
+
+        assert result.data == {"order_id": 77, "gift": True, "note": "x"}
+
+    def test_failing_rule_callable_falls_back_to_llm(self):
+        """Any exception from a rule extractor leaves the parameter to the LLM."""
+
+        def broken(text):
+            raise KeyError("boom")
+
+        node = ExtractorNode(
+            name="order",
+            param_schema={"quantity": int},
+            param_extractors={"quantity": broken},
+            llm_config={"model": "m"},
+        )
+        ctx, client = self._context('{"quantity": 12}')
+
+        result = node.execute("a dozen eggs", ctx)
+
+        assert result.data == {"quantity": 12}
+        client.generate.assert_called_once()
+
+    def test_extractors_for_unknown_params_rejected(self):
+        with pytest.raises(ValueError, match="unknown parameters"):
+            ExtractorNode(
+                name="order", param_schema={"a": str}, param_extractors={"b": r"x"}
+            )
+
+
+class TestExtractorNodeStreaming:
+    """Test streamed extraction with early stop."""
+
+    def _context(self, chunks):
+        consumed = []
+
+        def generate_stream(prompt, model, **params):
+            try:
+                for chunk in chunks:
+                    consumed.append(chunk)
+                    yield chunk
+            finally:
+                consumed.append("<closed>")
+
+        client = Mock()
+        client.generate_stream.side_effect = generate_stream
+        service = Mock()
+        service.get_client.return_value = client
+        ctx = DefaultContext()
+        ctx.set("llm_service", service)
+        return ctx, client, consumed
+
+    def test_stops_stream_once_all_params_complete(self):
+        node = ExtractorNode(
+            name="weather",
+            param_schema={"city": str, "days": int},
+            llm_config={"model": "m"},
+            stream=True,
+        )
+        chunks = ['{"city": "Par', 'is", "days": "3"', ', "note": "long', ' tail"}']
+        ctx, client, consumed = self._context(chunks)
+
+        result = node.execute("weather in Paris for 3 days", ctx)
+
+        assert result.data == {"city": "Paris", "days": 3}
+        assert consumed == chunks[:2] + ["<closed>"]
+        assert result.metrics["stream_aborted_early"] is True
+        assert result.metrics["stream_chunks"] == 2
+        client.generate.assert_not_called()
+        assert "cache_prefix" in client.generate_stream.call_args.kwargs
+
+    def test_falls_back_to_full_parse_when_incomplete(self):
+        node = ExtractorNode(
+            name="weather",
+            param_schema={"city": str, "days": int},
+            llm_config={"model": "m"},
+            stream=True,
+        )
+        ctx, _, consumed = self._context(["city: Paris\n", "days: 3\n"])
+
+        result = node.execute("weather in Paris for 3 days", ctx)
+
+        assert result.data == {"city": "Paris", "days": 3}
+        assert "stream_aborted_early" not in result.metrics
+        assert consumed[-1] == "<closed>"
+
+    def test_streams_only_unresolved_params(self):
+        node = ExtractorNode(
+            name="order",
+            param_schema={"order_id": int, "reason": str},
+            param_extractors={"order_id": r"#(\d+)"},
+            llm_config={"model": "m"},
+            stream=True,
+        )
+        ctx, _, consumed = self._context(['{"reason": "damaged"', "}"])
+
+        result = node.execute("return order #77, it arrived damaged", ctx)
+
+        assert result.data == {"order_id": 77, "reason": "damaged"}
+        assert consumed == ['{"reason": "damaged"', "<closed>"]
+
+    def test_fallback_coerces_like_incremental_path(self):
+        """Full-text fallbacks are coerced to the schema as streamed values are."""
+        node = ExtractorNode(
+            name="weather",
+            param_schema={"city": str, "days": int},
+            llm_config={"model": "m"},
+            stream=True,
+        )
+        ctx, _, _ = self._context(["city: Paris\n", 'days: "3"\n'])
+
+        result = node.execute("weather in Paris for 3 days", ctx)
+
+        assert result.data == {"city": "Paris", "days": 3}
+
+    def test_on_param_called_while_streaming(self):
+        """on_param sees each value before the stream is closed."""
+        seen = []
+        node = ExtractorNode(
+            name="order",
+            param_schema={"order_id": int, "reason": str},
+            param_extractors={"order_id": r"#(\d+)"},
+            llm_config={"model": "m"},
+            stream=True,
+            on_param=lambda name, value: seen.append((name, value, list(consumed))),
+        )
+        ctx, _, consumed = self._context(['{"reason": "damaged"', "}"])
+
+        node.execute("return order #77, it arrived damaged", ctx)
+
+        assert seen == [
+            ("order_id", 77, []),
+            ("reason", "damaged", ['{"reason": "damaged"']),
+        ]
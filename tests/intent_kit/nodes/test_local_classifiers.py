@@ -0,0 +1,244 @@
+"""Tests for LLM-free local classifiers."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from intent_kit.nodes.local_classifiers import (
+    CentroidClassifier,
+    ClassificationScore,
+    LabelRule,
+    LocalClassifier,
+    RuleClassifier,
+)
+
+DATASETS = Path(__file__).parents[3] / "intent_kit" / "evals" / "datasets"
+
+EXAMPLES = {
+    "weather": [
+        "what's the weather like today",
+        "will it rain tomorrow",
+        "weather forecast for london",
+    ],
+    "cancel": [
+        "cancel my order",
+        "please cancel my reservation",
+        "I want to cancel my subscription",
+    ],
+}
+
+
+class TestCentroidClassifier:
+    """Test CentroidClassifier."""
+
+    @pytest.mark.parametrize("strategy", ["centroid", "exemplar"])
+    def test_classifies_routine_inputs(self, strategy):
+        classifier = CentroidClassifier(EXAMPLES, strategy=strategy)
+
+        weather = classifier.classify("what is the weather in paris")
+        cancel = classifier.classify("cancel my hotel reservation")
+
+        assert weather.label == "weather"
+        assert cancel.label == "cancel"
+        assert 0.0 < weather.confidence <= 1.0
+        assert set(weather.scores) == {"weather", "cancel"}
+
+    def test_unrelated_input_has_low_confidence(self):
+        classifier = CentroidClassifier(EXAMPLES)
+
+        related = classifier.classify("weather forecast for tokyo")
+        unrelated = classifier.classify("zzz qqq")
+
+        assert unrelated.confidence < related.confidence
+
+    def test_abstains_without_overlap(self):
+        classifier = CentroidClassifier(EXAMPLES)
+
+        assert classifier.classify("").label is None
+
+    def test_classifies_non_latin_inputs(self):
+        classifier = CentroidClassifier(
+            {
+                "weather": ["какая сегодня погода", "будет ли завтра дождь"],
+                "cancel": ["отмените мой заказ", "отменить бронирование"],
+            }
+        )
+
+        assert classifier.classify("какая погода в москве").label == "weather"
+        assert classifier.classify("отмените заказ").label == "cancel"
+
+    def test_from_dataset(self):
+        classifier = CentroidClassifier.from_dataset(
+            DATASETS / "classifier_node_llm.yaml"
+        )
+
+        assert set(classifier.labels) == {"weather", "cancel"}
+        assert classifier.classify("cancel my flight").label == "cancel"
+
+    def test_requires_examples(self):
+        with pytest.raises(ValueError):
+            CentroidClassifier({"weather": []})
+
+    def test_invalid_strategy(self):
+        with pytest.raises(ValueError):
+            CentroidClassifier(EXAMPLES, strategy="knn")  # type: ignore[arg-type]
+
+    def test_satisfies_protocol(self):
+        assert isinstance(CentroidClassifier(EXAMPLES), LocalClassifier)
+
+
+class TestClassificationScore:
+    """Test ClassificationScore."""
+
+    def test_defaults(self):
+        score = ClassificationScore(label=None, confidence=0.0)
+
+        assert score.scores == {}
+
+
+class TestRuleClassifier:
+    """Test RuleClassifier."""
+
+    def test_keyword_match(self):
+        classifier = RuleClassifier(
+            [
+                LabelRule("weather", keywords=["weather", "forecast"]),
+                LabelRule("cancel", keywords=["cancel"]),
+            ]
+        )
+
+        score = classifier.classify("What's the Weather like?")
+
+        assert score.label == "weather"
+        assert score.confidence == 1.0
+
+    def test_regex_match(self):
+        classifier = RuleClassifier(
+            [LabelRule("weather", patterns=[r"\btemp(erature)?s?\b"])]
+        )
+
+        assert classifier.classify("Temperature in Oslo").label == "weather"
+
+    def test_no_match_abstains(self):
+        classifier = RuleClassifier([LabelRule("cancel", keywords=["cancel"])])
+
+        score = classifier.classify("hello there")
+
+        assert score.label is None
+        assert score.confidence == 0.0
+
+    def test_whole_words(self):
+        rules = [LabelRule("cancel", keywords=["cancel"])]
+
+        assert RuleClassifier(rules).classify("cancellation").label is None
+        assert (
+            RuleClassifier(rules, whole_words=False).classify("cancellation").label
+            == "cancel"
+        )
+
+    def test_case_sensitive(self):
+        rules = [LabelRule("acronym", keywords=["ETA"], patterns=[r"\bUTC\b"])]
+        classifier = RuleClassifier(rules, case_sensitive=True)
+
+        assert classifier.classify("eta utc").label is None
+        assert classifier.classify("ETA").label == "acronym"
+        assert classifier.classify("UTC").label == "acronym"
+
+    def test_priority_wins(self):
+        classifier = RuleClassifier(
+            [
+                LabelRule("cancel", keywords=["cancel", "refund"]),
+                LabelRule("urgent", keywords=["asap"], priority=5),
+            ]
+        )
+
+        score = classifier.classify("cancel and refund asap")
+
+        assert score.label == "urgent"
+        assert score.confidence == 1.0
+
+    def test_more_hits_win_ties(self):
+        classifier = RuleClassifier(
+            [
+                LabelRule("cancel", keywords=["cancel"]),
+                LabelRule("weather", keywords=["weather", "rain"]),
+            ]
+        )
+
+        score = classifier.classify("cancel because of weather and rain")
+
+        assert score.label == "weather"
+        assert score.confidence == 2 / 3
+
+    def test_earliest_match_breaks_equal_hits(self):
+        classifier = RuleClassifier(
+            [
+                LabelRule("cancel", keywords=["cancel"]),
+                LabelRule("weather", keywords=["weather"]),
+            ]
+        )
+
+        assert classifier.classify("weather made me cancel").label == "weather"
+        assert classifier.classify("cancel due to weather").label == "cancel"
+
+    def test_from_config(self):
+        classifier = RuleClassifier.from_config(
+            {
+                "weather": {"keywords": ["forecast"], "patterns": [r"\brain(y)?\b"]},
+                "cancel": ["cancel", "refund"],
+            }
+        )
+
+        assert classifier.classify("is it rainy").label == "weather"
+        assert classifier.classify("I want a refund").label == "cancel"
+
+    def test_from_config_invalid(self):
+        with pytest.raises(ValueError):
+            RuleClassifier.from_config({"weather": "forecast"})
+
+    def test_invalid_pattern(self):
+        with pytest.raises(re.error):
+            RuleClassifier([LabelRule("bad", patterns=["("])])
+
+    def test_backreferences_keep_their_groups(self):
+        """Numbered and named backreferences still refer to their own groups."""
+        classifier = RuleClassifier(
+            [
+                LabelRule("first", patterns=[r"\bx(y)z\b"]),
+                LabelRule("repeat", patterns=[r"\b(\w+) \1\b"]),
+                LabelRule("quote", patterns=[r"(?P<q>['\"]).+?(?P=q)"]),
+            ]
+        )
+
+        assert classifier.classify("I said that that was fine").label == "repeat"
+        assert classifier.classify("I said that was fine").label is None
+        assert classifier.classify("say 'hi' now").label == "quote"
+        assert classifier.classify("xyz").label == "first"
+
+    def test_inline_global_flags(self):
+        """Patterns starting with (?i) or (?x) work alongside other patterns."""
+        classifier = RuleClassifier(
+            [
+                LabelRule("acronym", patterns=[r"\bUTC\b", r"(?i)\bgmt\b"]),
+                LabelRule("spaced", patterns=[r"(?x) \b time \s zone \b  # tz"]),
+            ],
+            case_sensitive=True,
+        )
+
+        assert classifier.classify("GMT offset").label == "acronym"
+        assert classifier.classify("utc offset").label is None
+        assert classifier.classify("which time zone").label == "spaced"
+
+    def test_overlapping_matches_across_labels(self):
+        """A match for one label does not hide an overlapping one for another."""
+        classifier = RuleClassifier(
+            [
+                LabelRule("weather", patterns=[r"\brain"]),
+                LabelRule("forecast", patterns=[r"\brain(y|ing) tomorrow\b"]),
+            ]
+        )
+
+        score = classifier.classify("is it raining tomorrow")
+
+        assert score.scores == {"weather": 0.5, "forecast": 0.5}
@@ -0,0 +1,76 @@
+"""Tests for local parameter extractors."""
+
+import re
+
+import pytest
+
+from intent_kit.nodes.local_extractors import (
+    COMMON_PATTERNS,
+    CallableExtractor,
+    RegexExtractor,
+    as_param_extractor,
+)
+
+
+class TestRegexExtractor:
+    """Test RegexExtractor."""
+
+    def test_whole_match(self):
+        extractor = RegexExtractor(r"\d+")
+
+        assert extractor.extract("order 42 please") == "42"
+        assert extractor.extract("nothing here") is None
+
+    def test_first_group_and_convert(self):
+        extractor = RegexExtractor(r"order #(\d+)", convert=int)
+
+        assert extractor.extract("where is order #1234?") == 1234
+
+    def test_named_value_group(self):
+        extractor = RegexExtractor(r"(from|to) (?P<value>[A-Z]\w+)")
+
+        assert extractor.extract("flights to Paris") == "Paris"
+
+    def test_precompiled_pattern(self):
+        extractor = RegexExtractor(re.compile(r"yes|no", re.IGNORECASE))
+
+        assert extractor.extract("YES") == "YES"
+
+
+class TestAsParamExtractor:
+    """Test as_param_extractor."""
+
+    def test_builtin_patterns(self):
+        email = as_param_extractor({"builtin": "email"})
+        date = as_param_extractor({"builtin": "iso_date"})
+        number = as_param_extractor({"builtin": "number"})
+
+        assert email.extract("mail bob@example.com now") == "bob@example.com"
+        assert date.extract("due 2025-08-20.") == "2025-08-20"
+        assert number.extract("add 3.5 and 2") == "3.5"
+
+    def test_pattern_dict_ignore_case(self):
+        extractor = as_param_extractor({"pattern": "paris", "ignore_case": True})
+
+        assert extractor.extract("PARIS") == "PARIS"
+
+    def test_callable(self):
+        extractor = as_param_extractor(lambda text: text.upper() or None)
+
+        assert isinstance(extractor, CallableExtractor)
+        assert extractor.extract("hi") == "HI"
+
+    def test_passes_through_extractors(self):
+        extractor = RegexExtractor(r"\d+")
+
+        assert as_param_extractor(extractor) is extractor
+
+    def test_invalid_specs(self):
+        with pytest.raises(ValueError, match="Unknown builtin"):
+            as_param_extractor({"builtin": "zipcode"})
+        with pytest.raises(ValueError):
+            as_param_extractor(42)
+
+    def test_common_patterns_compile(self):
+        for pattern in COMMON_PATTERNS.values():
+            re.compile(pattern)
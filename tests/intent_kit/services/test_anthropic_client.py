@@ -135,6 +135,64 @@ class TestAnthropicClient:
                 messages=[{"role": "user", "content": "Test prompt"}],
             )
 
+    def test_generate_with_generation_params(self):
+        """Test that generation params map onto the messages request."""
+        with patch.object(AnthropicClient, "get_client") as mock_get_client:
+            mock_client = Mock()
+            mock_content = Mock()
+            mock_content.text = "weather"
+            mock_response = Mock()
+            mock_response.content = [mock_content]
+            mock_response.usage = None
+            mock_client.messages.create.return_value = mock_response
+            mock_get_client.return_value = mock_client
+
+            client = AnthropicClient("test_api_key")
+            result = client.generate(
+                "Test prompt",
+                max_tokens=4,
+                temperature=0.0,
+                stop=["\n", "###"],
+                choices=["greet", "weather"],
+            )
+
+            assert result.content == "weather"
+            mock_client.messages.create.assert_called_once_with(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=4,
+                messages=[{"role": "user", "content": "Test prompt"}],
+                temperature=0.0,
+                stop_sequences=["###"],
+            )
+
+    def test_generate_with_cache_prefix(self):
+        """Test that a cacheable prefix becomes a cache_control block."""
+        with patch.object(AnthropicClient, "get_client") as mock_get_client:
+            mock_client = Mock()
+            mock_content = Mock()
+            mock_content.text = "weather"
+            mock_response = Mock()
+            mock_response.content = [mock_content]
+            mock_response.usage = Mock(
+                prompt_tokens=10, completion_tokens=1, cache_read_input_tokens=1500
+            )
+            mock_client.messages.create.return_value = mock_response
+            mock_get_client.return_value = mock_client
+
+            client = AnthropicClient("test_api_key")
+            result = client.generate("Static prefix. Input: hi", cache_prefix=15)
+
+            assert result.cached_tokens == 1500
+            messages = mock_client.messages.create.call_args.kwargs["messages"]
+            assert messages[0]["content"] == [
+                {
+                    "type": "text",
+                    "text": "Static prefix. ",
+                    "cache_control": {"type": "ephemeral"},
+                },
+                {"type": "text", "text": "Input: hi"},
+            ]
+
     def test_generate_with_custom_model(self):
         """Test text generation with custom model."""
         with patch.object(AnthropicClient, "get_client") as mock_get_client:
@@ -87,6 +87,24 @@ class TestOllamaClient:
             model="llama2", prompt="Test prompt", stream=True
         )
 
+    @patch("ollama.Client")
+    def test_generate_stream_with_params(self, mock_client_class):
+        """Test streaming passes generation options to Ollama."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+        mock_client.generate.return_value = [{"response": "{}"}]
+
+        client = OllamaClient()
+        result = list(client.generate_stream("Test prompt", max_tokens=20))
+
+        assert result == ["{}"]
+        mock_client.generate.assert_called_once_with(
+            model="llama2",
+            prompt="Test prompt",
+            stream=True,
+            options={"num_predict": 20},
+        )
+
     @patch("ollama.Client")
     def test_chat_success(self, mock_client_class):
         """Test successful chat functionality."""
@@ -5,6 +5,7 @@ Tests for OpenAI client.
 import pytest
 import os
 from unittest.mock import Mock, patch
+from intent_kit.services.ai.base_client import is_reasoning_model
 from intent_kit.services.ai.openai_client import OpenAIClient
 from intent_kit.services.ai.llm_response import RawLLMResponse
 from intent_kit.services.ai.pricing_service import PricingService
@@ -134,6 +135,193 @@ class TestOpenAIClient:
                 max_tokens=1000,
             )
 
+    def test_generate_with_generation_params(self):
+        """Test that generation params map onto the chat completion request."""
+        with patch.object(OpenAIClient, "get_client") as mock_get_client:
+            mock_client = Mock()
+            mock_message = Mock()
+            mock_message.content = '{"choice": "weather"}'
+            mock_choice = Mock()
+            mock_choice.message = mock_message
+            mock_response = Mock()
+            mock_response.choices = [mock_choice]
+            mock_response.usage = None
+            mock_client.chat.completions.create.return_value = mock_response
+            mock_get_client.return_value = mock_client
+
+            client = OpenAIClient("test_api_key")
+            result = client.generate(
+                "Test prompt",
+                model="gpt-4o-mini",
+                max_tokens=4,
+                temperature=0.0,
+                stop=["\n"],
+                choices=["greet", "weather"],
+            )
+
+            assert result.content == "weather"
+            kwargs = mock_client.chat.completions.create.call_args.kwargs
+            assert kwargs["max_tokens"] == 20
+            assert kwargs["temperature"] == 0.0
+            # Stop sequences could truncate the JSON wrapper
+            assert "stop" not in kwargs
+            schema = kwargs["response_format"]["json_schema"]["schema"]
+            assert schema["properties"]["choice"]["enum"] == ["greet", "weather"]
+
+    def test_generate_with_reasoning_model(self):
+        """Reasoning models get max_completion_tokens and no temperature or stop."""
+        with patch.object(OpenAIClient, "get_client") as mock_get_client:
+            mock_client = Mock()
+            mock_message = Mock()
+            mock_message.content = '{"choice": "weather"}'
+            mock_choice = Mock()
+            mock_choice.message = mock_message
+            mock_response = Mock()
+            mock_response.choices = [mock_choice]
+            mock_response.usage = None
+            mock_client.chat.completions.create.return_value = mock_response
+            mock_get_client.return_value = mock_client
+
+            client = OpenAIClient("test_api_key")
+            result = client.generate(
+                "Test prompt",
+                model="o3-mini",
+                max_tokens=4,
+                temperature=0.0,
+                stop=["\n"],
+                choices=["greet", "weather"],
+            )
+
+            assert result.content == "weather"
+            kwargs = mock_client.chat.completions.create.call_args.kwargs
+            # A label-sized budget would be spent on reasoning tokens
+            assert kwargs["max_completion_tokens"] == 1000
+            assert "max_tokens" not in kwargs
+            assert "temperature" not in kwargs
+            assert "stop" not in kwargs
+            schema = kwargs["response_format"]["json_schema"]["schema"]
+            assert schema["properties"]["choice"]["enum"] == ["greet", "weather"]
+
+            client.generate("Test prompt", model="o1", max_tokens=4000, stop=["\n"])
+            kwargs = mock_client.chat.completions.create.call_args.kwargs
+            assert kwargs == {
+                "model": "o1",
+                "messages": [{"role": "user", "content": "Test prompt"}],
+                "max_completion_tokens": 4000,
+            }
+
+    def test_is_reasoning_model(self):
+        assert is_reasoning_model("o1")
+        assert is_reasoning_model("o4-mini")
+        assert is_reasoning_model("gpt-5-mini")
+        assert is_reasoning_model("openai/o3")
+        assert not is_reasoning_model("gpt-5-chat-latest")
+        assert not is_reasoning_model("gpt-4o-mini")
+        assert not is_reasoning_model("gpt-4.1")
+
+    def test_generate_ignores_choices_without_structured_outputs(self):
+        """Models without structured outputs get only the token and stop limits."""
+        with patch.object(OpenAIClient, "get_client") as mock_get_client:
+            mock_client = Mock()
+            mock_message = Mock()
+            mock_message.content = "weather"
+            mock_choice = Mock()
+            mock_choice.message = mock_message
+            mock_response = Mock()
+            mock_response.choices = [mock_choice]
+            mock_response.usage = None
+            mock_client.chat.completions.create.return_value = mock_response
+            mock_get_client.return_value = mock_client
+
+            client = OpenAIClient("test_api_key")
+            for model in ("gpt-4", "gpt-3.5-turbo"):
+                result = client.generate(
+                    "Test prompt",
+                    model=model,
+                    max_tokens=4,
+                    stop=["\n"],
+                    choices=["greet", "weather"],
+                )
+
+                assert result.content == "weather"
+                kwargs = mock_client.chat.completions.create.call_args.kwargs
+                assert "response_format" not in kwargs
+                assert kwargs["max_tokens"] == 4
+                assert kwargs["stop"] == ["\n"]
+
+    def test_supports_choices(self):
+        with patch.object(OpenAIClient, "get_client"):
+            client = OpenAIClient("test_api_key")
+        assert client.supports_choices("gpt-4o-mini")
+        assert client.supports_choices("gpt-4o-2024-08-06")
+        assert client.supports_choices("o3-mini")
+        assert not client.supports_choices("gpt-4")
+        assert not client.supports_choices("gpt-4-turbo")
+        assert not client.supports_choices("gpt-3.5-turbo")
+        assert not client.supports_choices("gpt-4o-2024-05-13")
+
+    def test_generate_rejects_unknown_params(self):
+        """Test that unsupported generation params raise."""
+        with patch.object(OpenAIClient, "get_client"):
+            client = OpenAIClient("test_api_key")
+            with pytest.raises(ValueError, match="top_k"):
+                client.generate("Test prompt", top_k=5)
+
+    def test_generate_reports_cached_tokens(self):
+        """Test that cached prompt tokens are read from usage details."""
+        with patch.object(OpenAIClient, "get_client") as mock_get_client:
+            mock_client = Mock()
+            mock_message = Mock()
+            mock_message.content = "Generated response"
+            mock_choice = Mock()
+            mock_choice.message = mock_message
+            mock_response = Mock()
+            mock_response.choices = [mock_choice]
+            mock_response.usage = Mock(prompt_tokens=2000, completion_tokens=5)
+            mock_response.usage.prompt_tokens_details.cached_tokens = 1792
+            mock_client.chat.completions.create.return_value = mock_response
+            mock_get_client.return_value = mock_client
+
+            client = OpenAIClient("test_api_key")
+            result = client.generate("Test prompt", cache_prefix=6)
+
+            assert result.cached_tokens == 1792
+            # Prefix caching is automatic; no extra request parameters are sent
+            mock_client.chat.completions.create.assert_called_once_with(
+                model="gpt-4",
+                messages=[{"role": "user", "content": "Test prompt"}],
+                max_tokens=1000,
+            )
+
+    def test_generate_stream_yields_deltas_and_closes(self):
+        """Test streaming yields content deltas and closes the stream early."""
+        with patch.object(OpenAIClient, "get_client") as mock_get_client:
+            mock_client = Mock()
+            chunks = []
+            for content in ['{"a": ', None, '"b"}', "tail"]:
+                chunk = Mock()
+                chunk.choices = [Mock()]
+                chunk.choices[0].delta.content = content
+                chunks.append(chunk)
+            mock_stream = Mock()
+            mock_stream.__iter__ = Mock(return_value=iter(chunks))
+            mock_client.chat.completions.create.return_value = mock_stream
+            mock_get_client.return_value = mock_client
+
+            client = OpenAIClient("test_api_key")
+            stream = client.generate_stream("Test prompt", max_tokens=50)
+            received = [next(stream), next(stream)]
+            stream.close()
+
+            assert received == ['{"a": ', '"b"}']
+            mock_stream.close.assert_called_once()
+            mock_client.chat.completions.create.assert_called_once_with(
+                model="gpt-4",
+                messages=[{"role": "user", "content": "Test prompt"}],
+                stream=True,
+                max_tokens=50,
+            )
+
     def test_generate_with_custom_model(self):
         """Test text generation with custom model."""
         with patch.object(OpenAIClient, "get_client") as mock_get_client:
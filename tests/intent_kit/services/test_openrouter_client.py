@@ -399,6 +399,15 @@ class TestOpenRouterClient:
         assert len(openrouter_provider.models) > 0
         assert "mistralai/mistral-7b-instruct" in openrouter_provider.models
 
+    def test_supports_choices(self):
+        """Only OpenAI models with structured outputs enforce choices."""
+        with patch.object(OpenRouterClient, "get_client"):
+            client = OpenRouterClient(api_key="test-key")
+
+        assert client.supports_choices("openai/gpt-4o-mini")
+        assert not client.supports_choices("openai/gpt-4")
+        assert not client.supports_choices("mistralai/mistral-7b-instruct")
+
     def test_ensure_imported(self):
         """Test ensuring client is imported."""
         client = OpenRouterClient(api_key="test-key")
@@ -0,0 +1,234 @@
+"""
+Tests for the recording LLM client.
+"""
+
+import gzip
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from intent_kit.services.ai.base_client import BaseLLMClient
+from intent_kit.services.ai.llm_response import RawLLMResponse
+from intent_kit.services.ai.recording_client import (
+    CassetteWriter,
+    RecordingLLMClient,
+    cassette_key,
+    iter_cassette,
+)
+
+
+class FakeClient(BaseLLMClient):
+    """Minimal client returning canned responses."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls: List[Tuple[str, str, Dict[str, Any]]] = []
+        self.streamed: List[str] = []
+        super().__init__(name="fake")
+
+    def _initialize_client(self, **kwargs) -> None:
+        self._client = object()
+
+    def get_client(self):
+        return self._client
+
+    def _ensure_imported(self) -> None:
+        pass
+
+    def generate(self, prompt: str, model: str, **params) -> RawLLMResponse:
+        self.calls.append((prompt, model, params))
+        if self.fail:
+            raise RuntimeError("provider down")
+        return RawLLMResponse(
+            content=f"echo:{prompt}",
+            model=model,
+            provider="fake",
+            input_tokens=3,
+            output_tokens=2,
+            cost=0.001,
+            duration=0.01,
+        )
+
+    def generate_stream(self, prompt: str, model: str, **params):
+        self.calls.append((prompt, model, params))
+        try:
+            for chunk in ("echo", ":", prompt):
+                self.streamed.append(chunk)
+                yield chunk
+                if self.fail:
+                    raise RuntimeError("stream dropped")
+        finally:
+            self.streamed.append("<closed>")
+
+
+class TestRecordingLLMClient:
+    """Test RecordingLLMClient."""
+
+    def test_records_response(self, tmp_path):
+        path = tmp_path / "traffic.jsonl.gz"
+        wrapped = FakeClient()
+
+        with RecordingLLMClient(wrapped, path) as client:
+            response = client.generate("hello", "fake-model")
+
+        assert response.content == "echo:hello"
+        records = list(iter_cassette(path))
+        assert len(records) == 1
+        record = records[0]
+        assert record["prompt"] == "hello"
+        assert record["model"] == "fake-model"
+        assert record["params"] == {}
+        assert record["content"] == "echo:hello"
+        assert record["input_tokens"] == 3
+        assert record["output_tokens"] == 2
+        assert record["cost"] == 0.001
+        assert record["latency"] >= 0
+        assert record["key"] == cassette_key("hello", "fake-model")
+
+    def test_forwards_params(self, tmp_path):
+        path = tmp_path / "traffic.jsonl.gz"
+        wrapped = FakeClient()
+
+        with RecordingLLMClient(wrapped, path) as client:
+            client.generate("hi", "fake-model", max_tokens=5)
+
+        assert wrapped.calls == [("hi", "fake-model", {"max_tokens": 5})]
+        (record,) = iter_cassette(path)
+        assert record["params"] == {"max_tokens": 5}
+        assert record["key"] == cassette_key("hi", "fake-model", {"max_tokens": 5})
+
+    def test_records_errors_and_reraises(self, tmp_path):
+        path = tmp_path / "traffic.jsonl.gz"
+
+        with RecordingLLMClient(FakeClient(fail=True), path) as client:
+            with pytest.raises(RuntimeError, match="provider down"):
+                client.generate("hello", "fake-model")
+
+        (record,) = iter_cassette(path)
+        assert record["error"] == "provider down"
+        assert "content" not in record
+
+    def test_forwards_stream_and_records_content(self, tmp_path):
+        path = tmp_path / "traffic.jsonl.gz"
+        wrapped = FakeClient()
+
+        with RecordingLLMClient(wrapped, path) as client:
+            chunks = list(client.generate_stream("hi", "fake-model", max_tokens=5))
+
+        assert chunks == ["echo", ":", "hi"]
+        assert wrapped.calls == [("hi", "fake-model", {"max_tokens": 5})]
+        (record,) = iter_cassette(path)
+        assert record["stream"] is True
+        assert record["content"] == "echo:hi"
+        assert record["params"] == {"max_tokens": 5}
+        assert record["key"] == cassette_key("hi", "fake-model", {"max_tokens": 5})
+        assert "closed_early" not in record
+
+    def test_early_close_closes_wrapped_stream(self, tmp_path):
+        path = tmp_path / "traffic.jsonl.gz"
+        wrapped = FakeClient()
+
+        with RecordingLLMClient(wrapped, path) as client:
+            stream = client.generate_stream("hi", "fake-model")
+            assert next(stream) == "echo"
+            stream.close()
+
+        assert wrapped.streamed == ["echo", "<closed>"]
+        (record,) = iter_cassette(path)
+        assert record["content"] == "echo"
+        assert record["closed_early"] is True
+
+    def test_records_stream_errors_and_reraises(self, tmp_path):
+        path = tmp_path / "traffic.jsonl.gz"
+
+        with RecordingLLMClient(FakeClient(fail=True), path) as client:
+            with pytest.raises(RuntimeError, match="stream dropped"):
+                list(client.generate_stream("hello", "fake-model"))
+
+        (record,) = iter_cassette(path)
+        assert record["error"] == "stream dropped"
+        assert record["content"] == "echo"
+
+    def test_cassette_is_append_only(self, tmp_path):
+        path = tmp_path / "traffic.jsonl.gz"
+
+        with RecordingLLMClient(FakeClient(), path) as client:
+            client.generate("first", "m")
+        with RecordingLLMClient(FakeClient(), path) as client:
+            client.generate("second", "m")
+
+        prompts = [r["prompt"] for r in iter_cassette(path)]
+        assert prompts == ["first", "second"]
+
+    def test_cassette_is_compressed(self, tmp_path):
+        path = tmp_path / "traffic.jsonl.gz"
+
+        with RecordingLLMClient(FakeClient(), path) as client:
+            for _ in range(50):
+                client.generate("the same long prompt " * 20, "m")
+
+        raw = path.read_bytes()
+        assert raw[:2] == b"\x1f\x8b"
+        assert len(raw) < len(gzip.decompress(raw)) / 10
+
+
+class TestTruncatedCassette:
+    """Test reading cassettes whose writer was never closed."""
+
+    def test_reads_flushed_records_of_unclosed_writer(self, tmp_path):
+        path = tmp_path / "c.jsonl.gz"
+        writer = CassetteWriter(path, flush_every=1)
+        for i in range(3):
+            writer.write({"i": i})
+        # Simulate a crash: copy the file before close() writes the trailer
+        crashed = tmp_path / "crashed.jsonl.gz"
+        crashed.write_bytes(path.read_bytes())
+        writer.close()
+
+        assert [r["i"] for r in iter_cassette(crashed)] == [0, 1, 2]
+
+    def test_drops_record_cut_mid_way(self, tmp_path):
+        path = tmp_path / "c.jsonl.gz"
+        with CassetteWriter(path) as writer:
+            writer.write({"i": 0})
+        with CassetteWriter(path) as writer:
+            writer.write({"i": 1, "text": "x" * 200})
+        path.write_bytes(path.read_bytes()[:-20])
+
+        assert [r["i"] for r in iter_cassette(path)] == [0]
+
+    def test_tolerates_cut_in_member_header(self, tmp_path):
+        path = tmp_path / "c.jsonl.gz"
+        with CassetteWriter(path) as writer:
+            writer.write({"i": 0})
+        with path.open("ab") as f:
+            f.write(b"\x1f\x8b\x08")
+
+        assert [r["i"] for r in iter_cassette(path)] == [0]
+
+
+class TestCassetteWriter:
+    """Test CassetteWriter."""
+
+    def test_write_after_close_raises(self, tmp_path):
+        writer = CassetteWriter(tmp_path / "c.jsonl.gz")
+        writer.close()
+        writer.close()
+
+        assert writer.closed
+        with pytest.raises(ValueError):
+            writer.write({"a": 1})
+
+    def test_invalid_flush_every(self, tmp_path):
+        with pytest.raises(ValueError):
+            CassetteWriter(tmp_path / "c.jsonl.gz", flush_every=0)
+
+    def test_counts_records(self, tmp_path):
+        with CassetteWriter(tmp_path / "c.jsonl.gz", flush_every=2) as writer:
+            for i in range(5):
+                writer.write({"i": i})
+            assert writer.records_written == 5
+
+        assert [r["i"] for r in iter_cassette(tmp_path / "c.jsonl.gz")] == list(
+            range(5)
+        )
@@ -0,0 +1,44 @@
+"""Tests for the Aho–Corasick matcher."""
+
+import re
+
+from intent_kit.utils.aho_corasick import AhoCorasick
+
+
+class TestAhoCorasick:
+    """Test AhoCorasick."""
+
+    def test_finds_all_keywords(self):
+        automaton = AhoCorasick(["he", "she", "his", "hers"])
+
+        matches = sorted(automaton.iter_matches("ushers"))
+
+        assert matches == [(1, 4, 1), (2, 4, 0), (2, 6, 3)]
+
+    def test_no_matches(self):
+        automaton = AhoCorasick(["weather"])
+
+        assert list(automaton.iter_matches("cancel my order")) == []
+
+    def test_ignores_empty_keywords(self):
+        automaton = AhoCorasick(["", "a"])
+
+        assert list(automaton.iter_matches("aa")) == [(0, 1, 1), (1, 2, 1)]
+
+    def test_duplicate_keywords_report_each_index(self):
+        automaton = AhoCorasick(["rain", "rain"])
+
+        assert sorted(i for _, _, i in automaton.iter_matches("rain")) == [0, 1]
+
+    def test_matches_agree_with_naive_search(self):
+        keywords = ["ab", "abc", "bc", "c", "cab", "bca"]
+        text = "abcabcabbcacab"
+        automaton = AhoCorasick(keywords)
+
+        expected = sorted(
+            (m.start(), m.start() + len(k), i)
+            for i, k in enumerate(keywords)
+            for m in re.finditer(f"(?={re.escape(k)})", text)
+        )
+
+        assert sorted(automaton.iter_matches(text)) == expected
@@ -0,0 +1,90 @@
+"""Tests for local embedding utilities."""
+
+import math
+
+import pytest
+
+from intent_kit.utils.embeddings import (
+    Embedder,
+    HashedNgramEmbedder,
+    centroid,
+    cosine_similarity,
+    normalize,
+)
+
+
+class TestHashedNgramEmbedder:
+    """Test HashedNgramEmbedder."""
+
+    def test_vectors_are_normalized(self):
+        embedder = HashedNgramEmbedder()
+        embedder.fit(["hello world", "weather today"])
+
+        vector = embedder.embed("hello there world")
+
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        assert norm == pytest.approx(1.0)
+
+    def test_identical_texts_have_similarity_one(self):
+        embedder = HashedNgramEmbedder()
+        embedder.fit(["what is the weather"])
+
+        a = embedder.embed("what is the weather")
+        b = embedder.embed("What is the weather?")
+
+        assert cosine_similarity(a, b) == pytest.approx(1.0)
+
+    def test_similar_texts_score_higher(self):
+        embedder = HashedNgramEmbedder()
+        embedder.fit(["weather forecast", "cancel my order"])
+
+        query = embedder.embed("weather forcast tomorrow")
+
+        assert cosine_similarity(
+            query, embedder.embed("weather forecast")
+        ) > cosine_similarity(query, embedder.embed("cancel my order"))
+
+    def test_empty_text_embeds_to_empty_vector(self):
+        embedder = HashedNgramEmbedder()
+
+        assert embedder.embed("") == {}
+        assert embedder.embed("!!!") == {}
+
+    def test_non_latin_text_is_embedded(self):
+        embedder = HashedNgramEmbedder()
+        embedder.fit(["какая сегодня погода", "отмените мой заказ"])
+
+        query = embedder.embed("какая погода завтра")
+
+        assert query
+        assert embedder.embed("天気予報")
+        assert cosine_similarity(
+            query, embedder.embed("какая сегодня погода")
+        ) > cosine_similarity(query, embedder.embed("отмените мой заказ"))
+
+    def test_hashing_is_stable(self):
+        assert HashedNgramEmbedder().embed("hello") == HashedNgramEmbedder().embed(
+            "hello"
+        )
+
+    def test_satisfies_protocol(self):
+        assert isinstance(HashedNgramEmbedder(), Embedder)
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            HashedNgramEmbedder(n_features=0)
+        with pytest.raises(ValueError):
+            HashedNgramEmbedder(char_ngram_range=(4, 2))
+
+
+class TestVectorHelpers:
+    """Test sparse vector helpers."""
+
+    def test_normalize_zero_vector(self):
+        assert normalize({1: 0.0}) == {}
+
+    def test_centroid(self):
+        result = centroid([{0: 1.0}, {1: 1.0}])
+
+        assert result[0] == pytest.approx(1 / math.sqrt(2))
+        assert result[1] == pytest.approx(1 / math.sqrt(2))
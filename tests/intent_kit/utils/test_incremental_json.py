@@ -0,0 +1,75 @@
+"""
+Tests for incremental JSON object parsing.
+"""
+
+import json
+
+import pytest
+
+from intent_kit.utils.incremental_json import IncrementalJSONObjectParser
+
+
+def _feed_chars(parser, text):
+    """Feed text one character at a time, collecting completed members."""
+    completed = []
+    for char in text:
+        completed.extend(parser.feed(char))
+    return completed
+
+
+class TestIncrementalJSONObjectParser:
+    """Test IncrementalJSONObjectParser."""
+
+    def test_members_complete_as_values_close(self):
+        parser = IncrementalJSONObjectParser()
+
+        assert parser.feed('{"city": "Par') == []
+        assert parser.feed('is", "days": 3') == [("city", "Paris")]
+        assert parser.feed(", ") == [("days", 3)]
+        assert parser.feed('"ok": true}') == [("ok", True)]
+        assert parser.done
+        assert parser.members == {"city": "Paris", "days": 3, "ok": True}
+
+    def test_character_by_character_matches_json_loads(self):
+        payload = {
+            "text": 'comma, brace } and "quote" \\ escaped',
+            "nested": {"list": [1, {"a": "]"}], "empty": {}},
+            "number": -1.5e3,
+            "none": None,
+            "flag": False,
+            "unicode": "café",
+        }
+        parser = IncrementalJSONObjectParser()
+
+        completed = _feed_chars(parser, json.dumps(payload))
+
+        assert [key for key, _ in completed] == list(payload)
+        assert dict(completed) == payload
+        assert parser.done
+
+    def test_skips_fence_and_preamble(self):
+        parser = IncrementalJSONObjectParser()
+
+        completed = parser.feed('Sure:\n```json\n{"a": 1}\n```')
+
+        assert completed == [("a", 1)]
+        assert parser.done
+        assert parser.text.endswith("```")
+
+    def test_empty_object(self):
+        parser = IncrementalJSONObjectParser()
+
+        assert parser.feed("{ }") == []
+        assert parser.done
+
+    def test_text_after_object_is_ignored(self):
+        parser = IncrementalJSONObjectParser()
+        parser.feed('{"a": 1} {"b": 2}')
+
+        assert parser.members == {"a": 1}
+
+    def test_invalid_value_raises(self):
+        parser = IncrementalJSONObjectParser()
+
+        with pytest.raises(ValueError):
+            parser.feed('{"a": nope,')
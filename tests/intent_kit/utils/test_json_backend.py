@@ -0,0 +1,66 @@
+"""
+Tests for the JSON backend facade.
+"""
+
+import json
+
+import pytest
+
+from intent_kit.utils import json_backend
+
+DOCUMENT = {
+    "intent": "book_flight",
+    "params": {"from": "SFO", "to": "Zürich", "passengers": 2, "price": 412.5},
+    "flags": [True, False, None],
+}
+
+
+@pytest.fixture(params=json_backend.available_backends())
+def backend(request):
+    previous = json_backend.backend_name
+    json_backend.use_backend(request.param)
+    yield request.param
+    json_backend.use_backend(previous)
+
+
+class TestJsonBackend:
+    """Test every installed backend against the standard library."""
+
+    def test_loads_matches_stdlib(self, backend):
+        text = json.dumps(DOCUMENT)
+
+        assert json_backend.loads(text) == json.loads(text)
+        assert json_backend.loads(text.encode("utf-8")) == DOCUMENT
+
+    def test_loads_falls_back_for_stdlib_only_input(self, backend):
+        assert json_backend.loads(str(2**70)) == 2**70
+        assert json_backend.loads('{"x": Infinity}') == {"x": float("inf")}
+
+    def test_loads_raises_stdlib_error(self, backend):
+        with pytest.raises(json.JSONDecodeError):
+            json_backend.loads('{"a": ')
+
+    def test_dumps_round_trips(self, backend):
+        assert json.loads(json_backend.dumps(DOCUMENT)) == DOCUMENT
+        assert "\n  " in json_backend.dumps(DOCUMENT, indent=True)
+
+    def test_canonical_dumps_sorts_keys_compactly(self, backend):
+        text = json_backend.canonical_dumps({"b": 1, "a": {"d": 2, "c": 3}})
+
+        assert text == '{"a":{"c":3,"d":2},"b":1}'
+
+    def test_canonical_dumps_ignores_backend(self, backend):
+        """Fingerprint encoding is pinned to the standard library."""
+        data = {"name": "José", "ratio": 0.1}
+        expected = json.dumps(data, separators=(",", ":"), sort_keys=True)
+        assert json_backend.canonical_dumps(data) == expected
+
+    def test_dumps_default_and_fallback(self, backend):
+        assert json_backend.dumps({"n": 1.5j}, default=str) == '{"n":"1.5j"}'
+        assert json_backend.dumps({"big": 2**70}) == '{"big":%d}' % 2**70
+        with pytest.raises(TypeError):
+            json_backend.dumps({"s": {1, 2}})
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError, match="not available"):
+            json_backend.use_backend("simdjson")
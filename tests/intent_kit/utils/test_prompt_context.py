@@ -0,0 +1,92 @@
+"""
+Tests for prompt context rendering.
+"""
+
+from unittest.mock import patch
+
+from intent_kit.core.context import DefaultContext
+from intent_kit.utils.prompt_context import (
+    CONTEXT_HEADER,
+    estimate_snapshot_tokens,
+    estimate_tokens,
+    render_context,
+)
+
+
+class TestRenderContext:
+    """Test render_context."""
+
+    def _context(self):
+        ctx = DefaultContext()
+        ctx.set("llm_service", object())
+        ctx.set("metadata", {"default_llm_config": {"model": "gpt-4o-mini"}})
+        ctx.set("user.name", "Alice")
+        ctx.set("cart", {"items": [2, 1], "total": 9.5})
+        return ctx
+
+    def test_renders_only_declared_keys(self):
+        rendered = render_context(self._context(), ["user.name", "cart"])
+
+        assert rendered.text == (
+            CONTEXT_HEADER
+            + '- user.name: "Alice"\n'
+            + '- cart: {"items":[2,1],"total":9.5}'
+        )
+        assert "llm_service" not in rendered.text
+        assert "metadata" not in rendered.text
+        assert rendered.tokens == estimate_tokens(rendered.text)
+        assert rendered.tokens_saved > 0
+        assert not rendered.truncated
+
+    def test_snapshot_estimate_is_lazy_and_copies_nothing(self):
+        ctx = self._context()
+
+        with patch.object(DefaultContext, "snapshot") as snapshot:
+            rendered = render_context(ctx, ["user.name"])
+            assert rendered._snapshot_tokens is None
+            saved = rendered.tokens_saved
+
+        snapshot.assert_not_called()
+        assert rendered.snapshot_tokens == estimate_tokens(
+            f"{CONTEXT_HEADER}{ctx.snapshot()}"
+        )
+        assert saved == rendered.snapshot_tokens - rendered.tokens
+
+    def test_snapshot_estimate_of_empty_context(self):
+        assert estimate_snapshot_tokens(DefaultContext()) == 0
+        assert estimate_snapshot_tokens(None) == 0
+
+    def test_skips_missing_keys(self):
+        rendered = render_context(self._context(), ["missing", "user.name"])
+
+        assert rendered.text == CONTEXT_HEADER + '- user.name: "Alice"'
+
+    def test_no_keys_renders_nothing(self):
+        rendered = render_context(self._context(), [])
+
+        assert rendered.text == ""
+        assert rendered.tokens == 0
+        assert rendered.tokens_saved == rendered.snapshot_tokens
+
+    def test_truncation_is_deterministic(self):
+        ctx = self._context()
+        ctx.set("history", ["turn"] * 200)
+        keys = ["user.name", "history", "cart"]
+
+        first = render_context(ctx, keys, max_tokens=20)
+        second = render_context(ctx, keys, max_tokens=20)
+
+        assert first == second
+        assert first.truncated
+        assert len(first.text) <= 20 * 4
+        assert first.text.endswith("...")
+        assert '- user.name: "Alice"' in first.text
+        assert "cart" not in first.text
+
+    def test_unserializable_values_fall_back_to_str(self):
+        ctx = DefaultContext()
+        ctx.set("when", {1, 2})
+
+        rendered = render_context(ctx, ["when"])
+
+        assert rendered.text == CONTEXT_HEADER + '- when: "{1, 2}"'
@@ -0,0 +1,37 @@
+"""
+Tests for precompiled prompt templates.
+"""
+
+import pytest
+
+from intent_kit.utils.prompt_template import PromptTemplate
+
+
+class TestPromptTemplate:
+    """Test PromptTemplate."""
+
+    def test_render_starts_with_prefix(self):
+        template = PromptTemplate("Static {not a field}\n", "Input: {user_input}")
+
+        prompt = template.render(user_input="hello {name}")
+
+        assert prompt == "Static {not a field}\nInput: hello {name}"
+        assert template.prefix_length == len("Static {not a field}\n")
+        assert template.fields == ["user_input"]
+
+    def test_escaped_braces(self):
+        template = PromptTemplate("", '{{"label": "{label}"}}')
+
+        assert template.render(label="x") == '{"label": "x"}'
+
+    def test_missing_field_raises(self):
+        template = PromptTemplate("", "{a} {b}")
+
+        with pytest.raises(KeyError, match="b"):
+            template.render(a=1)
+
+    def test_rejects_format_specs(self):
+        with pytest.raises(ValueError):
+            PromptTemplate("", "{value:>10}")
+        with pytest.raises(ValueError):
+            PromptTemplate("", "{}")
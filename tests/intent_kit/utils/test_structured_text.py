@@ -0,0 +1,133 @@
+"""
+Tests for single-pass structured text scanning.
+"""
+
+import json
+
+import pytest
+
+from intent_kit.utils import structured_text
+from intent_kit.utils.structured_text import locate_structured, scan_structured
+
+
+class _CountingDecoder(json.JSONDecoder):
+    """Decoder recording how many characters each scan hands it."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.chars = 0
+
+    def raw_decode(self, s, idx=0):
+        self.calls += 1
+        self.chars += len(s) - idx
+        return super().raw_decode(s, idx)
+
+
+@pytest.fixture
+def decoder(monkeypatch):
+    counting = _CountingDecoder()
+    monkeypatch.setattr(structured_text, "_DECODER", counting)
+    return counting
+
+
+class TestScanStructured:
+    """Test scan_structured."""
+
+    def test_finds_blocks_and_values_in_order(self):
+        text = 'Intro [1, 2]\n```json\n{"a": {"b": {"c": [1]}}}\n```\nthen {"d": 4}'
+
+        scan = scan_structured(text)
+
+        assert [(block.lang, block.content) for block in scan.blocks] == [
+            ("json", '{"a": {"b": {"c": [1]}}}')
+        ]
+        assert [(c.value, c.fence) for c in scan.values] == [
+            ([1, 2], None),
+            ({"a": {"b": {"c": [1]}}}, "json"),
+            ({"d": 4}, None),
+        ]
+
+    def test_arbitrary_nesting(self):
+        nested = '{"a": ' * 50 + "1" + "}" * 50
+
+        scan = scan_structured(f"Result: {nested} done")
+
+        value = scan.first_value(dict)
+        for _ in range(50):
+            value = value["a"]
+        assert value == 1
+
+    def test_skips_invalid_openers(self):
+        scan = scan_structured('use {braces} or [brackets] but {"ok": true}')
+
+        assert scan.first_value() == {"ok": True}
+
+    def test_prefers_json_fence_then_untagged_fence(self):
+        text = '{"plain": 1}\n```\n{"untagged": 2}\n```\n```json\n{"tagged": 3}\n```'
+
+        scan = scan_structured(text)
+
+        assert scan.first_value(dict) == {"tagged": 3}
+        assert scan.first_value(list) is None
+
+    @pytest.mark.parametrize(
+        "unit, found",
+        [
+            ("{", {"ok": 1}),
+            ("{a} ", {"ok": 1}),
+            ('{"', {"ok": 1}),
+            ("```json\n{", {"ok": 1}),
+            # Nesting too deep to decode swallows the rest
+            ("[", None),
+            ("[1, ", None),
+            ('{"a": [', None),
+        ],
+    )
+    def test_adversarial_input_is_linear(self, decoder, unit, found):
+        """Unbalanced or malformed openers cost time linear in the text."""
+        text = unit * 20000 + '{"ok": 1}'
+
+        scan = scan_structured(text)
+
+        # Rescanning after each failure would hand the decoder ~len(text)**2 / 2
+        assert decoder.chars <= 2 * structured_text._WINDOW * len(text)
+        assert scan.first_value() == found
+
+    def test_fenced_json_decoded_once(self, decoder):
+        scan = scan_structured('```json\n{"a": [1, {"b": 2}]}\n```')
+
+        assert decoder.calls == 1
+        assert scan.blocks[0].is_json
+        assert scan.blocks[0].value == {"a": [1, {"b": 2}]}
+        assert scan.first_value() == {"a": [1, {"b": 2}]}
+
+    def test_single_line_and_unterminated_fences(self):
+        assert scan_structured('```json{"a": 1}```').first_value() == {"a": 1}
+
+        scan = scan_structured('```json\n{"a": 1}')
+        assert scan.blocks[0].content == '{"a": 1}'
+        assert scan.first_value() == {"a": 1}
+
+
+class TestLocateStructured:
+    """Test locate_structured."""
+
+    def test_whole_text_json_including_scalars(self):
+        assert locate_structured(" 42 ").value == 42
+        assert locate_structured('```json\n"text"\n```').value == "text"
+
+    def test_embedded_json_in_prose(self):
+        payload = locate_structured('Sure! Here it is:\n{"a": [1, {"b": 2}]}\nBye')
+
+        assert payload.is_json
+        assert payload.value == {"a": [1, {"b": 2}]}
+
+    def test_yaml_left_for_fallback(self):
+        payload = locate_structured("name: x\nitems: [1, 2]")
+        assert not payload.is_json
+        assert payload.source == "name: x\nitems: [1, 2]"
+
+        payload = locate_structured('```yaml\nfilter: {"a": 1}\nlimit: 5\n```')
+        assert not payload.is_json
+        assert payload.source == 'filter: {"a": 1}\nlimit: 5'
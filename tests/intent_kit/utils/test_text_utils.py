@@ -35,6 +35,12 @@ class TestTextUtils:
         result = extract_json_from_text(text)
         assert result == {"key": "value"}
 
+    def test_extract_json_from_text_deeply_nested(self):
+        """Test extracting a JSON object nested deeper than two levels."""
+        text = 'Answer: {"a": {"b": {"c": {"d": [1, {"e": 2}]}}}} end'
+        result = extract_json_from_text(text)
+        assert result == {"a": {"b": {"c": {"d": [1, {"e": 2}]}}}}
+
     def test_extract_json_from_text_no_json(self):
         """Test extracting JSON when none exists."""
         text = "This is just plain text"
@@ -2,12 +2,16 @@
 Tests for the type validation utility.
 """
 
+from __future__ import annotations
+
 import pytest
 import enum
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple, Union
 
 from intent_kit.utils.type_coercion import (
+    _coerce_value,
+    compile_validator,
     validate_type,
     validate_dict,
     TypeValidationError,
@@ -295,3 +299,145 @@ class TestResolveType:
                 assert TYPE_MAP[type_name] is set
             elif type_name == "frozenset":
                 assert TYPE_MAP[type_name] is frozenset
+
+
+@dataclass
+class TreeNode:
+    """Self-referencing dataclass."""
+
+    value: int
+    children: List[TreeNode] = field(default_factory=list)
+
+
+class Point:
+    """Plain class built from its __init__ signature."""
+
+    def __init__(self, x: int, y: int = 0):
+        self.x = x
+        self.y = y
+
+    def __eq__(self, other):
+        return (self.x, self.y) == (other.x, other.y)
+
+
+def _outcome(func, value):
+    """Return ("ok", result) or ("error", message) for a validation call."""
+    try:
+        return ("ok", func(value))
+    except TypeValidationError as e:
+        return ("error", str(e))
+
+
+class TestCompileValidator:
+    """Test compiled validators, which also back ``_coerce_value``."""
+
+    @pytest.mark.parametrize(
+        "type_spec, value, expected",
+        [
+            (int, "42", ("ok", 42)),
+            (int, 4.0, ("ok", 4)),
+            (int, "x", ("error", "Expected int, got 'x'")),
+            (int, None, ("error", "Expected int, got None")),
+            (float, "1.5", ("ok", 1.5)),
+            (float, "nan?", ("error", "Expected float, got 'nan?'")),
+            (bool, 0, ("ok", False)),
+            (bool, "yes", ("ok", True)),
+            (bool, "OFF", ("ok", False)),
+            (bool, "maybe", ("error", "Expected bool, got str")),
+            (bool, 2, ("error", "Expected bool, got int")),
+            (str, 1, ("ok", "1")),
+            (str, None, ("ok", "None")),
+            (Any, object, ("ok", object)),
+            (type(None), None, ("ok", None)),
+            (type(None), 0, ("error", "Expected None, got int")),
+            (Optional[int], None, ("ok", None)),
+            (Optional[int], "3", ("ok", 3)),
+            (Optional[int], "x", ("error", "Expected None, got str")),
+            (Union[int, str], "abc", ("ok", "abc")),
+            (Union[int, str], 1.0, ("ok", 1)),
+            (Literal["a", "b"], "a", ("ok", "a")),
+            (Literal["a", "b"], "c", ("error", "Expected one of ('a', 'b'), got 'c'")),
+            (Role, "admin", ("ok", Role.ADMIN)),
+            (Role, "ADMIN", ("ok", Role.ADMIN)),
+            (Role, "nobody", ("error", "Cannot coerce 'nobody' to enum Role")),
+            (List[int], ("3",), ("ok", [3])),
+            (List[int], "12", ("error", "Expected list, got str")),
+            (List[int], [None], ("error", "Expected int, got None")),
+            (Tuple[int], [1, "2"], ("ok", (1, 2))),
+            (Set[str], [1, 1, 2], ("ok", {"1", "2"})),
+            (Dict[str, int], {"a": "1"}, ("ok", {"a": 1})),
+            (Dict[str, int], [1], ("error", "Expected dict, got list")),
+            (dict, [("a", 1)], ("error", "Expected dict, got list")),
+            (
+                User,
+                {"id": "1", "name": "n", "email": "e"},
+                ("error", "Missing required field(s) for User: ['role']"),
+            ),
+            (
+                User,
+                {"id": "1", "name": "n", "email": "e", "role": "user", "x": 1},
+                ("error", "Unexpected fields for User: ['x']"),
+            ),
+            (User, ["not", "a"], ("error", "Expected object (mapping) for User")),
+            (Point, {"x": "1"}, ("ok", Point(1))),
+            (Point, {"y": 2}, ("error", "Missing required param 'x' for Point")),
+            (Point, {"x": 1, "z": 0}, ("error", "Unexpected fields for Point: ['z']")),
+        ],
+    )
+    def test_coercion_outcomes(self, type_spec, value, expected):
+        assert _outcome(compile_validator(type_spec), value) == expected
+        assert _outcome(lambda v: _coerce_value(v, type_spec), value) == expected
+
+    def test_validators_are_cached(self):
+        assert compile_validator(List[int]) is compile_validator(List[int])
+        assert compile_validator("int") is compile_validator(int)
+
+    def test_union_member_order_kept(self):
+        """typing equates Union[str, int] and Union[int, str]; the cache must not."""
+        assert validate_type("5", Union[str, int]) == "5"
+        assert validate_type("5", Union[int, str]) == 5
+        assert compile_validator(Union[str, int]) is not compile_validator(
+            Union[int, str]
+        )
+        assert compile_validator(Literal[1])(True) is True
+        assert _outcome(compile_validator(Literal[True]), 1) == ("ok", 1)
+
+    def test_string_type_names_resolved(self):
+        assert compile_validator("float")("2") == 2.0
+        with pytest.raises(ValueError, match="Unknown type name"):
+            compile_validator("decimal")
+
+    def test_self_referencing_dataclass(self):
+        tree = compile_validator(TreeNode)(
+            {"value": "1", "children": [{"value": 2, "children": []}]}
+        )
+
+        assert tree == TreeNode(1, [TreeNode(2)])
+
+    def test_unexpected_errors_wrapped(self):
+        class Exploding:
+            def __init__(self, x: int):
+                raise RuntimeError("boom")
+
+        with pytest.raises(TypeValidationError, match="Unexpected error.*boom"):
+            compile_validator(Exploding)({"x": 1})
+
+    def test_unresolvable_annotations_fail_per_call(self):
+        @dataclass
+        class Pending:
+            later: "DefinedLater"  # type: ignore[name-defined]  # noqa: F821
+
+        validator = compile_validator(Pending)
+
+        with pytest.raises(TypeValidationError, match="Expected object"):
+            validator(["not", "a", "mapping"])
+        with pytest.raises(TypeValidationError, match="Unexpected error.*Defined"):
+            validator({"later": 1})
+
+    def test_unsupported_parameter_kind(self):
+        class Variadic:
+            def __init__(self, *args: int):
+                self.args = args
+
+        with pytest.raises(TypeValidationError, match="Unsupported parameter kind"):
+            compile_validator(Variadic)({"args": [1]})